@@ -0,0 +1,142 @@
+"""Microbenchmark of the exclude/include glob filter over synthetic s3 keys.
+
+Filters the keys against exclude and include patterns with the compiled
+GlobFilter, per key and in batches of a list_objects page, and with the
+previous per pattern fnmatch loop as the baseline. The baseline only runs
+over --baseline-count keys and is extrapolated to --count.
+
+Usage:
+    python benchmarks/glob_filter.py [--count 10000000] [--patterns 50]
+"""
+import argparse
+import fnmatch
+import os
+import sys
+import time
+from typing import Callable, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from fzfaws.s3.helper.exclude_file import GlobFilter  # noqa: E402
+
+# number of keys in a list_objects page
+PAGE_SIZE = 1000
+
+
+def synthetic_key(i: int) -> str:
+    """Generate a key in the shape of a log bucket.
+
+    :param i: index of the key
+    :type i: int
+    :return: the key
+    :rtype: str
+    """
+    return "logs/%04d/%02d/%08d.%s" % (i % 2020, i % 12, i, ("json.gz", "txt")[i % 2])
+
+
+def synthetic_patterns(count: int) -> List[str]:
+    """Generate exclude patterns, most of them don't match any key.
+
+    :param count: number of patterns
+    :type count: int
+    :return: glob patterns
+    :rtype: List[str]
+    """
+    shapes = ["tmp/%s/*", "*.%s.bak", "logs/[!0-9]%s*", "*/cache%s/?"]
+    return ["*.txt"] + [shapes[i % 4] % i for i in range(count - 1)]
+
+
+def fnmatch_exclude(exclude: List[str], include: List[str], filename: str) -> bool:
+    """Check the file with the previous per pattern fnmatch loop.
+
+    :param exclude: exclude glob pattern
+    :type exclude: List[str]
+    :param include: include glob pattern
+    :type include: List[str]
+    :param filename: filename to check
+    :type filename: str
+    :return: bool value indicating whether the file should be excluded
+    :rtype: bool
+    """
+    should_exclude = False
+    for pattern in exclude:
+        if fnmatch.fnmatch(filename, pattern):
+            should_exclude = True
+    if should_exclude:
+        for pattern in include:
+            if fnmatch.fnmatch(filename, pattern):
+                should_exclude = False
+    return should_exclude
+
+
+def measure(
+    count: int, run: Callable[[int], int], label: str, extrapolate: Optional[int] = None
+) -> None:
+    """Time the run and print the keys per second.
+
+    :param count: number of keys to filter
+    :type count: int
+    :param run: filter the keys and return the number of kept keys
+    :type run: Callable[[int], int]
+    :param label: name of the run
+    :type label: str
+    :param extrapolate: number of keys to extrapolate the time to
+    :type extrapolate: int, optional
+    """
+    start = time.perf_counter()
+    kept = run(count)
+    elapsed = time.perf_counter() - start
+    line = "%-16s %10.3fs %12.0f keys/s  kept %s/%s" % (
+        label + ":",
+        elapsed,
+        count / elapsed,
+        kept,
+        count,
+    )
+    if extrapolate:
+        line += "  (%.1fs for %s keys)" % (elapsed * extrapolate / count, extrapolate)
+    print(line)
+
+
+def main() -> None:
+    """Run the benchmark and print the result."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10000000)
+    parser.add_argument("--patterns", type=int, default=50)
+    parser.add_argument("--baseline-count", type=int, default=100000)
+    args = parser.parse_args()
+
+    exclude = synthetic_patterns(args.patterns)
+    include = ["logs/0001/*", "*/07/*"]
+    glob_filter = GlobFilter(exclude, include)
+
+    def run_fnmatch(count: int) -> int:
+        return sum(
+            not fnmatch_exclude(exclude, include, synthetic_key(i))
+            for i in range(count)
+        )
+
+    def run_exclude(count: int) -> int:
+        excluded = glob_filter.exclude
+        return sum(not excluded(synthetic_key(i)) for i in range(count))
+
+    def run_filter(count: int) -> int:
+        kept = 0
+        for start in range(0, count, PAGE_SIZE):
+            end = min(start + PAGE_SIZE, count)
+            page = [synthetic_key(i) for i in range(start, end)]
+            kept += len(glob_filter.filter(page))
+        return kept
+
+    def run_keys(count: int) -> int:
+        return sum(1 for i in range(count) if synthetic_key(i))
+
+    print("patterns:        %s exclude, %s include" % (len(exclude), len(include)))
+    measure(args.count, run_keys, "generate keys")
+    measure(args.baseline_count, run_fnmatch, "fnmatch loop", args.count)
+    measure(args.count, run_exclude, "GlobFilter")
+    measure(args.count, run_filter, "GlobFilter page")
+
+
+if __name__ == "__main__":
+    main()
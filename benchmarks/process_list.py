@@ -0,0 +1,77 @@
+"""Microbenchmark of Pyfzf.process_list over synthetic s3 keys.
+
+Records the wall time and the peak RSS of formatting the keys and
+feeding them through the fzf stdin pipe.
+
+Usage:
+    python benchmarks/process_list.py [--count 1000000] [--stream]
+
+fzf itself is replaced by `tail -n 1` so that the benchmark is not interactive.
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+from typing import Any, Dict, Generator
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from fzfaws.utils.pyfzf import Pyfzf  # noqa: E402
+
+
+def synthetic_keys(count: int) -> Generator[Dict[str, Any], None, None]:
+    """Generate list_objects like entries.
+
+    :param count: number of keys to generate
+    :type count: int
+    :return: s3 object entries in generator form
+    :rtype: Generator[Dict[str, Any], None, None]
+    """
+    for i in range(count):
+        yield {
+            "Key": "logs/%04d/%02d/%08d.json.gz" % (i % 2020, i % 12, i),
+            "Size": i,
+        }
+
+
+def peak_rss_mb() -> float:
+    """Return the peak RSS of current process in MB.
+
+    :return: peak resident set size in MB
+    :rtype: float
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on MacOS and in kilobytes on Linux
+    if sys.platform.startswith("darwin"):
+        return peak / 1024 / 1024
+    return peak / 1024
+
+
+def main() -> None:
+    """Run the benchmark and print the result."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1000000)
+    parser.add_argument("--stream", action="store_true", default=False)
+    args = parser.parse_args()
+
+    fzf = Pyfzf()
+    start = time.perf_counter()
+    fzf.process_list(synthetic_keys(args.count), "Key", stream=args.stream)
+    processed = time.perf_counter()
+    if not args.stream:
+        fzf._rstrip_chunks()
+    selection = fzf._run_fzf(["tail", "-n", "1"])
+    finished = time.perf_counter()
+
+    print("keys:          %s" % args.count)
+    print("mode:          %s" % ("stream" if args.stream else "buffer"))
+    print("process_list:  %.3fs" % (processed - start))
+    print("pipe to fzf:   %.3fs" % (finished - processed))
+    print("total:         %.3fs" % (finished - start))
+    print("peak rss:      %.1fMB" % peak_rss_mb())
+    print("last entry:    %s" % str(selection, "utf-8").strip())
+
+
+if __name__ == "__main__":
+    main()
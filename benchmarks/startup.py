@@ -0,0 +1,98 @@
+"""Cold start benchmark of the fzfaws entry point.
+
+Imports fzfaws.cli in fresh interpreters with `python -X importtime` and
+reports the cumulative import time. Exit with 1 when the best run exceeds
+the budget or any of the deferred modules (boto3, yaml etc) got imported
+before a subcommand is selected.
+
+Usage:
+    python benchmarks/startup.py [--runs 5] [--budget 150]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# modules that should only be imported once a subcommand is running
+DEFERRED_MODULES: List[str] = [
+    "boto3",
+    "botocore",
+    "yaml",
+    "pkg_resources",
+    "fzfaws.cloudformation",
+    "fzfaws.ec2",
+    "fzfaws.s3",
+]
+
+IMPORTTIME_PATTERN = re.compile(
+    r"^import time:\s+(?P<self>\d+)\s+\|\s+(?P<cumulative>\d+)\s+\|(?P<name>.*)$"
+)
+
+
+def import_entry() -> Dict[str, int]:
+    """Import fzfaws.cli in a new interpreter and parse the import times.
+
+    :return: cumulative import time in microseconds of each imported module
+    :rtype: Dict[str, int]
+    """
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import fzfaws.cli"],
+        cwd=root,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        check=True,
+    )
+    timings: Dict[str, int] = {}
+    for line in result.stderr.decode("utf-8").splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match:
+            timings[match.group("name").strip()] = int(match.group("cumulative"))
+    return timings
+
+
+def check_startup(runs: int) -> Tuple[float, List[str]]:
+    """Run the import multiple times and return the best result.
+
+    :param runs: number of fresh interpreters to run
+    :type runs: int
+    :return: best cumulative import time in ms and the deferred modules imported
+    :rtype: Tuple[float, List[str]]
+    """
+    best: float = float("inf")
+    imported: List[str] = []
+    for _ in range(runs):
+        timings = import_entry()
+        best = min(best, timings.get("fzfaws.cli", 0) / 1000)
+        imported = [
+            module
+            for module in DEFERRED_MODULES
+            if any(name.split(".")[0] == module for name in timings)
+            or module in timings
+        ]
+    return best, imported
+
+
+def main() -> None:
+    """Run the benchmark and exit with 1 if the budget is exceeded."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget", type=float, default=150, help="max import time in ms"
+    )
+    args = parser.parse_args()
+
+    best, imported = check_startup(args.runs)
+    print("import fzfaws.cli: %.1fms (budget %.1fms)" % (best, args.budget))
+    if imported:
+        print("deferred modules imported at startup: %s" % ", ".join(imported))
+        sys.exit(1)
+    if best > args.budget:
+        print("cold start exceeded the budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,12 +10,6 @@ from pathlib import Path
 from shutil import copy
 import sys
 
-from botocore.exceptions import ClientError
-import pkg_resources
-
-from fzfaws.cloudformation.main import cloudformation
-from fzfaws.ec2.main import ec2
-from fzfaws.s3.main import s3
 from fzfaws.utils import FileLoader, get_default_args
 from fzfaws.utils.exceptions import InvalidFileType, NoSelectionMade
 
@@ -56,8 +50,7 @@ def main() -> None:
             copy_config()
             sys.exit(0)
         elif args.version:
-            version = pkg_resources.require("fzfaws")[0].version
-            print("Current fzfaws version: %s" % version)
+            print("Current fzfaws version: %s" % get_version())
             sys.exit(0)
 
         fileloader = FileLoader()
@@ -65,11 +58,18 @@ def main() -> None:
 
         argument_list = get_default_args(args.subparser_name, sys.argv[2:])
 
+        # only import the selected service, boto3 is imported along with it
         if args.subparser_name == "cloudformation":
+            from fzfaws.cloudformation.main import cloudformation
+
             cloudformation(argument_list)
         elif args.subparser_name == "ec2":
+            from fzfaws.ec2.main import ec2
+
             ec2(argument_list)
         elif args.subparser_name == "s3":
+            from fzfaws.s3.main import s3
+
             s3(argument_list)
 
     except InvalidFileType:
@@ -82,11 +82,31 @@ def main() -> None:
     except NoSelectionMade:
         print("No selection was made or the result was empty")
         sys.exit(1)
-    except (ClientError, Exception) as e:
+    except Exception as e:
+        # botocore ClientError is also handled here, avoid importing botocore
         print(e)
         sys.exit(1)
 
 
+def get_version() -> str:
+    """Get the installed fzfaws version.
+
+    importlib.metadata is only available in python3.8+, pkg_resources is
+    slow to import, only use it as a fallback.
+
+    :return: version of fzfaws
+    :rtype: str
+    """
+    try:
+        from importlib.metadata import version
+
+        return version("fzfaws")
+    except ImportError:
+        import pkg_resources
+
+        return pkg_resources.require("fzfaws")[0].version
+
+
 def copy_config() -> None:
     """Copy the default fzfaws.yml to $XDG_CONFIG_HOME/fzfaws/."""
     default_config_path = Path(__file__).resolve().parent.joinpath("./fzfaws.yml")
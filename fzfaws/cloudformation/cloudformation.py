@@ -3,10 +3,9 @@ import json
 import os
 import re
 import sys
-from typing import Any, Callable, Dict, Generator, List, Tuple, Union
+from typing import Any, Callable, Dict, Generator, Iterable, List, Tuple, Union
 
 from fzfaws.utils import BaseSession, Pyfzf, Spinner, get_confirmation
-from fzfaws.utils.util import search_dict_in_list
 
 
 class Cloudformation(BaseSession):
@@ -37,20 +36,17 @@ class Cloudformation(BaseSession):
         :type no_progress: bool, optional
         """
         fzf = Pyfzf()
-        with Spinner.spin(
-            message="Fetching cloudformation stacks ...", no_progress=no_progress
-        ):
-            paginator = self.client.get_paginator("describe_stacks")
-            response = paginator.paginate()
-            stack_generator = self._get_stack_generator(response)
-            for result in response:
-                fzf.process_list(
-                    result["Stacks"], "StackName", "StackStatus", "Description"
-                )
-        self.stack_name = str(fzf.execute_fzf(empty_allow=False))
-        self.stack_details = search_dict_in_list(
-            self.stack_name, stack_generator, "StackName"
+        fzf.process_list(
+            self._get_stack_generator(self.paginate("describe_stacks")),
+            "StackName",
+            "StackStatus",
+            "Description",
+            stream=True,
+            record=True,
+            reload=self.refreshed("describe_stacks", self._get_stack_generator),
         )
+        self.stack_details = fzf.execute_fzf_records(empty_allow=False)
+        self.stack_name = self.stack_details["StackName"]
 
     def get_stack_resources(
         self, empty_allow: bool = False, header: str = None, no_progress: bool = False
@@ -67,21 +63,14 @@ class Cloudformation(BaseSession):
         :rtype: List[str]
         """
         fzf = Pyfzf()
-        with Spinner.spin(
-            message="Fetching stack resources ...", no_progress=no_progress
-        ):
-            paginator = self.client.get_paginator("list_stack_resources")
-            for result in paginator.paginate(StackName=self.stack_name):
-                for resource in result.get("StackResourceSummaries"):
-                    resource["Drift"] = resource.get("DriftInformation").get(
-                        "StackResourceDriftStatus"
-                    )
-                fzf.process_list(
-                    result.get("StackResourceSummaries"),
-                    "LogicalResourceId",
-                    "ResourceType",
-                    "Drift",
-                )
+        paginator = self.client.get_paginator("list_stack_resources")
+        fzf.process_list(
+            self._get_resource_generator(paginator.paginate(StackName=self.stack_name)),
+            "LogicalResourceId",
+            "ResourceType",
+            "Drift",
+            stream=True,
+        )
         return list(
             fzf.execute_fzf(multi_select=True, header=header, empty_allow=empty_allow)
         )
@@ -173,15 +162,30 @@ class Cloudformation(BaseSession):
         )
 
     def _get_stack_generator(
-        self, response: List[Dict[str, Any]]
+        self, response: Iterable[Dict[str, Any]]
     ) -> Generator[Dict[str, Any], None, None]:
         """Create generator for boto3 paginator.
 
         Attempt to reduce unnecessary memory usage.
 
         :param response: response from paginator.paginate()
-        :type response: List[Dict[str, Any]]
+        :type response: Iterable[Dict[str, Any]]
         """
         for result in response:
             for stack in result.get("Stacks", []):
                 yield stack
+
+    def _get_resource_generator(
+        self, response: Iterable[Dict[str, Any]]
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Create generator of stack resources with the drift status.
+
+        :param response: response from paginator.paginate()
+        :type response: Iterable[Dict[str, Any]]
+        """
+        for result in response:
+            for resource in result.get("StackResourceSummaries", []):
+                resource["Drift"] = resource.get("DriftInformation").get(
+                    "StackResourceDriftStatus"
+                )
+                yield resource
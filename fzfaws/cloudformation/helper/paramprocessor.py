@@ -37,8 +37,10 @@ class ParamProcessor:
             params = {}
         if original_params == None:
             original_params = []
-        self.ec2 = EC2(profile, region)
-        self.route53 = Route53(profile, region)
+        self._profile: Optional[Union[str, bool]] = profile
+        self._region: Optional[Union[str, bool]] = region
+        self._ec2: Optional[EC2] = None
+        self._route53: Optional[Route53] = None
         self.params: Dict[str, Any] = params
         self.original_params: List[Dict[str, Any]] = original_params
         self.processed_params: List[Dict[str, Any]] = []
@@ -64,6 +66,20 @@ class ParamProcessor:
             "List<AWS::Route53::HostedZone::Id>",
         ]
 
+    @property
+    def ec2(self) -> EC2:
+        """Return the EC2 instance, created when a ec2 param is processed."""
+        if self._ec2 is None:
+            self._ec2 = EC2(self._profile, self._region)
+        return self._ec2
+
+    @property
+    def route53(self) -> Route53:
+        """Return the Route53 instance, created when a route53 param is processed."""
+        if self._route53 is None:
+            self._route53 = Route53(self._profile, self._region)
+        return self._route53
+
     def process_stack_params(self) -> None:
         """Process the template file parameters.
 
@@ -1,7 +1,7 @@
 """Contains wrapper class to interacte with cloudwatch."""
-from typing import Optional, Union
+from typing import Any, Dict, Generator, Iterable, Optional, Union
 
-from fzfaws.utils import BaseSession, Pyfzf, Spinner
+from fzfaws.utils import BaseSession, Pyfzf
 
 
 class Cloudwatch(BaseSession):
@@ -47,13 +47,12 @@ class Cloudwatch(BaseSession):
         """
         if not arns:
             fzf = Pyfzf()
-            with Spinner.spin(message="Fetching cloudwatch alarms ..."):
-                paginator = self.client.get_paginator("describe_alarms")
-                for result in paginator.paginate():
-                    if result.get("CompositeAlarms"):
-                        fzf.process_list(result["CompositeAlarms"], "AlarmArn")
-                    if result.get("MetricAlarms"):
-                        fzf.process_list(result["MetricAlarms"], "AlarmArn")
+            fzf.process_list(
+                self._alarm_generator(self.paginate("describe_alarms")),
+                "AlarmArn",
+                stream=True,
+                reload=self.refreshed("describe_alarms", self._alarm_generator),
+            )
             arns = fzf.execute_fzf(
                 empty_allow=empty_allow, multi_select=multi_select, header=header
             )
@@ -61,3 +60,18 @@ class Cloudwatch(BaseSession):
             self.arns[0] = str(arns)
         elif type(arns) == list:
             self.arns = list(arns)
+
+    def _alarm_generator(
+        self, pages: Iterable[Dict[str, Any]]
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Create generator for both composite and metric alarms.
+
+        :param pages: pages from self.paginate("describe_alarms")
+        :type pages: Iterable[Dict[str, Any]]
+        :return: alarms in generator form
+        :rtype: Generator[Dict[str, Any], None, None]
+        """
+        for result in pages:
+            for alarm_type in ("CompositeAlarms", "MetricAlarms"):
+                for alarm in result.get(alarm_type, []):
+                    yield alarm
@@ -1,7 +1,8 @@
 """Module contains the ec2 wrapper class."""
 import json
 import os
-from typing import Any, Dict, Generator, List, Optional, Union
+from functools import partial
+from typing import Any, Callable, Dict, Generator, Iterable, List, Optional, Union
 
 from fzfaws.utils import BaseSession, Pyfzf, Spinner, get_name_tag
 
@@ -42,41 +43,37 @@ class EC2(BaseSession):
         :type no_progress: bool, optional
         """
         fzf = Pyfzf()
-        with Spinner.spin(
-            message="Fetching EC2 instances ...", no_progress=no_progress
-        ):
-            paginator = self.client.get_paginator("describe_instances")
-            for result in paginator.paginate():
-                response_generator = self._instance_generator(result["Reservations"])
-                fzf.process_list(
-                    response_generator,
-                    "InstanceId",
-                    "Status",
-                    "InstanceType",
-                    "Name",
-                    "KeyName",
-                    "PublicDnsName",
-                    "PublicIpAddress",
-                    "PrivateIpAddress",
-                )
-        selected_instance = fzf.execute_fzf(
-            multi_select=multi_select, header=header, print_col=0
+        generator = partial(
+            self._page_generator,
+            key="Reservations",
+            item_generator=self._instance_generator,
+        )
+        fzf.process_list(
+            generator(self.paginate("describe_instances")),
+            "InstanceId",
+            "Status",
+            "InstanceType",
+            "Name",
+            "KeyName",
+            "PublicDnsName",
+            "PublicIpAddress",
+            "PrivateIpAddress",
+            stream=True,
+            record=True,
+            reload=self.refreshed("describe_instances", generator),
+        )
+        selected_instance = fzf.execute_fzf_records(
+            multi_select=multi_select, header=header
         )
 
+        self.instance_ids[:] = []
+        self.instance_list[:] = []
         if multi_select:
-            self.instance_ids[:] = []
-            self.instance_list[:] = []
-            for instance in selected_instance:
-                curr = fzf.format_selected_to_dict(str(instance))
-                self.instance_list.append(curr)
-                self.instance_ids.append(curr["InstanceId"])
-        else:
-            self.instance_ids[:] = []
-            self.instance_list[:] = []
-            self.instance_list.append(
-                fzf.format_selected_to_dict(str(selected_instance))
-            )
-            self.instance_ids.append(self.instance_list[0]["InstanceId"])
+            self.instance_list.extend(selected_instance)
+        elif selected_instance:
+            self.instance_list.append(selected_instance)
+        for instance in self.instance_list:
+            self.instance_ids.append(instance["InstanceId"])
         if len(self.instance_ids) == 0:
             self.instance_ids = [""]
         if len(self.instance_list) == 0:
@@ -140,18 +137,26 @@ class EC2(BaseSession):
         :rtype: Union[str, list]
         """
         fzf = Pyfzf()
-        with Spinner.spin(
-            message="Fetching SecurityGroups ...", no_progress=no_progress
-        ):
-            paginator = self.client.get_paginator("describe_security_groups")
-            for result in paginator.paginate():
-                response_generator = self._name_tag_generator(
-                    result.get("SecurityGroups", [])
-                )
-                if return_attr == "id":
-                    fzf.process_list(response_generator, "GroupId", "GroupName", "Name")
-                elif return_attr == "name":
-                    fzf.process_list(response_generator, "GroupName", "Name")
+        generator = partial(
+            self._page_generator,
+            key="SecurityGroups",
+            item_generator=self._name_tag_generator,
+        )
+        response_generator = generator(self.paginate("describe_security_groups"))
+        reload = self.refreshed("describe_security_groups", generator)
+        if return_attr == "id":
+            fzf.process_list(
+                response_generator,
+                "GroupId",
+                "GroupName",
+                "Name",
+                stream=True,
+                reload=reload,
+            )
+        elif return_attr == "name":
+            fzf.process_list(
+                response_generator, "GroupName", "Name", stream=True, reload=reload
+            )
         return fzf.execute_fzf(
             multi_select=multi_select, empty_allow=True, header=header
         )
@@ -169,13 +174,18 @@ class EC2(BaseSession):
         :rtype: Union[str, list]
         """
         fzf = Pyfzf()
-        with Spinner.spin(message="Fetching EC2 instances ..."):
-            paginator = self.client.get_paginator("describe_instances")
-            for result in paginator.paginate():
-                response_generator = self._instance_id_generator(
-                    result.get("Reservations", [])
-                )
-                fzf.process_list(response_generator, "InstanceId", "Name")
+        generator = partial(
+            self._page_generator,
+            key="Reservations",
+            item_generator=self._instance_id_generator,
+        )
+        fzf.process_list(
+            generator(self.paginate("describe_instances")),
+            "InstanceId",
+            "Name",
+            stream=True,
+            reload=self.refreshed("describe_instances", generator),
+        )
         return fzf.execute_fzf(
             multi_select=multi_select, empty_allow=True, header=header
         )
@@ -195,17 +205,18 @@ class EC2(BaseSession):
         :rtype: Union[str, list]
         """
         fzf = Pyfzf()
-        with Spinner.spin(message="Fetching Subnets ...", no_progress=no_progress):
-            paginator = self.client.get_paginator("describe_subnets")
-            for result in paginator.paginate():
-                response_generator = self._name_tag_generator(result.get("Subnets", []))
-                fzf.process_list(
-                    response_generator,
-                    "SubnetId",
-                    "AvailabilityZone",
-                    "CidrBlock",
-                    "Name",
-                )
+        generator = partial(
+            self._page_generator, key="Subnets", item_generator=self._name_tag_generator
+        )
+        fzf.process_list(
+            generator(self.paginate("describe_subnets")),
+            "SubnetId",
+            "AvailabilityZone",
+            "CidrBlock",
+            "Name",
+            stream=True,
+            reload=self.refreshed("describe_subnets", generator),
+        )
         return fzf.execute_fzf(
             multi_select=multi_select, empty_allow=True, header=header
         )
@@ -225,11 +236,16 @@ class EC2(BaseSession):
         :rtype: Union[str, list]
         """
         fzf = Pyfzf()
-        with Spinner.spin(message="Fetching EBS volumes ...", no_progress=no_progress):
-            paginator = self.client.get_paginator("describe_volumes")
-            for result in paginator.paginate():
-                response_generator = self._name_tag_generator(result.get("Volumes", []))
-                fzf.process_list(response_generator, "VolumeId", "Name")
+        generator = partial(
+            self._page_generator, key="Volumes", item_generator=self._name_tag_generator
+        )
+        fzf.process_list(
+            generator(self.paginate("describe_volumes")),
+            "VolumeId",
+            "Name",
+            stream=True,
+            reload=self.refreshed("describe_volumes", generator),
+        )
         return fzf.execute_fzf(
             multi_select=multi_select, empty_allow=True, header=header
         )
@@ -249,17 +265,43 @@ class EC2(BaseSession):
         :rtype: Union[str, list]
         """
         fzf = Pyfzf()
-        with Spinner.spin(message="Fetching VPCs ...", no_progress=no_progress):
-            paginator = self.client.get_paginator("describe_vpcs")
-            for result in paginator.paginate():
-                response_generator = self._name_tag_generator(result.get("Vpcs", []))
-                fzf.process_list(
-                    response_generator, "VpcId", "IsDefault", "CidrBlock", "Name"
-                )
+        generator = partial(
+            self._page_generator, key="Vpcs", item_generator=self._name_tag_generator
+        )
+        fzf.process_list(
+            generator(self.paginate("describe_vpcs")),
+            "VpcId",
+            "IsDefault",
+            "CidrBlock",
+            "Name",
+            stream=True,
+            reload=self.refreshed("describe_vpcs", generator),
+        )
         return fzf.execute_fzf(
             empty_allow=True, multi_select=multi_select, header=header
         )
 
+    def _page_generator(
+        self,
+        pages: Iterable[Dict[str, Any]],
+        key: str,
+        item_generator: Callable[[List[Dict[str, Any]]], Iterable[Dict[str, Any]]],
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Create a generator for the formatted items of all pages.
+
+        :param pages: pages from self.paginate()
+        :type pages: Iterable[Dict[str, Any]]
+        :param key: key of the item list in each page, e.g. Reservations
+        :type key: str
+        :param item_generator: function to format the items of each page
+        :type item_generator: Callable[[List[Dict[str, Any]]], Iterable[Dict[str, Any]]]
+        :return: formatted items in generator form
+        :rtype: Generator[Dict[str, Any], None, None]
+        """
+        for result in pages:
+            for item in item_generator(result.get(key, [])):
+                yield item
+
     def _name_tag_generator(
         self, response: List[Dict[str, Any]]
     ) -> Generator[Dict[str, Any], None, None]:
@@ -287,6 +329,9 @@ class EC2(BaseSession):
     ) -> Generator[Dict[str, str], None, None]:
         """Get ec2 instance helper, format ec2 response and return generator.
 
+        The formatted information is merged into the original instance response,
+        so that the selected instance contains the full details.
+
         :param instances: list of instance response from boto3
         :type instances: List[Dict[str, Any]]
         :return: formatted dict of instance information in generator form
@@ -294,6 +339,7 @@ class EC2(BaseSession):
         """
         for instance in instances:
             instance_information = {
+                **instance["Instances"][0],
                 "InstanceId": instance["Instances"][0].get("InstanceId"),
                 "InstanceType": instance["Instances"][0].get("InstanceType"),
                 "Status": instance["Instances"][0]["State"].get("Name"),
@@ -119,8 +119,8 @@ def ls_instance(
             and not keyname
             and not instanceid
         ):
-            response = ec2.client.describe_instances(InstanceIds=ec2.instance_ids)
-            dump_response(response)
+            # instance_list already contains the full details from the listing
+            dump_response({"Instances": ec2.instance_list})
         else:
             for instance in ec2.instance_list:
                 if ipv4:
@@ -1,9 +1,8 @@
 """This module contains the iam wrapper class."""
-from typing import List, Optional, Union
+from typing import Any, Dict, Generator, Iterable, List, Optional, Union
 
 from fzfaws.utils.pyfzf import Pyfzf
 from fzfaws.utils.session import BaseSession
-from fzfaws.utils.spinner import Spinner
 
 
 class IAM(BaseSession):
@@ -52,35 +51,49 @@ class IAM(BaseSession):
         """
         if arns is None:
             fzf = Pyfzf()
-            with Spinner.spin(message="Fetching iam roles ..."):
-                paginator = self.client.get_paginator("list_roles")
-                for result in paginator.paginate():
-                    if service:
-                        for role in result.get("Roles", []):
-                            statements = role.get("AssumeRolePolicyDocument", {}).get(
-                                "Statement", []
-                            )
-                            for statement in statements:
-                                if (
-                                    statement.get("Principal", {}).get("Service", "")
-                                    == service
-                                ):
-                                    fzf.append_fzf(
-                                        "RoleName: %s  Arn: %s"
-                                        % (
-                                            role.get("RoleName"),
-                                            role.get("Arn"),
-                                        )
-                                    )
-                    else:
-                        fzf.process_list(result.get("Roles", []), "RoleName", "Arn")
-            arns = fzf.execute_fzf(
-                empty_allow=empty_allow,
-                print_col=4,
-                header=header,
-                multi_select=multi_select,
+            fzf.process_list(
+                self._role_generator(self.paginate("list_roles"), service),
+                "RoleName",
+                "Arn",
+                stream=True,
+                record=True,
+                reload=self.refreshed(
+                    "list_roles", lambda pages: self._role_generator(pages, service)
+                ),
             )
+            roles = fzf.execute_fzf_records(
+                empty_allow=empty_allow, header=header, multi_select=multi_select
+            )
+            if multi_select:
+                arns = [role["Arn"] for role in roles]
+            else:
+                arns = roles["Arn"] if roles else ""
         if type(arns) == str:
             self.arns[0] = str(arns)
         elif type(arns) == list:
             self.arns = list(arns)
+
+    def _role_generator(
+        self, response: Iterable[Dict[str, Any]], service: Optional[str] = None
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Create generator of roles, optionally only the ones assumable by service.
+
+        :param response: response from paginator.paginate()
+        :type response: Iterable[Dict[str, Any]]
+        :param service: service principal to filter roles
+        :type service: str, optional
+        :return: roles in generator form
+        :rtype: Generator[Dict[str, Any], None, None]
+        """
+        for result in response:
+            for role in result.get("Roles", []):
+                if not service:
+                    yield role
+                    continue
+                statements = role.get("AssumeRolePolicyDocument", {}).get(
+                    "Statement", []
+                )
+                for statement in statements:
+                    if statement.get("Principal", {}).get("Service", "") == service:
+                        yield role
+                        break
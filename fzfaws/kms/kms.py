@@ -1,7 +1,7 @@
 """Module contains the kms class for interacting with kms."""
-from typing import Optional, Union
+from typing import Any, Dict, Generator, Iterable, Optional, Union
 
-from fzfaws.utils import BaseSession, Pyfzf, Spinner
+from fzfaws.utils import BaseSession, Pyfzf
 
 
 class KMS(BaseSession):
@@ -47,15 +47,14 @@ class KMS(BaseSession):
         """
         if not keyids:
             fzf = Pyfzf()
-            with Spinner.spin(message="Fetching kms keys ..."):
-                paginator = self.client.get_paginator("list_aliases")
-                for result in paginator.paginate():
-                    aliases = [
-                        alias
-                        for alias in result.get("Aliases")
-                        if alias.get("TargetKeyId")
-                    ]
-                    fzf.process_list(aliases, "TargetKeyId", "AliasName", "AliasArn")
+            fzf.process_list(
+                self._alias_generator(self.paginate("list_aliases")),
+                "TargetKeyId",
+                "AliasName",
+                "AliasArn",
+                stream=True,
+                reload=self.refreshed("list_aliases", self._alias_generator),
+            )
             keyids = fzf.execute_fzf(
                 header=header, multi_select=multi_select, empty_allow=empty_allow
             )
@@ -63,3 +62,18 @@ class KMS(BaseSession):
             self.keyids[0] = str(keyids)
         elif type(keyids) == list:
             self.keyids = list(keyids)
+
+    def _alias_generator(
+        self, pages: Iterable[Dict[str, Any]]
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Create generator for the aliases with a target key.
+
+        :param pages: pages from self.paginate("list_aliases")
+        :type pages: Iterable[Dict[str, Any]]
+        :return: aliases in generator form
+        :rtype: Generator[Dict[str, Any], None, None]
+        """
+        for result in pages:
+            for alias in result.get("Aliases", []):
+                if alias.get("TargetKeyId"):
+                    yield alias
@@ -1,8 +1,8 @@
 """Module contains the wrapper class to interacte with route53."""
 import re
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Generator, Iterable, List, Optional, Union
 
-from fzfaws.utils import BaseSession, Pyfzf, Spinner
+from fzfaws.utils import BaseSession, Pyfzf
 
 
 class Route53(BaseSession):
@@ -42,17 +42,35 @@ class Route53(BaseSession):
         """
         if zone_ids is None:
             fzf = Pyfzf()
-            with Spinner.spin(message="Fetching hostedzones ..."):
-                paginator = self.client.get_paginator("list_hosted_zones")
-                for result in paginator.paginate():
-                    result = self._process_hosted_zone(result["HostedZones"])
-                    fzf.process_list(result, "Id", "Name")
+            fzf.process_list(
+                self._hosted_zone_generator(self.paginate("list_hosted_zones")),
+                "Id",
+                "Name",
+                stream=True,
+                reload=self.refreshed(
+                    "list_hosted_zones", self._hosted_zone_generator
+                ),
+            )
             zone_ids = fzf.execute_fzf(multi_select=multi_select, empty_allow=True)
         if type(zone_ids) == str:
             self.zone_ids[0] = str(zone_ids)
         elif type(zone_ids) == list:
             self.zone_ids = list(zone_ids)
 
+    def _hosted_zone_generator(
+        self, pages: Iterable[Dict[str, Any]]
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Create generator for the processed hostedzones.
+
+        :param pages: pages from self.paginate("list_hosted_zones")
+        :type pages: Iterable[Dict[str, Any]]
+        :return: hostedzones with the raw id in generator form
+        :rtype: Generator[Dict[str, Any], None, None]
+        """
+        for result in pages:
+            for zone in self._process_hosted_zone(result["HostedZones"]):
+                yield zone
+
     def _process_hosted_zone(
         self, hostedzone_list: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
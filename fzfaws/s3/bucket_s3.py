@@ -4,11 +4,22 @@ from typing import Dict, List, Optional, Tuple
 
 from botocore.exceptions import ClientError
 
-from fzfaws.s3.helper.get_copy_args import get_copy_args
+from fzfaws.s3.helper.get_copy_args import (
+    MetadataCapture,
+    ObjectMetadata,
+    get_copy_args,
+    get_metadata_capture,
+)
 from fzfaws.s3.helper.s3args import S3Args
 from fzfaws.s3.helper.s3progress import S3Progress
 from fzfaws.s3.helper.s3transferwrapper import S3TransferWrapper
 from fzfaws.s3.helper.sync_s3 import sync_s3
+from fzfaws.s3.helper.transfer_journal import open_transfer_journal
+from fzfaws.s3.helper.transfer_scheduler import (
+    TransferJob,
+    TransferScheduler,
+    print_failures,
+)
 from fzfaws.s3.helper.walk_s3_folder import walk_s3_folder
 from fzfaws.s3.s3 import S3
 from fzfaws.utils import get_confirmation
@@ -24,6 +35,8 @@ def bucket_s3(
     include: Optional[List[str]] = None,
     version: bool = False,
     preserve: bool = False,
+    etag: bool = False,
+    resume: str = "",
 ) -> None:
     """Transfer file between buckets.
 
@@ -48,6 +61,10 @@ def bucket_s3(
     :type version: bool, optional
     :param perserve: save all object's config instead of using the new bucket's settings
     :type perserve: bool, optional
+    :param etag: compare files by ETag instead of last modified time during sync
+    :type etag: bool, optional
+    :param resume: id of the interrupted recursive copy to resume
+    :type resume: str, optional
     """
     if exclude is None:
         exclude = []
@@ -103,6 +120,8 @@ def bucket_s3(
             include,
             "s3://%s/%s" % (target_bucket, target_path),
             "s3://%s/%s" % (dest_bucket, dest_path),
+            client=s3.client,
+            etag=etag,
         )
     elif recursive:
         recursive_copy(
@@ -114,6 +133,7 @@ def bucket_s3(
             exclude,
             include,
             preserve,
+            resume,
         )
 
     elif version:
@@ -139,26 +159,37 @@ def bucket_s3(
                 % (target_bucket, target_path, dest_bucket, s3_key)
             )
         if get_confirmation("Confirm?"):
-            for target_path in target_path_list:
-                s3_key = s3.get_s3_destination_key(target_path)
-                print(
-                    "copy: s3://%s/%s to s3://%s/%s"
-                    % (target_bucket, target_path, dest_bucket, s3_key)
-                )
-                copy_source = {"Bucket": target_bucket, "Key": target_path}
-                if not preserve:
-                    s3transferwrapper = S3TransferWrapper()
-                    s3.client.copy(
-                        copy_source,
+            copy_list: List[Tuple[str, str]] = [
+                (target_path, s3.get_s3_destination_key(target_path))
+                for target_path in target_path_list
+            ]
+            if not preserve:
+                get_copy_scheduler(s3, target_bucket, dest_bucket).run(
+                    TransferJob(
+                        "copy",
                         dest_bucket,
                         s3_key,
-                        Callback=S3Progress(target_path, target_bucket, s3.client),
-                        Config=s3transferwrapper.transfer_config,
+                        copy_source={"Bucket": target_bucket, "Key": target_path},
+                        message="copy: s3://%s/%s to s3://%s/%s"
+                        % (target_bucket, target_path, dest_bucket, s3_key),
+                    )
+                    for target_path, s3_key in copy_list
+                )
+            else:
+                s3.bucket_name = target_bucket
+                capture = get_metadata_capture(s3, S3Args(s3))
+                for target_path, s3_key in copy_list:
+                    print(
+                        "copy: s3://%s/%s to s3://%s/%s"
+                        % (target_bucket, target_path, dest_bucket, s3_key)
                     )
-                else:
-                    s3.bucket_name = target_bucket
                     copy_and_preserve(
-                        s3, target_bucket, target_path, dest_bucket, s3_key
+                        s3,
+                        target_bucket,
+                        target_path,
+                        dest_bucket,
+                        s3_key,
+                        capture=capture,
                     )
 
 
@@ -205,39 +236,37 @@ def copy_version(
         )
 
     if get_confirmation("Confirm?"):
+        jobs: List[TransferJob] = []
+        capture: Optional[MetadataCapture] = None
         for obj_version in obj_versions:
             s3_key = s3.get_s3_destination_key(obj_version.get("Key", ""))
-            print(
-                "copy: s3://%s/%s to s3://%s/%s with version %s"
-                % (
-                    target_bucket,
-                    obj_version.get("Key"),
-                    dest_bucket,
-                    s3_key,
-                    obj_version.get("VersionId"),
-                )
+            message = "copy: s3://%s/%s to s3://%s/%s with version %s" % (
+                target_bucket,
+                obj_version.get("Key"),
+                dest_bucket,
+                s3_key,
+                obj_version.get("VersionId"),
             )
-            copy_source = {
-                "Bucket": target_bucket,
-                "Key": obj_version.get("Key"),
-                "VersionId": obj_version.get("VersionId"),
-            }
             if not preserve:
-                s3transferwrapper = S3TransferWrapper()
-                s3.client.copy(
-                    copy_source,
-                    dest_bucket,
-                    s3_key,
-                    Callback=S3Progress(
-                        obj_version.get("Key", ""),
-                        target_bucket,
-                        s3.client,
-                        version_id=obj_version.get("VersionId"),
-                    ),
-                    Config=s3transferwrapper.transfer_config,
+                copy_source = {
+                    "Bucket": target_bucket,
+                    "Key": obj_version.get("Key", ""),
+                    "VersionId": obj_version.get("VersionId", ""),
+                }
+                jobs.append(
+                    TransferJob(
+                        "copy",
+                        dest_bucket,
+                        s3_key,
+                        copy_source=copy_source,
+                        message=message,
+                    )
                 )
             else:
+                print(message)
                 s3.bucket_name = target_bucket
+                if capture is None:
+                    capture = get_metadata_capture(s3, S3Args(s3))
                 copy_and_preserve(
                     s3,
                     target_bucket,
@@ -245,7 +274,10 @@ def copy_version(
                     dest_bucket,
                     s3_key,
                     version=obj_version.get("VersionId"),
+                    capture=capture,
                 )
+        if jobs:
+            get_copy_scheduler(s3, target_bucket, dest_bucket).run(jobs)
 
 
 def recursive_copy(
@@ -257,9 +289,13 @@ def recursive_copy(
     exclude: List[str],
     include: List[str],
     preserve: bool,
+    resume: str = "",
 ) -> None:
     """Recursive copy object to other bucket.
 
+    Copies are recorded in a TransferJournal, objects copied by the
+    interrupted job to resume are skipped.
+
     :param s3: S3 instance
     :type s3: S3
     :param target_bucket: source bucket
@@ -276,7 +312,10 @@ def recursive_copy(
     :type include: List[str]
     :param preserve: preserve previous object config
     :type preserve: bool
+    :param resume: id of the interrupted copy to resume
+    :type resume: str, optional
     """
+    sizes: Dict[str, int] = {}
     file_list = walk_s3_folder(
         s3.client,
         target_bucket,
@@ -288,27 +327,95 @@ def recursive_copy(
         "bucket",
         dest_path,
         dest_bucket,
+        sizes=sizes,
     )
 
-    if get_confirmation("Confirm?"):
-        for s3_key, dest_pathname in file_list:
-            print(
-                "copy: s3://%s/%s to s3://%s/%s"
-                % (target_bucket, s3_key, dest_bucket, dest_pathname)
-            )
-            copy_source = {"Bucket": target_bucket, "Key": s3_key}
-            if not preserve:
-                s3transferwrapper = S3TransferWrapper()
-                s3.client.copy(
-                    copy_source,
+    if not get_confirmation("Confirm?"):
+        return
+    journal = open_transfer_journal("copy", resume)
+    jobs = [
+        TransferJob(
+            "copy",
+            dest_bucket,
+            dest_pathname,
+            copy_source={"Bucket": target_bucket, "Key": s3_key},
+            message="copy: s3://%s/%s to s3://%s/%s"
+            % (target_bucket, s3_key, dest_bucket, dest_pathname),
+            size=sizes.get(s3_key),
+        )
+        for s3_key, dest_pathname in file_list
+    ]
+    if not preserve:
+        get_copy_scheduler(s3, target_bucket, dest_bucket, journal).run(jobs)
+        return
+
+    s3.bucket_name = target_bucket
+    pending = [job for job in jobs if not journal.is_completed(job)]
+    if len(pending) < len(jobs):
+        print("%s file(s) already transferred, skipped" % (len(jobs) - len(pending)))
+    failures: List[Tuple[TransferJob, Exception]] = []
+    finished = False
+    try:
+        # capture the metadata of the next objects while the current one copies
+        destinations = {job.copy_source["Key"]: job for job in pending}
+        capture = get_metadata_capture(s3, S3Args(s3))
+        for s3_key, _, object_metadata in capture.prefetch(
+            target_bucket,
+            ((s3_key, None) for s3_key in destinations),
+            return_errors=True,
+        ):
+            job = destinations[s3_key]
+            if isinstance(object_metadata, Exception):
+                failures.append((job, object_metadata))
+                continue
+            print(job.message)
+            journal.plan(job)
+            try:
+                copy_and_preserve(
+                    s3,
+                    target_bucket,
+                    s3_key,
                     dest_bucket,
-                    dest_pathname,
-                    Callback=S3Progress(s3_key, target_bucket, s3.client),
-                    Config=s3transferwrapper.transfer_config,
+                    job.key,
+                    size=job.size,
+                    metadata=object_metadata,
                 )
-            else:
-                s3.bucket_name = target_bucket
-                copy_and_preserve(s3, target_bucket, s3_key, dest_bucket, dest_pathname)
+            except Exception as e:
+                failures.append((job, e))
+                continue
+            journal.complete(job)
+        finished = True
+    finally:
+        journal.close(remove=finished and not failures)
+    print_failures(failures)
+    if failures:
+        print("Resume the transfer with --resume %s" % journal.job_id)
+
+
+def get_copy_scheduler(
+    s3: S3, target_bucket: str, dest_bucket: str, journal=None
+) -> TransferScheduler:
+    """Get the TransferScheduler to copy between the buckets.
+
+    The copy requests are sent to the region of the destination bucket,
+    the source objects are read in the region of the source bucket.
+
+    :param s3: S3 instance
+    :type s3: S3
+    :param target_bucket: source bucket
+    :type target_bucket: str
+    :param dest_bucket: destination bucket
+    :type dest_bucket: str
+    :param journal: journal to record the copies
+    :type journal: TransferJournal, optional
+    :return: TransferScheduler with region pinned clients
+    :rtype: TransferScheduler
+    """
+    return TransferScheduler(
+        s3.get_bucket_client(dest_bucket),
+        source_client=s3.get_bucket_client(target_bucket),
+        journal=journal,
+    )
 
 
 def copy_and_preserve(
@@ -318,6 +425,9 @@ def copy_and_preserve(
     dest_bucket: str,
     dest_path: str,
     version: str = None,
+    size: Optional[int] = None,
+    metadata: Optional[ObjectMetadata] = None,
+    capture: Optional[MetadataCapture] = None,
 ) -> None:
     """Copy object to other buckets and preserve previous details.
 
@@ -331,14 +441,28 @@ def copy_and_preserve(
     :type dest_path: str
     :param version: versionID of the object
     :type version: str
+    :param size: size of the object from the listing, skip the head_object call
+    :type size: int, optional
+    :param metadata: metadata captured by MetadataCapture, captured if not provided
+    :type metadata: ObjectMetadata, optional
+    :param capture: MetadataCapture of the operation to capture the metadata with
+    :type capture: MetadataCapture, optional
     :raises ClientError: clienterror will raise when coping KMS encrypted file, handled internally
     """
     copy_source: Dict[str, str] = {"Bucket": target_bucket, "Key": target_path}
     if version:
         copy_source["VersionId"] = version
+    if size is None and metadata is not None:
+        size = metadata.head.get("ContentLength")
     s3_args = S3Args(s3)
     copy_object_args = get_copy_args(
-        s3, target_path, s3_args, extra_args=True, version=version
+        s3,
+        target_path,
+        s3_args,
+        extra_args=True,
+        version=version,
+        metadata=metadata,
+        capture=capture,
     )
 
     # limit to one retry
@@ -347,11 +471,15 @@ def copy_and_preserve(
         try:
             attempt_count += 1
             s3transferwrapper = S3TransferWrapper()
-            s3.client.copy(
+            source_client = s3.get_bucket_client(target_bucket)
+            s3.get_bucket_client(dest_bucket).copy(
                 copy_source,
                 dest_bucket,
                 dest_path,
-                Callback=S3Progress(target_path, s3.bucket_name, s3.client),
+                Callback=S3Progress(
+                    target_path, target_bucket, source_client, version, size
+                ),
+                SourceClient=source_client,
                 ExtraArgs=copy_object_args,
                 Config=s3transferwrapper.transfer_config,
             )
@@ -1,9 +1,17 @@
 """Contains function for handling delete operation on s3."""
-from typing import Dict, List, Optional, Union
-
-from fzfaws.s3.helper.exclude_file import exclude_file
+import json
+import tempfile
+from typing import IO, Dict, Generator, List, Optional, Union
+
+from fzfaws.s3.helper.batch_delete import MAX_DELETE_KEYS, BatchDeleter
+from fzfaws.s3.helper.list_object_versions import (
+    group_object_versions,
+    list_object_versions,
+)
+from fzfaws.s3.helper.s3progress import human_readable_size
 from fzfaws.s3.helper.walk_s3_folder import walk_s3_folder
 from fzfaws.s3.s3 import S3
+from fzfaws.utils.exceptions import MFADeleteLimit
 from fzfaws.utils.util import get_confirmation
 
 
@@ -58,8 +66,8 @@ def delete_s3(
         allversion = True
         recursive = True
     if mfa:
-        # mfa operation can only operate on one object
-        # because each time, it will require a new mfa code
+        # each mfa code can only be used once, selected objects are deleted
+        # in a single delete_objects request, recursive could exceed its limit
         recursive = False
         allversion = False
         clean = False
@@ -72,11 +80,7 @@ def delete_s3(
             s3.set_s3_path()
     else:
         if not s3.path_list[0]:
-            s3.set_s3_object(
-                version=version,
-                multi_select=True if not mfa else False,
-                deletemark=deletemark,
-            )
+            s3.set_s3_object(version=version, multi_select=True, deletemark=deletemark)
 
     if recursive:
         delete_object_recursive(s3, exclude, include, deletemark, clean, allversion)
@@ -90,12 +94,9 @@ def delete_s3(
         for s3_path in s3.path_list:
             print("(dryrun) delete: s3://%s/%s" % (s3.bucket_name, s3_path))
         if get_confirmation("Confirm?"):
-            for s3_path in s3.path_list:
-                print("delete: s3://%s/%s" % (s3.bucket_name, s3_path))
-                s3.client.delete_object(
-                    Bucket=s3.bucket_name,
-                    Key=s3_path,
-                )
+            BatchDeleter(s3.client, s3.bucket_name).run(
+                {"Key": s3_path} for s3_path in s3.path_list
+            )
 
 
 def delete_object_version(s3: S3, allversion: bool = False, mfa: str = "") -> None:
@@ -107,10 +108,15 @@ def delete_object_version(s3: S3, allversion: bool = False, mfa: str = "") -> No
     :type allversion: bool, optional
     :param mfa: mfa serial number and code seperate by space to use mfa privilage
     :type mfa: str, optional
+    :raises MFADeleteLimit: more versions are selected than a single mfa delete
     """
-    obj_versions = s3.get_object_version(
-        delete=True, select_all=allversion, multi_select=True if not mfa else False
-    )
+    obj_versions = s3.get_object_version(delete=True, select_all=allversion)
+    if mfa and len(obj_versions) > MAX_DELETE_KEYS:
+        # each mfa code can only be used once, refuse before the dry run
+        raise MFADeleteLimit(
+            "%s versions selected, mfa delete is limited to %s versions"
+            % (len(obj_versions), MAX_DELETE_KEYS)
+        )
 
     for obj_version in obj_versions:
         print(
@@ -118,21 +124,7 @@ def delete_object_version(s3: S3, allversion: bool = False, mfa: str = "") -> No
             % (s3.bucket_name, obj_version.get("Key"), obj_version.get("VersionId"))
         )
     if get_confirmation("Confirm?"):
-        for obj_version in obj_versions:
-            print(
-                "delete: s3://%s/%s with version %s"
-                % (
-                    s3.bucket_name,
-                    obj_version.get("Key"),
-                    obj_version.get("VersionId"),
-                )
-            )
-            s3.client.delete_object(
-                Bucket=s3.bucket_name,
-                Key=obj_version.get("Key"),
-                MFA=mfa,
-                VersionId=obj_version.get("VersionId"),
-            )
+        BatchDeleter(s3.client, s3.bucket_name, mfa=mfa).run(obj_versions)
 
 
 def delete_object_recursive(
@@ -159,54 +151,44 @@ def delete_object_recursive(
     :type allversion: bool, optional
     """
     if allversion:
-        # use a different method other than the walk s3 folder
-        # since walk_s3_folder doesn't provide access to deleted version object
-        # delete_all_versions method will list all files including deleted versions or even delete marker
-        file_list = find_all_version_files(
-            s3.client,
-            s3.bucket_name,
-            s3.path_list[0],
-            [],
-            exclude,
-            include,
-            deletemark,
-        )
-        obj_versions: List[Dict[str, str]] = []
-
-        # loop through all files and get their versions
-        for file in file_list:
-            obj_versions.extend(
-                s3.get_object_version(
-                    key=file, delete=True, select_all=True, non_current=clean
-                )
-            )
-            print(
-                "(dryrun) delete: s3://%s/%s %s"
-                % (
-                    s3.bucket_name,
-                    file,
-                    "with all versions" if not clean else "all non-current versions",
-                )
-            )
-
-        if get_confirmation(
-            "Delete %s?"
-            % ("all of their versions" if not clean else "all non-current versions")
-        ):
-            for obj_version in obj_versions:
+        # walk_s3_folder doesn't provide access to deleted version object
+        # list_object_versions streams all versions including delete markers
+        # the versions shown are spooled to a temporary file to keep memory
+        # bounded, only they are deleted after confirmation, versions written
+        # after the dry run are left untouched
+        with tempfile.TemporaryFile(mode="w+") as spool:
+            total_versions = total_bytes = 0
+            for key, versions in group_object_versions(
+                list_object_versions(
+                    s3.client, s3.bucket_name, s3.path_list[0], exclude, include
+                ),
+                non_current=clean,
+                deletemark=deletemark,
+            ):
                 print(
-                    "delete: s3://%s/%s with version %s"
+                    "(dryrun) delete: s3://%s/%s %s"
                     % (
                         s3.bucket_name,
-                        obj_version.get("Key"),
-                        obj_version.get("VersionId"),
+                        key,
+                        "with all versions"
+                        if not clean
+                        else "all non-current versions",
                     )
                 )
-                s3.client.delete_object(
-                    Bucket=s3.bucket_name,
-                    Key=obj_version.get("Key"),
-                    VersionId=obj_version.get("VersionId"),
-                )
+                for version in versions:
+                    spool.write("%s\n" % json.dumps([key, version.version_id]))
+                total_versions += len(versions)
+                total_bytes += sum(version.size for version in versions)
+            print(
+                "(dryrun) total: %s version(s), %s"
+                % (total_versions, human_readable_size(total_bytes))
+            )
+
+            if get_confirmation(
+                "Delete the %s version(s) listed above?" % total_versions
+            ):
+                spool.seek(0)
+                BatchDeleter(s3.client, s3.bucket_name).run(_read_spool(spool))
 
     else:
         file_list = walk_s3_folder(
@@ -220,72 +202,19 @@ def delete_object_recursive(
             "delete",
         )
         if get_confirmation("Confirm?"):
-            for s3_key, _ in file_list:
-                print("delete: s3://%s/%s" % (s3.bucket_name, s3_key))
-                s3.client.delete_object(
-                    Bucket=s3.bucket_name,
-                    Key=s3_key,
-                )
-
+            BatchDeleter(s3.client, s3.bucket_name).run(
+                {"Key": s3_key} for s3_key, _ in file_list
+            )
 
-def find_all_version_files(
-    client,
-    bucket: str,
-    path: str,
-    file_list: Optional[List[str]] = None,
-    exclude: Optional[List[str]] = None,
-    include: Optional[List[str]] = None,
-    deletemark: bool = False,
-) -> List[str]:
-    """Find all files based on versions.
 
-    This method is able to find all files even deleted files or just delete marker left overs.
-    Use this method when needing to cleanly delete all files including their versions.
+def _read_spool(spool: IO[str]) -> Generator[Dict[str, str], None, None]:
+    """Read back the versions spooled during the dry run.
 
-    :param client: boto3 client
-    :type client: boto3.client
-    :param bucket: bucket to walk
-    :type bucket: str
-    :param path: the folder path to walk, empty to walk from root
-    :type path: str
-    :param file_list: list of files that was walked, for recursive purpose, pass empty list in
-    :type file_list: List[str], optional
-    :param exclude: glob pattern to exclude
-    :type exclude: List[str], optional
-    :param include: glob pattern to include
-    :type include: glob pattern to include
-    :param deletemark: set to true if only want to find deletemark
-    :type deletemark: bool, optional
-    :return: return a list of file names including deleted file names with delete mark remained
-    :rtype: List[str]
+    :param spool: file of json [key, version_id] lines
+    :type spool: IO[str]
+    :return: versions in the delete_objects form
+    :rtype: Generator[Dict[str, str], None, None]
     """
-    if file_list is None:
-        file_list = []
-    if exclude is None:
-        exclude = []
-    if include is None:
-        include = []
-
-    paginator = client.get_paginator("list_object_versions")
-    for result in paginator.paginate(Bucket=bucket, Delimiter="/", Prefix=path):
-        if result.get("CommonPrefixes") is not None:
-            for subdir in result.get("CommonPrefixes"):
-                file_list = find_all_version_files(
-                    client, bucket, subdir.get("Prefix"), file_list, exclude, include
-                )
-        if not deletemark:
-            for file in result.get("Versions", []):
-                if exclude_file(exclude, include, file.get("Key")):
-                    continue
-                if file.get("Key") in file_list:
-                    continue
-                else:
-                    file_list.append(file.get("Key"))
-        for file in result.get("DeleteMarkers", []):
-            if exclude_file(exclude, include, file.get("Key")):
-                continue
-            if file.get("Key") in file_list:
-                continue
-            else:
-                file_list.append(file.get("Key"))
-    return file_list
+    for line in spool:
+        key, version_id = json.loads(line)
+        yield {"Key": key, "VersionId": version_id}
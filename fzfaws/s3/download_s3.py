@@ -2,9 +2,9 @@
 import os
 from typing import Dict, List, Optional, Union
 
-from fzfaws.s3.helper.s3progress import S3Progress
-from fzfaws.s3.helper.s3transferwrapper import S3TransferWrapper
 from fzfaws.s3.helper.sync_s3 import sync_s3
+from fzfaws.s3.helper.transfer_journal import open_transfer_journal
+from fzfaws.s3.helper.transfer_scheduler import TransferJob, TransferScheduler
 from fzfaws.s3.helper.walk_s3_folder import walk_s3_folder
 from fzfaws.s3.s3 import S3
 from fzfaws.utils.pyfzf import Pyfzf
@@ -22,6 +22,8 @@ def download_s3(
     include: Optional[List[str]] = None,
     hidden: bool = False,
     version: bool = False,
+    etag: bool = False,
+    resume: str = "",
 ) -> None:
     """Download files/'directory' from s3.
 
@@ -38,7 +40,7 @@ def download_s3(
     :type recursive: bool, optional
     :param search_root: search from root
     :type search_root: bool, optional
-    :param sync: use aws cli s3 sync
+    :param sync: sync the s3 directory to local
     :type sync: bool, optional
     :param exclude: glob patterns to exclude
     :type exclude: List[str], optional
@@ -48,6 +50,10 @@ def download_s3(
     :type hidden: bool, optional
     :param version: download version object
     :type version: bool, optional
+    :param etag: compare files by ETag instead of last modified time during sync
+    :type etag: bool, optional
+    :param resume: id of the interrupted recursive download to resume
+    :type resume: str, optional
     """
     if not exclude:
         exclude = []
@@ -81,9 +87,11 @@ def download_s3(
             include=include,
             from_path="s3://%s/%s" % (s3.bucket_name, s3.path_list[0]),
             to_path=local_path,
+            client=s3.get_bucket_client(),
+            etag=etag,
         )
     elif recursive:
-        download_recusive(s3, exclude, include, local_path)
+        download_recusive(s3, exclude, include, local_path, resume)
 
     elif version:
         download_version(s3, obj_versions, local_path)
@@ -98,26 +106,30 @@ def download_s3(
                 % (s3.bucket_name, s3_path, destination_path)
             )
         if get_confirmation("Confirm?"):
+            jobs: List[TransferJob] = []
             for s3_path in s3.path_list:
                 destination_path = os.path.join(local_path, os.path.basename(s3_path))
-                print(
-                    "download: s3://%s/%s to %s"
-                    % (s3.bucket_name, s3_path, destination_path)
-                )
-                transfer = S3TransferWrapper(s3.client)
-                transfer.s3transfer.download_file(
-                    s3.bucket_name,
-                    s3_path,
-                    destination_path,
-                    callback=S3Progress(s3_path, s3.bucket_name, s3.client),
+                jobs.append(
+                    TransferJob(
+                        "download",
+                        s3.bucket_name,
+                        s3_path,
+                        filename=destination_path,
+                        message="download: s3://%s/%s to %s"
+                        % (s3.bucket_name, s3_path, destination_path),
+                    )
                 )
+            TransferScheduler(s3.get_bucket_client()).run(jobs)
 
 
 def download_recusive(
-    s3: S3, exclude: List[str], include: List[str], local_path: str
+    s3: S3, exclude: List[str], include: List[str], local_path: str, resume: str = ""
 ) -> None:
     """Download s3 recursive.
 
+    Downloads are recorded in a TransferJournal, files downloaded by the
+    interrupted job to resume are skipped.
+
     :param s3: S3 instance
     :type s3: S3
     :param exclude: glob pattern to exclude
@@ -126,7 +138,10 @@ def download_recusive(
     :type include: List[str]
     :param local_path: local directory to download
     :type local_path: str
+    :param resume: id of the interrupted download to resume
+    :type resume: str, optional
     """
+    sizes: Dict[str, int] = {}
     download_list = walk_s3_folder(
         s3.client,
         s3.bucket_name,
@@ -137,22 +152,24 @@ def download_recusive(
         include,
         "download",
         local_path,
+        sizes=sizes,
     )
 
     if get_confirmation("Confirm?"):
-        for s3_key, dest_pathname in download_list:
-            if not os.path.exists(os.path.dirname(dest_pathname)):
-                os.makedirs(os.path.dirname(dest_pathname))
-            print(
-                "download: s3://%s/%s to %s" % (s3.bucket_name, s3_key, dest_pathname)
-            )
-            transfer = S3TransferWrapper(s3.client)
-            transfer.s3transfer.download_file(
+        TransferScheduler(
+            s3.get_bucket_client(), journal=open_transfer_journal("download", resume)
+        ).run(
+            TransferJob(
+                "download",
                 s3.bucket_name,
                 s3_key,
-                dest_pathname,
-                callback=S3Progress(s3_key, s3.bucket_name, s3.client),
+                filename=dest_pathname,
+                message="download: s3://%s/%s to %s"
+                % (s3.bucket_name, s3_key, dest_pathname),
+                size=sizes.get(s3_key),
             )
+            for s3_key, dest_pathname in download_list
+        )
 
 
 def download_version(
@@ -182,29 +199,25 @@ def download_version(
         )
 
     if get_confirmation("Confirm"):
+        jobs: List[TransferJob] = []
         for obj_version in obj_versions:
             destination_path = os.path.join(
                 local_path, os.path.basename(obj_version.get("Key", ""))
             )
-            print(
-                "download: s3://%s/%s to %s with version %s"
-                % (
+            jobs.append(
+                TransferJob(
+                    "download",
                     s3.bucket_name,
-                    obj_version.get("Key"),
-                    destination_path,
-                    obj_version.get("VersionId"),
-                )
-            )
-            transfer = S3TransferWrapper(s3.client)
-            transfer.s3transfer.download_file(
-                s3.bucket_name,
-                obj_version.get("Key"),
-                destination_path,
-                extra_args={"VersionId": obj_version.get("VersionId")},
-                callback=S3Progress(
                     obj_version.get("Key", ""),
-                    s3.bucket_name,
-                    s3.client,
-                    obj_version.get("VersionId"),
-                ),
+                    filename=destination_path,
+                    extra_args={"VersionId": obj_version.get("VersionId")},
+                    message="download: s3://%s/%s to %s with version %s"
+                    % (
+                        s3.bucket_name,
+                        obj_version.get("Key"),
+                        destination_path,
+                        obj_version.get("VersionId"),
+                    ),
+                )
             )
+        TransferScheduler(s3.get_bucket_client()).run(jobs)
@@ -0,0 +1,161 @@
+"""Module contains the batched s3 object deletion."""
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List
+
+from botocore.exceptions import ClientError
+
+from fzfaws.utils.exceptions import MFADeleteLimit
+
+# max number of keys accepted by a single delete_objects request
+MAX_DELETE_KEYS = 1000
+
+
+class BatchDeleter:
+    """Delete objects through delete_objects in batches of 1000 keys.
+
+    Objects are consumed lazily and grouped into batches, batches are sent
+    concurrently on a thread pool, the number of batches in flight is capped
+    so that objects could be streamed from a listing.
+
+    A failed key doesn't abort the deletion, the per key errors of the response
+    are collected and reported once all batches are done. When a whole batch
+    failed, every key of the batch is recorded with the error of the request.
+
+    When mfa is provided, the objects are sent in a single request with the
+    mfa, a mfa code could only be used once so mfa deletes exceeding one
+    batch are refused before anything is deleted.
+
+    Example:
+        deleter = BatchDeleter(s3.client, s3.bucket_name)
+        errors = deleter.run({"Key": key} for key in keys)
+
+    :param client: boto3.client("s3")
+    :type client: boto3.client
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param mfa: mfa serial number and code seperate by space
+    :type mfa: str, optional
+    :param max_workers: max number of batches to send concurrently
+    :type max_workers: int, optional
+    :param batch_size: number of keys per delete_objects request
+    :type batch_size: int, optional
+    """
+
+    def __init__(
+        self,
+        client,
+        bucket: str,
+        mfa: str = "",
+        max_workers: int = 10,
+        batch_size: int = MAX_DELETE_KEYS,
+    ) -> None:
+        """Construct the deleter instance."""
+        self.client = client
+        self.bucket: str = bucket
+        self.mfa: str = mfa
+        self.max_workers: int = 1 if mfa else max_workers
+        self.batch_size: int = min(batch_size, MAX_DELETE_KEYS)
+        self.deleted: int = 0
+        self.errors: List[Dict[str, str]] = []
+        self._lock = threading.Lock()
+
+    def run(self, objects: Iterable[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Delete all objects and report the errors at the end.
+
+        :param objects: objects to delete in the form of {"Key", "VersionId"}
+        :type objects: Iterable[Dict[str, str]]
+        :raises MFADeleteLimit: mfa is provided with more objects than a batch
+        :return: errors in the delete_objects Errors form
+        :rtype: List[Dict[str, str]]
+        """
+        self.deleted = 0
+        self.errors = []
+        objects = iter(objects)
+        if self.mfa:
+            batch = list(itertools.islice(objects, self.batch_size + 1))
+            if len(batch) > self.batch_size:
+                raise MFADeleteLimit(
+                    "A mfa code could only be used once, "
+                    "mfa delete is limited to %s objects" % self.batch_size
+                )
+            objects = iter(batch)
+        slots = threading.BoundedSemaphore(self.max_workers * 2)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                batch = list(itertools.islice(objects, self.batch_size))
+                if not batch:
+                    break
+                slots.acquire()
+                future = executor.submit(self._delete_batch, batch)
+                future.add_done_callback(lambda _: slots.release())
+        self.print_errors()
+        return self.errors
+
+    def print_errors(self) -> None:
+        """Print the failed keys of the last run."""
+        if not self.errors:
+            return
+        print("%s object(s) failed to delete:" % len(self.errors))
+        for error in self.errors:
+            print(
+                "delete failed: %s %s: %s"
+                % (
+                    self._get_object_path(error),
+                    error.get("Code", ""),
+                    error.get("Message", ""),
+                )
+            )
+
+    def _delete_batch(self, batch: List[Dict[str, str]]) -> None:
+        """Send a single delete_objects request.
+
+        :param batch: objects to delete, at most 1000
+        :type batch: List[Dict[str, str]]
+        """
+        args: Dict[str, Any] = {
+            "Bucket": self.bucket,
+            "Delete": {"Objects": batch, "Quiet": False},
+        }
+        if self.mfa:
+            args["MFA"] = self.mfa
+        try:
+            response = self.client.delete_objects(**args)
+        except ClientError as e:
+            error = e.response.get("Error", {})
+            errors = [
+                {
+                    **s3_object,
+                    "Code": error.get("Code", ""),
+                    "Message": error.get("Message", str(e)),
+                }
+                for s3_object in batch
+            ]
+            response = {"Errors": errors}
+        except Exception as e:
+            errors = [{**s3_object, "Message": str(e)} for s3_object in batch]
+            response = {"Errors": errors}
+
+        with self._lock:
+            for deleted in response.get("Deleted", []):
+                print("delete: %s" % self._get_object_path(deleted))
+            self.deleted += len(response.get("Deleted", []))
+            self.errors.extend(response.get("Errors", []))
+
+    def _get_object_path(self, s3_object: Dict[str, Any]) -> str:
+        """Format the object for display.
+
+        :param s3_object: object in the form of {"Key", "VersionId"}
+        :type s3_object: Dict[str, Any]
+        :return: s3 path with the version if present
+        :rtype: str
+        """
+        if s3_object.get("VersionId"):
+            return "s3://%s/%s with version %s" % (
+                self.bucket,
+                s3_object.get("Key"),
+                s3_object.get("VersionId"),
+            )
+        return "s3://%s/%s" % (self.bucket, s3_object.get("Key"))
+
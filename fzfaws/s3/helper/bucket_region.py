@@ -0,0 +1,132 @@
+"""Module contains the bucket region resolver.
+
+The region of each bucket is looked up once per process through
+get_bucket_location and persisted under $XDG_CACHE_HOME/fzfaws so that
+the next invocation doesn't need to look it up again.
+"""
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Optional
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from fzfaws.utils.session import get_client
+
+# process wide cache of bucket regions, loaded from disk on first use
+_regions_lock = threading.RLock()
+_regions: Dict[str, str] = {}
+_loaded: bool = False
+
+
+def get_bucket_region(client, bucket: str) -> Optional[str]:
+    """Get the region of the bucket.
+
+    :param client: boto3.client("s3") used to look up the location
+    :type client: boto3.client
+    :param bucket: name of the bucket
+    :type bucket: str
+    :return: region of the bucket, None when the location couldn't be read
+    :rtype: Optional[str]
+    """
+    if not bucket:
+        return None
+    with _regions_lock:
+        _load_regions()
+        if bucket in _regions:
+            return _regions[bucket]
+
+    try:
+        response = client.get_bucket_location(Bucket=bucket)
+    except (BotoCoreError, ClientError):
+        return None
+    location = response.get("LocationConstraint")
+    # buckets in us-east-1 have no location constraint, EU is the legacy eu-west-1
+    if not location:
+        region = "us-east-1"
+    elif location == "EU":
+        region = "eu-west-1"
+    else:
+        region = location
+
+    with _regions_lock:
+        _regions[bucket] = region
+        _save_regions()
+    return region
+
+
+def get_bucket_client(client, bucket: str, profile: Optional[str] = None):
+    """Get the shared s3 client pinned to the region of the bucket.
+
+    Requests are sent to the bucket's region directly without being redirected,
+    presigned url are also signed for the correct region. Falls back to the
+    provided client when the region couldn't be resolved.
+
+    :param client: boto3.client("s3") used to look up the location
+    :type client: boto3.client
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param profile: profile of the client
+    :type profile: str, optional
+    :return: boto3 client in the region of the bucket
+    :rtype: boto3.client
+    """
+    region = get_bucket_region(client, bucket)
+    if not region or region == client.meta.region_name:
+        return client
+    return get_client("s3", profile, region)
+
+
+def clear_bucket_regions() -> None:
+    """Remove the regions cached in process.
+
+    Useful for unit testing only, the regions are loaded from disk again
+    on next use.
+    """
+    global _loaded
+    with _regions_lock:
+        _regions.clear()
+        _loaded = False
+
+
+def _get_cache_path() -> str:
+    """Get the path of the region cache file.
+
+    :return: path to the cache file
+    :rtype: str
+    """
+    home = os.path.expanduser("~")
+    base_directory = os.getenv("XDG_CACHE_HOME", "%s/.cache" % home)
+    return "%s/fzfaws/bucket_region.json" % base_directory
+
+
+def _load_regions() -> None:
+    """Load the cached regions from disk once."""
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    try:
+        with open(_get_cache_path(), "r") as file:
+            _regions.update(json.load(file))
+    except (OSError, ValueError):
+        pass
+
+
+def _save_regions() -> None:
+    """Write the regions to disk, a temp file is written first and then renamed."""
+    cache_path = _get_cache_path()
+    cache_dir = os.path.dirname(cache_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=cache_dir)
+    except OSError:
+        return
+    try:
+        with os.fdopen(file_descriptor, "w") as file:
+            json.dump(_regions, file)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
@@ -0,0 +1,243 @@
+"""Module contains the local s3 ETag calculation.
+
+S3 ETag of a single part upload is the md5 of the file, multipart upload
+ETag is the md5 of the concatenated md5 of each part suffixed with the
+number of parts, e.g. "md5-of-md5s-N".
+"""
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from fzfaws.s3.helper.s3transferwrapper import S3TransferWrapper
+
+
+class ETagHasher:
+    """Calculate the s3 ETag of local files.
+
+    Files are memory mapped and the parts are hashed concurrently, md5
+    releases the GIL so the parts are spread across cores. Results are
+    cached on disk keyed by the path, size and mtime_ns of the file, only
+    files that changed are hashed again.
+
+    The part size defaults to the multipart_chunksize of the transfer config,
+    the same size used by the uploads of fzfaws.
+
+    Example:
+        with ETagHasher() as hasher:
+            if hasher.get_etag(filename, multipart="-" in etag) != etag:
+                print("changed")
+
+    :param chunksize: part size of multipart ETag
+    :type chunksize: int, optional
+    :param max_workers: max number of parts to hash concurrently
+    :type max_workers: int, optional
+    :param cache: cache the digests on disk
+    :type cache: bool, optional
+    """
+
+    def __init__(
+        self,
+        chunksize: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        cache: bool = True,
+    ) -> None:
+        """Construct the hasher instance."""
+        self.chunksize: int = (
+            chunksize or S3TransferWrapper().transfer_config.multipart_chunksize
+        )
+        self.digest_cache: Optional[DigestCache] = DigestCache() if cache else None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count())
+
+    def __enter__(self) -> "ETagHasher":
+        """Return the hasher."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Save the cache and stop the workers."""
+        self.close()
+
+    def close(self) -> None:
+        """Save the cache and stop the workers."""
+        if self.digest_cache:
+            self.digest_cache.save()
+        self._executor.shutdown(wait=True)
+
+    def get_etag(self, filename: str, multipart: bool = False) -> str:
+        """Get the ETag of the local file.
+
+        :param filename: path to the local file
+        :type filename: str
+        :param multipart: calculate the multipart ETag
+        :type multipart: bool, optional
+        :return: ETag wrapped in double quotes, same as s3 returns
+        :rtype: str
+        """
+        etag_type = str(self.chunksize) if multipart else "md5"
+        stat = os.stat(filename)
+        if self.digest_cache:
+            etag = self.digest_cache.get(filename, stat, etag_type)
+            if etag is not None:
+                return etag
+
+        if not multipart:
+            etag = '"%s"' % self.get_digest(filename, stat.st_size).hex()
+        else:
+            part_digests = self.get_part_digests(filename, stat.st_size)
+            etag = '"%s-%s"' % (
+                hashlib.md5(b"".join(part_digests)).hexdigest(),
+                len(part_digests),
+            )
+
+        if self.digest_cache:
+            self.digest_cache.set(filename, stat, etag_type, etag)
+        return etag
+
+    def get_digest(self, filename: str, size: int) -> bytes:
+        """Hash the whole file.
+
+        :param filename: path to the local file
+        :type filename: str
+        :param size: size of the file
+        :type size: int
+        :return: md5 digest of the file
+        :rtype: bytes
+        """
+        if size == 0:
+            return hashlib.md5().digest()
+        with open(filename, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    return hashlib.md5(view).digest()
+
+    def get_part_digests(self, filename: str, size: int) -> List[bytes]:
+        """Hash each part of the file concurrently.
+
+        :param filename: path to the local file
+        :type filename: str
+        :param size: size of the file
+        :type size: int
+        :return: md5 digest of each part
+        :rtype: List[bytes]
+        """
+        if size == 0:
+            return [hashlib.md5().digest()]
+        with open(filename, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                offsets = range(0, size, self.chunksize)
+                return list(
+                    self._executor.map(
+                        lambda offset: self._hash_part(mapped, offset), offsets
+                    )
+                )
+
+    def _hash_part(self, mapped: mmap.mmap, offset: int) -> bytes:
+        """Hash a single part of the memory mapped file.
+
+        :param mapped: the memory mapped file
+        :type mapped: mmap.mmap
+        :param offset: start of the part
+        :type offset: int
+        :return: md5 digest of the part
+        :rtype: bytes
+        """
+        with memoryview(mapped) as view:
+            with view[offset : offset + self.chunksize] as part:
+                return hashlib.md5(part).digest()
+
+
+class DigestCache:
+    """On disk cache of the local ETags.
+
+    Stored in a single json file $XDG_CACHE_HOME/fzfaws/etag.json, an entry
+    is only valid while the path, size and mtime_ns of the file are unchanged.
+
+    :param cache_path: path to the cache file
+    :type cache_path: str, optional
+    """
+
+    def __init__(self, cache_path: Optional[str] = None) -> None:
+        """Construct the cache instance and load the existing entries."""
+        if not cache_path:
+            home = os.path.expanduser("~")
+            base_directory = os.getenv("XDG_CACHE_HOME", "%s/.cache" % home)
+            cache_path = "%s/fzfaws/etag.json" % base_directory
+        self.cache_path: str = cache_path
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._changed: bool = False
+        try:
+            with open(self.cache_path, "r") as file:
+                self._entries = json.load(file)
+        except (OSError, ValueError):
+            pass
+
+    def get(
+        self, filename: str, stat: os.stat_result, etag_type: str
+    ) -> Optional[str]:
+        """Get the cached ETag of the file.
+
+        :param filename: path to the local file
+        :type filename: str
+        :param stat: os.stat of the file
+        :type stat: os.stat_result
+        :param etag_type: md5 or the part size of multipart ETag
+        :type etag_type: str
+        :return: the cached ETag, None if not cached or the file changed
+        :rtype: Optional[str]
+        """
+        entry = self._entries.get(os.path.abspath(filename))
+        if (
+            not entry
+            or entry.get("size") != stat.st_size
+            or entry.get("mtime_ns") != stat.st_mtime_ns
+        ):
+            return None
+        return entry.get("etags", {}).get(etag_type)
+
+    def set(
+        self, filename: str, stat: os.stat_result, etag_type: str, etag: str
+    ) -> None:
+        """Cache the ETag of the file.
+
+        :param filename: path to the local file
+        :type filename: str
+        :param stat: os.stat of the file when it's hashed
+        :type stat: os.stat_result
+        :param etag_type: md5 or the part size of multipart ETag
+        :type etag_type: str
+        :param etag: the ETag to cache
+        :type etag: str
+        """
+        path = os.path.abspath(filename)
+        entry = self._entries.get(path)
+        if (
+            not entry
+            or entry.get("size") != stat.st_size
+            or entry.get("mtime_ns") != stat.st_mtime_ns
+        ):
+            entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "etags": {}}
+            self._entries[path] = entry
+        entry["etags"][etag_type] = etag
+        self._changed = True
+
+    def save(self) -> None:
+        """Write the entries to disk if changed.
+
+        The file is written to a temp file first and then renamed.
+        """
+        if not self._changed:
+            return
+        cache_dir = os.path.dirname(self.cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=cache_dir)
+        try:
+            with os.fdopen(file_descriptor, "w") as file:
+                json.dump(self._entries, file)
+            os.replace(temp_path, self.cache_path)
+            self._changed = False
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
@@ -1,6 +1,79 @@
 """Contains function to handle glob pattern and determine if file should be excluded."""
 import fnmatch
-from typing import List, Optional
+import os
+import re
+from functools import lru_cache
+from typing import Callable, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class GlobFilter:
+    """Exclude/include glob patterns compiled into a single regex each.
+
+    Same semantics as exclude_file, a filename is excluded when it matches
+    any exclude pattern and none of the include patterns. Each list is
+    matched by one regex alternation which stops at the first matching
+    pattern, the include patterns are only tried for excluded filenames.
+
+    Example:
+        glob_filter = GlobFilter(["*"], ["*.txt"])
+        glob_filter.exclude("hello.txt") # False
+        glob_filter.filter(["hello.txt", "hello.json"]) # ["hello.txt"]
+
+    :param exclude: exclude glob pattern
+    :type exclude: List[str], optional
+    :param include: include glob pattern
+    :type include: List[str], optional
+    """
+
+    def __init__(
+        self, exclude: Optional[List[str]] = None, include: Optional[List[str]] = None
+    ) -> None:
+        """Compile the patterns."""
+        exclude = [os.path.normcase(pattern) for pattern in exclude or []]
+        include = [os.path.normcase(pattern) for pattern in include or []]
+        # os.path.normcase is only applied to the filename on Windows, same as fnmatch
+        self._normcase = os.path.normcase if os.name == "nt" else None
+        self._exclude_all = "*" in exclude
+        self._include_all = "*" in include
+        self._exclude = _compile(exclude)
+        self._include = _compile(include)
+
+    def exclude(self, filename: str) -> bool:
+        """Check if the file should be excluded.
+
+        :param filename: filename or key to check
+        :type filename: str
+        :return: bool value indicating whether the file should be excluded
+        :rtype: bool
+        """
+        if self._exclude is None or self._include_all:
+            return False
+        if self._normcase:
+            filename = self._normcase(filename)
+        if not self._exclude_all and not self._exclude(filename):
+            return False
+        return self._include is None or not self._include(filename)
+
+    def filter(
+        self, items: Iterable[T], key: Optional[Callable[[T], str]] = None
+    ) -> List[T]:
+        """Filter a batch of filenames, e.g. a page of keys or a directory.
+
+        :param items: filenames, or items to get the filename from through key
+        :type items: Iterable[T]
+        :param key: function to get the filename of the item
+        :type key: Callable[[T], str], optional
+        :return: items that should not be excluded, in the original order
+        :rtype: List[T]
+        """
+        if self._exclude is None or self._include_all:
+            return list(items)
+        exclude = self.exclude
+        if key is None:
+            return [item for item in items if not exclude(item)]  # type: ignore
+        return [item for item in items if not exclude(key(item))]
 
 
 def exclude_file(
@@ -14,6 +87,8 @@ def exclude_file(
     if the filename should be included.
 
     List should be glob pattern, trying to be in sync with aws cli.
+    The patterns are compiled once per distinct lists, use GlobFilter
+    directly in loops.
 
     :param exclude: exclude glob pattern
     :type exclude: List[str], optional
@@ -23,18 +98,34 @@ def exclude_file(
     :rtype: bool
     """
     if not exclude:
-        exclude = []
-    if not include:
-        include = []
-
-    should_exclude = False
-    # validate the relative_path against exclude list
-    for pattern in exclude:
-        if fnmatch.fnmatch(filename, pattern):
-            should_exclude = True
-    # validate against include list if it is previous denied
-    if should_exclude:
-        for pattern in include:
-            if fnmatch.fnmatch(filename, pattern):
-                should_exclude = False
-    return should_exclude
+        return False
+    return _get_filter(tuple(exclude), tuple(include or ())).exclude(filename)
+
+
+@lru_cache(maxsize=32)
+def _get_filter(exclude: Tuple[str, ...], include: Tuple[str, ...]) -> GlobFilter:
+    """Get the compiled filter of the patterns.
+
+    :param exclude: exclude glob pattern
+    :type exclude: Tuple[str, ...]
+    :param include: include glob pattern
+    :type include: Tuple[str, ...]
+    :return: the compiled filter
+    :rtype: GlobFilter
+    """
+    return GlobFilter(list(exclude), list(include))
+
+
+def _compile(patterns: List[str]) -> Optional[Callable[[str], Optional["re.Match"]]]:
+    """Compile the glob patterns into the match function of a single regex.
+
+    :param patterns: glob patterns
+    :type patterns: List[str]
+    :return: match function of the regex, None if there is no pattern
+    :rtype: Callable[[str], Optional[re.Match]], optional
+    """
+    if not patterns:
+        return None
+    # each translated pattern is anchored with \Z, duplicates are only tried once
+    translated = dict.fromkeys(fnmatch.translate(pattern) for pattern in patterns)
+    return re.compile("|".join(translated)).match
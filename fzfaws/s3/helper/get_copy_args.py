@@ -1,11 +1,248 @@
 """Contains the function to get s3 copy argument for preserving all object information."""
-from typing import Any, Dict
+import collections
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+from urllib.parse import urlencode
+
+from botocore.exceptions import ClientError
+
 from fzfaws.s3 import S3
 from fzfaws.s3.helper.s3args import S3Args
 
 
+class ObjectMetadata(NamedTuple):
+    """Captured information of an object used to preserve it during copy.
+
+    :param head: response of head_object
+    :type head: Dict[str, Any]
+    :param acl: response of get_object_acl, empty if not captured
+    :type acl: Dict[str, Any]
+    :param tags: TagSet of get_object_tagging, empty if not captured
+    :type tags: List[Dict[str, str]]
+    """
+
+    head: Dict[str, Any]
+    acl: Dict[str, Any]
+    tags: List[Dict[str, str]]
+
+
+class MetadataCapture:
+    """Capture the metadata of objects through head_object, acl and tagging.
+
+    head_object only reads the headers of the object, the acl and the tags
+    are fetched concurrently with it. Results of get are cached per
+    (bucket, key, version), create a single capture per operation and pass
+    it to get_copy_args to reuse them.
+
+    Use prefetch to capture a stream of objects concurrently, so that the copies
+    could be fed directly from it. Results of prefetch are not cached so the
+    memory stays bounded on large prefixes.
+
+    Example:
+        capture = MetadataCapture(s3.client)
+        for key, version, metadata in capture.prefetch("bucket", objects):
+            get_copy_args(s3, key, s3_args, True, version, metadata)
+
+    :param client: boto3.client("s3")
+    :type client: boto3.client
+    :param acl: capture the acl
+    :type acl: bool, optional
+    :param tags: capture the tags
+    :type tags: bool, optional
+    :param max_workers: max number of requests to send concurrently
+    :type max_workers: int, optional
+    """
+
+    def __init__(
+        self, client, acl: bool = True, tags: bool = True, max_workers: int = 10
+    ) -> None:
+        """Construct the capture instance."""
+        self.client = client
+        self.acl: bool = acl
+        self.tags: bool = tags
+        self.max_workers: int = max_workers
+        self._cache: Dict[Tuple[str, str, Optional[str]], ObjectMetadata] = {}
+
+    def get(
+        self, bucket: str, key: str, version: Optional[str] = None
+    ) -> ObjectMetadata:
+        """Capture the metadata of a single object.
+
+        :param bucket: name of the bucket
+        :type bucket: str
+        :param key: key of the object
+        :type key: str
+        :param version: version id of the object
+        :type version: str, optional
+        :return: captured metadata
+        :rtype: ObjectMetadata
+        """
+        metadata = self._cache.get((bucket, key, version))
+        if metadata is None:
+            metadata = list(self.prefetch(bucket, [(key, version)]))[0][2]
+            self._cache[(bucket, key, version)] = metadata
+        return metadata
+
+    def prefetch(
+        self,
+        bucket: str,
+        objects: Iterable[Tuple[str, Optional[str]]],
+        ordered: bool = True,
+        return_errors: bool = False,
+    ) -> Generator[
+        Tuple[str, Optional[str], Union[ObjectMetadata, Exception]], None, None
+    ]:
+        """Capture the metadata of the objects concurrently.
+
+        Objects are consumed lazily, at most max_workers * 2 objects are
+        captured ahead of the consumer. Each request of an object is sent
+        separately on the thread pool.
+
+        With return_errors, the exception of an object that failed to be
+        captured is yielded in place of its metadata so that the rest of
+        the objects could carry on, otherwise the exception is raised.
+
+        :param bucket: name of the bucket
+        :type bucket: str
+        :param objects: key and version id of the objects
+        :type objects: Iterable[Tuple[str, Optional[str]]]
+        :param ordered: yield in the order of objects, otherwise in completion order
+        :type ordered: bool, optional
+        :param return_errors: yield the exception of the objects failed to capture
+        :type return_errors: bool, optional
+        :return: key, version id and the captured metadata in generator form
+        :rtype: Generator[Tuple[str, Optional[str], Union[ObjectMetadata, Exception]], None, None]
+        """
+        pending: Deque[Tuple[str, Optional[str], List[Future]]] = collections.deque()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for key, version in objects:
+                pending.append(
+                    (key, version, self._submit(executor, bucket, key, version))
+                )
+                if len(pending) >= self.max_workers * 2:
+                    yield from self._collect(pending, ordered, return_errors)
+            while pending:
+                yield from self._collect(pending, ordered, return_errors)
+
+    def _submit(
+        self,
+        executor: ThreadPoolExecutor,
+        bucket: str,
+        key: str,
+        version: Optional[str],
+    ) -> List[Future]:
+        """Submit the head, acl and tagging request of the object.
+
+        :param executor: the thread pool to submit to
+        :type executor: ThreadPoolExecutor
+        :param bucket: name of the bucket
+        :type bucket: str
+        :param key: key of the object
+        :type key: str
+        :param version: version id of the object
+        :type version: str, optional
+        :return: futures of the head, acl and tags
+        :rtype: List[Future]
+        """
+        args = _get_object_args(bucket, key, version)
+        return [
+            executor.submit(self.client.head_object, **args),
+            executor.submit(self.client.get_object_acl, **args)
+            if self.acl
+            else _get_done_future({}),
+            executor.submit(self._get_tags, args)
+            if self.tags
+            else _get_done_future([]),
+        ]
+
+    def _collect(
+        self,
+        pending: Deque[Tuple[str, Optional[str], List[Future]]],
+        ordered: bool,
+        return_errors: bool,
+    ) -> Generator[
+        Tuple[str, Optional[str], Union[ObjectMetadata, Exception]], None, None
+    ]:
+        """Wait for the pending objects and yield the captured ones.
+
+        When ordered, only the first pending object is waited and yielded,
+        otherwise all objects that completed are yielded.
+
+        :param pending: key, version id and the futures of the pending objects
+        :type pending: Deque[Tuple[str, Optional[str], List[Future]]]
+        :param ordered: yield in the order of objects
+        :type ordered: bool
+        :param return_errors: yield the exception of the objects failed to capture
+        :type return_errors: bool
+        :return: key, version id and the captured metadata in generator form
+        :rtype: Generator[Tuple[str, Optional[str], Union[ObjectMetadata, Exception]], None, None]
+        """
+        if ordered:
+            completed = [pending.popleft()]
+        else:
+            completed = []
+            while not completed:
+                completed = [
+                    entry for entry in pending if all(f.done() for f in entry[2])
+                ]
+                if not completed:
+                    wait(
+                        [f for entry in pending for f in entry[2] if not f.done()],
+                        return_when=FIRST_COMPLETED,
+                    )
+            for entry in completed:
+                pending.remove(entry)
+
+        for key, version, futures in completed:
+            try:
+                metadata = ObjectMetadata(*(future.result() for future in futures))
+            except Exception as e:
+                if not return_errors:
+                    raise
+                yield key, version, e
+                continue
+            yield key, version, metadata
+
+    def _get_tags(self, args: Dict[str, str]) -> List[Dict[str, str]]:
+        """Get the tags of the object.
+
+        Without permission to read the tags, the tags are left to be copied by s3.
+        Other errors are raised so that the object is reported as failed instead
+        of being copied without its tags.
+
+        :param args: Bucket, Key and VersionId of the object
+        :type args: Dict[str, str]
+        :raises ClientError: the tags couldn't be read for other reason than permission
+        :return: TagSet of the object
+        :rtype: List[Dict[str, str]]
+        """
+        try:
+            return self.client.get_object_tagging(**args).get("TagSet", [])
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "AccessDenied":
+                raise
+            return []
+
+
 def get_copy_args(
-    s3: S3, s3_key: str, s3_args: S3Args, extra_args: bool = False, version: str = None
+    s3: S3,
+    s3_key: str,
+    s3_args: S3Args,
+    extra_args: bool = False,
+    version: str = None,
+    metadata: Optional[ObjectMetadata] = None,
+    capture: Optional[MetadataCapture] = None,
 ) -> Dict[str, Any]:
     """Get copy argument for s3 operations.
 
@@ -19,6 +256,9 @@ def get_copy_args(
     This function is supposed to be used when needing to preserve all previous object
     information such as encryption type, storage_class etc.
 
+    Metadata, content type and tags are also passed explicitly because
+    multipart copies don't carry them over from the source object.
+
     :param s3: S3 class instance
     :type s3: S3
     :param s3_key: the object key in s3
@@ -30,26 +270,26 @@ def get_copy_args(
     :type extra_args: bool, optional
     :param version: specify object version id
     :type version: str, optional
+    :param metadata: metadata captured by MetadataCapture, captured if not provided
+    :type metadata: ObjectMetadata, optional
+    :param capture: MetadataCapture of the operation to capture the metadata with
+    :type capture: MetadataCapture, optional
     :return: copy object argument
     :rtype: dict
     """
-    if version:
-        s3_obj = s3.client.get_object(
-            Bucket=s3.bucket_name, Key=s3_key, VersionId=version
-        )
-        s3_acl = s3.client.get_object_acl(
-            Bucket=s3.bucket_name, Key=s3_key, VersionId=version
-        )
-    else:
-        s3_obj = s3.client.get_object(Bucket=s3.bucket_name, Key=s3_key)
-        s3_acl = s3.client.get_object_acl(Bucket=s3.bucket_name, Key=s3_key)
+    if metadata is None:
+        if capture is None:
+            capture = get_metadata_capture(s3, s3_args)
+        metadata = capture.get(s3.bucket_name, s3_key, version)
+    s3_obj = metadata.head
+    s3_acl = metadata.acl
 
     permission_read = []
     permission_acp_read = []
     permission_acp_write = []
     permission_full = []
     if check_acl_update(s3_args):
-        for grantee in s3_acl.get("Grants"):
+        for grantee in s3_acl.get("Grants", []):
             if grantee.get("Permission") == "READ":
                 if grantee["Grantee"].get("ID"):
                     permission_read.append("id=" + grantee["Grantee"]["ID"])
@@ -101,10 +341,19 @@ def get_copy_args(
     if s3_args.tags:
         copy_object_args["TaggingDirective"] = "REPLACE"
         copy_object_args["Tagging"] = s3_args.tags
+    elif metadata.tags:
+        copy_object_args["Tagging"] = urlencode(
+            [(tag.get("Key"), tag.get("Value")) for tag in metadata.tags]
+        )
 
     if s3_args.metadata:
         copy_object_args["Metadata"] = s3_args.metadata
         copy_object_args["MetadataDirective"] = "REPLACE"
+    elif s3_obj.get("Metadata"):
+        copy_object_args["Metadata"] = s3_obj.get("Metadata")
+
+    if s3_obj.get("ContentType"):
+        copy_object_args["ContentType"] = s3_obj.get("ContentType")
 
     if s3_args.acl:
         copy_object_args["ACL"] = s3_args.acl
@@ -131,6 +380,26 @@ def get_copy_args(
     return copy_object_args
 
 
+def get_metadata_capture(s3: S3, s3_args: S3Args) -> MetadataCapture:
+    """Get the MetadataCapture which only captures what get_copy_args requires.
+
+    The acl is not needed when it's replaced, the tags are not needed when
+    new tags are set.
+
+    :param s3: S3 class instance
+    :type s3: S3
+    :param s3_args: S3Args instance which contains the argument for s3 client
+    :type s3_args: S3Args
+    :return: MetadataCapture instance
+    :rtype: MetadataCapture
+    """
+    return MetadataCapture(
+        s3.client,
+        acl=check_acl_update(s3_args) and not s3_args.acl,
+        tags=not s3_args.tags,
+    )
+
+
 def check_acl_update(s3_args) -> bool:
     """Check if any acl is updated.
 
@@ -147,3 +416,34 @@ def check_acl_update(s3_args) -> bool:
         and not s3_args.acl_acp_write
         and not s3_args.acl_acp_read
     )
+
+
+def _get_object_args(bucket: str, key: str, version: Optional[str]) -> Dict[str, str]:
+    """Get the Bucket, Key and VersionId arguments of the object.
+
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param key: key of the object
+    :type key: str
+    :param version: version id of the object
+    :type version: str, optional
+    :return: arguments for head_object, get_object_acl and get_object_tagging
+    :rtype: Dict[str, str]
+    """
+    args = {"Bucket": bucket, "Key": key}
+    if version:
+        args["VersionId"] = version
+    return args
+
+
+def _get_done_future(result: Any) -> Future:
+    """Get a completed future of the result.
+
+    :param result: result of the future
+    :type result: Any
+    :return: the completed future
+    :rtype: Future
+    """
+    future: Future = Future()
+    future.set_result(result)
+    return future
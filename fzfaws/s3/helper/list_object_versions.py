@@ -0,0 +1,182 @@
+"""Module contains the streaming s3 object version listing."""
+import heapq
+import itertools
+from typing import Any, Dict, Generator, Iterable, List, NamedTuple, Optional, Tuple
+
+from fzfaws.s3.helper.exclude_file import GlobFilter
+
+
+class ObjectVersion(NamedTuple):
+    """A single version or delete marker of an object.
+
+    :param key: key of the object
+    :type key: str
+    :param version_id: version id, "null" for objects created before versioning
+    :type version_id: str
+    :param is_latest: the version is the current version
+    :type is_latest: bool
+    :param is_delete_marker: the version is a delete marker
+    :type is_delete_marker: bool
+    :param size: size of the version, 0 for delete markers
+    :type size: int, optional
+    """
+
+    key: str
+    version_id: str
+    is_latest: bool
+    is_delete_marker: bool
+    size: int = 0
+
+
+class VersionSummary(NamedTuple):
+    """Versions of a single key.
+
+    :param key: key of the object
+    :type key: str
+    :param versions: number of versions, delete markers excluded
+    :type versions: int
+    :param delete_markers: number of delete markers
+    :type delete_markers: int
+    :param noncurrent_bytes: total size of the non-current versions
+    :type noncurrent_bytes: int
+    """
+
+    key: str
+    versions: int
+    delete_markers: int
+    noncurrent_bytes: int
+
+
+def list_object_versions(
+    client,
+    bucket: str,
+    prefix: str = "",
+    exclude: Optional[List[str]] = None,
+    include: Optional[List[str]] = None,
+) -> Generator[ObjectVersion, None, None]:
+    """List all versions and delete markers under the prefix in a single pass.
+
+    The listing is flat without delimiter, versions and delete markers of each
+    page are merged so that versions of the same key are yielded together
+    in key order. Only a single page is held in memory.
+
+    Example:
+        for version in list_object_versions(s3.client, "bucket", "logs/"):
+            print(version.key, version.version_id)
+
+    :param client: boto3.client("s3")
+    :type client: boto3.client
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param prefix: only list versions under this prefix
+    :type prefix: str, optional
+    :param exclude: glob patterns to exclude, matched against the key
+    :type exclude: List[str], optional
+    :param include: glob patterns to include
+    :type include: List[str], optional
+    :return: versions and delete markers in generator form
+    :rtype: Generator[ObjectVersion, None, None]
+    """
+    paginator = client.get_paginator("list_object_versions")
+    return iter_object_versions(
+        paginator.paginate(Bucket=bucket, Prefix=prefix), exclude, include
+    )
+
+
+def iter_object_versions(
+    pages: Iterable[Dict[str, Any]],
+    exclude: Optional[List[str]] = None,
+    include: Optional[List[str]] = None,
+) -> Generator[ObjectVersion, None, None]:
+    """Flatten the list_object_versions pages into versions in key order.
+
+    :param pages: pages of the list_object_versions paginator
+    :type pages: Iterable[Dict[str, Any]]
+    :param exclude: glob patterns to exclude, matched against the key
+    :type exclude: List[str], optional
+    :param include: glob patterns to include
+    :type include: List[str], optional
+    :return: versions and delete markers in generator form
+    :rtype: Generator[ObjectVersion, None, None]
+    """
+    glob_filter = GlobFilter(exclude, include)
+    for page in pages:
+        versions = (
+            ObjectVersion(
+                version["Key"],
+                version.get("VersionId", "null"),
+                version.get("IsLatest", False),
+                False,
+                version.get("Size", 0),
+            )
+            for version in page.get("Versions", [])
+        )
+        markers = (
+            ObjectVersion(
+                marker["Key"],
+                marker.get("VersionId", "null"),
+                marker.get("IsLatest", False),
+                True,
+            )
+            for marker in page.get("DeleteMarkers", [])
+        )
+        for version in heapq.merge(versions, markers, key=lambda v: v.key):
+            if glob_filter.exclude(version.key):
+                continue
+            yield version
+
+
+def group_object_versions(
+    versions: Iterable[ObjectVersion],
+    non_current: bool = False,
+    deletemark: bool = False,
+) -> Generator[Tuple[str, List[ObjectVersion]], None, None]:
+    """Group the versions by key and select the versions to delete.
+
+    Only the versions of a single key are held in memory.
+
+    :param versions: versions in key order from list_object_versions
+    :type versions: Iterable[ObjectVersion]
+    :param non_current: skip the current version, delete markers are kept
+    :type non_current: bool, optional
+    :param deletemark: only select keys that have delete markers
+    :type deletemark: bool, optional
+    :return: key and its selected versions in generator form
+    :rtype: Generator[Tuple[str, List[ObjectVersion]], None, None]
+    """
+    for key, key_versions in itertools.groupby(versions, key=lambda v: v.key):
+        key_versions = list(key_versions)
+        if deletemark and not any(v.is_delete_marker for v in key_versions):
+            continue
+        selected = [
+            version
+            for version in key_versions
+            if not non_current or version.is_delete_marker or not version.is_latest
+        ]
+        if selected:
+            yield key, selected
+
+
+def summarize_object_versions(
+    versions: Iterable[ObjectVersion],
+) -> Generator[VersionSummary, None, None]:
+    """Count the versions of each key.
+
+    Versions are listed in key order across pages, so the versions of a key
+    are counted as they stream by without holding them in memory.
+
+    :param versions: versions in key order from list_object_versions
+    :type versions: Iterable[ObjectVersion]
+    :return: summary of each key in generator form
+    :rtype: Generator[VersionSummary, None, None]
+    """
+    for key, key_versions in itertools.groupby(versions, key=lambda v: v.key):
+        version_count = delete_markers = noncurrent_bytes = 0
+        for version in key_versions:
+            if version.is_delete_marker:
+                delete_markers += 1
+                continue
+            version_count += 1
+            if not version.is_latest:
+                noncurrent_bytes += version.size
+        yield VersionSummary(key, version_count, delete_markers, noncurrent_bytes)
@@ -0,0 +1,230 @@
+"""Module contains the flat and sharded s3 object listing."""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+# max number of pages buffered from the shards before they are consumed
+MAX_BUFFERED_PAGES = 32
+
+
+def list_s3_objects(
+    client,
+    bucket: str,
+    prefix: str = "",
+    boundaries: Optional[List[str]] = None,
+    max_workers: int = 10,
+    max_shards: int = 64,
+) -> Generator[Dict[str, Any], None, None]:
+    """List all objects under the prefix flat and lazily through list_objects_v2.
+
+    The key space is split into shards, each shard is a range of keys
+    listed with StartAfter and stops once the key passed the end of the range.
+    Shards are fetched concurrently on a thread pool and objects are yielded
+    as soon as a page arrives, objects are in order within a shard but
+    shards are interleaved.
+
+    When boundaries is not provided, the top level prefixes under the prefix
+    are used as boundaries. They are fetched through a Delimiter="/" listing,
+    if there is no sub prefix, the listing is done in this single request/pages.
+
+    Example:
+        for s3_object in list_s3_objects(s3.client, "bucket", "logs/"):
+            print(s3_object["Key"])
+
+    :param client: boto3.client("s3")
+    :type client: boto3.client
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param prefix: only list objects under this prefix
+    :type prefix: str, optional
+    :param boundaries: sorted keys to split the key space on
+    :type boundaries: List[str], optional
+    :param max_workers: max number of shards to fetch concurrently
+    :type max_workers: int, optional
+    :param max_shards: max number of shards to split into
+    :type max_shards: int, optional
+    :return: objects in the list_objects_v2 Contents form in generator form
+    :rtype: Generator[Dict[str, Any], None, None]
+    """
+    if boundaries is None:
+        boundaries = []
+        for page in _list_delimiter_pages(client, bucket, prefix):
+            if not boundaries and not page.get("CommonPrefixes"):
+                if not page.get("IsTruncated"):
+                    # no sub prefix, this page is the full listing
+                    yield from page.get("Contents", [])
+                    return
+                # nothing to shard on, list everything in one shard
+                break
+            boundaries.extend(
+                common_prefix["Prefix"]
+                for common_prefix in page.get("CommonPrefixes", [])
+            )
+
+    shards = get_shards(boundaries, max_shards)
+    if len(shards) == 1:
+        yield from _list_shard(client, bucket, prefix, *shards[0])
+        return
+    yield from _list_shards(client, bucket, prefix, shards, max_workers)
+
+
+def get_shards(
+    boundaries: List[str], max_shards: int = 64
+) -> List[Tuple[Optional[str], Optional[str]]]:
+    """Split the key space into ranges.
+
+    Each shard is a tuple of (start_after, end), covering keys that are greater than
+    start_after and less or equal to end, None meaning unbounded. When there are
+    more boundaries than max_shards, boundaries are picked evenly.
+
+    Example:
+        get_shards(["a/", "b/"]) == [(None, "a/"), ("a/", "b/"), ("b/", None)]
+
+    :param boundaries: sorted keys to split the key space on
+    :type boundaries: List[str]
+    :param max_shards: max number of shards to return
+    :type max_shards: int, optional
+    :return: list of (start_after, end)
+    :rtype: List[Tuple[Optional[str], Optional[str]]]
+    """
+    if len(boundaries) >= max_shards:
+        step = len(boundaries) / max_shards
+        boundaries = [boundaries[int(i * step)] for i in range(1, max_shards)]
+    starts: List[Optional[str]] = [None, *boundaries]
+    ends: List[Optional[str]] = [*boundaries, None]
+    return list(zip(starts, ends))
+
+
+def _list_delimiter_pages(
+    client, bucket: str, prefix: str
+) -> Generator[Dict[str, Any], None, None]:
+    """List the top level of the prefix.
+
+    :param client: boto3.client("s3")
+    :type client: boto3.client
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param prefix: prefix to list
+    :type prefix: str
+    :return: pages of list_objects_v2 in generator form
+    :rtype: Generator[Dict[str, Any], None, None]
+    """
+    paginator = client.get_paginator("list_objects_v2")
+    yield from paginator.paginate(Bucket=bucket, Prefix=prefix, Delimiter="/")
+
+
+def _list_shard(
+    client,
+    bucket: str,
+    prefix: str,
+    start_after: Optional[str],
+    end: Optional[str],
+    stop_event: Optional[threading.Event] = None,
+) -> Generator[Dict[str, Any], None, None]:
+    """List the objects of a single shard.
+
+    :param client: boto3.client("s3")
+    :type client: boto3.client
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param prefix: prefix to list
+    :type prefix: str
+    :param start_after: only list keys greater than this key
+    :type start_after: Optional[str]
+    :param end: stop once the key is greater than this key
+    :type end: Optional[str]
+    :param stop_event: stop before requesting the next page once set
+    :type stop_event: threading.Event, optional
+    :return: objects in generator form
+    :rtype: Generator[Dict[str, Any], None, None]
+    """
+    params: Dict[str, Any] = {"Bucket": bucket, "Prefix": prefix}
+    if start_after is not None:
+        params["StartAfter"] = start_after
+    paginator = client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(**params):
+        for s3_object in page.get("Contents", []):
+            if end is not None and s3_object["Key"] > end:
+                return
+            yield s3_object
+        if stop_event is not None and stop_event.is_set():
+            return
+
+
+def _list_shards(
+    client,
+    bucket: str,
+    prefix: str,
+    shards: List[Tuple[Optional[str], Optional[str]]],
+    max_workers: int,
+) -> Generator[Dict[str, Any], None, None]:
+    """List the shards concurrently and yield the objects as they arrive.
+
+    Once the generator is closed, shards not started yet are cancelled and
+    running workers stop before requesting their next page.
+
+    :param client: boto3.client("s3")
+    :type client: boto3.client
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param prefix: prefix to list
+    :type prefix: str
+    :param shards: list of (start_after, end)
+    :type shards: List[Tuple[Optional[str], Optional[str]]]
+    :param max_workers: max number of shards to fetch concurrently
+    :type max_workers: int
+    :return: objects in generator form
+    :rtype: Generator[Dict[str, Any], None, None]
+    """
+    pages: queue.Queue = queue.Queue(maxsize=MAX_BUFFERED_PAGES)
+    stop_event = threading.Event()
+    finished = object()
+
+    def _put(item: Any) -> None:
+        while not stop_event.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _worker(start_after: Optional[str], end: Optional[str]) -> None:
+        if stop_event.is_set():
+            return
+        try:
+            page: List[Dict[str, Any]] = []
+            for s3_object in _list_shard(
+                client, bucket, prefix, start_after, end, stop_event
+            ):
+                page.append(s3_object)
+                if len(page) >= 1000:
+                    _put(page)
+                    page = []
+                if stop_event.is_set():
+                    return
+            _put(page)
+            _put(finished)
+        except Exception as e:
+            _put(e)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = []
+    try:
+        for start_after, end in shards:
+            futures.append(executor.submit(_worker, start_after, end))
+        remaining = len(shards)
+        while remaining:
+            item = pages.get()
+            if item is finished:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield from item
+    finally:
+        stop_event.set()
+        # shutdown(cancel_futures=True) is only available from python3.9
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
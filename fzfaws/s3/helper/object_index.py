@@ -0,0 +1,505 @@
+"""Module contains the local SQLite object index of s3 buckets.
+
+The keys, sizes, LastModified and ETags of a bucket are stored in
+$XDG_CACHE_HOME/fzfaws/s3index/<bucket>.sqlite, built from a single flat
+listing. The pickers answer prefix queries from the index instead of
+listing the bucket again. The recursive operations refresh the prefix they
+operate on first, so they never act on a stale index.
+
+The index is only used when enabled through services.s3.index in the
+config file or with the --refresh flag. The index of a bucket with an
+inventory report (services.s3.inventory) is built from the report.
+"""
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from fzfaws.s3.helper.list_s3_objects import list_s3_objects
+from fzfaws.s3.helper.prefix_trie import PrefixListing
+from fzfaws.s3.helper.s3_inventory import S3Inventory, get_inventory
+from fzfaws.utils import Spinner
+
+# number of rows written or read per batch
+BATCH_SIZE = 1000
+
+_indexes_lock = threading.Lock()
+_indexes: Dict[str, "ObjectIndex"] = {}
+# held while a bucket is checked and refreshed, other buckets are not blocked
+_refresh_locks: Dict[str, threading.Lock] = {}
+# buckets checked for staleness in this process
+_checked: Set[str] = set()
+_force_refresh: bool = False
+
+
+class ObjectIndex:
+    """SQLite index of the objects of a single bucket.
+
+    Keys are stored in a primary key column, prefix queries are range
+    scans on the key and folders are found by skipping over each folder,
+    so listing a level only reads the rows of that level.
+
+    Refresh re-lists a prefix and replaces its rows, keys no longer in the
+    listing are removed, the rest of the index is kept. The listing is
+    written a batch at a time so reads are only blocked while a batch is
+    written, not for the whole listing.
+
+    Example:
+        index = ObjectIndex("bucket")
+        index.refresh(s3.client, "logs/")
+        listing = index.list_prefix("logs/")
+
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param path: path to the database, default to the cache directory
+    :type path: str, optional
+    """
+
+    def __init__(self, bucket: str, path: str = "") -> None:
+        """Construct the index instance and create the tables."""
+        self.bucket: str = bucket
+        self.path: str = path or _get_index_path(bucket)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        # shared with the prefetch threads of the pickers, guarded by the lock
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS objects ("
+                "key TEXT PRIMARY KEY, size INTEGER, last_modified REAL, "
+                "etag TEXT, storage_class TEXT, generation INTEGER)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)"
+            )
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._connection.close()
+
+    def get_refreshed_at(self) -> Optional[float]:
+        """Get the time of the last refresh of the whole bucket.
+
+        :return: unix time of the last refresh, None if never refreshed
+        :rtype: Optional[float]
+        """
+        with self._lock:
+            value = self._get_meta("refreshed_at")
+        return float(value) if value else None
+
+    def is_stale(self, ttl: int = 0) -> bool:
+        """Check if the bucket should be listed again.
+
+        :param ttl: seconds before the index expires, 0 to never expire
+        :type ttl: int, optional
+        :return: True if never refreshed or expired
+        :rtype: bool
+        """
+        refreshed_at = self.get_refreshed_at()
+        if refreshed_at is None:
+            return True
+        return ttl > 0 and time.time() - refreshed_at > ttl
+
+    def get_source(self) -> Optional[str]:
+        """Get the source of the last refresh of the whole bucket.
+
+        :return: the source, empty string for a listing, None if never refreshed
+        :rtype: Optional[str]
+        """
+        with self._lock:
+            return self._get_meta("source")
+
+    def refresh(
+        self,
+        client,
+        prefix: str = "",
+        objects: Optional[Iterable[Dict[str, Any]]] = None,
+        source: str = "",
+    ) -> int:
+        """List the prefix and replace the indexed objects under the prefix.
+
+        :param client: boto3.client("s3")
+        :type client: boto3.client
+        :param prefix: prefix to refresh, default to the whole bucket
+        :type prefix: str, optional
+        :param objects: objects under the prefix to index instead of listing,
+            e.g. read from an inventory report
+        :type objects: Iterable[Dict[str, Any]], optional
+        :param source: name of the objects source, e.g. the manifest of the report
+        :type source: str, optional
+        :return: number of objects indexed
+        :rtype: int
+        """
+        if objects is None:
+            objects = list_s3_objects(client, self.bucket, prefix)
+        with self._lock, self._connection:
+            generation = int(self._get_meta("generation") or 0) + 1
+            self._set_meta("generation", str(generation))
+        count = 0
+        batch: List[Tuple[Any, ...]] = []
+        # the listing is consumed outside of the lock
+        for s3_object in objects:
+            batch.append(_to_row(s3_object, generation))
+            if len(batch) >= BATCH_SIZE:
+                self._write_rows(batch)
+                count += len(batch)
+                batch = []
+        self._write_rows(batch)
+        count += len(batch)
+        with self._lock, self._connection:
+            where, params = _get_prefix_clause(prefix)
+            self._connection.execute(
+                "DELETE FROM objects WHERE %s AND generation < ?" % where,
+                (*params, generation),
+            )
+            if not prefix:
+                self._set_meta("refreshed_at", str(time.time()))
+                self._set_meta("source", source)
+        return count
+
+    def list_objects(
+        self,
+        prefix: str = "",
+        exclude: Optional[List[str]] = None,
+        include: Optional[List[str]] = None,
+    ) -> Generator[Dict[str, Any], None, None]:
+        """List the indexed objects under the prefix in key order.
+
+        The glob patterns are matched by SQLite GLOB, with the same
+        exclude then include semantics as exclude_file.
+
+        :param prefix: only list objects under this prefix
+        :type prefix: str, optional
+        :param exclude: glob patterns to exclude, matched against the key
+        :type exclude: List[str], optional
+        :param include: glob patterns to include
+        :type include: List[str], optional
+        :return: objects in the list_objects_v2 Contents form in generator form
+        :rtype: Generator[Dict[str, Any], None, None]
+        """
+        where, params = _get_prefix_clause(prefix)
+        if exclude:
+            glob_params = [_to_sqlite_glob(pattern) for pattern in exclude]
+            glob_clause = " OR ".join("key GLOB ?" for _ in exclude)
+            if include:
+                glob_params.extend(_to_sqlite_glob(pattern) for pattern in include)
+                glob_clause = "(%s) AND NOT (%s)" % (
+                    glob_clause,
+                    " OR ".join("key GLOB ?" for _ in include),
+                )
+            where = "%s AND NOT (%s)" % (where, glob_clause)
+            params = (*params, *glob_params)
+
+        last_key: Optional[str] = None
+        while True:
+            if last_key is None:
+                query_where, query_params = where, params
+            else:
+                query_where = "%s AND key > ?" % where
+                query_params = (*params, last_key)
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT key, size, last_modified, etag, storage_class "
+                    "FROM objects WHERE %s ORDER BY key LIMIT %s"
+                    % (query_where, BATCH_SIZE),
+                    query_params,
+                ).fetchall()
+            for row in rows:
+                yield _to_object(row)
+            if len(rows) < BATCH_SIZE:
+                return
+            last_key = rows[-1][0]
+
+    def list_prefix(self, prefix: str = "") -> PrefixListing:
+        """List a single level under the prefix, same as a Delimiter="/" listing.
+
+        :param prefix: prefix to list
+        :type prefix: str, optional
+        :return: child prefixes and keys directly under the prefix
+        :rtype: PrefixListing
+        """
+        listing = PrefixListing([], [])
+        upper = _get_upper_bound(prefix)
+        start, inclusive = prefix, True
+        with self._lock:
+            while True:
+                query = "SELECT key FROM objects WHERE key %s ?" % (
+                    ">=" if inclusive else ">"
+                )
+                params: Tuple[Any, ...] = (start,)
+                if upper is not None:
+                    query += " AND key < ?"
+                    params = (start, upper)
+                row = self._connection.execute(
+                    query + " ORDER BY key LIMIT 1", params
+                ).fetchone()
+                if not row:
+                    return listing
+                key = row[0]
+                name, separator, _ = key[len(prefix) :].partition("/")
+                if separator:
+                    child_prefix = "%s%s/" % (prefix, name)
+                    listing.prefixes.append(child_prefix)
+                    # skip over every key of the child prefix
+                    start, inclusive = _get_upper_bound(child_prefix), True
+                    if start is None:
+                        return listing
+                else:
+                    listing.keys.append(key)
+                    start, inclusive = key, False
+
+    def _write_rows(self, rows: List[Tuple[Any, ...]]) -> None:
+        """Insert or replace the rows in a single transaction.
+
+        :param rows: rows in the column order of the objects table
+        :type rows: List[Tuple[Any, ...]]
+        """
+        if not rows:
+            return
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO objects "
+                "(key, size, last_modified, etag, storage_class, generation) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def _get_meta(self, name: str) -> Optional[str]:
+        """Get a value of the meta table, caller should hold the lock.
+
+        :param name: name of the value
+        :type name: str
+        :return: the value, None if not set
+        :rtype: Optional[str]
+        """
+        row = self._connection.execute(
+            "SELECT value FROM meta WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, name: str, value: str) -> None:
+        """Set a value of the meta table, caller should hold the lock.
+
+        :param name: name of the value
+        :type name: str
+        :param value: the value
+        :type value: str
+        """
+        self._connection.execute(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value)
+        )
+
+
+def get_object_index(
+    client, bucket: str, no_progress: bool = False
+) -> Optional[ObjectIndex]:
+    """Get the index of the bucket if the index is enabled.
+
+    The bucket is listed into the index on first use in the process when
+    the index was never built, expired (services.s3.index_ttl) or
+    refresh is forced through set_index_refresh. A bucket with an inventory
+    report is read from the report instead, once per report.
+
+    The bucket is listed outside of the global lock, only the callers of
+    the same bucket wait for it.
+
+    :param client: boto3.client("s3") to list the bucket
+    :type client: boto3.client
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param no_progress: don't display the spinner while listing
+    :type no_progress: bool, optional
+    :return: the index, None if the index is disabled
+    :rtype: Optional[ObjectIndex]
+    """
+    if not bucket or not (_force_refresh or os.getenv("FZFAWS_S3_INDEX")):
+        return None
+    with _indexes_lock:
+        if bucket not in _indexes:
+            _indexes[bucket] = ObjectIndex(bucket)
+            _refresh_locks[bucket] = threading.Lock()
+        index = _indexes[bucket]
+        refresh_lock = _refresh_locks[bucket]
+    with refresh_lock:
+        if bucket in _checked:
+            return index
+        inventory = get_inventory(client, bucket)
+        if inventory:
+            source = "%s@%s" % (
+                inventory.manifest.path,
+                inventory.manifest.creation_timestamp,
+            )
+            stale = index.get_source() != source
+        else:
+            source = ""
+            ttl = int(os.getenv("FZFAWS_S3_INDEX_TTL", "") or 0)
+            stale = index.get_source() != source or index.is_stale(ttl)
+        if _force_refresh or stale:
+            with Spinner.spin(
+                message="Indexing s3://%s ..." % bucket, no_progress=no_progress
+            ):
+                index.refresh(
+                    client,
+                    objects=inventory.list_objects() if inventory else None,
+                    source=source,
+                )
+        _checked.add(bucket)
+    return index
+
+
+def get_listing_source(
+    client, bucket: str, no_progress: bool = False
+) -> Optional[Union[ObjectIndex, S3Inventory]]:
+    """Get the source to list the bucket from instead of LIST requests.
+
+    Both sources provide list_objects and list_prefix, the object index is
+    used when enabled, otherwise the inventory report of the bucket.
+
+    :param client: boto3.client("s3")
+    :type client: boto3.client
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param no_progress: don't display the spinner while indexing
+    :type no_progress: bool, optional
+    :return: the source, None to list the bucket
+    :rtype: Optional[Union[ObjectIndex, S3Inventory]]
+    """
+    return get_object_index(client, bucket, no_progress) or get_inventory(
+        client, bucket
+    )
+
+
+def set_index_refresh(refresh: bool = True) -> None:
+    """Re-list the buckets into the index on first use in this process.
+
+    Also enables the index for this process and the picker reload commands
+    started by it, they read the refreshed index without listing again.
+
+    :param refresh: force the refresh
+    :type refresh: bool, optional
+    """
+    global _force_refresh
+    _force_refresh = refresh
+    if refresh:
+        os.environ["FZFAWS_S3_INDEX"] = "1"
+
+
+def clear_object_indexes() -> None:
+    """Close the indexes opened in process.
+
+    Useful for unit testing only.
+    """
+    global _force_refresh
+    with _indexes_lock:
+        for index in _indexes.values():
+            index.close()
+        _indexes.clear()
+        _refresh_locks.clear()
+        _checked.clear()
+        _force_refresh = False
+
+
+def _get_index_path(bucket: str) -> str:
+    """Get the path of the index database of the bucket.
+
+    :param bucket: name of the bucket
+    :type bucket: str
+    :return: path to the database
+    :rtype: str
+    """
+    home = os.path.expanduser("~")
+    base_directory = os.getenv("XDG_CACHE_HOME", "%s/.cache" % home)
+    return "%s/fzfaws/s3index/%s.sqlite" % (base_directory, bucket)
+
+
+def _get_upper_bound(prefix: str) -> Optional[str]:
+    """Get the smallest key greater than all keys starting with the prefix.
+
+    :param prefix: the prefix
+    :type prefix: str
+    :return: the upper bound, None if unbounded
+    :rtype: Optional[str]
+    """
+    for i in range(len(prefix) - 1, -1, -1):
+        if ord(prefix[i]) < 0x10FFFF:
+            return prefix[:i] + chr(ord(prefix[i]) + 1)
+    return None
+
+
+def _get_prefix_clause(prefix: str) -> Tuple[str, Tuple[str, ...]]:
+    """Get the where clause of the keys under the prefix.
+
+    :param prefix: the prefix
+    :type prefix: str
+    :return: the where clause and its parameters
+    :rtype: Tuple[str, Tuple[str, ...]]
+    """
+    upper = _get_upper_bound(prefix)
+    if upper is None:
+        return "key >= ?", (prefix,)
+    return "key >= ? AND key < ?", (prefix, upper)
+
+
+def _to_sqlite_glob(pattern: str) -> str:
+    """Convert the fnmatch pattern to SQLite GLOB.
+
+    :param pattern: fnmatch pattern
+    :type pattern: str
+    :return: GLOB pattern, "[!seq]" is written as "[^seq]"
+    :rtype: str
+    """
+    return pattern.replace("[!", "[^")
+
+
+def _to_row(s3_object: Dict[str, Any], generation: int) -> Tuple[Any, ...]:
+    """Convert the listed object to a row of the objects table.
+
+    :param s3_object: object in the list_objects_v2 Contents form
+    :type s3_object: Dict[str, Any]
+    :param generation: generation of the refresh
+    :type generation: int
+    :return: row of the objects table
+    :rtype: Tuple[Any, ...]
+    """
+    last_modified = s3_object.get("LastModified")
+    return (
+        s3_object["Key"],
+        s3_object.get("Size", 0),
+        last_modified.timestamp() if last_modified else None,
+        s3_object.get("ETag"),
+        s3_object.get("StorageClass"),
+        generation,
+    )
+
+
+def _to_object(row: Tuple[Any, ...]) -> Dict[str, Any]:
+    """Convert a row of the objects table to the list_objects_v2 Contents form.
+
+    :param row: key, size, last_modified, etag, storage_class
+    :type row: Tuple[Any, ...]
+    :return: the object
+    :rtype: Dict[str, Any]
+    """
+    key, size, last_modified, etag, storage_class = row
+    s3_object: Dict[str, Any] = {"Key": key, "Size": size}
+    if last_modified is not None:
+        s3_object["LastModified"] = datetime.fromtimestamp(last_modified, timezone.utc)
+    if etag is not None:
+        s3_object["ETag"] = etag
+    if storage_class is not None:
+        s3_object["StorageClass"] = storage_class
+    return s3_object
@@ -0,0 +1,155 @@
+"""Module contains the reload commands of the prefix scoped object picker.
+
+The object picker only lists a single level of the bucket, fzf reload
+bindings run main() of this module in a shell to list another level server
+side and print the fzf entries.
+"""
+import argparse
+import re
+import shlex
+import sys
+from typing import List, Optional, Tuple
+
+# fzf keys of the reload bindings
+OPEN_KEY = "alt-l"
+PARENT_KEY = "alt-h"
+PREFIX_KEY = "alt-p"
+
+PICKER_HEADER = "%s: open folder, %s: parent folder, %s: list query as prefix" % (
+    OPEN_KEY,
+    PARENT_KEY,
+    PREFIX_KEY,
+)
+
+_main_command = "from fzfaws.s3.helper.prefix_picker import main; main()"
+_ansi_pattern = re.compile(r"\x1b\[[0-9;]*m")
+
+
+def get_entry_path(line: str) -> str:
+    """Get the key or prefix of the fzf entry.
+
+    The second field is returned, same as the selection of execute_fzf
+    with delimiter ": ", version entries are followed by the version counts.
+
+    :param line: fzf entry in the form of "Key: path" or "Prefix: path/"
+    :type line: str
+    :return: the key or prefix, empty string if the entry is empty
+    :rtype: str
+    """
+    fields = _ansi_pattern.sub("", line.rstrip("\n")).split(": ")
+    return fields[1] if len(fields) > 1 else ""
+
+
+def get_parent_prefix(path: str) -> str:
+    """Get the prefix the path is listed under.
+
+    :param path: key or prefix, e.g. "logs/2020/" or "logs/app.log"
+    :type path: str
+    :return: the parent prefix, e.g. "logs/", empty string for top level path
+    :rtype: str
+    """
+    parent, separator, _ = path.rstrip("/").rpartition("/")
+    return parent + separator
+
+
+def get_open_prefix(line: str) -> str:
+    """Get the prefix to list when opening the fzf entry.
+
+    Opening a folder lists the folder, opening an object stays
+    in the folder of the object.
+
+    :param line: the selected fzf entry
+    :type line: str
+    :return: prefix to list
+    :rtype: str
+    """
+    path = get_entry_path(line)
+    if path.endswith("/"):
+        return path
+    return get_parent_prefix(path)
+
+
+def get_up_prefix(line: str) -> str:
+    """Get the parent prefix of the folder the fzf entry is listed in.
+
+    :param line: the selected fzf entry
+    :type line: str
+    :return: prefix to list
+    :rtype: str
+    """
+    return get_parent_prefix(get_parent_prefix(get_entry_path(line)))
+
+
+def get_reload_binds(
+    bucket: str,
+    profile: Optional[str] = None,
+    region: Optional[str] = None,
+    version: bool = False,
+    deletemark: bool = False,
+) -> List[Tuple[str, str]]:
+    """Get the fzf reload bindings of the object picker.
+
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param profile: profile to list the bucket
+    :type profile: str, optional
+    :param region: region to list the bucket
+    :type region: str, optional
+    :param version: list object versions
+    :type version: bool, optional
+    :param deletemark: only list objects with delete marker
+    :type deletemark: bool, optional
+    :return: list of (key, command) to pass to Pyfzf.bind_reload
+    :rtype: List[Tuple[str, str]]
+    """
+    # run through -c, running the module with -m would import it twice
+    args = [sys.executable, "-c", _main_command, "--bucket", bucket]
+    if profile:
+        args.extend(["--profile", profile])
+    if region:
+        args.extend(["--region", region])
+    if version:
+        args.append("--version")
+    if deletemark:
+        args.append("--deletemark")
+    command = " ".join(shlex.quote(arg) for arg in args)
+    return [
+        (OPEN_KEY, "%s --open {}" % command),
+        (PARENT_KEY, "%s --parent {}" % command),
+        (PREFIX_KEY, "%s --prefix {q}" % command),
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Print the fzf entries of the requested prefix.
+
+    :param argv: command line arguments, default to sys.argv
+    :type argv: List[str], optional
+    """
+    parser = argparse.ArgumentParser(prog="fzfaws.s3.helper.prefix_picker")
+    parser.add_argument("--bucket", required=True)
+    parser.add_argument("--profile")
+    parser.add_argument("--region")
+    parser.add_argument("--version", action="store_true", default=False)
+    parser.add_argument("--deletemark", action="store_true", default=False)
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--open", metavar="ENTRY")
+    group.add_argument("--parent", metavar="ENTRY")
+    group.add_argument("--prefix", metavar="QUERY")
+    args = parser.parse_args(argv)
+
+    if args.open is not None:
+        prefix = get_open_prefix(args.open)
+    elif args.parent is not None:
+        prefix = get_up_prefix(args.parent)
+    else:
+        prefix = args.prefix
+
+    # imported here, S3 imports this module for the reload bindings
+    from fzfaws.s3.s3 import S3
+
+    s3 = S3(profile=args.profile, region=args.region)
+    s3.bucket_name = args.bucket
+    for entry in s3.get_prefix_entries(prefix, args.version, args.deletemark):
+        sys.stdout.write(entry)
+    sys.stdout.flush()
@@ -0,0 +1,249 @@
+"""Module contains the in memory prefix listing cache of s3 path navigation."""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class PrefixListing(NamedTuple):
+    """A single level listing under a prefix.
+
+    :param prefixes: child prefixes, e.g. "logs/2020/"
+    :type prefixes: List[str]
+    :param keys: keys of the objects directly under the prefix
+    :type keys: List[str]
+    """
+
+    prefixes: List[str]
+    keys: List[str]
+
+
+class _PrefixNode:
+    """A node of the trie, one node per folder level."""
+
+    def __init__(self) -> None:
+        """Construct the node instance."""
+        self.children: Dict[str, "_PrefixNode"] = {}
+        self.future: Optional[Future] = None
+
+
+class PrefixTrie:
+    """Cache the delimited listings of the visited prefixes.
+
+    Listings are stored in a trie keyed by the folder names, so navigating
+    back to a parent prefix doesn't list the parent again. Child prefixes
+    could be prefetched on a thread pool while the current level is displayed,
+    opening a prefetched child returns straight away.
+
+    Example:
+        with PrefixTrie(s3.client, s3.bucket_name) as trie:
+            listing = trie.get("logs/")
+            trie.prefetch(listing.prefixes)
+
+    :param client: boto3.client("s3")
+    :type client: boto3.client
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param max_workers: max number of prefixes to prefetch concurrently
+    :type max_workers: int, optional
+    :param max_prefetch: max number of child prefixes to prefetch per level
+    :type max_prefetch: int, optional
+    :param index: object index or inventory to read the listings from instead
+        of the bucket, refer to get_listing_source
+    :type index: Union[ObjectIndex, S3Inventory], optional
+    """
+
+    def __init__(
+        self,
+        client,
+        bucket: str,
+        max_workers: int = 4,
+        max_prefetch: int = 20,
+        index=None,
+    ) -> None:
+        """Construct the trie instance."""
+        self.client = client
+        self.bucket: str = bucket
+        self.index = index
+        self.max_prefetch: int = max_prefetch
+        self._root = _PrefixNode()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def __enter__(self) -> "PrefixTrie":
+        """Return the trie."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Stop the prefetch."""
+        self.close()
+
+    def __contains__(self, prefix: str) -> bool:
+        """Check if the listing of the prefix is completed.
+
+        :param prefix: prefix to check
+        :type prefix: str
+        :return: True if the listing could be returned without waiting
+        :rtype: bool
+        """
+        with self._lock:
+            node = self._get_node(prefix)
+        return (
+            node.future is not None
+            and node.future.done()
+            and not node.future.cancelled()
+            and node.future.exception() is None
+        )
+
+    def close(self) -> None:
+        """Cancel the pending prefetch and stop the workers.
+
+        Running prefetch stop before the next page.
+        """
+        self._closed.set()
+        with self._lock:
+            nodes = [self._root]
+            while nodes:
+                node = nodes.pop()
+                if node.future:
+                    node.future.cancel()
+                nodes.extend(node.children.values())
+        self._executor.shutdown(wait=False)
+
+    def get(self, prefix: str) -> PrefixListing:
+        """Get the listing of the prefix.
+
+        The listing is fetched in the current thread if it's not cached
+        or prefetched, a failed listing is fetched again on next get.
+
+        :param prefix: prefix to list
+        :type prefix: str
+        :return: the listing of the prefix
+        :rtype: PrefixListing
+        """
+        with self._lock:
+            node = self._get_node(prefix)
+            future = node.future
+            # a failed prefetch is fetched again
+            if _needs_listing(future):
+                future = Future()
+                future.set_running_or_notify_cancel()
+                node.future = future
+                fetch = True
+            else:
+                fetch = False
+
+        if fetch:
+            try:
+                future.set_result(self._list_prefix(prefix))
+            except Exception as e:
+                future.set_exception(e)
+        try:
+            return future.result()
+        except Exception:
+            with self._lock:
+                if node.future is future:
+                    node.future = None
+            raise
+
+    def prefetch(
+        self,
+        prefixes: Iterable[str],
+        callback: Optional[Callable[[str, PrefixListing], None]] = None,
+    ) -> None:
+        """List the prefixes in background.
+
+        Only the first max_prefetch prefixes that are not cached are listed.
+
+        :param prefixes: prefixes to list
+        :type prefixes: Iterable[str]
+        :param callback: called with the prefix and its listing once listed,
+            called straight away for cached prefixes
+        :type callback: Callable[[str, PrefixListing], None], optional
+        """
+        futures: List[Tuple[str, Future]] = []
+        submitted = 0
+        with self._lock:
+            for prefix in prefixes:
+                node = self._get_node(prefix)
+                if _needs_listing(node.future):
+                    if submitted >= self.max_prefetch:
+                        continue
+                    node.future = self._executor.submit(self._list_prefix, prefix)
+                    submitted += 1
+                futures.append((prefix, node.future))
+        if callback:
+            for prefix, future in futures:
+                future.add_done_callback(partial(_call_back, callback, prefix))
+
+    def _get_node(self, prefix: str) -> _PrefixNode:
+        """Get the node of the prefix, create the missing nodes.
+
+        :param prefix: prefix of the node
+        :type prefix: str
+        :return: the node of the prefix
+        :rtype: _PrefixNode
+        """
+        node = self._root
+        # "logs/2020/app" -> "logs/", "2020/", "app"
+        for name in prefix.split("/")[:-1]:
+            node = node.children.setdefault("%s/" % name, _PrefixNode())
+        name = prefix.rpartition("/")[2]
+        if name:
+            node = node.children.setdefault(name, _PrefixNode())
+        return node
+
+    def _list_prefix(self, prefix: str) -> PrefixListing:
+        """List a single level under the prefix.
+
+        :param prefix: prefix to list
+        :type prefix: str
+        :return: the listing of the prefix
+        :rtype: PrefixListing
+        """
+        if self.index:
+            return self.index.list_prefix(prefix)
+        listing = PrefixListing([], [])
+        paginator = self.client.get_paginator("list_objects")
+        for result in paginator.paginate(
+            Bucket=self.bucket, Prefix=prefix, Delimiter="/"
+        ):
+            if self._closed.is_set():
+                break
+            for common_prefix in result.get("CommonPrefixes", []):
+                listing.prefixes.append(common_prefix.get("Prefix"))
+            for content in result.get("Contents", []):
+                listing.keys.append(content.get("Key"))
+        return listing
+
+
+def _needs_listing(future: Optional[Future]) -> bool:
+    """Check if the prefix needs to be listed again.
+
+    :param future: future of the listing
+    :type future: Future, optional
+    :return: True if not listed, cancelled or failed
+    :rtype: bool
+    """
+    return (
+        future is None
+        or future.cancelled()
+        or (future.done() and future.exception() is not None)
+    )
+
+
+def _call_back(
+    callback: Callable[[str, PrefixListing], None], prefix: str, future: Future
+) -> None:
+    """Pass the listing to the prefetch callback if listed successfully.
+
+    :param callback: the prefetch callback
+    :type callback: Callable[[str, PrefixListing], None]
+    :param prefix: prefix of the listing
+    :type prefix: str
+    :param future: future of the listing
+    :type future: Future
+    """
+    if not future.cancelled() and future.exception() is None:
+        callback(prefix, future.result())
@@ -0,0 +1,412 @@
+"""Module contains the S3 Inventory report reader.
+
+An inventory report lists every object of the source bucket, reading the
+report instead of listing the bucket doesn't send any LIST request.
+Manifests are set through services.s3.inventory in the config file or
+the --inventory flag, local paths and s3://bucket/key paths are accepted.
+"""
+import csv
+import gzip
+import io
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Generator, List, NamedTuple, Optional
+from urllib.parse import unquote_plus
+
+from fzfaws.s3.helper.exclude_file import GlobFilter
+from fzfaws.s3.helper.prefix_trie import PrefixListing
+from fzfaws.utils.exceptions import InvalidFileType
+
+_inventories_lock = threading.Lock()
+_manifests: Dict[str, "InventoryManifest"] = {}
+
+
+class InventoryManifest(NamedTuple):
+    """The manifest.json of an inventory report.
+
+    :param path: local path or s3://bucket/key of the manifest
+    :type path: str
+    :param source_bucket: bucket the report lists
+    :type source_bucket: str
+    :param destination_bucket: bucket the report is stored in
+    :type destination_bucket: str
+    :param file_format: CSV, ORC or PARQUET
+    :type file_format: str
+    :param file_schema: normalised column names of the CSV files
+    :type file_schema: List[str]
+    :param files: keys of the report files in the destination bucket
+    :type files: List[str]
+    :param creation_timestamp: creation time of the report in milliseconds
+    :type creation_timestamp: str
+    """
+
+    path: str
+    source_bucket: str
+    destination_bucket: str
+    file_format: str
+    file_schema: List[str]
+    files: List[str]
+    creation_timestamp: str
+
+
+class S3Inventory:
+    """Read the objects of a bucket from its inventory report.
+
+    Report files are streamed one at a time, objects are filtered by prefix
+    and glob while reading. CSV reports are read with the standard library,
+    ORC and Parquet reports require pyarrow.
+
+    Files of a local manifest are read from the manifest directory or the
+    data directory next to it, the layout of a downloaded report.
+
+    Example:
+        inventory = S3Inventory(s3.client, read_inventory_manifest(s3.client, path))
+        for s3_object in inventory.list_objects("logs/", exclude=["*.tmp"]):
+            print(s3_object["Key"])
+
+    :param client: boto3.client("s3") to read a report stored in s3
+    :type client: boto3.client
+    :param manifest: manifest of the report
+    :type manifest: InventoryManifest
+    """
+
+    def __init__(self, client, manifest: InventoryManifest) -> None:
+        """Construct the inventory instance."""
+        self.client = client
+        self.manifest: InventoryManifest = manifest
+
+    def get_created_at(self) -> str:
+        """Get the creation time of the report to display.
+
+        :return: creation time in UTC, empty if unknown
+        :rtype: str
+        """
+        if not self.manifest.creation_timestamp:
+            return ""
+        return datetime.fromtimestamp(
+            int(self.manifest.creation_timestamp) / 1000, timezone.utc
+        ).strftime("%Y-%m-%d %H:%M:%S UTC")
+
+    def list_objects(
+        self,
+        prefix: str = "",
+        exclude: Optional[List[str]] = None,
+        include: Optional[List[str]] = None,
+    ) -> Generator[Dict[str, Any], None, None]:
+        """List the current objects under the prefix in report order.
+
+        :param prefix: only list objects under this prefix
+        :type prefix: str, optional
+        :param exclude: glob patterns to exclude, matched against the key
+        :type exclude: List[str], optional
+        :param include: glob patterns to include
+        :type include: List[str], optional
+        :return: objects in the list_objects_v2 Contents form in generator form
+        :rtype: Generator[Dict[str, Any], None, None]
+        """
+        glob_filter = GlobFilter(exclude, include)
+        for file_key in self.manifest.files:
+            for s3_object in self._read_file(file_key):
+                if not s3_object["Key"].startswith(prefix):
+                    continue
+                if glob_filter.exclude(s3_object["Key"]):
+                    continue
+                yield s3_object
+
+    def list_prefix(self, prefix: str = "") -> PrefixListing:
+        """List a single level under the prefix, same as a Delimiter="/" listing.
+
+        The whole report is read for each level, enable the object index
+        to read the report once.
+
+        :param prefix: prefix to list
+        :type prefix: str, optional
+        :return: child prefixes and keys directly under the prefix
+        :rtype: PrefixListing
+        """
+        prefixes = set()
+        keys = []
+        for s3_object in self.list_objects(prefix):
+            name, separator, _ = s3_object["Key"][len(prefix) :].partition("/")
+            if separator:
+                prefixes.add("%s%s/" % (prefix, name))
+            else:
+                keys.append(s3_object["Key"])
+        return PrefixListing(sorted(prefixes), sorted(keys))
+
+    def _read_file(self, file_key: str) -> Generator[Dict[str, Any], None, None]:
+        """Read the current objects of a report file.
+
+        :param file_key: key of the report file in the destination bucket
+        :type file_key: str
+        :raises InvalidFileType: when the file format couldn't be read
+        :return: objects in the list_objects_v2 Contents form in generator form
+        :rtype: Generator[Dict[str, Any], None, None]
+        """
+        file_format = self.manifest.file_format
+        if file_format == "CSV":
+            with self._open_file(file_key) as file:
+                text = io.TextIOWrapper(
+                    gzip.GzipFile(fileobj=file), encoding="utf-8", newline=""
+                )
+                for row in csv.reader(text):
+                    record = dict(zip(self.manifest.file_schema, row))
+                    s3_object = _to_object(record, csv_record=True)
+                    if s3_object:
+                        yield s3_object
+        elif file_format in ("ORC", "PARQUET"):
+            with self._open_file(file_key) as file:
+                # pyarrow needs a seekable file, the report file is read in memory
+                source = file if hasattr(file, "seek") else io.BytesIO(file.read())
+                for record in _read_columnar_records(source, file_format):
+                    s3_object = _to_object(record)
+                    if s3_object:
+                        yield s3_object
+        else:
+            raise InvalidFileType(
+                "Inventory report format %s is not supported" % file_format
+            )
+
+    def _open_file(self, file_key: str):
+        """Open a report file in binary mode.
+
+        :param file_key: key of the report file in the destination bucket
+        :type file_key: str
+        :raises FileNotFoundError: when the file of a local manifest is not found
+        :return: the file object
+        :rtype: BinaryIO
+        """
+        if self.manifest.path.startswith("s3://"):
+            response = self.client.get_object(
+                Bucket=self.manifest.destination_bucket, Key=file_key
+            )
+            return _ClosingBody(response["Body"])
+        manifest_directory = os.path.dirname(os.path.abspath(self.manifest.path))
+        file_name = os.path.basename(file_key)
+        for file_path in (
+            os.path.join(manifest_directory, file_name),
+            os.path.join(os.path.dirname(manifest_directory), "data", file_name),
+        ):
+            if os.path.isfile(file_path):
+                return open(file_path, "rb")
+        raise FileNotFoundError(
+            "Inventory report file %s not found next to %s"
+            % (file_name, self.manifest.path)
+        )
+
+
+class _ClosingBody:
+    """Context manager around the botocore StreamingBody."""
+
+    def __init__(self, body) -> None:
+        """Construct the body wrapper."""
+        self.body = body
+
+    def __enter__(self):
+        """Return the body."""
+        return self.body
+
+    def __exit__(self, *args) -> None:
+        """Close the body."""
+        self.body.close()
+
+
+def read_inventory_manifest(client, path: str) -> InventoryManifest:
+    """Read the manifest.json of an inventory report.
+
+    :param client: boto3.client("s3") to read a manifest stored in s3
+    :type client: boto3.client
+    :param path: local path or s3://bucket/key of the manifest
+    :type path: str
+    :return: the manifest
+    :rtype: InventoryManifest
+    """
+    if path.startswith("s3://"):
+        bucket, _, key = path[len("s3://") :].partition("/")
+        body = json.load(client.get_object(Bucket=bucket, Key=key)["Body"])
+    else:
+        path = os.path.expanduser(path)
+        with open(path, "r") as file:
+            body = json.load(file)
+    return InventoryManifest(
+        path=path,
+        source_bucket=body.get("sourceBucket", ""),
+        # arn:aws:s3:::bucket
+        destination_bucket=body.get("destinationBucket", "").rpartition(":")[2],
+        file_format=body.get("fileFormat", "CSV").upper(),
+        file_schema=[
+            _normalise_column(column)
+            for column in body.get("fileSchema", "").split(",")
+        ],
+        files=[file["key"] for file in body.get("files", [])],
+        creation_timestamp=str(body.get("creationTimestamp", "")),
+    )
+
+
+def get_inventory(client, bucket: str) -> Optional[S3Inventory]:
+    """Get the inventory report of the bucket from the configured manifests.
+
+    The latest report is used when more than one manifest lists the bucket.
+
+    :param client: boto3.client("s3") to read the report
+    :type client: boto3.client
+    :param bucket: name of the bucket
+    :type bucket: str
+    :return: the inventory, None if no manifest lists the bucket
+    :rtype: Optional[S3Inventory]
+    """
+    if not bucket:
+        return None
+    manifest_paths = json.loads(os.getenv("FZFAWS_S3_INVENTORY", "") or "[]")
+    latest: Optional[InventoryManifest] = None
+    with _inventories_lock:
+        for path in manifest_paths:
+            if path not in _manifests:
+                _manifests[path] = read_inventory_manifest(client, path)
+            manifest = _manifests[path]
+            if manifest.source_bucket != bucket:
+                continue
+            if latest is None or int(manifest.creation_timestamp or 0) > int(
+                latest.creation_timestamp or 0
+            ):
+                latest = manifest
+    return S3Inventory(client, latest) if latest else None
+
+
+def add_inventory_manifest(path: str) -> None:
+    """Add a manifest to the configured manifests of this process.
+
+    The manifest is also used by the picker reload commands started by it.
+
+    :param path: local path or s3://bucket/key of the manifest
+    :type path: str
+    """
+    manifest_paths = json.loads(os.getenv("FZFAWS_S3_INVENTORY", "") or "[]")
+    if path not in manifest_paths:
+        manifest_paths.append(path)
+    os.environ["FZFAWS_S3_INVENTORY"] = json.dumps(manifest_paths)
+
+
+def clear_inventory_manifests() -> None:
+    """Remove the manifests read in process.
+
+    Useful for unit testing only.
+    """
+    with _inventories_lock:
+        _manifests.clear()
+
+
+def _normalise_column(column: str) -> str:
+    """Normalise the column name of the CSV schema and the ORC/Parquet fields.
+
+    :param column: column name, e.g. "LastModifiedDate" or "last_modified_date"
+    :type column: str
+    :return: normalised name, e.g. "lastmodifieddate"
+    :rtype: str
+    """
+    return column.strip().replace("_", "").lower()
+
+
+def _read_columnar_records(
+    source, file_format: str
+) -> Generator[Dict[str, Any], None, None]:
+    """Read the records of an ORC or Parquet report file through pyarrow.
+
+    :param source: seekable file object of the report file
+    :type source: BinaryIO
+    :param file_format: ORC or PARQUET
+    :type file_format: str
+    :raises InvalidFileType: when pyarrow is not installed
+    :return: records keyed by the normalised column name in generator form
+    :rtype: Generator[Dict[str, Any], None, None]
+    """
+    try:
+        if file_format == "PARQUET":
+            import pyarrow.parquet
+
+            parquet_file = pyarrow.parquet.ParquetFile(source)
+            batches = (
+                parquet_file.read_row_group(i)
+                for i in range(parquet_file.num_row_groups)
+            )
+        else:
+            import pyarrow.orc
+
+            orc_file = pyarrow.orc.ORCFile(source)
+            batches = (orc_file.read_stripe(i) for i in range(orc_file.nstripes))
+    except ImportError:
+        raise InvalidFileType(
+            "pyarrow is required to read %s inventory reports" % file_format
+        )
+    for batch in batches:
+        columns = batch.to_pydict()
+        names = [_normalise_column(name) for name in columns]
+        for values in zip(*columns.values()):
+            yield dict(zip(names, values))
+
+
+def _to_object(
+    record: Dict[str, Any], csv_record: bool = False
+) -> Optional[Dict[str, Any]]:
+    """Convert a report record to the list_objects_v2 Contents form.
+
+    :param record: record keyed by the normalised column name
+    :type record: Dict[str, Any]
+    :param csv_record: record of a CSV report, the key is url encoded and
+        the other columns are strings
+    :type csv_record: bool, optional
+    :return: the object, None for a non-current version or delete marker
+    :rtype: Optional[Dict[str, Any]]
+    """
+    if _is_false(record.get("islatest", True)) or not _is_false(
+        record.get("isdeletemarker", False)
+    ):
+        return None
+    key, size, last_modified = (
+        record.get("key", ""),
+        record.get("size"),
+        record.get("lastmodifieddate"),
+    )
+    if csv_record:
+        key = unquote_plus(key)
+        size = int(size) if size else 0
+        last_modified = _parse_date(last_modified) if last_modified else None
+    s3_object: Dict[str, Any] = {"Key": key, "Size": size or 0}
+    if last_modified:
+        s3_object["LastModified"] = last_modified
+    if record.get("etag"):
+        s3_object["ETag"] = '"%s"' % record["etag"].strip('"')
+    if record.get("storageclass"):
+        s3_object["StorageClass"] = record["storageclass"]
+    return s3_object
+
+
+def _is_false(value: Any) -> bool:
+    """Check if the boolean column is false, CSV booleans are strings.
+
+    :param value: value of the column
+    :type value: Any
+    :return: True if the value is false
+    :rtype: bool
+    """
+    if isinstance(value, str):
+        return value.lower() != "true"
+    return not value
+
+
+def _parse_date(value: str) -> datetime:
+    """Parse the LastModifiedDate of a CSV report.
+
+    :param value: date in the form of 2020-06-01T12:00:00.000Z
+    :type value: str
+    :return: timezone aware datetime
+    :rtype: datetime
+    """
+    for date_format in ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ"):
+        try:
+            return datetime.strptime(value, date_format).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    raise ValueError("Invalid inventory date %s" % value)
@@ -2,6 +2,7 @@
 import os
 import sys
 import threading
+import time
 from typing import Optional
 
 
@@ -30,6 +31,8 @@ class S3Progress(object):
     :type client: boto3.client
     :param version_id: specify version id if download/copy is a version
     :type version_id: str
+    :param size: size of the file if already known, e.g. from the listing
+    :type size: float, optional
     """
 
     def __init__(
@@ -38,13 +41,16 @@ class S3Progress(object):
         bucket: str = None,
         client=None,
         version_id: str = None,
+        size: Optional[float] = None,
     ) -> None:
         """Construct the progress bar instance."""
         self._filename: str = filename
         self._seen_so_far: float = 0
         self._lock = threading.Lock()
         self._size: float = 0
-        if bucket and client:
+        if size is not None:
+            self._size = size
+        elif bucket and client:
             if not version_id:
                 self._size = client.head_object(Bucket=bucket, Key=filename).get(
                     "ContentLength"
@@ -87,16 +93,194 @@ class S3Progress(object):
 
         Convert an size in bytes into a human readable format.
         """
-        HUMANIZE_SUFFIXES = ("KiB", "MiB", "GiB", "TiB", "PiB", "EiB")
-        base = 1024
-        bytes_int = float(value)
-
-        if bytes_int == 1:
-            return "1 Byte"
-        elif bytes_int < base:
-            return "%d Bytes" % bytes_int
-
-        for i, suffix in enumerate(HUMANIZE_SUFFIXES):
-            unit = base ** (i + 2)
-            if round((bytes_int / unit) * base) < base:
-                return "%.1f %s" % ((base * bytes_int / unit), suffix)
+        return human_readable_size(value)
+
+
+class BatchProgress:
+    """The aggregated progress bar of concurrent transfers.
+
+    Display the total bytes, files done/total, throughput and ETA of all
+    transfers in a single line. Transfer threads only update the counters,
+    the line is redrawn by a separate thread at most frame_rate times per
+    second, so rendering never blocks the transfers.
+
+    Sizes are expected to come from the listing results, files with unknown
+    size could be counted first and add their size once known.
+
+    Example:
+        with BatchProgress(total_files=2, total_bytes=2048) as progress:
+            progress.update(1024)
+            progress.file_done()
+            progress.write("download: s3://bucket/key to /tmp/key")
+
+    :param total_files: number of files to transfer
+    :type total_files: int, optional
+    :param total_bytes: total size of the files in bytes
+    :type total_bytes: int, optional
+    :param frame_rate: max number of redraws per second
+    :type frame_rate: int, optional
+    """
+
+    def __init__(
+        self, total_files: int = 0, total_bytes: int = 0, frame_rate: int = 10
+    ) -> None:
+        """Construct the progress bar instance."""
+        self.total_files: int = total_files
+        self.total_bytes: int = total_bytes
+        self.done_files: int = 0
+        self.seen_bytes: int = 0
+        self._interval: float = 1 / frame_rate
+        self._start_time: float = time.monotonic()
+        self._lock = threading.Lock()
+        self._output_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "BatchProgress":
+        """Start rendering in the background."""
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Stop rendering and draw the final line."""
+        self.stop()
+
+    def add_file(self, size: Optional[int] = None) -> None:
+        """Count a new file into the totals.
+
+        :param size: size of the file, None if not known yet
+        :type size: int, optional
+        """
+        with self._lock:
+            self.total_files += 1
+            self.total_bytes += size or 0
+
+    def add_bytes(self, size: int) -> None:
+        """Add the size of a file which was counted without size.
+
+        :param size: size of the file
+        :type size: int
+        """
+        with self._lock:
+            self.total_bytes += size
+
+    def update(self, bytes_amount: int) -> None:
+        """Record transferred bytes, called from the transfer threads.
+
+        :param bytes_amount: number of bytes transferred since last update
+        :type bytes_amount: int
+        """
+        with self._lock:
+            self.seen_bytes += bytes_amount
+
+    def file_done(self) -> None:
+        """Record a finished file."""
+        with self._lock:
+            self.done_files += 1
+
+    def write(self, message: str) -> None:
+        """Print a message above the progress line.
+
+        :param message: message to print
+        :type message: str
+        """
+        with self._output_lock:
+            sys.stdout.write("\033[2K\033[1G%s\n" % message)
+            sys.stdout.flush()
+
+    def start(self) -> None:
+        """Start the render thread."""
+        self._start_time = time.monotonic()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._render_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the render thread and print the final line."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.render()
+        with self._output_lock:
+            sys.stdout.write("\n")
+            sys.stdout.flush()
+
+    def render(self) -> None:
+        """Redraw the progress line."""
+        line = self.get_line()
+        with self._output_lock:
+            sys.stdout.write("\033[2K\033[1G%s" % line)
+            sys.stdout.flush()
+
+    def get_line(self) -> str:
+        """Format the progress line.
+
+        :return: e.g. 1.0 MiB / 2.0 MiB  1/2 files  1.0 MiB/s  ETA 00:01
+        :rtype: str
+        """
+        with self._lock:
+            seen_bytes = self.seen_bytes
+            total_bytes = max(self.total_bytes, seen_bytes)
+            done_files = self.done_files
+            total_files = self.total_files
+        elapsed = time.monotonic() - self._start_time
+        rate = seen_bytes / elapsed if elapsed > 0 else 0
+        if rate > 0:
+            eta = format_duration((total_bytes - seen_bytes) / rate)
+        else:
+            eta = "--:--"
+        return "%s / %s  %s/%s files  %s/s  ETA %s" % (
+            human_readable_size(seen_bytes),
+            human_readable_size(total_bytes),
+            done_files,
+            total_files,
+            human_readable_size(rate),
+            eta,
+        )
+
+    def _render_loop(self) -> None:
+        """Redraw at the frame rate until stopped."""
+        while not self._stop_event.wait(self._interval):
+            self.render()
+
+
+def human_readable_size(value: float) -> Optional[str]:
+    """Convert bytes to some human readable size.
+
+    Copied from awscli, try to provide the same experience.
+
+    :param value: size in bytes
+    :type value: float
+    :return: human readable size, e.g. 1.0 KiB
+    :rtype: Optional[str]
+    """
+    HUMANIZE_SUFFIXES = ("KiB", "MiB", "GiB", "TiB", "PiB", "EiB")
+    base = 1024
+    bytes_int = float(value)
+
+    if bytes_int == 1:
+        return "1 Byte"
+    elif bytes_int < base:
+        return "%d Bytes" % bytes_int
+
+    for i, suffix in enumerate(HUMANIZE_SUFFIXES):
+        unit = base ** (i + 2)
+        if round((bytes_int / unit) * base) < base:
+            return "%.1f %s" % ((base * bytes_int / unit), suffix)
+    return None
+
+
+def format_duration(seconds: float) -> str:
+    """Format seconds into mm:ss or hh:mm:ss.
+
+    :param seconds: duration in seconds
+    :type seconds: float
+    :return: formatted duration
+    :rtype: str
+    """
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return "%d:%02d:%02d" % (hours, minutes, seconds)
+    return "%02d:%02d" % (minutes, seconds)
@@ -0,0 +1,168 @@
+"""Module contains the concurrent local directory scanner."""
+import os
+import queue
+import threading
+from operator import itemgetter
+from typing import Generator, List, NamedTuple, Optional, Tuple
+
+from fzfaws.s3.helper.exclude_file import GlobFilter
+
+# max number of directory batches buffered before they are consumed
+MAX_BUFFERED_BATCHES = 64
+
+
+class LocalFile(NamedTuple):
+    """A file found by scan_local_tree.
+
+    :param path: path of the file, joined to the scanned root
+    :type path: str
+    :param relative_path: path relative to the scanned root, same as os.path.relpath
+    :type relative_path: str
+    :param size: size of the file in bytes
+    :type size: int
+    :param mtime: last modified time of the file
+    :type mtime: float
+    """
+
+    path: str
+    relative_path: str
+    size: int
+    mtime: float
+
+
+def scan_local_tree(
+    root: str,
+    exclude: Optional[List[str]] = None,
+    include: Optional[List[str]] = None,
+    max_workers: int = 8,
+) -> Generator[LocalFile, None, None]:
+    """Scan all files under the root concurrently and lazily.
+
+    Directories are read through os.scandir on a pool of threads, each
+    worker takes a directory and queues its sub directories for the other
+    workers. Files are filtered and stat'd a directory at a time and yielded
+    as soon as the directory is read, so the consumer could start working
+    while the scan is still running. Files are in order within a directory
+    but directories are interleaved.
+
+    Same as os.walk, symlinks to directories are not followed and
+    unreadable directories are skipped.
+
+    Example:
+        for local_file in scan_local_tree("/tmp", exclude=["*.log"]):
+            print(local_file.relative_path, local_file.size)
+
+    :param root: directory to scan
+    :type root: str
+    :param exclude: glob patterns to exclude, matched against the relative path
+    :type exclude: List[str], optional
+    :param include: glob patterns to include
+    :type include: List[str], optional
+    :param max_workers: max number of directories to read concurrently
+    :type max_workers: int, optional
+    :return: files under the root in generator form
+    :rtype: Generator[LocalFile, None, None]
+    """
+    glob_filter = GlobFilter(exclude, include)
+    # (directory path, relative path of the directory), None stops a worker
+    directories: "queue.Queue[Optional[Tuple[str, str]]]" = queue.Queue()
+    results: queue.Queue = queue.Queue(maxsize=MAX_BUFFERED_BATCHES)
+    stopped = threading.Event()
+    lock = threading.Lock()
+    pending = [1]
+
+    def put_result(item) -> None:
+        # the consumer may have stopped reading, don't block forever
+        while not stopped.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def scan() -> None:
+        while not stopped.is_set():
+            directory = directories.get()
+            if directory is None:
+                return
+            try:
+                files, subdirectories = _scan_directory(*directory, glob_filter)
+                with lock:
+                    pending[0] += len(subdirectories)
+                for subdirectory in subdirectories:
+                    directories.put(subdirectory)
+                if files:
+                    put_result(files)
+            except Exception as e:
+                put_result(e)
+            with lock:
+                pending[0] -= 1
+                finished = pending[0] == 0
+            if finished:
+                put_result(None)
+
+    directories.put((root, ""))
+    workers = [
+        threading.Thread(target=scan, daemon=True) for _ in range(max(max_workers, 1))
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        while True:
+            batch = results.get()
+            if batch is None:
+                return
+            if isinstance(batch, Exception):
+                raise batch
+            yield from batch
+    finally:
+        stopped.set()
+        for _ in workers:
+            directories.put(None)
+
+
+def _scan_directory(
+    directory: str, relative_directory: str, glob_filter: GlobFilter
+) -> Tuple[List[LocalFile], List[Tuple[str, str]]]:
+    """Read a single directory.
+
+    :param directory: path of the directory
+    :type directory: str
+    :param relative_directory: path of the directory relative to the scanned root
+    :type relative_directory: str
+    :param glob_filter: filter of the relative paths
+    :type glob_filter: GlobFilter
+    :return: files that are not excluded and the sub directories to scan
+    :rtype: Tuple[List[LocalFile], List[Tuple[str, str]]]
+    """
+    entries: List[Tuple[str, os.DirEntry]] = []
+    subdirectories: List[Tuple[str, str]] = []
+    try:
+        with os.scandir(directory) as iterator:
+            for entry in iterator:
+                relative_path = (
+                    os.path.join(relative_directory, entry.name)
+                    if relative_directory
+                    else entry.name
+                )
+                try:
+                    is_directory = entry.is_dir()
+                except OSError:
+                    is_directory = False
+                if not is_directory:
+                    entries.append((relative_path, entry))
+                elif not entry.is_symlink():
+                    subdirectories.append((entry.path, relative_path))
+    except OSError:
+        # same as os.walk, unreadable directories are skipped
+        return [], []
+
+    files: List[LocalFile] = []
+    for relative_path, entry in glob_filter.filter(entries, key=itemgetter(0)):
+        try:
+            stat = entry.stat()
+        except OSError:
+            # e.g. broken symlinks, removed while scanning
+            continue
+        files.append(LocalFile(entry.path, relative_path, stat.st_size, stat.st_mtime))
+    return files, subdirectories
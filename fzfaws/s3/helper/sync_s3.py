@@ -1,10 +1,18 @@
 """Module contains function to handle sync operation.
 
-Note: awscli is required for now.
+Sync is done in process, the destination is listed once and compared
+against the source by size and last modified time, optionally by ETag.
+Only changed files are transferred through the TransferScheduler.
 """
-import subprocess
-from typing import List, Optional
+import os
+import re
+from typing import Any, Dict, Generator, List, Optional, Tuple
 
+from fzfaws.s3.helper.etag import ETagHasher
+from fzfaws.s3.helper.exclude_file import GlobFilter
+from fzfaws.s3.helper.list_s3_objects import list_s3_objects
+from fzfaws.s3.helper.scan_local_tree import scan_local_tree
+from fzfaws.s3.helper.transfer_scheduler import TransferJob, TransferScheduler
 from fzfaws.utils import get_confirmation
 from fzfaws.utils.exceptions import InvalidS3PathPattern
 
@@ -14,16 +22,17 @@ def sync_s3(
     include: Optional[List[str]] = None,
     from_path: str = "",
     to_path: str = "",
+    client=None,
+    etag: bool = False,
 ) -> None:
-    """Sync from_path with to_path using awscli.
+    """Sync from_path with to_path.
 
-    Utilizing subprocess to call aws cli s3 sync, as boto3 doesn't provide
-    way to have sync operation.
+    Support local to s3, s3 to local and s3 to s3, similar to aws cli s3 sync.
+    A file is transferred when it doesn't exist in the destination, the size
+    is different or the source is newer than the destination. When etag is
+    set, the last modified time is ignored and the ETag is compared instead.
 
-    May try to implement the sync myself using S3 ETag calculation to compare
-    file, require more time and benchmark to see time difference.
-
-    For now, sync is the only process require aws cli to be installed.
+    The diff is computed once for the dryrun and reused after confirmation.
 
     :param exclude: list of files to exclude
     :type exclude: List[str], Optional
@@ -33,39 +42,370 @@ def sync_s3(
     :type from_path: str
     :param to_path: destination file location
     :type to_path: str
+    :param client: boto3.client("s3"), use the shared s3 client if not provided
+    :type client: boto3.client, optional
+    :param etag: compare files by ETag instead of last modified time
+    :type etag: bool, optional
     :raises InvalidS3PathPattern: when the from_path and to_path is empty
     """
     if not from_path or not to_path:
         raise InvalidS3PathPattern(
             "Invalid S3 path pattern for sync, example: s3://bucketname/path/"
         )
+    if client is None:
+        from fzfaws.utils.session import get_client
+
+        client = get_client("s3")
+
+    jobs = get_sync_jobs(client, from_path, to_path, exclude, include, etag)
+    for job in jobs:
+        print("(dryrun) %s" % job.message)
+    if not jobs:
+        print("%s is already in sync with %s" % (from_path, to_path))
+        return
 
-    if not exclude:
-        exclude = []
-    if not include:
-        include = []
-    # add in the exclude flag and include flag into the command list
-    exclude_list: List[str] = []
-    include_list: List[str] = []
-    for pattern in exclude:
-        if not exclude_list:
-            exclude_list.append("--exclude")
-        exclude_list.append(pattern)
-    for pattern in include:
-        if not include_list:
-            include_list.append("--include")
-        include_list.append(pattern)
-
-    cmd_list: List[str] = ["aws", "s3", "sync", from_path, to_path]
-    cmd_list.extend(exclude_list)
-    cmd_list.extend(include_list)
-    cmd_list.append("--dryrun")
-
-    sync_dry = subprocess.Popen(cmd_list)
-    sync_dry.communicate()
     if get_confirmation("Confirm?"):
-        # remove the dryrun flag and actually invoke it
-        cmd_list.pop()
-        sync = subprocess.Popen(cmd_list)
-        sync.communicate()
+        TransferScheduler(client).run(jobs)
         print("%s synced with %s" % (from_path, to_path))
+
+
+def get_sync_jobs(
+    client,
+    from_path: str,
+    to_path: str,
+    exclude: Optional[List[str]] = None,
+    include: Optional[List[str]] = None,
+    etag: bool = False,
+) -> List[TransferJob]:
+    """Compare from_path and to_path and get the transfer jobs of changed files.
+
+    :param client: boto3.client("s3")
+    :type client: boto3.client
+    :param from_path: local path or s3 path, e.g. s3://bucket/path/
+    :type from_path: str
+    :param to_path: local path or s3 path
+    :type to_path: str
+    :param exclude: glob patterns to exclude, matched against the relative path
+    :type exclude: List[str], optional
+    :param include: glob patterns to include
+    :type include: List[str], optional
+    :param etag: compare files by ETag instead of last modified time
+    :type etag: bool, optional
+    :raises InvalidS3PathPattern: when both paths are local paths
+    :return: list of transfer jobs
+    :rtype: List[TransferJob]
+    """
+    from_bucket, from_prefix = parse_s3_path(from_path)
+    to_bucket, to_prefix = parse_s3_path(to_path)
+    if not from_bucket and not to_bucket:
+        raise InvalidS3PathPattern(
+            "Invalid S3 path pattern for sync, example: s3://bucketname/path/"
+        )
+
+    if from_bucket and to_bucket:
+        return _get_copy_jobs(
+            client,
+            from_bucket,
+            from_prefix,
+            to_bucket,
+            to_prefix,
+            exclude,
+            include,
+            etag,
+        )
+
+    # local files are hashed when comparing by etag
+    with ETagHasher(cache=etag) as hasher:
+        if not from_bucket:
+            return _get_upload_jobs(
+                client,
+                os.path.expanduser(from_path),
+                to_bucket,
+                to_prefix,
+                exclude,
+                include,
+                hasher if etag else None,
+            )
+        return _get_download_jobs(
+            client,
+            from_bucket,
+            from_prefix,
+            os.path.expanduser(to_path),
+            exclude,
+            include,
+            hasher if etag else None,
+        )
+
+
+def _get_upload_jobs(
+    client,
+    local_root: str,
+    to_bucket: str,
+    to_prefix: str,
+    exclude: Optional[List[str]],
+    include: Optional[List[str]],
+    hasher: Optional[ETagHasher],
+) -> List[TransferJob]:
+    """Get the upload jobs of local files that are new or changed.
+
+    :param client: boto3.client("s3")
+    :type client: boto3.client
+    :param local_root: local directory to upload
+    :type local_root: str
+    :param to_bucket: destination bucket
+    :type to_bucket: str
+    :param to_prefix: destination prefix
+    :type to_prefix: str
+    :param exclude: glob patterns to exclude
+    :type exclude: List[str], optional
+    :param include: glob patterns to include
+    :type include: List[str], optional
+    :param hasher: compare by ETag when provided
+    :type hasher: ETagHasher, optional
+    :return: list of upload jobs
+    :rtype: List[TransferJob]
+    """
+    jobs: List[TransferJob] = []
+    source = dict(_walk_local(local_root, exclude, include))
+    # stream the destination listing and remove up to date files from source
+    for relative_path, destination in _walk_s3(client, to_bucket, to_prefix):
+        local_file = source.get(relative_path)
+        if local_file is None:
+            continue
+        if hasher:
+            changed = local_file["Size"] != destination["Size"] or (
+                hasher.get_etag(local_file["Path"], "-" in destination["ETag"])
+                != destination["ETag"]
+            )
+        else:
+            changed = (
+                local_file["Size"] != destination["Size"]
+                or local_file["LastModified"] > destination["LastModified"]
+            )
+        if not changed:
+            del source[relative_path]
+    for relative_path, local_file in sorted(source.items()):
+        key = to_prefix + relative_path
+        jobs.append(
+            TransferJob(
+                "upload",
+                to_bucket,
+                key,
+                filename=local_file["Path"],
+                message="upload: %s to s3://%s/%s"
+                % (local_file["Path"], to_bucket, key),
+                size=local_file["Size"],
+            )
+        )
+    return jobs
+
+
+def _get_download_jobs(
+    client,
+    from_bucket: str,
+    from_prefix: str,
+    local_root: str,
+    exclude: Optional[List[str]],
+    include: Optional[List[str]],
+    hasher: Optional[ETagHasher],
+) -> List[TransferJob]:
+    """Get the download jobs of s3 objects that are new or changed.
+
+    :param client: boto3.client("s3")
+    :type client: boto3.client
+    :param from_bucket: source bucket
+    :type from_bucket: str
+    :param from_prefix: source prefix
+    :type from_prefix: str
+    :param local_root: local directory to download to
+    :type local_root: str
+    :param exclude: glob patterns to exclude
+    :type exclude: List[str], optional
+    :param include: glob patterns to include
+    :type include: List[str], optional
+    :param hasher: compare by ETag when provided
+    :type hasher: ETagHasher, optional
+    :return: list of download jobs
+    :rtype: List[TransferJob]
+    """
+    jobs: List[TransferJob] = []
+    destination = dict(_walk_local(local_root))
+    for relative_path, s3_object in _walk_s3(
+        client, from_bucket, from_prefix, exclude, include
+    ):
+        local_file = destination.get(relative_path)
+        if local_file is not None:
+            if hasher:
+                changed = local_file["Size"] != s3_object["Size"] or (
+                    hasher.get_etag(local_file["Path"], "-" in s3_object["ETag"])
+                    != s3_object["ETag"]
+                )
+            else:
+                changed = (
+                    local_file["Size"] != s3_object["Size"]
+                    or s3_object["LastModified"] > local_file["LastModified"]
+                )
+            if not changed:
+                continue
+        filename = os.path.join(local_root, *relative_path.split("/"))
+        jobs.append(
+            TransferJob(
+                "download",
+                from_bucket,
+                s3_object["Key"],
+                filename=filename,
+                message="download: s3://%s/%s to %s"
+                % (from_bucket, s3_object["Key"], filename),
+                size=s3_object["Size"],
+                last_modified=s3_object["LastModified"],
+            )
+        )
+    return jobs
+
+
+def _get_copy_jobs(
+    client,
+    from_bucket: str,
+    from_prefix: str,
+    to_bucket: str,
+    to_prefix: str,
+    exclude: Optional[List[str]],
+    include: Optional[List[str]],
+    etag: bool,
+) -> List[TransferJob]:
+    """Get the copy jobs of s3 objects that are new or changed.
+
+    :param client: boto3.client("s3")
+    :type client: boto3.client
+    :param from_bucket: source bucket
+    :type from_bucket: str
+    :param from_prefix: source prefix
+    :type from_prefix: str
+    :param to_bucket: destination bucket
+    :type to_bucket: str
+    :param to_prefix: destination prefix
+    :type to_prefix: str
+    :param exclude: glob patterns to exclude
+    :type exclude: List[str], optional
+    :param include: glob patterns to include
+    :type include: List[str], optional
+    :param etag: compare by ETag instead of last modified time
+    :type etag: bool
+    :return: list of copy jobs
+    :rtype: List[TransferJob]
+    """
+    jobs: List[TransferJob] = []
+    destination = dict(_walk_s3(client, to_bucket, to_prefix))
+    for relative_path, s3_object in _walk_s3(
+        client, from_bucket, from_prefix, exclude, include
+    ):
+        dest_object = destination.get(relative_path)
+        if dest_object is not None:
+            if etag:
+                changed = dest_object["ETag"] != s3_object["ETag"]
+            else:
+                changed = (
+                    dest_object["Size"] != s3_object["Size"]
+                    or s3_object["LastModified"] > dest_object["LastModified"]
+                )
+            if not changed:
+                continue
+        key = to_prefix + relative_path
+        jobs.append(
+            TransferJob(
+                "copy",
+                to_bucket,
+                key,
+                copy_source={"Bucket": from_bucket, "Key": s3_object["Key"]},
+                message="copy: s3://%s/%s to s3://%s/%s"
+                % (from_bucket, s3_object["Key"], to_bucket, key),
+                size=s3_object["Size"],
+            )
+        )
+    return jobs
+
+
+def parse_s3_path(path: str) -> Tuple[str, str]:
+    """Parse the bucket and prefix of the s3 path.
+
+    The prefix is treated as a directory, "/" is appended if missing.
+
+    Example:
+        parse_s3_path("s3://bucket/path") == ("bucket", "path/")
+        parse_s3_path("/tmp") == ("", "")
+
+    :param path: s3 path in the form of s3://bucket/path/ or a local path
+    :type path: str
+    :return: bucket and prefix, empty bucket if the path is a local path
+    :rtype: Tuple[str, str]
+    """
+    match = re.match(r"^s3://(?P<bucket>[^/]*)/?(?P<prefix>.*)$", path)
+    if not match:
+        return "", ""
+    prefix = match.group("prefix")
+    if prefix and not prefix.endswith("/"):
+        prefix += "/"
+    return match.group("bucket"), prefix
+
+
+def _walk_local(
+    local_root: str,
+    exclude: Optional[List[str]] = None,
+    include: Optional[List[str]] = None,
+) -> Generator[Tuple[str, Dict[str, Any]], None, None]:
+    """Walk the local directory concurrently through scan_local_tree.
+
+    :param local_root: local directory to walk
+    :type local_root: str
+    :param exclude: glob patterns to exclude
+    :type exclude: List[str], optional
+    :param include: glob patterns to include
+    :type include: List[str], optional
+    :return: relative path with "/" separator and the file details in generator form
+    :rtype: Generator[Tuple[str, Dict[str, Any]], None, None]
+    """
+    for local_file in scan_local_tree(local_root, exclude, include):
+        yield local_file.relative_path.replace(os.sep, "/"), {
+            "Path": local_file.path,
+            "Size": local_file.size,
+            "LastModified": local_file.mtime,
+        }
+
+
+def _walk_s3(
+    client,
+    bucket: str,
+    prefix: str,
+    exclude: Optional[List[str]] = None,
+    include: Optional[List[str]] = None,
+) -> Generator[Tuple[str, Dict[str, Any]], None, None]:
+    """Walk the objects under the prefix through list_s3_objects.
+
+    :param client: boto3.client("s3")
+    :type client: boto3.client
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param prefix: prefix to walk, should end with "/"
+    :type prefix: str
+    :param exclude: glob patterns to exclude
+    :type exclude: List[str], optional
+    :param include: glob patterns to include
+    :type include: List[str], optional
+    :return: relative key and the object details in generator form
+    :rtype: Generator[Tuple[str, Dict[str, Any]], None, None]
+    """
+    glob_filter = GlobFilter(exclude, include)
+    for s3_object in list_s3_objects(client, bucket, prefix):
+        key = s3_object.get("Key", "")
+        if not key or key.endswith("/"):
+            # user created dir in S3 console
+            continue
+        relative_path = key[len(prefix) :]
+        if glob_filter.exclude(relative_path):
+            continue
+        yield relative_path, {
+            "Key": key,
+            "Size": s3_object.get("Size", 0),
+            "ETag": s3_object.get("ETag", ""),
+            "LastModified": s3_object["LastModified"].timestamp(),
+        }
@@ -0,0 +1,249 @@
+"""Module contains the journal of recursive transfers.
+
+Each recursive transfer appends the planned and completed files to
+$XDG_STATE_HOME/fzfaws/journal/<job>.jsonl, an interrupted transfer could be
+run again with --resume <job> to skip the files already transferred.
+
+Files are resumed as a whole, except multipart uploads cut by a hard kill,
+e.g. SIGKILL or a crash. s3transfer aborts the multipart upload when the
+transfer fails or on KeyboardInterrupt, such files are uploaded again.
+"""
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from fzfaws.s3.helper.transfer_scheduler import TransferJob
+from fzfaws.utils.exceptions import InvalidJournal
+
+# number of records appended between each fsync
+FSYNC_INTERVAL = 100
+
+_job_id_pattern = re.compile(r"^[\w.-]+$")
+
+
+class TransferJournal:
+    """Append only journal of a recursive transfer.
+
+    Records are json lines flushed as they are written and fsync'd every
+    FSYNC_INTERVAL records, a line torn by a crash is ignored when the
+    journal is read again.
+
+    A file is only skipped on resume when its completed record matches
+    the size of the job, the mtime of the local file for uploads and the
+    size of the local file for downloads.
+
+    Example:
+        journal = open_transfer_journal("download", resume)
+        TransferScheduler(s3.client, journal=journal).run(jobs)
+
+    :param job_id: id of the transfer job
+    :type job_id: str
+    :param operation: upload, download or copy
+    :type operation: str
+    :param resume: read the existing journal of the job
+    :type resume: bool, optional
+    :raises InvalidJournal: the journal is not found or of another operation
+    """
+
+    def __init__(self, job_id: str, operation: str, resume: bool = False) -> None:
+        """Construct the journal instance and open the journal file."""
+        if not _job_id_pattern.match(job_id):
+            raise InvalidJournal("Invalid transfer job %s" % job_id)
+        self.job_id: str = job_id
+        self.operation: str = operation
+        self.path: str = os.path.join(_get_journal_directory(), "%s.jsonl" % job_id)
+        self.resuming: bool = resume
+        self._planned: Dict[str, Optional[int]] = {}
+        self._completed: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._unsynced = 0
+
+        if resume:
+            if not os.path.isfile(self.path):
+                raise InvalidJournal("Transfer job %s is not found" % job_id)
+            self._load()
+            self._file = open(self.path, "a")
+        else:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._file = open(self.path, "a")
+            self._append({"job": job_id, "operation": operation, "time": time.time()})
+
+    def is_completed(self, job: TransferJob) -> bool:
+        """Check if the job is completed and still valid.
+
+        :param job: job to check
+        :type job: TransferJob
+        :return: True if the job could be skipped
+        :rtype: bool
+        """
+        identity = _get_identity(job)
+        if identity not in self._completed:
+            return False
+        record = self._completed[identity]
+        if job.size is not None and record.get("size") != job.size:
+            return False
+        try:
+            if job.operation == "upload":
+                return os.path.getmtime(job.filename) == record.get("mtime")
+            if job.operation == "download":
+                return os.path.getsize(job.filename) == record.get("size")
+        except OSError:
+            return False
+        return True
+
+    def is_interrupted(self, job: TransferJob) -> bool:
+        """Check if the job was started by the previous run but not completed.
+
+        :param job: job to check
+        :type job: TransferJob
+        :return: True if the job was planned but not completed
+        :rtype: bool
+        """
+        identity = _get_identity(job)
+        return identity in self._planned and identity not in self._completed
+
+    def plan(self, job: TransferJob) -> None:
+        """Record the job before it's submitted.
+
+        Like completed records, planned records are fsync'd in batches,
+        call sync() once all jobs are planned.
+
+        :param job: the submitted job
+        :type job: TransferJob
+        """
+        self._append({"planned": _get_identity(job), "size": job.size}, sync=False)
+
+    def sync(self) -> None:
+        """Fsync the records appended since the last fsync."""
+        with self._lock:
+            if self._file.closed or not self._unsynced:
+                return
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def complete(self, job: TransferJob) -> None:
+        """Record the job once it's transferred.
+
+        :param job: the transferred job
+        :type job: TransferJob
+        """
+        record: Dict[str, Any] = {"completed": _get_identity(job), "size": job.size}
+        if job.operation == "upload":
+            record["mtime"] = os.path.getmtime(job.filename)
+        elif job.size is None and job.operation == "download":
+            record["size"] = os.path.getsize(job.filename)
+        self._append(record, sync=False)
+
+    def close(self, remove: bool = False) -> None:
+        """Sync and close the journal.
+
+        :param remove: remove the journal, e.g. all jobs are completed
+        :type remove: bool, optional
+        """
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            if remove:
+                os.remove(self.path)
+
+    def _append(self, record: Dict[str, Any], sync: bool = True) -> None:
+        """Append a record to the journal.
+
+        :param record: the record
+        :type record: Dict[str, Any]
+        :param sync: fsync the journal straight away
+        :type sync: bool, optional
+        """
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write("%s\n" % json.dumps(record))
+            self._file.flush()
+            self._unsynced += 1
+            if sync or self._unsynced >= FSYNC_INTERVAL:
+                os.fsync(self._file.fileno())
+                self._unsynced = 0
+
+    def _load(self) -> None:
+        """Read the records of the journal.
+
+        :raises InvalidJournal: the journal is for another operation
+        """
+        with open(self.path, "r") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # torn by a crash
+                    continue
+                if "operation" in record and record["operation"] != self.operation:
+                    raise InvalidJournal(
+                        "Transfer job %s is a %s, not a %s"
+                        % (self.job_id, record["operation"], self.operation)
+                    )
+                if "planned" in record:
+                    self._planned[record["planned"]] = record.get("size")
+                elif "completed" in record:
+                    self._completed[record["completed"]] = record
+
+
+def open_transfer_journal(operation: str, resume: str = "") -> TransferJournal:
+    """Open the journal of a new transfer job, or the job to resume.
+
+    The job id is printed straight away so that a killed run could
+    still be resumed.
+
+    :param operation: upload, download or copy
+    :type operation: str
+    :param resume: id of the job to resume
+    :type resume: str, optional
+    :raises InvalidJournal: the journal to resume is not found or invalid
+    :return: the journal
+    :rtype: TransferJournal
+    """
+    if resume:
+        journal = TransferJournal(resume, operation, resume=True)
+    else:
+        job_id = "%s-%s-%s" % (operation, time.strftime("%Y%m%d%H%M%S"), os.getpid())
+        journal = TransferJournal(job_id, operation)
+    print("job %s, resume with --resume %s" % (journal.job_id, journal.job_id))
+    return journal
+
+
+def _get_identity(job: TransferJob) -> str:
+    """Get the identity of the job in the journal.
+
+    :param job: the job
+    :type job: TransferJob
+    :return: identity of the source and destination of the job
+    :rtype: str
+    """
+    copy_source = job.copy_source or {}
+    return json.dumps(
+        [
+            job.operation,
+            job.bucket,
+            job.key,
+            job.filename,
+            copy_source.get("Bucket"),
+            copy_source.get("Key"),
+            copy_source.get("VersionId"),
+        ]
+    )
+
+
+def _get_journal_directory() -> str:
+    """Get the directory of the journals.
+
+    :return: path to the directory
+    :rtype: str
+    """
+    home = os.path.expanduser("~")
+    base_directory = os.getenv("XDG_STATE_HOME", "%s/.local/state" % home)
+    return "%s/fzfaws/journal" % base_directory
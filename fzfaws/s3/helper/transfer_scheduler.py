@@ -0,0 +1,513 @@
+"""Module contains the concurrent multi file transfer scheduler."""
+import hashlib
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sized,
+    Tuple,
+)
+
+from s3transfer.manager import TransferManager
+from s3transfer.subscribers import BaseSubscriber
+from s3transfer.utils import ChunksizeAdjuster
+
+from fzfaws.s3.helper.s3progress import BatchProgress
+from fzfaws.s3.helper.s3transferwrapper import S3TransferWrapper
+
+
+class TransferJob(NamedTuple):
+    """A single file to transfer.
+
+    :param operation: upload, download or copy
+    :type operation: str
+    :param bucket: destination bucket for upload/copy, source bucket for download
+    :type bucket: str
+    :param key: destination key for upload/copy, source key for download
+    :type key: str
+    :param filename: local file path to upload or download to
+    :type filename: str, optional
+    :param copy_source: copy source in the form of {"Bucket", "Key", "VersionId"}
+    :type copy_source: Dict[str, str], optional
+    :param extra_args: extra arguments passed to s3transfer
+    :type extra_args: Dict[str, Any], optional
+    :param message: message to print once the transfer is done
+    :type message: str, optional
+    :param size: size of the file from the listing, s3transfer won't
+        need to head the object to get its size when provided
+    :type size: int, optional
+    :param last_modified: timestamp to set as the mtime of the downloaded file,
+        so that the next sync could compare by last modified time
+    :type last_modified: float, optional
+    :param error: exception raised while preparing the job, the job is
+        reported as failed without being transferred
+    :type error: Exception, optional
+    """
+
+    operation: str
+    bucket: str
+    key: str
+    filename: str = ""
+    copy_source: Optional[Dict[str, str]] = None
+    extra_args: Optional[Dict[str, Any]] = None
+    message: str = ""
+    size: Optional[int] = None
+    last_modified: Optional[float] = None
+    error: Optional[Exception] = None
+
+
+class TransferScheduler:
+    """Submit transfer jobs concurrently to a single shared TransferManager.
+
+    The TransferManager is shared between all files so that the thread pool and
+    the http connections are reused, the number of files in flight is capped by
+    max_in_flight which is read from FZFAWS_S3_MAX_IN_FLIGHT, default 10.
+
+    A failed file doesn't abort the batch, failures are collected and reported
+    once all jobs are done. Progress of the whole batch is displayed through
+    BatchProgress, sizes are taken from the jobs.
+
+    With a TransferJournal, jobs are recorded before they are submitted and
+    once they are transferred, jobs completed by the previous run of the
+    journal are skipped. A multipart upload left by a hard kill of the
+    previous run is completed from the parts already uploaded instead of
+    starting over, on a separate thread pool so that other jobs are still
+    submitted meanwhile. s3transfer aborts the multipart upload when the
+    transfer fails or is interrupted by KeyboardInterrupt, such files are
+    uploaded again.
+
+    Example:
+        scheduler = TransferScheduler(s3.client)
+        failures = scheduler.run(
+            TransferJob("upload", "bucket", key, filename=path) for key, path in files
+        )
+
+    :param client: boto3.client("s3")
+    :type client: boto3.client
+    :param max_in_flight: max number of files to transfer concurrently
+    :type max_in_flight: int, optional
+    :param no_progress: don't display the progress bar
+    :type no_progress: bool, optional
+    :param source_client: client to read the copy source, default to client
+    :type source_client: boto3.client, optional
+    :param journal: journal to record the jobs, to resume the transfer later
+    :type journal: TransferJournal, optional
+    """
+
+    def __init__(
+        self,
+        client,
+        max_in_flight: Optional[int] = None,
+        no_progress: bool = False,
+        source_client=None,
+        journal=None,
+    ) -> None:
+        """Construct the scheduler instance."""
+        self.client = client
+        self.source_client = source_client or client
+        self.journal = journal
+        self.skipped: int = 0
+        self.no_progress: bool = no_progress
+        self.transfer_config = S3TransferWrapper().transfer_config
+        self.max_in_flight: int = max_in_flight or int(
+            os.getenv("FZFAWS_S3_MAX_IN_FLIGHT") or 10
+        )
+        self.failures: List[Tuple[TransferJob, Exception]] = []
+        self.progress: Optional[BatchProgress] = None
+        self._lock = threading.Lock()
+
+    def run(self, jobs: Iterable[TransferJob]) -> List[Tuple[TransferJob, Exception]]:
+        """Transfer all jobs and report the failures at the end.
+
+        Jobs are consumed lazily, a new job is only taken once there is a free
+        slot, so jobs could be streamed from a listing. When jobs is a list, the
+        totals of the progress are known upfront, otherwise they grow as jobs
+        are taken.
+
+        The journal is only removed when the run finished with no failure,
+        it's kept when the run is interrupted, e.g. KeyboardInterrupt or an
+        error raised while listing the jobs.
+
+        :param jobs: transfer jobs to run
+        :type jobs: Iterable[TransferJob]
+        :return: list of failed jobs and their exception
+        :rtype: List[Tuple[TransferJob, Exception]]
+        """
+        self.failures = []
+        self.skipped = 0
+        self.progress = BatchProgress() if not self.no_progress else None
+        sized = isinstance(jobs, Sized)
+        if self.journal:
+            jobs = self._skip_completed(jobs)
+        if sized:
+            jobs = [self._get_sized_job(job) for job in jobs]
+            for job in jobs:
+                self._add_progress_file(job)
+        slots = threading.BoundedSemaphore(self.max_in_flight)
+        finished = False
+        if self.progress:
+            self.progress.start()
+        try:
+            # the resumer exits first, its jobs could still submit to the manager
+            with TransferManager(
+                self.client, self.transfer_config
+            ) as manager, ThreadPoolExecutor(self.max_in_flight) as resumer:
+                for job in jobs:
+                    if not sized:
+                        job = self._get_sized_job(job)
+                        self._add_progress_file(job)
+                    slots.acquire()
+                    if self._plan(job):
+                        resumer.submit(self._resume_upload, manager, job, slots)
+                    else:
+                        self._submit_job(manager, job, slots)
+                if self.journal:
+                    self.journal.sync()
+            finished = True
+        finally:
+            if self.progress:
+                self.progress.stop()
+            if self.journal:
+                self.journal.close(remove=finished and not self.failures)
+        if self.skipped:
+            print("%s file(s) already transferred, skipped" % self.skipped)
+        self.print_failures()
+        if self.journal and self.failures:
+            print("Resume the transfer with --resume %s" % self.journal.job_id)
+        return self.failures
+
+    def print_failures(self) -> None:
+        """Print the failed jobs of the last run."""
+        print_failures(self.failures)
+
+    def _skip_completed(self, jobs: Iterable[TransferJob]) -> Iterable[TransferJob]:
+        """Skip the jobs completed by the previous run of the journal.
+
+        :param jobs: transfer jobs to run
+        :type jobs: Iterable[TransferJob]
+        :return: jobs not completed yet, a list if jobs is a list
+        :rtype: Iterable[TransferJob]
+        """
+
+        def not_completed(job: TransferJob) -> bool:
+            if self.journal.is_completed(self._get_sized_job(job)):
+                self.skipped += 1
+                return False
+            return True
+
+        if isinstance(jobs, Sized):
+            return [job for job in jobs if not_completed(job)]
+        return (job for job in jobs if not_completed(job))
+
+    def _plan(self, job: TransferJob) -> bool:
+        """Record the job and check if its interrupted multipart upload could be resumed.
+
+        :param job: job to submit
+        :type job: TransferJob
+        :return: True if the job is a multipart upload interrupted by the previous run
+        :rtype: bool
+        """
+        if not self.journal:
+            return False
+        interrupted = self.journal.is_interrupted(job)
+        self.journal.plan(job)
+        return (
+            interrupted
+            and job.error is None
+            and job.operation == "upload"
+            and job.size is not None
+            and job.size >= self.transfer_config.multipart_threshold
+        )
+
+    def _resume_upload(self, manager, job: TransferJob, slots) -> None:
+        """Resume the interrupted multipart upload of the job.
+
+        Run on the resumer thread pool, parts of the file are compared and
+        uploaded one at a time. The job is submitted to the TransferManager
+        when there is no multipart upload to resume.
+
+        :param manager: the shared TransferManager
+        :type manager: s3transfer.manager.TransferManager
+        :param job: job to resume
+        :type job: TransferJob
+        :param slots: slots of the jobs in flight
+        :type slots: threading.Semaphore
+        """
+        part_size = ChunksizeAdjuster().adjust_chunksize(
+            self.transfer_config.multipart_chunksize, job.size
+        )
+        try:
+            resumed = resume_multipart_upload(
+                self.client,
+                job,
+                part_size,
+                self.progress.update if self.progress else None,
+            )
+        except Exception as e:
+            self._done(job, e)
+            slots.release()
+            return
+        if resumed:
+            self._done(job)
+            slots.release()
+        else:
+            self._submit_job(manager, job, slots)
+
+    def _submit_job(self, manager, job: TransferJob, slots) -> None:
+        """Submit the job, recording it as failed if it couldn't be submitted.
+
+        :param manager: the shared TransferManager
+        :type manager: s3transfer.manager.TransferManager
+        :param job: job to submit
+        :type job: TransferJob
+        :param slots: slots of the jobs in flight, released once the job is done
+        :type slots: threading.Semaphore
+        """
+        try:
+            self._submit(manager, job, _DoneSubscriber(self, job, slots))
+        except Exception as e:
+            self._done(job, e)
+            slots.release()
+
+    def _submit(self, manager, job: TransferJob, subscriber) -> None:
+        """Submit the job to the TransferManager.
+
+        :param manager: the shared TransferManager
+        :type manager: s3transfer.manager.TransferManager
+        :param job: job to submit
+        :type job: TransferJob
+        :param subscriber: subscriber to notify once the job is done
+        :type subscriber: BaseSubscriber
+        :raises ValueError: unknown operation
+        """
+        if job.error is not None:
+            raise job.error
+        if job.operation == "upload":
+            manager.upload(
+                job.filename,
+                job.bucket,
+                job.key,
+                extra_args=job.extra_args,
+                subscribers=[subscriber],
+            )
+        elif job.operation == "download":
+            directory = os.path.dirname(job.filename)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            manager.download(
+                job.bucket,
+                job.key,
+                job.filename,
+                extra_args=job.extra_args,
+                subscribers=[subscriber],
+            )
+        elif job.operation == "copy":
+            manager.copy(
+                job.copy_source,
+                job.bucket,
+                job.key,
+                extra_args=job.extra_args,
+                subscribers=[subscriber],
+                source_client=self.source_client,
+            )
+        else:
+            raise ValueError("Unknown transfer operation %s" % job.operation)
+
+    def _get_sized_job(self, job: TransferJob) -> TransferJob:
+        """Fill in the size of upload jobs from the local file.
+
+        :param job: job to get size
+        :type job: TransferJob
+        :return: the job with size if available
+        :rtype: TransferJob
+        """
+        if job.size is None and job.operation == "upload":
+            try:
+                return job._replace(size=os.path.getsize(job.filename))
+            except OSError:
+                pass
+        return job
+
+    def _add_progress_file(self, job: TransferJob) -> None:
+        """Count the job into the progress.
+
+        :param job: job to count
+        :type job: TransferJob
+        """
+        if self.progress:
+            self.progress.add_file(job.size)
+
+    def _done(self, job: TransferJob, error: Optional[Exception] = None) -> None:
+        """Record the result of the job.
+
+        :param job: the finished job
+        :type job: TransferJob
+        :param error: exception raised by the job, None if succeeded
+        :type error: Exception, optional
+        """
+        if error is None and self.journal:
+            try:
+                self.journal.complete(job)
+            except Exception as e:
+                error = e
+        with self._lock:
+            if error is not None:
+                self.failures.append((job, error))
+            elif job.message and self.progress:
+                self.progress.write(job.message)
+            elif job.message:
+                sys.stdout.write("%s\n" % job.message)
+                sys.stdout.flush()
+        if self.progress:
+            self.progress.file_done()
+
+
+def print_failures(failures: List[Tuple[TransferJob, Exception]]) -> None:
+    """Print the failed jobs.
+
+    :param failures: failed jobs and their exception
+    :type failures: List[Tuple[TransferJob, Exception]]
+    """
+    if not failures:
+        return
+    print("%s file(s) failed to transfer:" % len(failures))
+    for job, error in failures:
+        print("%s failed: s3://%s/%s %s" % (job.operation, job.bucket, job.key, error))
+
+
+def resume_multipart_upload(
+    client,
+    job: TransferJob,
+    part_size: int,
+    callback: Optional[Callable[[int], None]] = None,
+) -> bool:
+    """Complete the interrupted multipart upload of the job.
+
+    Parts already uploaded are kept when their ETag matches the md5 of the
+    local part, missing or mismatched parts are uploaded again. The part
+    size should be the one s3transfer split the file with, the configured
+    multipart_chunksize adjusted by ChunksizeAdjuster for the file size.
+
+    :param client: boto3.client("s3")
+    :type client: boto3.client
+    :param job: the upload job
+    :type job: TransferJob
+    :param part_size: size of each part except the last one
+    :type part_size: int
+    :param callback: called with the bytes of each part uploaded or kept
+    :type callback: Callable[[int], None], optional
+    :return: True if completed, False if there is no multipart upload to resume
+    :rtype: bool
+    """
+    uploads = [
+        upload
+        for upload in client.list_multipart_uploads(
+            Bucket=job.bucket, Prefix=job.key
+        ).get("Uploads", [])
+        if upload["Key"] == job.key
+    ]
+    if not uploads:
+        return False
+    upload_id = max(uploads, key=lambda upload: upload["Initiated"])["UploadId"]
+    uploaded: Dict[int, Dict[str, Any]] = {}
+    paginator = client.get_paginator("list_parts")
+    for page in paginator.paginate(Bucket=job.bucket, Key=job.key, UploadId=upload_id):
+        for part in page.get("Parts", []):
+            uploaded[part["PartNumber"]] = part
+
+    file_size = os.path.getsize(job.filename)
+    part_count = -(-file_size // part_size)
+    if not uploaded or max(uploaded) > part_count:
+        # nothing to resume from or split differently, start over
+        client.abort_multipart_upload(
+            Bucket=job.bucket, Key=job.key, UploadId=upload_id
+        )
+        return False
+
+    # upload_part only accepts the sse-c and request payer arguments
+    part_args = {
+        key: value
+        for key, value in (job.extra_args or {}).items()
+        if key.startswith("SSECustomer") or key == "RequestPayer"
+    }
+    complete_args = {
+        key: value for key, value in part_args.items() if key == "RequestPayer"
+    }
+    parts: List[Dict[str, Any]] = []
+    with open(job.filename, "rb") as file:
+        for part_number in range(1, part_count + 1):
+            file.seek((part_number - 1) * part_size)
+            body = file.read(part_size)
+            etag = '"%s"' % hashlib.md5(body).hexdigest()
+            part = uploaded.get(part_number)
+            if not part or part["ETag"] != etag or part["Size"] != len(body):
+                part = client.upload_part(
+                    Bucket=job.bucket,
+                    Key=job.key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=body,
+                    **part_args
+                )
+            parts.append({"PartNumber": part_number, "ETag": part["ETag"]})
+            if callback:
+                callback(len(body))
+    client.complete_multipart_upload(
+        Bucket=job.bucket,
+        Key=job.key,
+        UploadId=upload_id,
+        MultipartUpload={"Parts": parts},
+        **complete_args
+    )
+    return True
+
+
+class _DoneSubscriber(BaseSubscriber):
+    """s3transfer subscriber to report progress, record the result and free the slot."""
+
+    def __init__(
+        self, scheduler: TransferScheduler, job: TransferJob, slots: threading.Semaphore
+    ) -> None:
+        """Construct the subscriber instance."""
+        self._scheduler = scheduler
+        self._job = job
+        self._slots = slots
+        self._size_counted: bool = job.size is not None
+
+    def on_queued(self, future, **kwargs) -> None:
+        """Provide the size from the listing so s3transfer won't head the object."""
+        if self._job.size is not None:
+            future.meta.provide_transfer_size(self._job.size)
+
+    def on_progress(self, future, bytes_transferred: int, **kwargs) -> None:
+        """Add the transferred bytes to the progress."""
+        progress = self._scheduler.progress
+        if not progress:
+            return
+        if not self._size_counted and future.meta.size is not None:
+            self._size_counted = True
+            progress.add_bytes(future.meta.size)
+        progress.update(bytes_transferred)
+
+    def on_done(self, future, **kwargs) -> None:
+        """Record the result of the transfer future and release the slot."""
+        try:
+            future.result()
+            if self._job.operation == "download" and self._job.last_modified:
+                os.utime(
+                    self._job.filename,
+                    (self._job.last_modified, self._job.last_modified),
+                )
+            self._scheduler._done(self._job)
+        except Exception as e:
+            self._scheduler._done(self._job, e)
+        finally:
+            self._slots.release()
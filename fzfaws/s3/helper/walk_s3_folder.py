@@ -1,10 +1,17 @@
-"""Module contains a helper function to recursivly walk and get all s3 object's within given path."""
+"""Module contains a helper function to walk and get all s3 object's within given path."""
 import os
 import re
-from typing import List, Optional, Tuple
+from typing import Dict, Generator, List, Optional, Tuple
 
-from fzfaws.s3.helper.exclude_file import exclude_file
+from fzfaws.s3.helper.exclude_file import GlobFilter
+from fzfaws.s3.helper.list_s3_objects import list_s3_objects
+from fzfaws.s3.helper.object_index import ObjectIndex, get_listing_source
+from fzfaws.s3.helper.s3_inventory import S3Inventory
 from fzfaws.utils.exceptions import InvalidS3PathPattern
+from fzfaws.utils.util import get_confirmation
+
+# operations that modify the bucket, only planned from an inventory report once confirmed
+MUTATING_OPERATIONS = ("delete", "bucket", "object")
 
 
 def walk_s3_folder(
@@ -18,17 +25,12 @@ def walk_s3_folder(
     operation: str = "download",
     destination_path: str = "/",
     destination_bucket: str = "",
+    sizes: Optional[Dict[str, int]] = None,
 ) -> List[Tuple[str, str]]:
-    """Walk s3 folder recursivly in the given path to obtail all objects.
-
-    Reference: https://stackoverflow.com/a/33350380.
-    Recursivly call walk_s3_folder to reach the bottom level and append the file path
-    to the file_list.
-
-    Process the destination when root is not bucket root.
+    """Walk s3 folder in the given path to obtail all objects.
 
-    Different types of operation doesn't change the actual walk behavior, it only changes
-    the information printed.
+    Collect the result of walk_s3_prefix into the file_list, refer to walk_s3_prefix
+    for the details.
 
     :param client: boto3.client('s3')
     :type client: boto3.client
@@ -52,6 +54,8 @@ def walk_s3_folder(
     :type destination_path: str, optional
     :param destination_bucket: the destination bucket name for operation='bucket'
     :type destination_bucket: str, optional
+    :param sizes: dict to collect the size of each original_key from the listing
+    :type sizes: Dict[str, int], optional
     :return: return the list of tuple of file path to download
     :rtype: List[Tuple[str,str]]
 
@@ -60,69 +64,145 @@ def walk_s3_folder(
     """
     if file_list is None:
         file_list = []
+    file_list.extend(
+        walk_s3_prefix(
+            client,
+            bucket,
+            bucket_path,
+            root,
+            exclude,
+            include,
+            operation,
+            destination_path,
+            destination_bucket,
+            sizes,
+        )
+    )
+    return file_list
+
+
+def walk_s3_prefix(
+    client,
+    bucket: str,
+    bucket_path: str,
+    root: str = "",
+    exclude: Optional[List[str]] = None,
+    include: Optional[List[str]] = None,
+    operation: str = "download",
+    destination_path: str = "/",
+    destination_bucket: str = "",
+    sizes: Optional[Dict[str, int]] = None,
+) -> Generator[Tuple[str, str], None, None]:
+    """Walk all objects under the given path lazily.
+
+    Objects are listed flat through list_s3_objects, which split the listing into
+    shards and fetch them concurrently, instead of a request per "directory".
+    When the local object index is enabled, the path is listed into the index
+    first so that the operation never acts on a stale index. When the bucket
+    has an inventory report, objects are read from the report without any
+    LIST request. The report could be a day old, its creation time is
+    printed and the delete/bucket/object operations, which modify the
+    bucket, only use the report once confirmed.
+
+    Process the destination when root is not bucket root.
+
+    Different types of operation doesn't change the actual walk behavior, it only changes
+    the information printed.
+
+    :param client: boto3.client('s3')
+    :type client: boto3.client
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param bucket_path: the path to walk
+    :type bucket_path: str
+    :param root: current operation root, set root to bucket_path to strip it from destination
+    :type root: str
+    :param exclude: list of glob pattern to exclude
+    :type exclude: List[str], optional
+    :param include: list of glob pattern to include
+    :type include: List[str], optional
+    :param operation: current operation type
+        Print different information based on operation type
+        download/bucket/delete/object
+    :type operation: str
+    :param destination_path: the destination root path, could be local path or s3 path
+    :type destination_path: str, optional
+    :param destination_bucket: the destination bucket name for operation='bucket'
+    :type destination_bucket: str, optional
+    :param sizes: dict to collect the size of each original_key from the listing,
+        useful to skip the head_object call during transfer
+    :type sizes: Dict[str, int], optional
+    :raises InvalidS3PathPattern: when the root is not valid for the key
+    :return: tuple of (original_key, destination_key) in generator form
+    :rtype: Generator[Tuple[str, str], None, None]
+    """
     if exclude is None:
         exclude = []
     if include is None:
         include = []
 
-    paginator = client.get_paginator("list_objects")
-    for result in paginator.paginate(Bucket=bucket, Delimiter="/", Prefix=bucket_path):
-        if result.get("CommonPrefixes") is not None:
-            for subdir in result.get("CommonPrefixes"):
-                file_list = walk_s3_folder(
-                    client,
-                    bucket,
-                    subdir.get("Prefix"),
-                    root,
-                    file_list,
-                    exclude,
-                    include,
-                    operation,
-                    destination_path,
-                    destination_bucket,
-                )
-        for file in result.get("Contents", []):
-            if file.get("Key").endswith("/") or not file.get("Key"):
-                # user created dir in S3 console will appear in the result and is not downloadable
-                continue
-            if exclude_file(exclude, include, file.get("Key")):
-                continue
-            if not root:
-                dest_pathname = os.path.join(destination_path, file.get("Key"))
-            else:
-                # strip off the root if the root is not root of the bucket
-                # with this, downloading sub folders like bucket/aws
-                # will not create a folder called /aws in the target directory
-                # rather, it will just download all files in bucket/aws to the target directory
-                # nested folders within bucket/aws will still be created in the target directory
-                # doing this because aws cli does it, do not want to change the behavior
-                pattern = r"(?<=%s)(?P<root>.*)" % root
-                strip_root_path_match = re.search(pattern, file.get("Key"))
-                if not strip_root_path_match:
-                    # raise exception if root was not found within the filepath
-                    raise InvalidS3PathPattern(
-                        "Encountered invalid root pattern when walking s3 folders"
-                    )
-                elif strip_root_path_match.group("root").startswith("/"):
-                    # raise exceptions if s3path doesn't end with a "/"
-                    raise InvalidS3PathPattern(
-                        "Encountered invalid s3 path pattern when walking s3 folder"
-                    )
-                strip_root_path = strip_root_path_match.group("root")
-                dest_pathname = os.path.join(destination_path, strip_root_path)
-            if operation == "download":
-                print(
-                    "(dryrun) download: s3://%s/%s to %s"
-                    % (bucket, file.get("Key"), dest_pathname)
+    source = get_listing_source(client, bucket)
+    if isinstance(source, ObjectIndex):
+        source.refresh(client, bucket_path)
+    elif isinstance(source, S3Inventory):
+        print(
+            "(dryrun) listing s3://%s/%s from the inventory report created at %s, "
+            "newer objects are not included"
+            % (bucket, bucket_path, source.get_created_at())
+        )
+        if operation in MUTATING_OPERATIONS and not get_confirmation(
+            "Use the inventory report instead of listing the bucket?"
+        ):
+            source = None
+    if source:
+        s3_objects = source.list_objects(bucket_path, exclude, include)
+    else:
+        s3_objects = list_s3_objects(client, bucket, bucket_path)
+
+    glob_filter = GlobFilter(exclude, include)
+    for file in s3_objects:
+        if file.get("Key").endswith("/") or not file.get("Key"):
+            # user created dir in S3 console will appear in the result and is not downloadable
+            continue
+        if glob_filter.exclude(file.get("Key")):
+            continue
+        if not root:
+            dest_pathname = os.path.join(destination_path, file.get("Key"))
+        else:
+            # strip off the root if the root is not root of the bucket
+            # with this, downloading sub folders like bucket/aws
+            # will not create a folder called /aws in the target directory
+            # rather, it will just download all files in bucket/aws to the target directory
+            # nested folders within bucket/aws will still be created in the target directory
+            # doing this because aws cli does it, do not want to change the behavior
+            pattern = r"(?<=%s)(?P<root>.*)" % root
+            strip_root_path_match = re.search(pattern, file.get("Key"))
+            if not strip_root_path_match:
+                # raise exception if root was not found within the filepath
+                raise InvalidS3PathPattern(
+                    "Encountered invalid root pattern when walking s3 folders"
                 )
-            elif operation == "bucket":
-                print(
-                    "(dryrun) copy: s3://%s/%s to s3://%s/%s"
-                    % (bucket, file.get("Key"), destination_bucket, dest_pathname)
+            elif strip_root_path_match.group("root").startswith("/"):
+                # raise exceptions if s3path doesn't end with a "/"
+                raise InvalidS3PathPattern(
+                    "Encountered invalid s3 path pattern when walking s3 folder"
                 )
-            elif operation == "delete":
-                print("(dryrun) delete: s3://%s/%s" % (bucket, file.get("Key")))
-            elif operation == "object":
-                print("(dryrun) update: s3://%s/%s" % (bucket, file.get("Key")))
-            file_list.append((file.get("Key"), dest_pathname))
-    return file_list
+            strip_root_path = strip_root_path_match.group("root")
+            dest_pathname = os.path.join(destination_path, strip_root_path)
+        if operation == "download":
+            print(
+                "(dryrun) download: s3://%s/%s to %s"
+                % (bucket, file.get("Key"), dest_pathname)
+            )
+        elif operation == "bucket":
+            print(
+                "(dryrun) copy: s3://%s/%s to s3://%s/%s"
+                % (bucket, file.get("Key"), destination_bucket, dest_pathname)
+            )
+        elif operation == "delete":
+            print("(dryrun) delete: s3://%s/%s" % (bucket, file.get("Key")))
+        elif operation == "object":
+            print("(dryrun) update: s3://%s/%s" % (bucket, file.get("Key")))
+        if sizes is not None:
+            sizes[file.get("Key")] = file.get("Size", 0)
+        yield file.get("Key"), dest_pathname
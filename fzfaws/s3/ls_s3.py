@@ -2,6 +2,8 @@
 import json
 from typing import Dict, List, Union
 
+from fzfaws.s3.helper.bucket_region import get_bucket_region
+from fzfaws.s3.helper.get_copy_args import MetadataCapture
 from fzfaws.s3.s3 import S3
 
 
@@ -16,6 +18,7 @@ def ls_s3(
     arn: bool = False,
     versionid: bool = False,
     bucketpath: str = None,
+    unordered: bool = False,
 ) -> None:
     """Display information on the selected s3 file or bucket.
 
@@ -39,6 +42,8 @@ def ls_s3(
     :type versionid: bool, optional
     :param bucketpath: specify a bucket to operate
     :type bucketpath: str, optional
+    :param unordered: print detailed object information in completion order
+    :type unordered: bool, optional
     """
     s3 = S3(profile)
     s3.set_bucket_and_path(bucketpath)
@@ -46,8 +51,7 @@ def ls_s3(
         s3.set_s3_bucket(no_progress=True)
 
     if bucket and url:
-        response = s3.client.get_bucket_location(Bucket=s3.bucket_name)
-        bucket_location = response["LocationConstraint"]
+        bucket_location = get_bucket_region(s3.client, s3.bucket_name)
         print(
             "https://s3-%s.amazonaws.com/%s/"
             % (
@@ -78,7 +82,7 @@ def ls_s3(
         obj_versions = s3.get_object_version(no_progress=True)
 
     if not url and not uri and not name and not versionid and not arn:
-        get_detailed_info(s3, bucket, version, obj_versions)
+        get_detailed_info(s3, bucket, version, obj_versions, not unordered)
     elif version:
         if url:
             for obj_version in obj_versions:
@@ -119,10 +123,17 @@ def ls_s3(
 
 
 def get_detailed_info(
-    s3: S3, bucket: bool, version: bool, obj_versions: List[Dict[str, str]]
+    s3: S3,
+    bucket: bool,
+    version: bool,
+    obj_versions: List[Dict[str, str]],
+    ordered: bool = True,
 ) -> None:
     """Print detailed information about bucket, object or version.
 
+    Details of objects are fetched concurrently and printed as JSON Lines,
+    one object per line.
+
     :param s3: S3 instance
     :type s3: S3
     :param bucket: print detailed information about the bucket
@@ -131,14 +142,15 @@ def get_detailed_info(
     :type version: bool
     :param obj_version: list of object versions to print details
     :type obj_version: List[Dict[str, str]]
+    :param ordered: print objects in selection order, otherwise in completion order
+    :type ordered: bool, optional
     """
     if bucket:
         response = {}
         acls = s3.client.get_bucket_acl(Bucket=s3.bucket_name)
         versions = s3.client.get_bucket_versioning(Bucket=s3.bucket_name)
-        region = s3.client.get_bucket_location(Bucket=s3.bucket_name)
         response["Owner"] = acls.get("Owner")
-        response["Region"] = region.get("LocationConstraint")
+        response["Region"] = get_bucket_region(s3.client, s3.bucket_name)
         try:
             encryption = s3.client.get_bucket_encryption(Bucket=s3.bucket_name)
             response["Encryption"] = encryption.get("ServerSideEncryptionConfiguration")
@@ -163,46 +175,25 @@ def get_detailed_info(
         print("s3://%s" % s3.bucket_name)
         print(json.dumps(response, indent=4, default=str))
 
-    elif version:
-        for obj_version in obj_versions:
-            response = s3.client.head_object(
-                Bucket=s3.bucket_name,
-                Key=obj_version.get("Key"),
-                VersionId=obj_version.get("VersionId"),
-            )
-            tags = s3.client.get_object_tagging(
-                Bucket=s3.bucket_name,
-                Key=obj_version.get("Key"),
-                VersionId=obj_version.get("VersionId"),
-            )
-            acls = s3.client.get_object_acl(
-                Bucket=s3.bucket_name,
-                Key=obj_version.get("Key"),
-                VersionId=obj_version.get("VersionId"),
-            )
-            response.pop("ResponseMetadata", None)
-            response["Tags"] = tags.get("TagSet")
-            response["Owner"] = acls.get("Owner")
-            response["Grants"] = acls.get("Grants")
-            print(80 * "-")
-            print(
-                "s3://%s/%s versioned %s"
-                % (s3.bucket_name, obj_version.get("Key"), obj_version.get("VersionId"))
-            )
-            print(json.dumps(response, indent=4, default=str))
-
     else:
-        for s3_key in s3.path_list:
-            response = s3.client.head_object(
-                Bucket=s3.bucket_name,
-                Key=s3_key,
-            )
-            tags = s3.client.get_object_tagging(Bucket=s3.bucket_name, Key=s3_key)
-            acls = s3.client.get_object_acl(Bucket=s3.bucket_name, Key=s3_key)
+        if version:
+            objects = [
+                (obj_version.get("Key", ""), obj_version.get("VersionId"))
+                for obj_version in obj_versions
+            ]
+        else:
+            objects = [(s3_key, None) for s3_key in s3.path_list]
+        # print each object as a json line as soon as its details arrive
+        capture = MetadataCapture(s3.client)
+        for s3_key, version_id, metadata in capture.prefetch(
+            s3.bucket_name, objects, ordered=ordered
+        ):
+            response = {"S3Uri": "s3://%s/%s" % (s3.bucket_name, s3_key)}
+            response.update(metadata.head)
             response.pop("ResponseMetadata", None)
-            response["Tags"] = tags.get("TagSet")
-            response["Owner"] = acls.get("Owner")
-            response["Grants"] = acls.get("Grants")
-            print(80 * "-")
-            print("s3://%s/%s" % (s3.bucket_name, s3_key))
-            print(json.dumps(response, indent=4, default=str))
+            if version_id:
+                response["VersionId"] = version_id
+            response["Tags"] = metadata.tags
+            response["Owner"] = metadata.acl.get("Owner")
+            response["Grants"] = metadata.acl.get("Grants")
+            print(json.dumps(response, default=str), flush=True)
@@ -6,6 +6,8 @@ from typing import Any, List
 from fzfaws.s3.bucket_s3 import bucket_s3
 from fzfaws.s3.delete_s3 import delete_s3
 from fzfaws.s3.download_s3 import download_s3
+from fzfaws.s3.helper.object_index import set_index_refresh
+from fzfaws.s3.helper.s3_inventory import add_inventory_manifest
 from fzfaws.s3.ls_s3 import ls_s3
 from fzfaws.s3.object_s3 import object_s3
 from fzfaws.s3.presign_s3 import presign_s3
@@ -67,7 +69,26 @@ def s3(raw_args: List[Any]) -> None:
         "--sync",
         action="store_true",
         default=False,
-        help="use the aws-cli s3 sync operation",
+        help="sync the directories, only transfer new or changed files",
+    )
+    upload_cmd.add_argument(
+        "--etag",
+        action="store_true",
+        default=False,
+        help="compare files by ETag instead of last modified time during sync",
+    )
+    upload_cmd.add_argument(
+        "--resume",
+        action="store",
+        default="",
+        metavar="JOB",
+        help="resume an interrupted recursive upload, skip the files already transferred, multipart uploads cut by a hard kill continue from their uploaded parts",
+    )
+    upload_cmd.add_argument(
+        "--summary",
+        action="store_true",
+        default=False,
+        help="only print the totals in the dry run of recursive upload, useful for large directories",
     )
     upload_cmd.add_argument(
         "-e",
@@ -146,7 +167,20 @@ def s3(raw_args: List[Any]) -> None:
         "--sync",
         action="store_true",
         default=False,
-        help="use the aws-cli s3 sync operation",
+        help="sync the directories, only transfer new or changed files",
+    )
+    download_cmd.add_argument(
+        "--etag",
+        action="store_true",
+        default=False,
+        help="compare files by ETag instead of last modified time during sync",
+    )
+    download_cmd.add_argument(
+        "--resume",
+        action="store",
+        default="",
+        metavar="JOB",
+        help="resume an interrupted recursive download, skip the files already transferred",
     )
     download_cmd.add_argument(
         "-e",
@@ -218,7 +252,20 @@ def s3(raw_args: List[Any]) -> None:
         "--sync",
         action="store_true",
         default=False,
-        help="use the aws-cli s3 sync operation",
+        help="sync the directories, only transfer new or changed files",
+    )
+    bucket_cmd.add_argument(
+        "--etag",
+        action="store_true",
+        default=False,
+        help="compare files by ETag instead of last modified time during sync",
+    )
+    bucket_cmd.add_argument(
+        "--resume",
+        action="store",
+        default="",
+        metavar="JOB",
+        help="resume an interrupted recursive copy, skip the files already transferred",
     )
     bucket_cmd.add_argument(
         "-e",
@@ -300,7 +347,8 @@ def s3(raw_args: List[Any]) -> None:
         action="store",
         default=[],
         help="perform MFA deletion, require two arguments: the authentication device serial number "
-        + "and the value that is displayed on the authentication device, does not support multiple operations",
+        + "and the value that is displayed on the authentication device, selected versions are deleted "
+        + "in a single request, does not support recursive operations",
     )
     delete_cmd.add_argument(
         "-v",
@@ -500,6 +548,12 @@ def s3(raw_args: List[Any]) -> None:
         default=False,
         help="display the selected object version's versionid",
     )
+    ls_cmd.add_argument(
+        "--unordered",
+        action="store_true",
+        default=False,
+        help="print the object details in completion order instead of selection order",
+    )
     ls_cmd.add_argument(
         "-P",
         "--profile",
@@ -508,6 +562,28 @@ def s3(raw_args: List[Any]) -> None:
         default=False,
         help="choose/specify a profile for the operation",
     )
+    for command_parser in (
+        upload_cmd,
+        download_cmd,
+        bucket_cmd,
+        delete_cmd,
+        presign_cmd,
+        object_cmd,
+        ls_cmd,
+    ):
+        command_parser.add_argument(
+            "--refresh",
+            action="store_true",
+            default=False,
+            help="list the bucket again into the local object index and use the index for this run",
+        )
+        command_parser.add_argument(
+            "--inventory",
+            action="append",
+            default=[],
+            metavar="MANIFEST",
+            help="read the objects from the manifest.json of an s3 inventory report instead of listing the bucket (local path or s3://bucket/key)",
+        )
     args = parser.parse_args(raw_args)
 
     if not raw_args:
@@ -543,6 +619,10 @@ def s3(raw_args: List[Any]) -> None:
             presign_cmd.print_help()
         sys.exit(0)
 
+    if args.refresh:
+        set_index_refresh()
+    for manifest in args.inventory:
+        add_inventory_manifest(manifest)
     if args.profile == None:
         # when user set --profile flag but without argument
         args.profile = True
@@ -561,6 +641,9 @@ def s3(raw_args: List[Any]) -> None:
             args.exclude,
             args.include,
             args.extra,
+            args.etag,
+            args.resume,
+            args.summary,
         )
     elif args.subparser_name == "download":
         local_path = args.path[0] if args.path else None
@@ -575,6 +658,8 @@ def s3(raw_args: List[Any]) -> None:
             args.include,
             args.hidden,
             args.version,
+            args.etag,
+            args.resume,
         )
     elif args.subparser_name == "bucket":
         from_bucket = args.bucketpath[0] if args.bucketpath else None
@@ -589,6 +674,8 @@ def s3(raw_args: List[Any]) -> None:
             args.include,
             args.version,
             args.preserve,
+            args.etag,
+            args.resume,
         )
     elif args.subparser_name == "delete":
         mfa = " ".join(args.mfa)
@@ -629,4 +716,5 @@ def s3(raw_args: List[Any]) -> None:
             args.arn,
             args.versionid,
             args.bucketpath,
+            args.unordered,
         )
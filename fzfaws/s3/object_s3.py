@@ -1,11 +1,12 @@
 """Contains function to update s3 object attribute."""
-from typing import List, Optional, Union
+from typing import Dict, Generator, Iterable, List, Optional, Union
 
 from fzfaws.s3 import S3
-from fzfaws.s3.helper.get_copy_args import get_copy_args
+from fzfaws.s3.helper.get_copy_args import get_copy_args, get_metadata_capture
 from fzfaws.s3.helper.s3args import S3Args
 from fzfaws.s3.helper.s3progress import S3Progress
 from fzfaws.s3.helper.s3transferwrapper import S3TransferWrapper
+from fzfaws.s3.helper.transfer_scheduler import TransferJob, TransferScheduler
 from fzfaws.s3.helper.walk_s3_folder import walk_s3_folder
 from fzfaws.utils import get_confirmation
 
@@ -97,9 +98,9 @@ def object_s3(
         for s3_key in s3.path_list:
             print("(dryrun) update: s3://%s/%s" % (s3.bucket_name, s3_key))
         if get_confirmation("Confirm?"):
-            for s3_key in s3.path_list:
-                print("update: s3://%s/%s" % (s3.bucket_name, s3_key))
-                if check_result:
+            if check_result:
+                for s3_key in s3.path_list:
+                    print("update: s3://%s/%s" % (s3.bucket_name, s3_key))
                     if check_result.get("Tags"):
                         s3.client.put_object_tagging(
                             Bucket=s3.bucket_name,
@@ -111,21 +112,11 @@ def object_s3(
                         grant_args.update(check_result.get("Grants", {}))
                         s3.client.put_object_acl(**grant_args)
 
-                else:
-                    # Note: this will create new version if version is enabled
-                    copy_object_args = get_copy_args(
-                        s3, s3_key, s3_args, extra_args=True
-                    )
-                    copy_source = {"Bucket": s3.bucket_name, "Key": s3_key}
-                    s3transferwrapper = S3TransferWrapper()
-                    s3.client.copy(
-                        copy_source,
-                        s3.bucket_name,
-                        s3_key,
-                        Callback=S3Progress(s3_key, s3.bucket_name, s3.client),
-                        ExtraArgs=copy_object_args,
-                        Config=s3transferwrapper.transfer_config,
-                    )
+            else:
+                # Note: this will create new version if version is enabled
+                TransferScheduler(s3.client).run(
+                    _get_update_jobs(s3, s3_args, s3.path_list)
+                )
 
 
 def update_object_version(
@@ -230,6 +221,7 @@ def update_object_recursive(
     # this way it won't create extra versions on the object
     check_result = s3_args.check_tag_acl()
 
+    sizes: Dict[str, int] = {}
     file_list = walk_s3_folder(
         s3.client,
         s3.bucket_name,
@@ -241,6 +233,7 @@ def update_object_recursive(
         "object",
         s3.path_list[0],
         s3.bucket_name,
+        sizes=sizes,
     )
     if get_confirmation("Confirm?"):
         if check_result:
@@ -258,22 +251,12 @@ def update_object_recursive(
                     s3.client.put_object_acl(**grant_args)
 
         else:
-            for original_key, _ in file_list:
-                print("update: s3://%s/%s" % (s3.bucket_name, original_key))
-                # Note: this will create new version if version is enabled
-                copy_object_args = get_copy_args(
-                    s3, original_key, s3_args, extra_args=True
-                )
-                copy_source = {"Bucket": s3.bucket_name, "Key": original_key}
-                s3transferwrapper = S3TransferWrapper()
-                s3.client.copy(
-                    copy_source,
-                    s3.bucket_name,
-                    original_key,
-                    Callback=S3Progress(original_key, s3.bucket_name, s3.client),
-                    ExtraArgs=copy_object_args,
-                    Config=s3transferwrapper.transfer_config,
+            # Note: this will create new version if version is enabled
+            TransferScheduler(s3.client).run(
+                _get_update_jobs(
+                    s3, s3_args, (original_key for original_key, _ in file_list), sizes
                 )
+            )
 
 
 def update_object_name(s3: S3, version: bool = False) -> None:
@@ -372,3 +355,50 @@ def update_object_name(s3: S3, version: bool = False) -> None:
                 ExtraArgs=copy_object_args,
                 Config=s3transferwrapper.transfer_config,
             )
+
+
+def _get_update_jobs(
+    s3: S3,
+    s3_args: S3Args,
+    s3_keys: Iterable[str],
+    sizes: Optional[Dict[str, int]] = None,
+) -> Generator[TransferJob, None, None]:
+    """Get the copy jobs to update the objects in place.
+
+    The metadata is captured concurrently and the jobs are yielded as it
+    arrives. An object that failed to be captured is yielded as a failed
+    job so the rest of the objects carry on.
+
+    :param s3: S3 instance
+    :type s3: S3
+    :param s3_args: S3Args instance with the new settings
+    :type s3_args: S3Args
+    :param s3_keys: keys of the objects to update
+    :type s3_keys: Iterable[str]
+    :param sizes: sizes of the objects from the listing
+    :type sizes: Dict[str, int], optional
+    :return: copy jobs in generator form
+    :rtype: Generator[TransferJob, None, None]
+    """
+    capture = get_metadata_capture(s3, s3_args)
+    for s3_key, _, object_metadata in capture.prefetch(
+        s3.bucket_name, ((s3_key, None) for s3_key in s3_keys), return_errors=True
+    ):
+        job = TransferJob(
+            "copy",
+            s3.bucket_name,
+            s3_key,
+            copy_source={"Bucket": s3.bucket_name, "Key": s3_key},
+            message="update: s3://%s/%s" % (s3.bucket_name, s3_key),
+            size=(sizes or {}).get(s3_key),
+        )
+        if isinstance(object_metadata, Exception):
+            yield job._replace(error=object_metadata)
+            continue
+        if job.size is None:
+            job = job._replace(size=object_metadata.head.get("ContentLength"))
+        yield job._replace(
+            extra_args=get_copy_args(
+                s3, s3_key, s3_args, extra_args=True, metadata=object_metadata
+            )
+        )
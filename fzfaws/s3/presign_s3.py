@@ -28,6 +28,8 @@ def presign_s3(
     if not s3.path_list[0]:
         s3.set_s3_object(version=version, multi_select=True)
 
+    # sign with the region of the bucket so the url doesn't get redirected
+    client = s3.get_bucket_client()
     if version:
         obj_versions = s3.get_object_version()
         for obj_version in obj_versions:
@@ -36,7 +38,7 @@ def presign_s3(
                 "Key": obj_version.get("Key"),
                 "VersionId": obj_version.get("VersionId"),
             }
-            url = s3.client.generate_presigned_url(
+            url = client.generate_presigned_url(
                 "get_object", Params=presign_param, ExpiresIn=expires_in
             )
             print(80 * "-")
@@ -45,7 +47,7 @@ def presign_s3(
     else:
         for s3_key in s3.path_list:
             presign_param = {"Bucket": s3.bucket_name, "Key": s3_key}
-            url = s3.client.generate_presigned_url(
+            url = client.generate_presigned_url(
                 "get_object", Params=presign_param, ExpiresIn=expires_in
             )
             print(80 * "-")
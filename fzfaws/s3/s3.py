@@ -1,17 +1,37 @@
 """Contains the s3 wrapper class."""
-import itertools
 import os
 import re
-from typing import Any, Dict, Generator, List, Optional, Sequence, Tuple, Union
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from botocore.exceptions import ClientError
 
+from fzfaws.s3.helper.bucket_region import get_bucket_client, get_bucket_region
+from fzfaws.s3.helper.list_object_versions import (
+    iter_object_versions,
+    summarize_object_versions,
+)
+from fzfaws.s3.helper.object_index import get_listing_source
+from fzfaws.s3.helper.prefix_picker import PICKER_HEADER, get_reload_binds
+from fzfaws.s3.helper.prefix_trie import PrefixTrie
+from fzfaws.s3.helper.s3_inventory import S3Inventory
+from fzfaws.s3.helper.s3progress import human_readable_size
 from fzfaws.utils import BaseSession, FileLoader, Pyfzf, Spinner, get_confirmation
 from fzfaws.utils.exceptions import (
     InvalidFileType,
     InvalidS3PathPattern,
     NoSelectionMade,
 )
+from fzfaws.utils.preview import FilePreview
 
 
 class S3(BaseSession):
@@ -45,8 +65,12 @@ class S3(BaseSession):
         """
         fzf = Pyfzf()
         with Spinner.spin(message="Fetching s3 buckets ...", no_progress=no_progress):
-            response = self.client.list_buckets()
-        fzf.process_list(response["Buckets"], "Name")
+            buckets = list(self._bucket_generator(self.paginate("list_buckets")))
+        fzf.process_list(
+            buckets,
+            "Name",
+            reload=self.refreshed("list_buckets", self._bucket_generator),
+        )
         self.bucket_name = str(fzf.execute_fzf(header=header))
 
     def set_bucket_and_path(self, bucket: str = None) -> None:
@@ -101,49 +125,56 @@ class S3(BaseSession):
             # print("S3 file path is set to root")
             pass
         elif selected_option == "append" or selected_option == "interactively":
-            paginator = self.client.get_paginator("list_objects")
             fzf = Pyfzf()
             parents = []
             # interactively search down 'folders' in s3
-            while True:
-                if len(parents) > 0:
-                    fzf.append_fzf("\033[34m../\033[0m\n")
-                fzf.append_fzf("\033[33m./\033[0m\n")
-                with Spinner.spin(message="Fetching s3 objects ..."):
-                    preview: str = ""
-                    for result in paginator.paginate(
-                        Bucket=self.bucket_name,
-                        Prefix=self.path_list[0],
-                        Delimiter="/",
+            source = get_listing_source(self.client, self.bucket_name)
+            trie = PrefixTrie(
+                self.client,
+                self.bucket_name,
+                # each listing of an inventory report reads the whole report
+                max_prefetch=0 if isinstance(source, S3Inventory) else 20,
+                index=source,
+            )
+            with trie, FilePreview() as preview:
+                while True:
+                    if len(parents) > 0:
+                        fzf.append_fzf("\033[34m../\033[0m\n")
+                        preview.add("../", trie.get(parents[-1]).keys)
+                    fzf.append_fzf("\033[33m./\033[0m\n")
+                    with Spinner.spin(
+                        message="Fetching s3 objects ...",
+                        no_progress=self.path_list[0] in trie,
                     ):
-                        for prefix in result.get("CommonPrefixes", []):
-                            fzf.append_fzf("%s\n" % prefix.get("Prefix"))
-                        for content in result.get("Contents", []):
-                            preview += content.get("Key")
-                            preview += "^"
-
-                # has to use tr to transform the string to new line during preview by fzf
-                # not sure why, but if directly use \n, fzf preview interpret as a new command
-                # TODO: findout why
-                selected_path = str(
-                    fzf.execute_fzf(
-                        print_col=0,
-                        header='PWD: s3://%s/%s (select "./" will the current path)'
-                        % (self.bucket_name, self.path_list[0]),
-                        preview="echo %s | tr '^' '\n'" % preview.rstrip(),
+                        listing = trie.get(self.path_list[0])
+                    preview.add("./", listing.keys)
+                    # list the folders in view while user is selecting
+                    trie.prefetch(
+                        listing.prefixes,
+                        callback=lambda prefix, child: preview.add(prefix, child.keys),
                     )
-                )
-                if not selected_path:
-                    raise NoSelectionMade
-                if selected_path == "../":
-                    self.path_list[0] = parents.pop()
-                elif selected_path == "./":
-                    break
-                else:
-                    parents.append(self.path_list[0])
-                    self.path_list[0] = selected_path
-                # reset fzf string
-                fzf.fzf_string = ""
+                    for prefix in listing.prefixes:
+                        fzf.append_fzf("%s\n" % prefix)
+
+                    selected_path = str(
+                        fzf.execute_fzf(
+                            print_col=0,
+                            header='PWD: s3://%s/%s (select "./" will the current path)'
+                            % (self.bucket_name, self.path_list[0]),
+                            preview=preview.command,
+                        )
+                    )
+                    if not selected_path:
+                        raise NoSelectionMade
+                    if selected_path == "../":
+                        self.path_list[0] = parents.pop()
+                    elif selected_path == "./":
+                        break
+                    else:
+                        parents.append(self.path_list[0])
+                        self.path_list[0] = selected_path
+                    # reset fzf string
+                    fzf.fzf_string = ""
 
             if selected_option == "append":
                 print(
@@ -162,11 +193,18 @@ class S3(BaseSession):
         multi_select: bool = False,
         deletemark: bool = False,
         no_progress: bool = False,
+        prefix: str = "",
     ) -> None:
         """List object within a bucket and let user select a object.
 
-        Stores the file path and the filetype into the instance attributes
-        using paginator to get all results.
+        Stores the file path and the filetype into the instance attributes.
+        Only a single level under the prefix is listed, folders are displayed
+        in yellow and selecting a folder lists the folder. Pages are streamed
+        into fzf as they are fetched, so fzf is displayed before the listing completes.
+
+        The fzf keys in PICKER_HEADER reload fzf with another level or with
+        the query as prefix, the listing is done server side by
+        fzfaws.s3.helper.prefix_picker.
 
         All of the deleted object are displayed in red color when version mode
         is enabled.
@@ -179,47 +217,37 @@ class S3(BaseSession):
         :type deletemark: bool, optional
         :param no_progress: don't display progress bar, useful for ls command
         :type no_progress: bool, optional
+        :param prefix: prefix to start the listing
+        :type prefix: str, optional
         :raises NoSelectionMade: when there is no selection made
         """
-        fzf = Pyfzf()
-
-        if not version:
-            paginator = self.client.get_paginator("list_objects")
-            with Spinner.spin(
-                message="Fetching s3 objects ...", no_progress=no_progress
+        while True:
+            fzf = Pyfzf()
+            fzf.stream_fzf(self.get_prefix_entries(prefix, version, deletemark))
+            for key, command in get_reload_binds(
+                self.bucket_name, self.profile, self.region, version, deletemark
             ):
-                for result in paginator.paginate(Bucket=self.bucket_name):
-                    for file in result.get("Contents", []):
-                        if file.get("Key").endswith("/") or not file.get("Key"):
-                            # user created dir in S3 console will appear in the result and is not operatable
-                            continue
-                        fzf.append_fzf("Key: %s\n" % file.get("Key"))
+                fzf.bind_reload(key, command)
+
             if multi_select:
-                self.path_list = list(
-                    fzf.execute_fzf(multi_select=True, delimiter=": ")
+                selected = list(
+                    fzf.execute_fzf(
+                        multi_select=True, delimiter=": ", header=PICKER_HEADER
+                    )
                 )
             else:
-                self.path_list[0] = str(fzf.execute_fzf(delimiter=": "))
+                selected = [str(fzf.execute_fzf(delimiter=": ", header=PICKER_HEADER))]
+
+            keys = [key for key in selected if not key.endswith("/")]
+            if keys:
+                break
+            # only folders are selected, list the first folder
+            prefix = selected[0]
 
+        if multi_select:
+            self.path_list = keys
         else:
-            paginator = self.client.get_paginator("list_object_versions")
-            with Spinner.spin(
-                message="Fetching s3 objects ...", no_progress=no_progress
-            ):
-                results = paginator.paginate(Bucket=self.bucket_name)
-                version_obj_genrator = self._uniq_object_generator(results, deletemark)
-                generated = False
-                for item in version_obj_genrator:
-                    generated = True
-                    fzf.append_fzf(item + "\n")
-                if not generated:
-                    raise NoSelectionMade
-            if multi_select:
-                self.path_list = list(
-                    fzf.execute_fzf(delimiter=": ", multi_select=True)
-                )
-            else:
-                self.path_list[0] = str(fzf.execute_fzf(delimiter=": "))
+            self.path_list[0] = keys[0]
 
     def get_object_version(
         self,
@@ -263,43 +291,50 @@ class S3(BaseSession):
             key_list.extend(self.path_list)
         selected_versions: list = []
         for key in key_list:
-            response_generator: Union[list, Generator[Dict[str, str], None, None]] = []
-            with Spinner.spin(
-                message="Fetching object versions ...", no_progress=no_progress
-            ):
-                paginator = self.client.get_paginator("list_object_versions")
-                for result in paginator.paginate(Bucket=bucket, Prefix=key):
-                    response_generator = self._version_generator(
-                        result.get("Versions", []),
-                        result.get("DeleteMarkers", []),
-                        non_current,
-                        delete,
-                    )
-                    if not select_all:
-                        fzf.process_list(
-                            response_generator,
-                            "VersionId",
-                            "Key",
-                            "IsLatest",
-                            "DeleteMarker",
-                            "LastModified",
-                        )
-                    else:
+            paginator = self.client.get_paginator("list_object_versions")
+            if select_all:
+                with Spinner.spin(
+                    message="Fetching object versions ...", no_progress=no_progress
+                ):
+                    for result in paginator.paginate(Bucket=bucket, Prefix=key):
                         selected_versions.extend(
                             [
                                 {"Key": key, "VersionId": version.get("VersionId")}
-                                for version in response_generator
+                                for version in self._version_generator(
+                                    result.get("Versions", []),
+                                    result.get("DeleteMarkers", []),
+                                    non_current,
+                                    delete,
+                                )
                             ]
                         )
+                continue
 
-            if not select_all:
-                if delete and multi_select:
-                    for result in fzf.execute_fzf(multi_select=True):
-                        selected_versions.append({"Key": key, "VersionId": result})
-                else:
-                    selected_versions.append(
-                        {"Key": key, "VersionId": str(fzf.execute_fzf())}
+            fzf.process_list(
+                (
+                    version
+                    for result in paginator.paginate(Bucket=bucket, Prefix=key)
+                    for version in self._version_generator(
+                        result.get("Versions", []),
+                        result.get("DeleteMarkers", []),
+                        non_current,
+                        delete,
                     )
+                ),
+                "VersionId",
+                "Key",
+                "IsLatest",
+                "DeleteMarker",
+                "LastModified",
+                stream=True,
+            )
+            if delete and multi_select:
+                for result in fzf.execute_fzf(multi_select=True):
+                    selected_versions.append({"Key": key, "VersionId": result})
+            else:
+                selected_versions.append(
+                    {"Key": key, "VersionId": str(fzf.execute_fzf())}
+                )
         return selected_versions
 
     def get_object_data(self, file_type: str = "") -> Dict[str, Any]:
@@ -327,6 +362,16 @@ class S3(BaseSession):
                 raise InvalidFileType
         return body_dict
 
+    def get_bucket_client(self, bucket: str = ""):
+        """Return the shared client pinned to the region of the bucket.
+
+        :param bucket: name of the bucket, if not set, bucket_name will be used
+        :type bucket: str, optional
+        :return: boto3 client in the region of the bucket
+        :rtype: boto3.client
+        """
+        return get_bucket_client(self.client, bucket or self.bucket_name, self.profile)
+
     def get_object_url(self, version: str = "", object_key: str = "") -> str:
         """Return the object url of the current selected object.
 
@@ -340,8 +385,7 @@ class S3(BaseSession):
         if not object_key:
             object_key = self.path_list[0]
 
-        response = self.client.get_bucket_location(Bucket=self.bucket_name)
-        bucket_location = response["LocationConstraint"]
+        bucket_location = get_bucket_region(self.client, self.bucket_name)
         if not version:
             return "https://s3-%s.amazonaws.com/%s/%s" % (
                 bucket_location,
@@ -476,42 +520,139 @@ class S3(BaseSession):
                     "LastModified": marker.get("LastModified"),
                 }
 
+    def _bucket_generator(
+        self, pages: Iterable[Dict[str, Any]]
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Create generator for the buckets of list_buckets.
+
+        :param pages: pages from self.paginate("list_buckets")
+        :type pages: Iterable[Dict[str, Any]]
+        :return: buckets in generator form
+        :rtype: Generator[Dict[str, Any], None, None]
+        """
+        for result in pages:
+            for bucket in result.get("Buckets", []):
+                yield bucket
+
+    def get_prefix_entries(
+        self, prefix: str = "", version: bool = False, deletemark: bool = False
+    ) -> Generator[str, None, None]:
+        """Create fzf entries of a single level under the prefix lazily.
+
+        Folders are listed through the CommonPrefixes of a delimited listing,
+        deeper levels are not fetched until the folder is opened.
+        Objects are read from the local object index or the inventory report
+        when available, versions are always listed from the bucket.
+
+        :param prefix: prefix to list
+        :type prefix: str, optional
+        :param version: list object versions
+        :type version: bool, optional
+        :param deletemark: only list objects with delete marker
+        :type deletemark: bool, optional
+        :return: formatted fzf entries in generator form
+        :rtype: Generator[str, None, None]
+        """
+        source = None
+        if not version:
+            source = get_listing_source(self.client, self.bucket_name)
+        if source:
+            listing = source.list_prefix(prefix)
+            result = {
+                "CommonPrefixes": [{"Prefix": folder} for folder in listing.prefixes],
+                "Contents": [{"Key": key} for key in listing.keys],
+            }
+            yield from self._folder_generator(result)
+            yield from self._object_generator([result])
+            return
+
+        operation = "list_object_versions" if version else "list_objects"
+        paginator = self.client.get_paginator(operation)
+        results = paginator.paginate(
+            Bucket=self.bucket_name, Prefix=prefix, Delimiter="/"
+        )
+        if not version:
+            for result in results:
+                yield from self._folder_generator(result)
+                yield from self._object_generator([result])
+            return
+
+        # versions of a key could span pages, all pages go through a single uniq
+        # generator, folders of each page are yielded once the page is read
+        folders: List[str] = []
+
+        def _read_pages() -> Generator[Dict[str, Any], None, None]:
+            for result in results:
+                folders.extend(self._folder_generator(result))
+                yield result
+
+        for item in self._uniq_object_generator(_read_pages(), deletemark):
+            while folders:
+                yield folders.pop(0)
+            yield "%s\n" % item
+        yield from folders
+
+    def _folder_generator(self, result: Dict[str, Any]) -> Generator[str, None, None]:
+        """Create fzf entries of the folders in a delimited listing page.
+
+        :param result: a page of list_objects or list_object_versions
+        :type result: Dict[str, Any]
+        :return: formatted fzf entries in generator form
+        :rtype: Generator[str, None, None]
+        """
+        for common_prefix in result.get("CommonPrefixes", []):
+            yield "\033[33mPrefix: %s\033[0m\n" % common_prefix.get("Prefix")
+
+    def _object_generator(
+        self, results: Iterable[Dict[str, Any]]
+    ) -> Generator[str, None, None]:
+        """Create fzf entries of the objects lazily from list_objects pages.
+
+        :param results: the result from boto3 paginator
+        :type results: Iterable[Dict[str, Any]]
+        :return: formatted fzf entries in generator form
+        :rtype: Generator[str, None, None]
+        """
+        for result in results:
+            for file in result.get("Contents", []):
+                if file.get("Key").endswith("/") or not file.get("Key"):
+                    # user created dir in S3 console will appear in the result and is not operatable
+                    continue
+                yield "Key: %s\n" % file.get("Key")
+
     def _uniq_object_generator(
-        self, results: List[Dict[str, Any]], onlydelete: bool
+        self, results: Iterable[Dict[str, Any]], onlydelete: bool
     ) -> Generator[str, None, None]:
         """Create uniq version generator.
 
-        Attempt to improve the performance on big data sets. Comparing with previous
-        solutions, although this handle one less edge case (if user delete a version object
-        but then created a new object with the same name), this is much faster and better
-        in memory usage.
+        Keys are listed once across all pages, S3 lists the versions in key
+        order so only the counters of the current key are kept in memory.
+        Each entry displays the number of versions and the size of the non-current
+        versions, the space reclaimed by delete --clean.
+
+        Keys with delete marker are displayed in red.
 
         :param results: the result from boto3 paginator
-        :type results: List[Dict[str, Any]]
+        :type results: Iterable[Dict[str, Any]]
         :param onlydelete: boolean indicator indicates whether to only show deletemark.
             This is only used by delete operation with "-d, --deletemark" flag.
         :type onlydelete: bool
         :return: return the uniq object generator
         :rtype: Generator[str, None, None]
         """
-
-        def _uniq(version_obj):
-            return version_obj.get("Key")
-
-        for result in results:
-            deletemarks = itertools.groupby(result.get("DeleteMarkers", []), _uniq)
-            delete_sets = set()
-            for deletemark, _ in deletemarks:
-                delete_sets.add(deletemark)
-
-            for deletemark in delete_sets:
-                if deletemark.endswith("/"):
-                    continue
-                yield "\033[31m" + "Key: %s" % deletemark + "\033[0m"
-
-            if not onlydelete:
-                for version, _ in itertools.groupby(result.get("Versions", []), _uniq):
-                    if version.endswith("/") or version in delete_sets:
-                        continue
-                    else:
-                        yield "Key: %s" % version
+        for summary in summarize_object_versions(iter_object_versions(results)):
+            if summary.key.endswith("/"):
+                continue
+            if onlydelete and not summary.delete_markers:
+                continue
+            info = "%s version(s)" % summary.versions
+            if summary.delete_markers:
+                info += ", %s delete marker(s)" % summary.delete_markers
+            if summary.noncurrent_bytes:
+                info += ", %s non-current" % human_readable_size(
+                    summary.noncurrent_bytes
+                )
+            if summary.delete_markers:
+                yield "\033[31mKey: %s\033[0m: %s" % (summary.key, info)
+            else:
+                yield "Key: %s: %s" % (summary.key, info)
@@ -1,13 +1,15 @@
 """Contains function to upload file to s3."""
-import os
-from typing import Dict, List, Optional, Union
+import json
+import tempfile
+from typing import IO, Generator, List, Optional, Union
 
 from fzfaws.s3 import S3
-from fzfaws.s3.helper.exclude_file import exclude_file
 from fzfaws.s3.helper.s3args import S3Args
-from fzfaws.s3.helper.s3progress import S3Progress
-from fzfaws.s3.helper.s3transferwrapper import S3TransferWrapper
+from fzfaws.s3.helper.s3progress import human_readable_size
+from fzfaws.s3.helper.scan_local_tree import scan_local_tree
 from fzfaws.s3.helper.sync_s3 import sync_s3
+from fzfaws.s3.helper.transfer_journal import open_transfer_journal
+from fzfaws.s3.helper.transfer_scheduler import TransferJob, TransferScheduler
 from fzfaws.utils import Pyfzf, get_confirmation
 
 
@@ -22,6 +24,9 @@ def upload_s3(
     exclude: Optional[List[str]] = None,
     include: Optional[List[str]] = None,
     extra_config: bool = False,
+    etag: bool = False,
+    resume: str = "",
+    summary: bool = False,
 ) -> None:
     """Upload local files/directories to s3.
 
@@ -40,7 +45,7 @@ def upload_s3(
     :type hidden: bool, optional
     :param search_root: search from root
     :type search_root: bool, optional
-    :param sync: use aws cli s3 sync
+    :param sync: sync the local directory to s3
     :type sync: bool, optional
     :param exclude: glob patterns to exclude
     :type exclude: List[str], optional
@@ -48,6 +53,12 @@ def upload_s3(
     :type include: List[str], optional
     :param extra_config: configure extra settings during upload
     :type extra_config: bool, optional
+    :param etag: compare files by ETag instead of last modified time during sync
+    :type etag: bool, optional
+    :param resume: id of the interrupted recursive upload to resume
+    :type resume: str, optional
+    :param summary: only print the totals in the dry run of recursive upload
+    :type summary: bool, optional
     """
     if not local_paths:
         local_paths = []
@@ -94,10 +105,12 @@ def upload_s3(
             include=include,
             from_path=local_path,
             to_path="s3://%s/%s" % (s3.bucket_name, s3.path_list[0]),
+            client=s3.client,
+            etag=etag,
         )
 
     elif recursive:
-        recursive_upload(s3, local_path, exclude, include, extra_args)
+        recursive_upload(s3, local_path, exclude, include, extra_args, resume, summary)
 
     else:
         for filepath in local_paths:
@@ -109,28 +122,42 @@ def upload_s3(
             )
 
         if get_confirmation("Confirm?"):
+            jobs: List[TransferJob] = []
             for filepath in local_paths:
                 destination_key = s3.get_s3_destination_key(filepath)
-                print(
-                    "upload: %s to s3://%s/%s"
-                    % (filepath, s3.bucket_name, destination_key)
-                )
-                transfer = S3TransferWrapper(s3.client)
-                transfer.s3transfer.upload_file(
-                    filepath,
-                    s3.bucket_name,
-                    destination_key,
-                    callback=S3Progress(filepath),
-                    extra_args=extra_args.extra_args,
+                jobs.append(
+                    TransferJob(
+                        "upload",
+                        s3.bucket_name,
+                        destination_key,
+                        filename=filepath,
+                        extra_args=extra_args.extra_args,
+                        message="upload: %s to s3://%s/%s"
+                        % (filepath, s3.bucket_name, destination_key),
+                    )
                 )
+            TransferScheduler(s3.client).run(jobs)
 
 
 def recursive_upload(
-    s3: S3, local_path: str, exclude: List[str], include: List[str], extra_args: S3Args
+    s3: S3,
+    local_path: str,
+    exclude: List[str],
+    include: List[str],
+    extra_args: S3Args,
+    resume: str = "",
+    summary: bool = False,
 ) -> None:
     """Recursive upload local directory to s3.
 
-    Perform a os.walk to upload everyfile under a directory.
+    The directory is scanned concurrently through scan_local_tree, the
+    dry run prints the files and the totals, or only the totals with
+    summary. The files shown are spooled to a temporary file instead of
+    being kept in memory, once confirmed exactly those files are uploaded,
+    files created after the dry run are left out.
+
+    Uploads are recorded in a TransferJournal, files uploaded by the
+    interrupted job to resume are skipped.
 
     :param s3: S3 instance
     :type s3: S3
@@ -142,41 +169,73 @@ def recursive_upload(
     :type include: List[str]
     :param extra_args: S3Args instance to set extra argument
     :type extra_args: S3Args
+    :param resume: id of the interrupted upload to resume
+    :type resume: str, optional
+    :param summary: only print the totals in the dry run
+    :type summary: bool, optional
     """
-    upload_list: List[Dict[str, str]] = []
-    for root, _, files in os.walk(local_path):
-        for filename in files:
-            full_path = os.path.join(root, filename)
-            relative_path = os.path.relpath(full_path, local_path)
-
-            if not exclude_file(exclude, include, relative_path):
-                destination_key = s3.get_s3_destination_key(
-                    relative_path, recursive=True
-                )
+    with tempfile.TemporaryFile(mode="w+") as spool:
+        total_files = 0
+        total_bytes = 0
+        for local_file in scan_local_tree(local_path, exclude, include):
+            destination_key = s3.get_s3_destination_key(
+                local_file.relative_path, recursive=True
+            )
+            if not summary:
                 print(
                     "(dryrun) upload: %s to s3://%s/%s"
-                    % (relative_path, s3.bucket_name, destination_key)
+                    % (local_file.relative_path, s3.bucket_name, destination_key)
                 )
-                upload_list.append(
-                    {
-                        "local_path": full_path,
-                        "bucket": s3.bucket_name,
-                        "key": destination_key,
-                        "relative": relative_path,
-                    }
+            spool.write(
+                "%s\n"
+                % json.dumps(
+                    [
+                        local_file.path,
+                        local_file.relative_path,
+                        local_file.size,
+                        destination_key,
+                    ]
                 )
-
-    if get_confirmation("Confirm?"):
-        for item in upload_list:
-            print(
-                "upload: %s to s3://%s/%s"
-                % (item["relative"], item["bucket"], item["key"])
-            )
-            transfer = S3TransferWrapper(s3.client)
-            transfer.s3transfer.upload_file(
-                item["local_path"],
-                item["bucket"],
-                item["key"],
-                callback=S3Progress(item["local_path"]),
-                extra_args=extra_args.extra_args,
             )
+            total_files += 1
+            total_bytes += local_file.size
+        if not total_files:
+            return
+        print(
+            "(dryrun) total: %s file(s), %s"
+            % (total_files, human_readable_size(total_bytes))
+        )
+
+        if get_confirmation("Confirm?"):
+            spool.seek(0)
+            TransferScheduler(
+                s3.client, journal=open_transfer_journal("upload", resume)
+            ).run(_get_upload_jobs(s3, spool, extra_args))
+
+
+def _get_upload_jobs(
+    s3: S3, spool: IO[str], extra_args: S3Args
+) -> Generator[TransferJob, None, None]:
+    """Read the files spooled during the dry run into upload jobs lazily.
+
+    :param s3: S3 instance
+    :type s3: S3
+    :param spool: file of json [path, relative_path, size, key] lines
+    :type spool: IO[str]
+    :param extra_args: S3Args instance to set extra argument
+    :type extra_args: S3Args
+    :return: upload jobs with the size from the scan in generator form
+    :rtype: Generator[TransferJob, None, None]
+    """
+    for line in spool:
+        path, relative_path, size, destination_key = json.loads(line)
+        yield TransferJob(
+            "upload",
+            s3.bucket_name,
+            destination_key,
+            filename=path,
+            extra_args=extra_args.extra_args,
+            message="upload: %s to s3://%s/%s"
+            % (relative_path, s3.bucket_name, destination_key),
+            size=size,
+        )
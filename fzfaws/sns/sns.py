@@ -1,7 +1,7 @@
 """The module contains the sns wrapper class."""
-from typing import Optional, Union, List
+from typing import Any, Dict, Generator, Iterable, List, Optional, Union
 
-from fzfaws.utils import BaseSession, Pyfzf, Spinner
+from fzfaws.utils import BaseSession, Pyfzf
 
 
 class SNS(BaseSession):
@@ -47,10 +47,12 @@ class SNS(BaseSession):
         """
         if not arns:
             fzf = Pyfzf()
-            with Spinner.spin(message="Fetching sns topics ..."):
-                paginator = self.client.get_paginator("list_topics")
-                for result in paginator.paginate():
-                    fzf.process_list(result.get("Topics", []), "TopicArn")
+            fzf.process_list(
+                self._topic_generator(self.paginate("list_topics")),
+                "TopicArn",
+                stream=True,
+                reload=self.refreshed("list_topics", self._topic_generator),
+            )
             arns = fzf.execute_fzf(
                 empty_allow=empty_allow, multi_select=multi_select, header=header
             )
@@ -58,3 +60,17 @@ class SNS(BaseSession):
             self.arns[0] = str(arns)
         elif type(arns) == list:
             self.arns = list(arns)
+
+    def _topic_generator(
+        self, pages: Iterable[Dict[str, Any]]
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Create generator for the topics in list_topics pages.
+
+        :param pages: pages from self.paginate("list_topics")
+        :type pages: Iterable[Dict[str, Any]]
+        :return: topics in generator form
+        :rtype: Generator[Dict[str, Any], None, None]
+        """
+        for result in pages:
+            for topic in result.get("Topics", []):
+                yield topic
@@ -0,0 +1,191 @@
+"""This module contains the on disk response cache.
+
+Responses of the list/describe calls are cached under
+$XDG_CACHE_HOME/fzfaws so that the pickers could open instantly
+on the next invocation.
+"""
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+# bumped when the format of the cache files changes, older files are ignored
+CACHE_FORMAT = 2
+
+_datetime_format = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+class ResponseCache:
+    """Cache boto3 responses on disk with a time to live.
+
+    Each entry is keyed by profile, region, service, operation and parameters.
+    The ttl is read from FZFAWS_<SERVICE>_CACHE_TTL and then FZFAWS_GLOBAL_CACHE_TTL
+    in seconds, the cache is disabled when ttl is 0 or not set. An invalid ttl
+    is warned about and the cache is disabled.
+
+    Datetimes of the responses are stored with a type tag so that cached pages
+    are the same as the boto3 responses.
+
+    Example:
+        cache = ResponseCache(profile="default", region="us-east-1", service_name="ec2")
+        cached = cache.get("describe_instances", {})
+        if cached is None:
+            cache.set("describe_instances", {}, pages)
+
+    :param profile: profile used for the requests
+    :type profile: str, optional
+    :param region: region used for the requests
+    :type region: str, optional
+    :param service_name: name of the boto3 service
+    :type service_name: str
+    """
+
+    def __init__(
+        self,
+        profile: Optional[str] = None,
+        region: Optional[str] = None,
+        service_name: str = "",
+    ) -> None:
+        """Construct the cache instance."""
+        self.profile: Optional[str] = profile
+        self.region: Optional[str] = region
+        self.service_name: str = service_name
+        self.ttl: int = _get_ttl(service_name)
+        home = os.path.expanduser("~")
+        base_directory = os.getenv("XDG_CACHE_HOME", "%s/.cache" % home)
+        self.cache_dir: str = "%s/fzfaws" % base_directory
+
+    @property
+    def enabled(self) -> bool:
+        """Return if the cache is enabled."""
+        return self.ttl > 0
+
+    def get(
+        self, operation: str, params: Dict[str, Any]
+    ) -> Optional[Tuple[List[Dict[str, Any]], bool]]:
+        """Read the cached pages of the operation.
+
+        :param operation: name of the boto3 operation
+        :type operation: str
+        :param params: parameters of the operation
+        :type params: Dict[str, Any]
+        :return: cached pages and whether the pages are expired, None if not cached
+        :rtype: Optional[Tuple[List[Dict[str, Any]], bool]]
+        """
+        try:
+            with open(self.get_path(operation, params), "r") as file:
+                cached = json.load(file, object_hook=_decode_datetime)
+        except (OSError, ValueError):
+            return None
+        if cached.get("format") != CACHE_FORMAT:
+            return None
+        expired = time.time() - cached.get("created", 0) > self.ttl
+        return cached.get("pages", []), expired
+
+    def set(
+        self, operation: str, params: Dict[str, Any], pages: List[Dict[str, Any]]
+    ) -> None:
+        """Store the pages of the operation.
+
+        The file is written to a temp file first and then renamed,
+        so that concurrent fzfaws process won't read a partial file.
+
+        :param operation: name of the boto3 operation
+        :type operation: str
+        :param params: parameters of the operation
+        :type params: Dict[str, Any]
+        :param pages: all pages returned by the operation
+        :type pages: List[Dict[str, Any]]
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir)
+        try:
+            with os.fdopen(file_descriptor, "w") as file:
+                json.dump(
+                    {"format": CACHE_FORMAT, "created": time.time(), "pages": pages},
+                    file,
+                    default=_encode_datetime,
+                )
+            os.replace(temp_path, self.get_path(operation, params))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def get_path(self, operation: str, params: Dict[str, Any]) -> str:
+        """Get the cache file path of the operation.
+
+        :param operation: name of the boto3 operation
+        :type operation: str
+        :param params: parameters of the operation
+        :type params: Dict[str, Any]
+        :return: path to the cache file
+        :rtype: str
+        """
+        key = json.dumps(
+            [self.profile, self.region, self.service_name, operation, params],
+            sort_keys=True,
+            default=str,
+        )
+        return "%s/%s.json" % (
+            self.cache_dir,
+            hashlib.sha256(key.encode("utf-8")).hexdigest(),
+        )
+
+
+def _get_ttl(service_name: str) -> int:
+    """Read the ttl of the service from the env.
+
+    :param service_name: name of the boto3 service
+    :type service_name: str
+    :return: ttl in seconds, 0 if not set or invalid
+    :rtype: int
+    """
+    name = "FZFAWS_%s_CACHE_TTL" % service_name.upper()
+    if os.getenv(name) is None:
+        name = "FZFAWS_GLOBAL_CACHE_TTL"
+    try:
+        return int(os.getenv(name, "0"))
+    except ValueError:
+        # stdout could be the input of fzf during reload
+        print(
+            "Invalid %s %s, response cache disabled" % (name, os.getenv(name)),
+            file=sys.stderr,
+        )
+        return 0
+
+
+def _encode_datetime(value: Any) -> Any:
+    """Encode the datetimes of the responses with a type tag.
+
+    :param value: value not serializable by json
+    :type value: Any
+    :return: the tagged datetime, str of other values
+    :rtype: Any
+    """
+    if not isinstance(value, datetime):
+        return str(value)
+    offset = value.utcoffset()
+    return {
+        "__datetime__": value.strftime(_datetime_format),
+        "utcoffset": offset.total_seconds() if offset is not None else None,
+    }
+
+
+def _decode_datetime(value: Dict[str, Any]) -> Any:
+    """Restore the datetimes tagged by _encode_datetime.
+
+    :param value: decoded json object
+    :type value: Dict[str, Any]
+    :return: the datetime or the original object
+    :rtype: Any
+    """
+    if "__datetime__" not in value:
+        return value
+    result = datetime.strptime(value["__datetime__"], _datetime_format)
+    if value.get("utcoffset") is not None:
+        result = result.replace(tzinfo=timezone(timedelta(seconds=value["utcoffset"])))
+    return result
@@ -35,3 +35,15 @@ class EC2Error(Exception):
     """Generic exception when the error is caused by during EC2 operation."""
 
     pass
+
+
+class InvalidJournal(Exception):
+    """The journal of the transfer job to resume is not found or invalid."""
+
+    pass
+
+
+class MFADeleteLimit(Exception):
+    """The mfa delete doesn't fit in a single delete_objects request."""
+
+    pass
@@ -7,12 +7,25 @@ import json
 import os
 from typing import Any, Dict
 
-import yaml
-from yaml.error import YAMLError
 
-# make yaml class ignore all undefined tags and keep parsing
-# yaml doesn't understand all the !Ref, !FindInMap etc
-yaml.SafeLoader.add_multi_constructor("!", lambda loader, suffix, node: None)
+def load_yaml(body: str) -> Any:
+    """Load the yaml body.
+
+    yaml is imported on first use to keep fzfaws startup fast.
+
+    :param body: yaml string to load
+    :type body: str
+    :raises yaml.error.YAMLError: when the body is not valid yaml
+    :return: loaded yaml body
+    :rtype: Any
+    """
+    import yaml
+
+    if "!" not in yaml.SafeLoader.yaml_multi_constructors:
+        # make yaml class ignore all undefined tags and keep parsing
+        # yaml doesn't understand all the !Ref, !FindInMap etc
+        yaml.SafeLoader.add_multi_constructor("!", lambda loader, suffix, node: None)
+    return yaml.safe_load(body)
 
 
 class FileLoader:
@@ -47,7 +60,7 @@ class FileLoader:
         """
         with open(self.path, "r") as file:
             body = file.read()
-            formated_body = yaml.safe_load(body)
+            formated_body = load_yaml(body)
             return {"body": body, "dictBody": formated_body}
 
     def process_json_file(self) -> Dict[str, Any]:
@@ -67,7 +80,7 @@ class FileLoader:
         :return: loaded dictionary
         :rtyrp: dict
         """
-        return yaml.safe_load(self.body)
+        return load_yaml(self.body)
 
     def process_json_body(self) -> dict:
         """Process the json body.
@@ -91,10 +104,12 @@ class FileLoader:
             config_path = "%s/fzfaws/fzfaws.yml" % base_directory
         if not os.path.isfile(config_path):
             return
+        from yaml.error import YAMLError
+
         with open(config_path, "r") as file:
             try:
                 body = file.read()
-                formated_body = yaml.safe_load(body)
+                formated_body = load_yaml(body)
                 if not formated_body:
                     return
                 self._set_fzf_env(formated_body.get("fzf", {}))
@@ -108,6 +123,8 @@ class FileLoader:
                     self._set_cloudformation_env(
                         formated_body["services"].get("cloudformation", {})
                     )
+                    for service, settings in formated_body["services"].items():
+                        self._set_cache_env(service, settings or {})
             except YAMLError as e:
                 print("Config file is malformed, please double check your config file")
                 print(e)
@@ -163,6 +180,14 @@ class FileLoader:
             os.environ["FZFAWS_S3_TRANSFER"] = json.dumps(
                 s3_settings["transfer_config"]
             )
+        if s3_settings.get("max_in_flight"):
+            os.environ["FZFAWS_S3_MAX_IN_FLIGHT"] = str(s3_settings["max_in_flight"])
+        if s3_settings.get("index"):
+            os.environ["FZFAWS_S3_INDEX"] = "1"
+        if s3_settings.get("index_ttl"):
+            os.environ["FZFAWS_S3_INDEX_TTL"] = str(s3_settings["index_ttl"])
+        if s3_settings.get("inventory"):
+            os.environ["FZFAWS_S3_INVENTORY"] = json.dumps(s3_settings["inventory"])
         if s3_settings.get("profile"):
             os.environ["FZFAWS_S3_PROFILE"] = s3_settings["profile"]
         if s3_settings.get("default_args"):
@@ -205,6 +230,24 @@ class FileLoader:
             os.environ["FZFAWS_GLOBAL_PROFILE"] = global_settings["profile"]
         if global_settings.get("region"):
             os.environ["FZFAWS_GLOBAL_REGION"] = global_settings["region"]
+        if global_settings.get("cache_ttl") is not None:
+            os.environ["FZFAWS_GLOBAL_CACHE_TTL"] = str(global_settings["cache_ttl"])
+
+    def _set_cache_env(self, service: str, service_settings: Dict[str, Any]) -> None:
+        """Set the response cache ttl of a service.
+
+        Any service could have cache_ttl set, e.g. services.iam.cache_ttl,
+        set it to 0 to disable the cache for the service.
+
+        :param service: name of the service, e.g. ec2
+        :type service: str
+        :param service_settings: settings of the service from config file
+        :type service_settings: Dict[str, Any]
+        """
+        if service_settings.get("cache_ttl") is not None:
+            os.environ["FZFAWS_%s_CACHE_TTL" % service.upper()] = str(
+                service_settings["cache_ttl"]
+            )
 
     def _set_fzf_env(self, fzf_settings: Dict[str, Any]) -> None:
         """Set env for fzf.
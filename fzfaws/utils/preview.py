@@ -0,0 +1,132 @@
+"""Module contains the file backed fzf preview.
+
+Preview contents are written into a temp directory, one file per fzf entry,
+the fzf preview command only hash the entry and cat the file of the hash.
+Nothing is passed through the arguments of the preview command.
+"""
+import os
+import shlex
+import shutil
+import tempfile
+import threading
+from typing import Iterable, List
+
+
+def _crc_table() -> List[int]:
+    """Build the lookup table of the POSIX cksum crc.
+
+    :return: crc of each byte value
+    :rtype: List[int]
+    """
+    table = []
+    for byte in range(256):
+        crc = byte << 24
+        for _ in range(8):
+            if crc & 0x80000000:
+                crc = ((crc << 1) ^ 0x04C11DB7) & 0xFFFFFFFF
+            else:
+                crc = (crc << 1) & 0xFFFFFFFF
+        table.append(crc)
+    return table
+
+
+_CRC_TABLE = _crc_table()
+
+
+def cksum(data: bytes) -> str:
+    """Return the POSIX cksum output of the data.
+
+    The same value is computed by the preview command through the cksum
+    utility, which is available on every POSIX system unlike md5sum or sha1sum.
+
+    :param data: data to checksum
+    :type data: bytes
+    :return: crc and byte count of the data seperated by space, same as cksum
+    :rtype: str
+    """
+    crc = 0
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFFFFFF) ^ _CRC_TABLE[(crc >> 24) ^ byte]
+    # the length of the data is also part of the crc
+    length = len(data)
+    while length:
+        crc = ((crc << 8) & 0xFFFFFFFF) ^ _CRC_TABLE[(crc >> 24) ^ (length & 0xFF)]
+        length >>= 8
+    return "%s %s" % (~crc & 0xFFFFFFFF, len(data))
+
+
+class FilePreview:
+    """Serve fzf previews from files.
+
+    Each entry is written to a file named after the cksum of the entry, the
+    preview command pipe the entry to cksum and cat the file, each preview
+    is a constant time file read regardless of the number of entries.
+    Contents could be added while fzf is running, e.g. from a background
+    thread, the preview of the entry is displayed once the file is written.
+
+    Example:
+        with FilePreview() as preview:
+            preview.add("logs/", ["logs/app.log"])
+            fzf.execute_fzf(print_col=0, preview=preview.command)
+
+    :param directory: directory to store the preview files, default to a temp directory
+    :type directory: str, optional
+    """
+
+    def __init__(self, directory: str = "") -> None:
+        """Construct the preview instance."""
+        self.directory: str = directory or tempfile.mkdtemp(prefix="fzfaws")
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "FilePreview":
+        """Return the preview."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Remove the preview files."""
+        self.close()
+
+    @property
+    def command(self) -> str:
+        """Return the fzf preview command.
+
+        :return: shell command to preview the current entry
+        :rtype: str
+        """
+        return 'cat %s/"$(printf %%s {} | cksum | tr " " -)" 2>/dev/null' % (
+            shlex.quote(self.directory)
+        )
+
+    def get_path(self, entry: str) -> str:
+        """Return the preview file path of the entry.
+
+        :param entry: the fzf entry without ansi color
+        :type entry: str
+        :return: path of the preview file
+        :rtype: str
+        """
+        return os.path.join(
+            self.directory, cksum(entry.encode("utf-8")).replace(" ", "-")
+        )
+
+    def add(self, entry: str, lines: Iterable[str]) -> None:
+        """Write the preview of the entry, replace the existing preview.
+
+        :param entry: the fzf entry without ansi color
+        :type entry: str
+        :param lines: lines to display in preview
+        :type lines: Iterable[str]
+        """
+        file_path = self.get_path(entry)
+        with self._lock:
+            if not os.path.isdir(self.directory):
+                return
+            # written to a temp file first, fzf may be reading the file
+            with open("%s.tmp" % file_path, "w") as file:
+                file.writelines("%s\n" % line for line in lines)
+            os.replace("%s.tmp" % file_path, file_path)
+
+    def close(self) -> None:
+        """Remove the preview files."""
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
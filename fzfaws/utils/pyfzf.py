@@ -5,9 +5,13 @@ to be launched. fzfaws comes with 4 fzf binary files and will
 be used if user doesn't specify to use system fzf in config file.
 """
 import os
+import shlex
+import shutil
 import subprocess
 import sys
-from typing import Any, Dict, Generator, List, Optional, Union
+import tempfile
+import threading
+from typing import Any, Dict, Generator, Iterable, List, Optional, Union
 
 from fzfaws.utils.exceptions import EmptyList, NoSelectionMade
 
@@ -29,15 +33,41 @@ class Pyfzf:
 
     The above example process the list of buckets in response and make "Name" the return value.
     The selected_bucket will be a bucket name.
+
+    For paginated responses, pass stream=True to process_list() so that fzf is launched
+    straight away and each page is written to fzf as soon as the paginator yields it.
+
+    Example:
+        fzf = Pyfzf()
+        paginator = s3.get_paginator("list_objects")
+        fzf.process_list(
+            (obj for page in paginator.paginate(Bucket=bucket) for obj in page["Contents"]),
+            "Key",
+            stream=True,
+        )
+        selected_key = fzf.execute_fzf(delimiter=": ")
     """
 
+    # seconds between each flush of the streamed entries into fzf
+    stream_flush_interval: float = 0.05
+    # max bytes written into the stdin of fzf per write
+    pipe_block_size: int = 64 * 1024
+    # key to reload the entries registered through reload_fzf()
+    reload_key: str = "ctrl-r"
+
     def __init__(self) -> None:
         """Construct the Pyfzf instance.
 
         Credit to https://github.com/pmazurek/aws-fuzzy-finder for the binary detection
         method.
         """
-        self.fzf_string: str = ""
+        self._chunks: List[str] = []
+        self._streams: List[Iterable[str]] = []
+        self._records: List[Any] = []
+        # streams and reloads record items from their own threads
+        self._records_lock = threading.Lock()
+        self._reloads: List[Iterable[str]] = []
+        self._binds: List[str] = []
         if sys.maxsize > 2 ** 32:
             arch = "amd64"
         else:
@@ -59,6 +89,29 @@ class Pyfzf:
             % (os.path.dirname(os.path.abspath(__file__)), system, arch)
         )
 
+    @property
+    def fzf_string(self) -> str:
+        """Return all of the appended fzf entries.
+
+        Joined on access, avoid calling it on large listing.
+
+        :return: the appended fzf entries
+        :rtype: str
+        """
+        return "".join(self._chunks)
+
+    @fzf_string.setter
+    def fzf_string(self, new_string: str) -> None:
+        """Replace all of the appended fzf entries.
+
+        Records added through process_list(record=True) are also cleared.
+
+        :param new_string: new fzf entries
+        :type new_string: str
+        """
+        self._chunks = [new_string] if new_string else []
+        self._records = []
+
     def append_fzf(self, new_string: str) -> None:
         r"""Append stings to fzf_string.
 
@@ -70,7 +123,48 @@ class Pyfzf:
         :param new_string: strings to append to fzf entry
         :type new_string: str
         """
-        self.fzf_string += new_string
+        if new_string:
+            self._chunks.append(new_string)
+
+    def stream_fzf(self, entries: Iterable[str]) -> None:
+        r"""Register a lazy source of entries for fzf.
+
+        The entries are not consumed until execute_fzf() is called, they are
+        written into fzf while fzf is already running. Each entry should
+        end with '\n'. Consumption stops as soon as the user made a selection.
+
+        :param entries: iterable or generator of fzf entries
+        :type entries: Iterable[str]
+        """
+        self._streams.append(entries)
+
+    def reload_fzf(self, entries: Iterable[str]) -> None:
+        r"""Register entries to replace the current entries when reload_key is pressed.
+
+        Used to swap in fresh results while fzf is displaying cached results.
+        The entries are consumed in a background thread and written to a temp file,
+        pressing reload_key wait for the file and reload fzf with its content.
+
+        :param entries: iterable or generator of fzf entries, each end with '\n'
+        :type entries: Iterable[str]
+        """
+        self._reloads.append(entries)
+
+    def bind_reload(self, key: str, command: str) -> None:
+        """Reload the entries with the output of the command when key is pressed.
+
+        The command is run by fzf in a shell, fzf placeholders like {} or {q}
+        are replaced with the current entry or query.
+
+        Example:
+            fzf.bind_reload("alt-l", "list-folder {}")
+
+        :param key: fzf key to bind
+        :type key: str
+        :param command: shell command to print the new entries
+        :type command: str
+        """
+        self._binds.append("--bind=%s:reload(%s)" % (key, command))
 
     def execute_fzf(
         self,
@@ -111,9 +205,94 @@ class Pyfzf:
         :return: selected entry from fzf
         :rtype: Union[list[Any], list[str], str]
         """
+        selection_str = self._select(empty_allow, preview, multi_select, header)
+        if selection_str is None:
+            return [] if multi_select else ""
+
+        if multi_select:
+            return_list: List[str] = []
+            # multi_select would return everything seperate by \n
+            selections: List[str] = selection_str.strip().splitlines()
+            for item in selections:
+                processed_str = self._get_col(item, print_col, delimiter)
+                return_list.append(processed_str)
+
+            return return_list
+        else:
+            return self._get_col(selection_str.strip(), print_col, delimiter)
+
+    def execute_fzf_records(
+        self,
+        empty_allow: bool = False,
+        preview: Optional[str] = None,
+        multi_select: bool = False,
+        header: Optional[str] = None,
+    ) -> Union[List[Any], Any]:
+        """Execute fzf and return the original records of the selected entries.
+
+        Only works with entries added through process_list(record=True), each entry
+        is prefixed with a hidden index of the record, fzf only display and search
+        from the second field, the selected index is then mapped back to the record.
+
+        Example:
+            fzf = Pyfzf()
+            fzf.process_list(response["Reservations"], "ReservationId", record=True)
+            reservation = fzf.execute_fzf_records()
+
+        :param empty_allow: determine if empty selection is allowed
+        :type empty_allow: bool, optional
+        :param preview: display preview in fzf, e.g.(echo 'hello')
+        :type preview: str, optional
+        :param multi_select: enable fzf multi selection
+        :type multi_select: bool, optional
+        :param header: header to display in fzf
+        :type header: str, optional
+        :raises NoSelectionMade: when user did not make a selection and empty_allow is False
+        :return: selected record or list of records when multi_select, None if empty
+        :rtype: Union[List[Any], Any]
+        """
+        selection_str = self._select(
+            empty_allow,
+            preview,
+            multi_select,
+            header,
+            extra_args=["--delimiter=\t", "--with-nth=2.."],
+        )
+        records: List[Any] = []
+        for line in (selection_str or "").strip().splitlines():
+            index, _, _ = line.partition("\t")
+            if index.isdigit():
+                records.append(self._records[int(index)])
+        if multi_select:
+            return records
+        return records[0] if records else None
+
+    def _select(
+        self,
+        empty_allow: bool,
+        preview: Optional[str],
+        multi_select: bool,
+        header: Optional[str],
+        extra_args: Optional[List[str]] = None,
+    ) -> Optional[str]:
+        """Launch fzf and return the raw selection.
+
+        :param empty_allow: determine if empty selection is allowed
+        :type empty_allow: bool
+        :param preview: display preview in fzf, e.g.(echo 'hello')
+        :type preview: Optional[str]
+        :param multi_select: enable fzf multi selection
+        :type multi_select: bool
+        :param header: header to display in fzf
+        :type header: Optional[str]
+        :param extra_args: extra arguments to pass to fzf
+        :type extra_args: Optional[List[str]], optional
+        :raises NoSelectionMade: when user did not make a selection and empty_allow is False
+        :return: raw output of fzf, None when fzf exit without a selection
+        :rtype: Optional[str]
+        """
         # remove trailing spaces/lines
-        self.fzf_string = str(self.fzf_string).rstrip()
-        fzf_input = subprocess.Popen(("echo", self.fzf_string), stdout=subprocess.PIPE)
+        self._rstrip_chunks()
         cmd_list: list = self._construct_fzf_cmd()
         selection: bytes = b""
         selection_str: str = ""
@@ -129,8 +308,18 @@ class Pyfzf:
         if preview:
             cmd_list.extend(["--preview", preview])
 
+        if extra_args:
+            cmd_list.extend(extra_args)
+
+        cmd_list.extend(self._binds)
+
+        reload_dir: Optional[str] = None
+        if self._reloads:
+            reload_dir = tempfile.mkdtemp(prefix="fzfaws")
+            cmd_list.append(self._start_reload(reload_dir))
+
         try:
-            selection = subprocess.check_output(cmd_list, stdin=fzf_input.stdout)
+            selection = self._run_fzf(cmd_list)
             selection_str = str(selection, "utf-8")
 
             if not selection and not empty_allow:
@@ -144,23 +333,49 @@ class Pyfzf:
             # thus ending with non zero exit code
             if not empty_allow:
                 raise NoSelectionMade
-            elif empty_allow:
-                if multi_select:
-                    return []
-                else:
-                    return ""
+            return None
 
-        if multi_select:
-            return_list: List[str] = []
-            # multi_select would return everything seperate by \n
-            selections: List[str] = selection_str.strip().splitlines()
-            for item in selections:
-                processed_str = self._get_col(item, print_col, delimiter)
-                return_list.append(processed_str)
+        finally:
+            self._reloads = []
+            self._binds = []
+            if reload_dir:
+                shutil.rmtree(reload_dir, ignore_errors=True)
 
-            return return_list
-        else:
-            return self._get_col(selection_str.strip(), print_col, delimiter)
+        return selection_str
+
+    def _start_reload(self, reload_dir: str) -> str:
+        """Write the reload entries into a file in a background thread.
+
+        fzf 0.21 could only reload from a command, the file is written
+        to a temp name and renamed once completed, the reload command
+        wait for the file to exist before reading it.
+
+        :param reload_dir: directory to store the reload file
+        :type reload_dir: str
+        :return: the fzf bind argument to reload the entries
+        :rtype: str
+        """
+        reloads = self._reloads
+        reload_path = os.path.join(reload_dir, "reload")
+
+        def _write() -> None:
+            try:
+                with open("%s.tmp" % reload_path, "w") as file:
+                    for entries in reloads:
+                        file.writelines(entries)
+                os.rename("%s.tmp" % reload_path, reload_path)
+            except Exception:
+                # fzf exited and the directory is removed or the refresh
+                # failed, current entries stay in fzf
+                pass
+
+        threading.Thread(target=_write, daemon=True).start()
+        quoted_path = shlex.quote(reload_path)
+        return "--bind=%s:reload(while [ ! -f %s ]; do sleep 0.1; done; cat %s)" % (
+            self.reload_key,
+            quoted_path,
+            quoted_path,
+        )
 
     def get_local_file(
         self,
@@ -299,12 +514,145 @@ class Pyfzf:
         except:
             return False
 
+    def _rstrip_chunks(self) -> None:
+        """Remove the trailing spaces/lines of the appended entries."""
+        while self._chunks and not self._chunks[-1].rstrip():
+            self._chunks.pop()
+        if self._chunks:
+            self._chunks[-1] = self._chunks[-1].rstrip()
+
+    def _run_fzf(self, cmd_list: List[str]) -> bytes:
+        """Launch fzf and feed the entries and registered streams into its stdin.
+
+        fzf is started before anything is fetched, a writer thread
+        then consumes the streams and writes each entry into fzf as it arrives.
+        Entries are written through a buffer of pipe_block_size, so the
+        listing is never copied into a single string or passed through argv.
+        Once fzf exits (selection made, esc or ctrl-c), the writer is signaled
+        to stop and won't pull the next entry/page from the streams.
+
+        :param cmd_list: fzf command list
+        :type cmd_list: List[str]
+        :raises subprocess.CalledProcessError: when fzf exit with non zero code
+        :return: raw output of fzf
+        :rtype: bytes
+        """
+        fzf_process = subprocess.Popen(
+            cmd_list,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            bufsize=self.pipe_block_size,
+        )
+        stop_event = threading.Event()
+        errors: List[Exception] = []
+        writer = threading.Thread(
+            target=self._write_stream,
+            args=(fzf_process, stop_event, errors),
+            daemon=True,
+        )
+        writer.start()
+        try:
+            selection: bytes = fzf_process.stdout.read()
+            fzf_process.wait()
+        finally:
+            stop_event.set()
+            if fzf_process.poll() is None:
+                fzf_process.terminate()
+                fzf_process.wait()
+            fzf_process.stdout.close()
+            self._streams = []
+
+        # don't wait on the writer if it's in the middle of a request
+        # it will exit by itself once the request returns
+        writer.join(timeout=self.stream_flush_interval)
+        if errors:
+            raise errors[0]
+        if fzf_process.returncode != 0:
+            raise subprocess.CalledProcessError(
+                fzf_process.returncode, cmd_list, output=selection
+            )
+        return selection
+
+    def _write_stream(
+        self,
+        fzf_process: subprocess.Popen,
+        stop_event: threading.Event,
+        errors: List[Exception],
+    ) -> None:
+        """Write the appended entries and all streams into the stdin of fzf.
+
+        Entries are buffered and flushed every stream_flush_interval by
+        a ticker thread, so that entries show up in fzf while the next page is
+        still fetching without paying a write syscall per entry.
+
+        Any exception raised by the streams are stored in errors and fzf is
+        terminated, so that execute_fzf could raise it in the main thread.
+
+        :param fzf_process: the running fzf process
+        :type fzf_process: subprocess.Popen
+        :param stop_event: event indicating fzf has exited
+        :type stop_event: threading.Event
+        :param errors: list to store exceptions raised by the streams
+        :type errors: List[Exception]
+        """
+        fzf_stdin = fzf_process.stdin
+        finished = threading.Event()
+        # _run_fzf resets the streams once fzf exits, keep them to close them
+        chunks = list(self._chunks)
+        streams = list(self._streams)
+
+        def _flush() -> None:
+            while not finished.wait(self.stream_flush_interval):
+                try:
+                    fzf_stdin.flush()
+                except (OSError, ValueError):
+                    return
+
+        ticker = threading.Thread(target=_flush, daemon=True)
+        ticker.start()
+        try:
+            for chunk in chunks:
+                if stop_event.is_set():
+                    return
+                fzf_stdin.write(chunk.encode("utf-8"))
+            if chunks:
+                fzf_stdin.write(b"\n")
+            for stream in streams:
+                entries = iter(stream)
+                # check before pulling the next entry, the next entry may
+                # trigger another page request
+                while not stop_event.is_set():
+                    try:
+                        entry = next(entries)
+                    except StopIteration:
+                        break
+                    except Exception as e:
+                        errors.append(e)
+                        fzf_process.terminate()
+                        return
+                    fzf_stdin.write(entry.encode("utf-8"))
+        except (OSError, ValueError):
+            # fzf exited and closed the pipe
+            pass
+        finally:
+            finished.set()
+            for stream in streams:
+                if isinstance(stream, Generator):
+                    stream.close()
+            try:
+                fzf_stdin.close()
+            except (OSError, ValueError):
+                pass
+
     def process_list(
         self,
         response_list: Union[list, Generator],
         key_name: str,
         *arg_keys,
-        empty_allow: bool = False
+        empty_allow: bool = False,
+        stream: bool = False,
+        record: bool = False,
+        reload: Optional[Iterable[Any]] = None
     ) -> None:
         """Process list passed in and formatted for fzf.
 
@@ -319,28 +667,84 @@ class Pyfzf:
 
         In the above example, if first entry is selected, it will return 1.
 
+        When stream is True, response_list is not consumed until fzf is
+        launched, the EmptyList check is skipped since the result is unknown
+        at this point, empty result would end up as NoSelectionMade.
+
+        When record is True, the items are kept and each entry is prefixed with
+        a hidden index, use execute_fzf_records() to get the selected items back
+        instead of parsing the selected string. All entries should be added
+        with record=True in this case.
+
+        When reload is provided, e.g. the fresh result of the cached response_list,
+        it is formatted the same way and swapped into fzf when reload_key is pressed.
+
         :param response_list: list to process
         :type response_list: list
         :param key_name: key_name to search and add into response
         :type key_name: str
-        :param gap: gap between each key
-        :type gap: int, optional
+        :param empty_allow: allow empty response_list
+        :type empty_allow: bool, optional
+        :param stream: lazily stream response_list into fzf
+        :type stream: bool, optional
+        :param record: keep the items for execute_fzf_records()
+        :type record: bool, optional
+        :param reload: list to replace response_list when reload_key is pressed
+        :type reload: Iterable[Any], optional
         :raises EmptyList: when the list is empty and did not get any result
         """
+        if reload is not None:
+            self.reload_fzf(
+                self._list_generator(reload, key_name, *arg_keys, record=record)
+            )
+        entries = self._list_generator(
+            response_list, key_name, *arg_keys, record=record
+        )
+        if stream:
+            self.stream_fzf(entries)
+            return
+        self._chunks.extend(entries)
+        if not self._chunks and not empty_allow:
+            raise EmptyList("Result list was empty")
+
+    def _list_generator(
+        self,
+        response_list: Union[list, Generator],
+        key_name: str,
+        *arg_keys,
+        record: bool = False
+    ) -> Generator[str, None, None]:
+        """Format each item of the list into a fzf entry lazily.
+
+        :param response_list: list to process
+        :type response_list: Union[list, Generator]
+        :param key_name: key_name to search and add into response
+        :type key_name: str
+        :param record: store the item and prefix the entry with its index
+        :type record: bool, optional
+        :return: formatted fzf entries in generator form
+        :rtype: Generator[str, None, None]
+        """
         for item in response_list:
-            self.append_fzf("%s: %s" % (key_name, item.get(key_name)))
+            entry = "%s: %s" % (key_name, item.get(key_name))
             for arg in arg_keys:
-                self.append_fzf(" | ")
-                self.append_fzf("%s: %s" % (arg, item.get(arg)))
-            self.append_fzf("\n")
-        if not self.fzf_string and not empty_allow:
-            raise EmptyList("Result list was empty")
+                entry += " | %s: %s" % (arg, item.get(arg))
+            if record:
+                with self._records_lock:
+                    index = len(self._records)
+                    self._records.append(item)
+                entry = "%s\t%s" % (index, entry)
+            yield "%s\n" % entry
 
     def format_selected_to_dict(self, selected_str: str) -> Dict[str, Any]:
         """Format the selected option into a proper dictionary.
 
         This is only useful if fzf.execute_fzf(print_col=0).
 
+        Prefer process_list(record=True) with execute_fzf_records(), which return
+        the original item without parsing and won't break on values containing
+        the separators.
+
         This is useful to use in conjuction with process_list, process_list
         might contain a lot of information but printing all of them into
         a str may not be useful enough.
@@ -5,11 +5,110 @@ all class responsible to interacte with boto3 should inherite
 from the BaseSession class.
 """
 import os
-from typing import Optional, Union
-
-from boto3.session import Session
+import threading
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from fzfaws.utils import Pyfzf
+from fzfaws.utils.cache import ResponseCache
+
+# process wide registry of boto3 sessions/clients/resources
+_registry_lock = threading.RLock()
+_sessions: Dict[Tuple[Optional[str], Optional[str]], Any] = {}
+_clients: Dict[Tuple[Optional[str], Optional[str], str], Any] = {}
+_resources: Dict[Tuple[Optional[str], Optional[str], str], Any] = {}
+
+
+def get_session(profile: Optional[str] = None, region: Optional[str] = None):
+    """Get the shared boto3 session of the profile and region.
+
+    Creating a session loads the aws config/credentials files and the botocore
+    data, only create one session per profile and region for the whole process.
+
+    :param profile: profile of the session, None to use the default profile
+    :type profile: str, optional
+    :param region: region of the session, None to use the default region
+    :type region: str, optional
+    :return: boto3 session
+    :rtype: boto3.session.Session
+    """
+    # boto3 takes a while to import, only import it when a session is needed
+    from boto3.session import Session
+
+    with _registry_lock:
+        if (profile, region) not in _sessions:
+            _sessions[(profile, region)] = Session(
+                region_name=region, profile_name=profile
+            )
+        return _sessions[(profile, region)]
+
+
+def get_client(
+    service_name: str, profile: Optional[str] = None, region: Optional[str] = None
+):
+    """Get the shared boto3 client of the service.
+
+    boto3 clients are thread safe and could be shared.
+
+    :param service_name: name of the boto3 service
+    :type service_name: str
+    :param profile: profile of the client
+    :type profile: str, optional
+    :param region: region of the client
+    :type region: str, optional
+    :return: boto3 client
+    :rtype: botocore.client.BaseClient
+    """
+    with _registry_lock:
+        if (profile, region, service_name) not in _clients:
+            _clients[(profile, region, service_name)] = get_session(
+                profile, region
+            ).client(service_name)
+        return _clients[(profile, region, service_name)]
+
+
+def get_resource(
+    service_name: str, profile: Optional[str] = None, region: Optional[str] = None
+):
+    """Get the shared boto3 resource of the service.
+
+    :param service_name: name of the boto3 service
+    :type service_name: str
+    :param profile: profile of the resource
+    :type profile: str, optional
+    :param region: region of the resource
+    :type region: str, optional
+    :raises boto3.exceptions.ResourceNotExistsError: when service has no resource
+    :return: boto3 service resource
+    :rtype: boto3.resources.base.ServiceResource
+    """
+    with _registry_lock:
+        if (profile, region, service_name) not in _resources:
+            _resources[(profile, region, service_name)] = get_session(
+                profile, region
+            ).resource(service_name)
+        return _resources[(profile, region, service_name)]
+
+
+def clear_registry() -> None:
+    """Remove all shared sessions, clients and resources.
+
+    Useful for unit testing only, e.g. when patching botocore before the client
+    is created.
+    """
+    with _registry_lock:
+        _sessions.clear()
+        _clients.clear()
+        _resources.clear()
 
 
 class BaseSession:
@@ -41,13 +140,15 @@ class BaseSession:
 
         If profile or region is True value, then
         fzf will be launched to let user select region or profile.
+
+        Sessions and clients are shared through the registry, the client
+        and resource are only created on first use.
         """
-        session = Session()
         selected_profile: Optional[str] = None
         selected_region: Optional[str] = None
         if profile and type(profile) == bool:
             fzf = Pyfzf()
-            for profile in session.available_profiles:
+            for profile in get_session().available_profiles:
                 fzf.append_fzf("%s\n" % profile)
             selected_profile = str(fzf.execute_fzf(print_col=1))
         elif profile and type(profile) is str:
@@ -55,7 +156,7 @@ class BaseSession:
 
         if region and type(region) == bool:
             fzf = Pyfzf()
-            regions = session.get_available_regions(service_name)
+            regions = get_session().get_available_regions(service_name)
             for region in regions:
                 fzf.append_fzf("%s\n" % region)
             selected_region = str(fzf.execute_fzf(print_col=1))
@@ -73,22 +174,158 @@ class BaseSession:
 
         self.profile: Optional[str] = selected_profile
         self.region: Optional[str] = selected_region
-        self.session = Session(
-            region_name=selected_region, profile_name=selected_profile
+        self.service_name: str = service_name
+        self.session = get_session(selected_profile, selected_region)
+        self._client = None
+        self._resource = None
+        self._cache = ResponseCache(
+            profile=selected_profile, region=selected_region, service_name=service_name
         )
-        self._client = self.session.client(service_name)
-
-        # only certain service support resource
-        resources = self.session.get_available_resources()
-        if service_name in resources:
-            self._resource = self.session.resource(service_name)
+        self._refreshes: Dict[str, Dict[str, Any]] = {}
 
     @property
     def client(self):
         """Return the client."""
+        if self._client is None:
+            self._client = get_client(self.service_name, self.profile, self.region)
         return self._client
 
     @property
     def resource(self):
-        """Return the resource."""
+        """Return the resource, only certain service support resource."""
+        if self._resource is None:
+            self._resource = get_resource(
+                self.service_name, self.profile, self.region
+            )
         return self._resource
+
+    def paginate(self, operation: str, **kwargs) -> Iterable[Dict[str, Any]]:
+        """Return all pages of the operation through the response cache.
+
+        When the cache is disabled, this is the same as using the paginator.
+        Otherwise, cached pages are returned straight away when available, if they
+        are expired, a background refresh is started and could be retrieved
+        through refreshed(). On cache miss, pages are fetched lazily and cached
+        after the last page is fetched.
+
+        Operations that couldn't paginate are returned as a single page.
+
+        :param operation: name of the boto3 operation
+        :type operation: str
+        :return: pages of the response
+        :rtype: Iterable[Dict[str, Any]]
+        """
+        if not self._cache.enabled:
+            return self._fetch_pages(operation, kwargs)
+        cached = self._cache.get(operation, kwargs)
+        if cached is None:
+            return self._cache_pages(operation, kwargs)
+        pages, expired = cached
+        if expired:
+            self._start_refresh(operation, kwargs, pages)
+        return pages
+
+    def refreshed(
+        self,
+        operation: str,
+        transform: Callable[[Iterable[Dict[str, Any]]], Any],
+        **kwargs
+    ) -> Optional[Any]:
+        """Return the refreshed pages of the operation passed through transform.
+
+        Only available if paginate() returned expired cache and started a refresh,
+        pages are yielded once the background refresh completed.
+
+        Example:
+            fzf.process_list(
+                self._topic_generator(self.paginate("list_topics")),
+                "TopicArn",
+                reload=self.refreshed("list_topics", self._topic_generator),
+            )
+
+        :param operation: name of the boto3 operation
+        :type operation: str
+        :param transform: function to process the pages, e.g. the generator used for
+            the cached pages
+        :type transform: Callable[[Iterable[Dict[str, Any]]], Any]
+        :return: the result of transform on the fresh pages, None if no refresh
+        :rtype: Optional[Any]
+        """
+        refresh = self._refreshes.get(self._cache.get_path(operation, kwargs))
+        if refresh is None:
+            return None
+        return transform(self._wait_refresh(refresh))
+
+    def _fetch_pages(
+        self, operation: str, params: Dict[str, Any]
+    ) -> Iterable[Dict[str, Any]]:
+        """Fetch pages of the operation from aws.
+
+        :param operation: name of the boto3 operation
+        :type operation: str
+        :param params: parameters of the operation
+        :type params: Dict[str, Any]
+        :return: pages of the response
+        :rtype: Iterable[Dict[str, Any]]
+        """
+        if self.client.can_paginate(operation):
+            return self.client.get_paginator(operation).paginate(**params)
+        return [getattr(self.client, operation)(**params)]
+
+    def _cache_pages(
+        self, operation: str, params: Dict[str, Any]
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Fetch pages lazily and cache them once all pages are fetched.
+
+        :param operation: name of the boto3 operation
+        :type operation: str
+        :param params: parameters of the operation
+        :type params: Dict[str, Any]
+        :return: pages of the response in generator form
+        :rtype: Generator[Dict[str, Any], None, None]
+        """
+        pages: List[Dict[str, Any]] = []
+        for page in self._fetch_pages(operation, params):
+            page.pop("ResponseMetadata", None)
+            pages.append(page)
+            yield page
+        self._cache.set(operation, params, pages)
+
+    def _start_refresh(
+        self, operation: str, params: Dict[str, Any], pages: List[Dict[str, Any]]
+    ) -> None:
+        """Refresh the cache of the operation in a background thread.
+
+        :param operation: name of the boto3 operation
+        :type operation: str
+        :param params: parameters of the operation
+        :type params: Dict[str, Any]
+        :param pages: the expired pages, used when the refresh failed
+        :type pages: List[Dict[str, Any]]
+        """
+        refresh: Dict[str, Any] = {"done": threading.Event(), "pages": pages}
+
+        def _refresh() -> None:
+            try:
+                refresh["pages"] = list(self._cache_pages(operation, params))
+            except Exception:
+                # keep using the cached pages
+                pass
+            finally:
+                refresh["done"].set()
+
+        self._refreshes[self._cache.get_path(operation, params)] = refresh
+        threading.Thread(target=_refresh, daemon=True).start()
+
+    def _wait_refresh(
+        self, refresh: Dict[str, Any]
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Wait for the background refresh and yield the fresh pages.
+
+        :param refresh: the refresh started by _start_refresh
+        :type refresh: Dict[str, Any]
+        :return: fresh pages in generator form
+        :rtype: Generator[Dict[str, Any], None, None]
+        """
+        refresh["done"].wait()
+        yield from refresh["pages"]
@@ -40,7 +40,7 @@ class TestCloudformation(unittest.TestCase):
 
     @patch.object(Paginator, "paginate")
     @patch.object(Pyfzf, "process_list")
-    @patch.object(Pyfzf, "execute_fzf")
+    @patch.object(Pyfzf, "execute_fzf_records")
     def test_set_stack(self, mocked_execute, mocked_list, mocked_page):
         data_path = os.path.join(
             os.path.dirname(os.path.abspath(__file__)),
@@ -50,11 +50,19 @@ class TestCloudformation(unittest.TestCase):
             response = json.load(file)
 
         mocked_page.return_value = response
-        mocked_execute.return_value = "dotbare-cicd"
+        mocked_execute.return_value = response[0]["Stacks"][0]
         self.cloudformation.set_stack()
+        mocked_page.assert_called_once()
         mocked_list.assert_called_once_with(
-            response[0]["Stacks"], "StackName", "StackStatus", "Description"
+            ANY,
+            "StackName",
+            "StackStatus",
+            "Description",
+            stream=True,
+            record=True,
+            reload=None,
         )
+        self.assertEqual(list(mocked_list.call_args[0][0]), response[0]["Stacks"])
         mocked_execute.assert_called_once_with(empty_allow=False)
         self.assertEqual(
             self.cloudformation.stack_details,
@@ -76,11 +84,18 @@ class TestCloudformation(unittest.TestCase):
 
         mocked_list.reset_mock()
         mocked_execute.reset_mock()
-        mocked_execute.return_value = "hellotesting"
+        mocked_execute.return_value = response[0]["Stacks"][1]
         self.cloudformation.set_stack()
         mocked_list.assert_called_once_with(
-            response[0]["Stacks"], "StackName", "StackStatus", "Description"
+            ANY,
+            "StackName",
+            "StackStatus",
+            "Description",
+            stream=True,
+            record=True,
+            reload=None,
         )
+        self.assertEqual(list(mocked_list.call_args[0][0]), response[0]["Stacks"])
         mocked_execute.assert_called_once_with(empty_allow=False)
         self.assertEqual(
             self.cloudformation.stack_details,
@@ -128,6 +143,10 @@ class TestCloudformation(unittest.TestCase):
         result = self.cloudformation.get_stack_resources()
         self.assertEqual(result, ["CodeBuild"])
         mocked_process.assert_called_once_with(
+            ANY, "LogicalResourceId", "ResourceType", "Drift", stream=True
+        )
+        self.assertEqual(
+            list(mocked_process.call_args[0][0]),
             [
                 {
                     "LogicalResourceId": "CodeBuild",
@@ -154,9 +173,6 @@ class TestCloudformation(unittest.TestCase):
                     "Drift": "IN_SYNC",
                 },
             ],
-            "LogicalResourceId",
-            "ResourceType",
-            "Drift",
         )
         mocked_execute.assert_called_once_with(
             multi_select=True, header=None, empty_allow=False
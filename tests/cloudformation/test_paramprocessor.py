@@ -33,6 +33,8 @@ class TestCloudformationParams(unittest.TestCase):
         sys.stdout = sys.__stdout__
 
     def test_constructor(self):
+        self.assertIsNone(self.paramprocessor._ec2)
+        self.assertIsNone(self.paramprocessor._route53)
         self.assertEqual(self.paramprocessor.ec2.profile, "default")
         self.assertEqual(self.paramprocessor.ec2.region, "us-east-1")
         self.assertEqual(self.paramprocessor.route53.profile, "default")
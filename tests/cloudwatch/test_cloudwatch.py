@@ -1,7 +1,7 @@
 import io
 import sys
 import unittest
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 from fzfaws.cloudwatch import Cloudwatch
 from fzfaws.utils import Pyfzf, FileLoader
 from botocore.paginate import Paginator
@@ -87,7 +87,9 @@ class TestCloudWwatch(unittest.TestCase):
                 "arn:aws:cloudwatch:ap-southeast-2:11111111:alarm:Auto-check-drift-CloudWatchAlarms-11111111"
             ],
         )
-        mocked_fzf_list.assert_called_with(
+        mocked_fzf_list.assert_called_with(ANY, "AlarmArn", stream=True, reload=None)
+        self.assertEqual(
+            list(mocked_fzf_list.call_args[0][0]),
             [
                 {
                     "AlarmName": "Auto-check-drift-CloudWatchAlarms-11111111",
@@ -121,7 +123,6 @@ class TestCloudWwatch(unittest.TestCase):
                     "Threshold": 6000000.0,
                 },
             ],
-            "AlarmArn",
         )
 
         # parameter test
@@ -153,5 +154,6 @@ class TestCloudWwatch(unittest.TestCase):
         self.cloudwatch.arns = [""]
         self.cloudwatch.set_arns()
         self.assertEqual(self.cloudwatch.arns, [""])
-        mocked_fzf_list.assert_not_called()
+        mocked_fzf_list.assert_called_once()
+        self.assertEqual(list(mocked_fzf_list.call_args[0][0]), [])
         mocked_fzf_execute.assert_called_once()
@@ -40,7 +40,7 @@ class TestEC2(unittest.TestCase):
     @patch.object(EC2, "_instance_generator")
     @patch.object(Paginator, "paginate")
     @patch.object(Pyfzf, "process_list")
-    @patch.object(Pyfzf, "execute_fzf")
+    @patch.object(Pyfzf, "execute_fzf_records")
     def test_set_ec2_instance(
         self, mocked_fzf_execute, mocked_fzf_list, mocked_result, mocked_generator
     ):
@@ -50,10 +50,27 @@ class TestEC2(unittest.TestCase):
         with open(json_path, "r") as json_file:
             mocked_result.return_value = json.load(json_file)
 
-        mocked_fzf_execute.return_value = [
-            "InstanceId: 11111111 | InstanceType: t2.micro | Status: running | Name: meal-Bean-10PYXE0G1F4HS | KeyName: ap-southeast-2_playground | PublicDnsName: ec2-13-238-143-201.ap-southeast-2.compute.amazonaws.com | PublicIpAddress: 13.238.143.201 | PrivateIpAddress: 172.31.2.33",
-            "InstanceId: 22222222 | InstanceType: t2.micro | Status: stopped | Name: default-ubuntu | KeyName: ap-southeast-2_playground | PublicDnsName: None | PublicIpAddress: None | PrivateIpAddress: 172.31.11.122",
-        ]
+        instance1 = {
+            "InstanceId": "11111111",
+            "InstanceType": "t2.micro",
+            "Status": "running",
+            "Name": "meal-Bean-10PYXE0G1F4HS",
+            "KeyName": "ap-southeast-2_playground",
+            "PublicDnsName": "ec2-13-238-143-201.ap-southeast-2.compute.amazonaws.com",
+            "PublicIpAddress": "13.238.143.201",
+            "PrivateIpAddress": "172.31.2.33",
+        }
+        instance2 = {
+            "InstanceId": "22222222",
+            "InstanceType": "t2.micro",
+            "Status": "stopped",
+            "Name": "default-ubuntu",
+            "KeyName": "ap-southeast-2_playground",
+            "PublicDnsName": None,
+            "PublicIpAddress": None,
+            "PrivateIpAddress": "172.31.11.122",
+        }
+        mocked_fzf_execute.return_value = [instance1, instance2]
         mocked_generator.return_value = [
             {
                 "InstanceId": "11111111",
@@ -78,6 +95,20 @@ class TestEC2(unittest.TestCase):
         ]
         self.ec2.set_ec2_instance()
         mocked_fzf_list.assert_called_with(
+            ANY,
+            "InstanceId",
+            "Status",
+            "InstanceType",
+            "Name",
+            "KeyName",
+            "PublicDnsName",
+            "PublicIpAddress",
+            "PrivateIpAddress",
+            stream=True, reload=None,
+            record=True,
+        )
+        self.assertEqual(
+            list(mocked_fzf_list.call_args[0][0]),
             [
                 {
                     "InstanceId": "11111111",
@@ -100,18 +131,8 @@ class TestEC2(unittest.TestCase):
                     "PrivateIpAddress": "172.31.11.122",
                 },
             ],
-            "InstanceId",
-            "Status",
-            "InstanceType",
-            "Name",
-            "KeyName",
-            "PublicDnsName",
-            "PublicIpAddress",
-            "PrivateIpAddress",
-        )
-        mocked_fzf_execute.assert_called_with(
-            multi_select=True, header=None, print_col=0
         )
+        mocked_fzf_execute.assert_called_with(multi_select=True, header=None)
         self.assertEqual(self.ec2.instance_ids, ["11111111", "22222222"])
         self.assertEqual(
             self.ec2.instance_list,
@@ -140,7 +161,7 @@ class TestEC2(unittest.TestCase):
         )
 
         # normal single select test
-        mocked_fzf_execute.return_value = "InstanceId: 11111111 | InstanceType: t2.micro | Status: running | Name: meal-Bean-10PYXE0G1F4HS | KeyName: ap-southeast-2_playground | PublicDnsName: ec2-13-238-143-201.ap-southeast-2.compute.amazonaws.com | PublicIpAddress: 13.238.143.201 | PrivateIpAddress: 172.31.2.33"
+        mocked_fzf_execute.return_value = instance1
         self.ec2.set_ec2_instance(multi_select=False, header="hello")
         self.assertEqual(self.ec2.instance_ids, ["11111111"])
         self.assertEqual(
@@ -158,9 +179,7 @@ class TestEC2(unittest.TestCase):
                 }
             ],
         )
-        mocked_fzf_execute.assert_called_with(
-            multi_select=False, header="hello", print_col=0
-        )
+        mocked_fzf_execute.assert_called_with(multi_select=False, header="hello")
 
         # empty test
         self.ec2.instance_list[:] = [{}]
@@ -229,7 +248,7 @@ class TestEC2(unittest.TestCase):
         mocked_fzf_execute.return_value = "sg-006ae18653dc5acd7"
         self.ec2.get_security_groups()
         mocked_fzf_list.assert_called_with(
-            ANY, "GroupId", "GroupName", "Name",
+            ANY, "GroupId", "GroupName", "Name", stream=True, reload=None,
         )
         mocked_fzf_execute.assert_called_with(
             multi_select=False, empty_allow=True, header=None
@@ -241,7 +260,7 @@ class TestEC2(unittest.TestCase):
             multi_select=True, return_attr="name", header="hello"
         )
         mocked_fzf_list.assert_called_with(
-            ANY, "GroupName", "Name",
+            ANY, "GroupName", "Name", stream=True, reload=None,
         )
         mocked_fzf_execute.assert_called_with(
             multi_select=True, empty_allow=True, header="hello"
@@ -260,7 +279,7 @@ class TestEC2(unittest.TestCase):
         mocked_fzf_execute.return_value = "11111111"
         self.ec2.get_instance_id()
         mocked_fzf_list.assert_called_with(
-            ANY, "InstanceId", "Name",
+            ANY, "InstanceId", "Name", stream=True, reload=None,
         )
         mocked_fzf_execute.assert_called_with(
             multi_select=False, empty_allow=True, header=None
@@ -287,7 +306,13 @@ class TestEC2(unittest.TestCase):
         mocked_fzf_execute.return_value = "11111111"
         self.ec2.get_subnet_id()
         mocked_fzf_list.assert_called_with(
-            ANY, "SubnetId", "AvailabilityZone", "CidrBlock", "Name",
+            ANY,
+            "SubnetId",
+            "AvailabilityZone",
+            "CidrBlock",
+            "Name",
+            stream=True,
+            reload=None,
         )
         mocked_fzf_execute.assert_called_with(
             multi_select=False, empty_allow=True, header=None
@@ -314,7 +339,7 @@ class TestEC2(unittest.TestCase):
         mocked_fzf_execute.return_value = "11111111"
         self.ec2.get_volume_id()
         mocked_fzf_list.assert_called_with(
-            ANY, "VolumeId", "Name",
+            ANY, "VolumeId", "Name", stream=True, reload=None,
         )
         mocked_fzf_execute.assert_called_with(
             multi_select=False, empty_allow=True, header=None
@@ -341,7 +366,7 @@ class TestEC2(unittest.TestCase):
         mocked_fzf_execute.return_value = "11111111"
         self.ec2.get_vpc_id()
         mocked_fzf_list.assert_called_with(
-            ANY, "VpcId", "IsDefault", "CidrBlock", "Name",
+            ANY, "VpcId", "IsDefault", "CidrBlock", "Name", stream=True, reload=None,
         )
         mocked_fzf_execute.assert_called_with(
             empty_allow=True, multi_select=False, header=None
@@ -366,6 +391,8 @@ class TestEC2(unittest.TestCase):
         for instance in generator:
             self.assertIsInstance(instance, dict)
             self.assertRegex(instance["InstanceId"], r"[0-9]*")
+            # original instance response should be kept
+            self.assertIn("State", instance)
 
     def test_name_tag_generator(self):
         data = [
@@ -57,11 +57,12 @@ class TestEC2ls(unittest.TestCase):
         self.capturedOutput.seek(0)
         ec2 = boto3.client("ec2")
         stubber = Stubber(ec2)
-        stubber.add_response("describe_instances", response[0])
         stubber.activate()
         mocked_client.return_value = ec2
         ls_instance()
-        self.assertRegex(self.capturedOutput.getvalue(), r"Reservations.*")
+        # should not call describe_instances again for the selected instances
+        stubber.assert_no_pending_responses()
+        self.assertRegex(self.capturedOutput.getvalue(), r"Instances.*")
 
     @patch.object(BaseSession, "client", new_callable=PropertyMock)
     @patch.object(EC2, "get_vpc_id")
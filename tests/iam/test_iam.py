@@ -2,7 +2,7 @@ import io
 import os
 import sys
 import unittest
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 from fzfaws.iam import IAM
 from fzfaws.utils import Pyfzf, FileLoader
 from botocore.paginate import Paginator
@@ -33,11 +33,8 @@ class TestIAM(unittest.TestCase):
 
     @patch.object(Paginator, "paginate")
     @patch.object(Pyfzf, "process_list")
-    @patch.object(Pyfzf, "append_fzf")
-    @patch.object(Pyfzf, "execute_fzf")
-    def test_setarns(
-        self, mocked_fzf_execute, mocked_fzf_append, mocked_fzf_list, mocked_result
-    ):
+    @patch.object(Pyfzf, "execute_fzf_records")
+    def test_setarns(self, mocked_fzf_execute, mocked_fzf_list, mocked_result):
         mocked_result.return_value = [
             {
                 "Roles": [
@@ -67,59 +64,38 @@ class TestIAM(unittest.TestCase):
             }
         ]
 
+        role = mocked_result.return_value[0]["Roles"][0]
+
         # general test
-        mocked_fzf_execute.return_value = (
-            "arn:aws:iam::111111:role/admincloudformaitontest"
-        )
+        mocked_fzf_execute.return_value = role
         self.iam.set_arns()
         self.assertEqual(
             self.iam.arns, ["arn:aws:iam::111111:role/admincloudformaitontest"]
         )
-        mocked_fzf_append.assert_not_called()
         mocked_fzf_list.assert_called_with(
-            [
-                {
-                    "Path": "/",
-                    "RoleName": "admincloudformaitontest",
-                    "RoleId": "AROAVQL5EWXLRDZGWYAU2",
-                    "Arn": "arn:aws:iam::111111:role/admincloudformaitontest",
-                    "CreateDate": "2010-09-09",
-                    "AssumeRolePolicyDocument": {
-                        "Version": "2012-10-17",
-                        "Statement": [
-                            {
-                                "Sid": "",
-                                "Effect": "Allow",
-                                "Principal": {
-                                    "Service": "cloudformation.amazonaws.com"
-                                },
-                                "Action": "sts:AssumeRole",
-                            }
-                        ],
-                    },
-                    "Description": "Allows CloudFormation to create and manage AWS stacks and resources on your behalf.",
-                    "MaxSessionDuration": 3600,
-                }
-            ],
-            "RoleName",
-            "Arn",
+            ANY, "RoleName", "Arn", stream=True, record=True, reload=None
+        )
+        self.assertEqual(list(mocked_fzf_list.call_args[0][0]), [role])
+        mocked_fzf_execute.assert_called_with(
+            empty_allow=True, header=None, multi_select=False
         )
 
         # parameter test
         self.iam.set_arns(service="cloudformation.amazonaws.com")
-        mocked_fzf_append.assert_called_with(
-            "RoleName: admincloudformaitontest  Arn: arn:aws:iam::111111:role/admincloudformaitontest"
-        )
+        self.assertEqual(list(mocked_fzf_list.call_args[0][0]), [role])
 
-        mocked_fzf_append.reset_mock()
         self.iam.set_arns(service="hello")
-        mocked_fzf_append.assert_not_called()
+        self.assertEqual(list(mocked_fzf_list.call_args[0][0]), [])
 
         mocked_fzf_list.reset_mock()
+        mocked_fzf_execute.return_value = [role]
         self.iam.set_arns(header="hello", empty_allow=True, multi_select=True)
         mocked_fzf_list.assert_called_once()
         mocked_fzf_execute.assert_called_with(
-            empty_allow=True, header="hello", multi_select=True, print_col=4
+            empty_allow=True, header="hello", multi_select=True
+        )
+        self.assertEqual(
+            self.iam.arns, ["arn:aws:iam::111111:role/admincloudformaitontest"]
         )
 
         self.iam.set_arns(arns="111111")
@@ -131,10 +107,9 @@ class TestIAM(unittest.TestCase):
         # empty result test
         self.iam.arns = [""]
         mocked_fzf_execute.reset_mock()
-        mocked_fzf_append.reset_mock()
         mocked_result.return_value = []
-        mocked_fzf_execute.return_value = ""
+        mocked_fzf_execute.return_value = None
         self.iam.set_arns(service="cloudformation.amazonaws.com")
-        mocked_fzf_append.assert_not_called()
+        self.assertEqual(list(mocked_fzf_list.call_args[0][0]), [])
         mocked_fzf_execute.assert_called_once()
         self.assertEqual([""], self.iam.arns)
@@ -2,7 +2,7 @@ import sys
 import os
 import io
 import unittest
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 from fzfaws.kms import KMS
 from fzfaws.utils import Pyfzf, FileLoader
 from botocore.paginate import Paginator
@@ -58,6 +58,10 @@ class TestKMS(unittest.TestCase):
         mocked_fzf_execute.return_value = "11111111-1261-4941-9731-11111111"
         self.kms.set_keyids()
         mocked_fzf_list.assert_called_with(
+            ANY, "TargetKeyId", "AliasName", "AliasArn", stream=True, reload=None
+        )
+        self.assertEqual(
+            list(mocked_fzf_list.call_args[0][0]),
             [
                 {
                     "AliasName": "alias/S3Encrypt",
@@ -70,9 +74,6 @@ class TestKMS(unittest.TestCase):
                     "TargetKeyId": "11111111-1261-4941-9731-11111111",
                 },
             ],
-            "TargetKeyId",
-            "AliasName",
-            "AliasArn",
         )
         self.assertEqual(self.kms.keyids, ["11111111-1261-4941-9731-11111111"])
 
@@ -99,6 +100,7 @@ class TestKMS(unittest.TestCase):
         mocked_fzf_list.reset_mock()
         self.kms.keyids = [""]
         self.kms.set_keyids()
-        mocked_fzf_list.assert_not_called()
+        mocked_fzf_list.assert_called_once()
+        self.assertEqual(list(mocked_fzf_list.call_args[0][0]), [])
         mocked_fzf_execute.assert_called_once()
         self.assertEqual(self.kms.keyids, [""])
@@ -2,7 +2,7 @@ import unittest
 import os
 import io
 import sys
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 from fzfaws.route53 import Route53
 from fzfaws.utils import Pyfzf, FileLoader
 from botocore.paginate import Paginator
@@ -64,12 +64,14 @@ class TestRoute53(unittest.TestCase):
         mocked_fzf_execute.return_value = "111111"
         self.route53.set_zone_id()
         mocked_fzf_process.assert_called_with(
+            ANY, "Id", "Name", stream=True, reload=None
+        )
+        self.assertEqual(
+            list(mocked_fzf_process.call_args[0][0]),
             [
                 {"Id": "111111", "Name": "bilibonshop.xyz."},
                 {"Id": "222222", "Name": "mealternative.com."},
             ],
-            "Id",
-            "Name",
         )
         self.assertEqual(self.route53.zone_ids, ["111111"])
 
@@ -91,7 +93,8 @@ class TestRoute53(unittest.TestCase):
         mocked_fzf_execute.return_value = ""
         mocked_result.return_value = []
         self.route53.set_zone_id()
-        mocked_fzf_process.assert_not_called()
+        mocked_fzf_process.assert_called_once()
+        self.assertEqual(list(mocked_fzf_process.call_args[0][0]), [])
         mocked_fzf_execute.assert_called_once()
         self.assertEqual(self.route53.zone_ids, [""])
 
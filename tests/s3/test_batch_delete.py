@@ -0,0 +1,117 @@
+import io
+import sys
+import unittest
+
+import boto3
+from botocore.stub import Stubber
+
+from fzfaws.s3.helper.batch_delete import BatchDeleter
+from fzfaws.utils.exceptions import MFADeleteLimit
+
+
+class TestBatchDeleter(unittest.TestCase):
+    def setUp(self):
+        self.capturedOutput = io.StringIO()
+        sys.stdout = self.capturedOutput
+        self.client = boto3.client(
+            "s3",
+            region_name="us-east-1",
+            aws_access_key_id="test",
+            aws_secret_access_key="test",
+        )
+        self.stubber = Stubber(self.client)
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    def test_constructor(self):
+        deleter = BatchDeleter(self.client, "kazhala-lol", batch_size=5000)
+        self.assertEqual(deleter.batch_size, 1000)
+        self.assertEqual(deleter.max_workers, 10)
+        deleter = BatchDeleter(self.client, "kazhala-lol", mfa="111 111")
+        self.assertEqual(deleter.max_workers, 1)
+
+    def test_run(self):
+        self.stubber.add_response(
+            "delete_objects",
+            {"Deleted": [{"Key": "0.txt"}, {"Key": "1.txt"}]},
+            {
+                "Bucket": "kazhala-lol",
+                "Delete": {
+                    "Objects": [{"Key": "0.txt"}, {"Key": "1.txt"}],
+                    "Quiet": False,
+                },
+            },
+        )
+        self.stubber.add_response(
+            "delete_objects",
+            {
+                "Deleted": [{"Key": "2.txt"}],
+                "Errors": [
+                    {"Key": "3.txt", "Code": "AccessDenied", "Message": "Access Denied"}
+                ],
+            },
+            {
+                "Bucket": "kazhala-lol",
+                "Delete": {
+                    "Objects": [{"Key": "2.txt"}, {"Key": "3.txt"}],
+                    "Quiet": False,
+                },
+            },
+        )
+        self.stubber.add_client_error(
+            "delete_objects", "InternalError", "We encountered an internal error."
+        )
+        self.stubber.activate()
+        deleter = BatchDeleter(self.client, "kazhala-lol", max_workers=1, batch_size=2)
+        errors = deleter.run({"Key": "%s.txt" % i} for i in range(5))
+        self.stubber.assert_no_pending_responses()
+
+        self.assertEqual(deleter.deleted, 3)
+        self.assertEqual(
+            errors,
+            [
+                {"Key": "3.txt", "Code": "AccessDenied", "Message": "Access Denied"},
+                {
+                    "Key": "4.txt",
+                    "Code": "InternalError",
+                    "Message": "We encountered an internal error.",
+                },
+            ],
+        )
+        self.assertEqual(
+            self.capturedOutput.getvalue(),
+            "delete: s3://kazhala-lol/0.txt\n"
+            "delete: s3://kazhala-lol/1.txt\n"
+            "delete: s3://kazhala-lol/2.txt\n"
+            "2 object(s) failed to delete:\n"
+            "delete failed: s3://kazhala-lol/3.txt AccessDenied: Access Denied\n"
+            "delete failed: s3://kazhala-lol/4.txt InternalError: "
+            "We encountered an internal error.\n",
+        )
+
+    def test_mfa(self):
+        objects = [{"Key": "hello.txt", "VersionId": "111"}]
+        self.stubber.add_response(
+            "delete_objects",
+            {"Deleted": objects},
+            {
+                "Bucket": "kazhala-lol",
+                "Delete": {"Objects": objects, "Quiet": False},
+                "MFA": "111 111",
+            },
+        )
+        self.stubber.activate()
+        errors = BatchDeleter(self.client, "kazhala-lol", mfa="111 111").run(objects)
+        self.stubber.assert_no_pending_responses()
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            self.capturedOutput.getvalue(),
+            "delete: s3://kazhala-lol/hello.txt with version 111\n",
+        )
+
+        # the mfa code can't be reused by a second batch
+        objects = ({"Key": "%s.txt" % i} for i in range(3))
+        deleter = BatchDeleter(self.client, "kazhala-lol", mfa="111 111", batch_size=2)
+        self.assertRaises(MFADeleteLimit, deleter.run, objects)
+        self.stubber.assert_no_pending_responses()
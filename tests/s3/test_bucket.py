@@ -1,8 +1,9 @@
 import io
 import sys
 import unittest
-from unittest.mock import call, patch
+from unittest.mock import ANY, call, patch
 from fzfaws.s3.bucket_s3 import bucket_s3, process_path_param
+from fzfaws.s3.helper.get_copy_args import MetadataCapture
 from fzfaws.s3 import S3
 
 
@@ -35,7 +36,9 @@ class TestS3BucketCopy(unittest.TestCase):
                 ),
             ]
         )
-        mocked_sync.assert_called_with(["*"], ["hello*"], "s3:///", "s3:///")
+        mocked_sync.assert_called_with(
+            ["*"], ["hello*"], "s3:///", "s3:///", client=ANY, etag=False
+        )
 
         bucket_s3(
             sync=True,
@@ -48,7 +51,12 @@ class TestS3BucketCopy(unittest.TestCase):
         mocked_version.assert_not_called()
         mocked_object.assert_not_called()
         mocked_sync.assert_called_with(
-            ["*"], ["hello*"], "s3://kazhala-lol/", "s3://kazhala-yes/foo/"
+            ["*"],
+            ["hello*"],
+            "s3://kazhala-lol/",
+            "s3://kazhala-yes/foo/",
+            client=ANY,
+            etag=False,
         )
 
     @patch.object(S3, "set_s3_path")
@@ -62,7 +70,7 @@ class TestS3BucketCopy(unittest.TestCase):
         self.capturedOutput.truncate(0)
         self.capturedOutput.seek(0)
         mocked_confirm.return_value = False
-        mocked_walk.side_effect = lambda a, b, c, d, e, g, h, i, j, k: print(
+        mocked_walk.side_effect = lambda a, b, c, d, e, g, h, i, j, k, **kwargs: print(
             b, c, d, e, g, h, i, j, k
         )
         bucket_s3(
@@ -213,9 +221,10 @@ class TestS3BucketCopy(unittest.TestCase):
     ):
         self.capturedOutput.truncate(0)
         self.capturedOutput.seek(0)
-        mocked_copy.side_effect = lambda a, b, c, d, e: print(b, c, d, e)
+        mocked_copy.side_effect = lambda a, b, c, d, e, capture=None: print(b, c, d, e)
         mocked_confirm.return_value = True
         bucket_s3(from_bucket="foo/boo.txt", to_bucket="lol/hello/", preserve=True)
+        self.assertIsInstance(mocked_copy.call_args[1]["capture"], MetadataCapture)
         self.assertEqual(
             self.capturedOutput.getvalue(),
             "(dryrun) copy: s3://foo/boo.txt to s3://lol/hello/boo.txt\ncopy: s3://foo/boo.txt to s3://lol/hello/boo.txt\nfoo boo.txt lol hello/boo.txt\n",
@@ -223,7 +232,7 @@ class TestS3BucketCopy(unittest.TestCase):
 
         self.capturedOutput.truncate(0)
         self.capturedOutput.seek(0)
-        mocked_copy.side_effect = lambda a, b, c, d, e, version=None: print(
+        mocked_copy.side_effect = lambda a, b, c, d, e, version=None, **kwargs: print(
             b, c, d, e, version
         )
         mocked_confirm.return_value = True
@@ -241,16 +250,74 @@ class TestS3BucketCopy(unittest.TestCase):
 
         self.capturedOutput.truncate(0)
         self.capturedOutput.seek(0)
-        mocked_copy.side_effect = lambda a, b, c, d, e: print(b, c, d, e)
+        mocked_copy.side_effect = lambda a, b, c, d, e, size=None, metadata=None: print(
+            b, c, d, e, metadata
+        )
         mocked_confirm.return_value = True
         mocked_walk.return_value = [("boo/hello.txt", "hello/hello.txt")]
-        bucket_s3(
-            from_bucket="foo/boo/",
-            to_bucket="lol/hello/",
-            recursive=True,
-            preserve=True,
-        )
+        with patch("fzfaws.s3.bucket_s3.get_metadata_capture") as mocked_capture, patch(
+            "fzfaws.s3.bucket_s3.open_transfer_journal"
+        ) as mocked_journal:
+            mocked_capture.return_value.prefetch.side_effect = (
+                lambda bucket, objects, **kwargs: (
+                    (key, version, "metadata") for key, version in objects
+                )
+            )
+            mocked_journal.return_value.is_completed.return_value = False
+            bucket_s3(
+                from_bucket="foo/boo/",
+                to_bucket="lol/hello/",
+                recursive=True,
+                preserve=True,
+                resume="copy-1",
+            )
+            mocked_capture.return_value.prefetch.assert_called_once_with(
+                "foo", ANY, return_errors=True
+            )
+            mocked_journal.assert_called_once_with("copy", "copy-1")
+            mocked_journal.return_value.plan.assert_called_once()
+            mocked_journal.return_value.complete.assert_called_once()
+            mocked_journal.return_value.close.assert_called_once_with(remove=True)
         self.assertEqual(
             self.capturedOutput.getvalue(),
-            "copy: s3://foo/boo/hello.txt to s3://lol/hello/hello.txt\nfoo boo/hello.txt lol hello/hello.txt\n",
+            "copy: s3://foo/boo/hello.txt to s3://lol/hello/hello.txt\nfoo boo/hello.txt lol hello/hello.txt metadata\n",
         )
+
+        # failed to capture or copy an object, carry on with the rest
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+        mocked_walk.return_value = [
+            ("boo/a.txt", "hello/a.txt"),
+            ("boo/b.txt", "hello/b.txt"),
+            ("boo/c.txt", "hello/c.txt"),
+        ]
+        mocked_copy.reset_mock()
+        mocked_copy.side_effect = [ValueError("copy failed"), None]
+
+        def prefetch(bucket, objects, **kwargs):
+            for key, version in objects:
+                if key == "boo/a.txt":
+                    yield key, version, ValueError("head failed")
+                else:
+                    yield key, version, "metadata"
+
+        with patch("fzfaws.s3.bucket_s3.get_metadata_capture") as mocked_capture, patch(
+            "fzfaws.s3.bucket_s3.open_transfer_journal"
+        ) as mocked_journal:
+            mocked_capture.return_value.prefetch.side_effect = prefetch
+            mocked_journal.return_value.is_completed.return_value = False
+            mocked_journal.return_value.job_id = "copy-1"
+            bucket_s3(
+                from_bucket="foo/boo/",
+                to_bucket="lol/hello/",
+                recursive=True,
+                preserve=True,
+            )
+            self.assertEqual(mocked_copy.call_count, 2)
+            mocked_journal.return_value.complete.assert_called_once()
+            mocked_journal.return_value.close.assert_called_once_with(remove=False)
+        output = self.capturedOutput.getvalue()
+        self.assertIn("2 file(s) failed to transfer:", output)
+        self.assertIn("copy failed: s3://lol/hello/a.txt head failed", output)
+        self.assertIn("copy failed: s3://lol/hello/b.txt copy failed", output)
+        self.assertIn("Resume the transfer with --resume copy-1", output)
@@ -0,0 +1,72 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+from fzfaws.s3.helper.bucket_region import (
+    clear_bucket_regions,
+    get_bucket_client,
+    get_bucket_region,
+)
+
+
+def get_client(location=None, region_name="us-east-1"):
+    client = MagicMock()
+    client.meta.region_name = region_name
+    client.get_bucket_location.return_value = {"LocationConstraint": location}
+    return client
+
+
+class TestBucketRegion(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+        patcher = patch.dict(os.environ, {"XDG_CACHE_HOME": self.cache_dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        clear_bucket_regions()
+        self.addCleanup(clear_bucket_regions)
+
+    def test_get_bucket_region(self):
+        client = get_client("ap-southeast-2")
+        self.assertEqual(get_bucket_region(client, "kazhala-lol"), "ap-southeast-2")
+        self.assertEqual(get_bucket_region(client, "kazhala-lol"), "ap-southeast-2")
+        client.get_bucket_location.assert_called_once_with(Bucket="kazhala-lol")
+
+        self.assertEqual(get_bucket_region(get_client(None), "us"), "us-east-1")
+        self.assertEqual(get_bucket_region(get_client("EU"), "eu"), "eu-west-1")
+        self.assertEqual(get_bucket_region(client, ""), None)
+
+        client = get_client()
+        client.get_bucket_location.side_effect = ClientError(
+            {"Error": {"Code": "AccessDenied"}}, "GetBucketLocation"
+        )
+        self.assertEqual(get_bucket_region(client, "denied"), None)
+        # failed lookup is not cached
+        get_bucket_region(client, "denied")
+        self.assertEqual(client.get_bucket_location.call_count, 2)
+
+    def test_cache_file(self):
+        get_bucket_region(get_client("ap-southeast-2"), "kazhala-lol")
+        cache_path = os.path.join(self.cache_dir.name, "fzfaws", "bucket_region.json")
+        with open(cache_path, "r") as file:
+            self.assertEqual(json.load(file), {"kazhala-lol": "ap-southeast-2"})
+
+        clear_bucket_regions()
+        client = get_client("us-west-2")
+        self.assertEqual(get_bucket_region(client, "kazhala-lol"), "ap-southeast-2")
+        client.get_bucket_location.assert_not_called()
+
+    @patch("fzfaws.s3.helper.bucket_region.get_client")
+    def test_get_bucket_client(self, mocked_client):
+        client = get_client("us-east-1")
+        self.assertIs(get_bucket_client(client, "kazhala-lol"), client)
+        mocked_client.assert_not_called()
+
+        client = get_client("ap-southeast-2")
+        result = get_bucket_client(client, "kazhala-version-testing", "default")
+        self.assertIs(result, mocked_client.return_value)
+        mocked_client.assert_called_once_with("s3", "default", "ap-southeast-2")
@@ -1,16 +1,15 @@
 import io
-import json
-import os
 import sys
 import unittest
 from unittest.mock import patch, PropertyMock, ANY
 
 import boto3
-from botocore.paginate import Paginator
 from botocore.stub import Stubber
 
-from fzfaws.s3.delete_s3 import delete_s3, find_all_version_files
+from fzfaws.s3.delete_s3 import delete_s3
+from fzfaws.s3.helper.list_object_versions import ObjectVersion
 from fzfaws.s3.s3 import S3
+from fzfaws.utils.exceptions import MFADeleteLimit
 from fzfaws.utils.session import BaseSession
 
 
@@ -22,64 +21,17 @@ class TestS3Delete(unittest.TestCase):
     def tearDown(self):
         sys.stdout = sys.__stdout__
 
-    @patch.object(Paginator, "paginate")
-    def test_find_all_version_files(self, mocked_result):
-        data_path = os.path.join(
-            os.path.dirname(os.path.abspath(__file__)), "../data/s3_object_ver.json"
-        )
-        with open(data_path, "r") as file:
-            mocked_result.return_value = json.load(file)
-
-        s3 = boto3.client("s3")
-        result = find_all_version_files(s3, "kazhala-lol", "")
-        self.assertEqual(
-            result,
-            [
-                " elb.pem",
-                " w tf.txt",
-                " wtf.txt",
-                "../",
-                ".DS_Store",
-                "CHANGELOG.md",
-                "README.md",
-                "wtf.pem",
-            ],
-        )
-
-        result = find_all_version_files(
-            s3, "kazhala-lol", "", exclude=["*.pem"], include=["wtf.pem"]
-        )
-        self.assertEqual(
-            result,
-            [
-                " w tf.txt",
-                " wtf.txt",
-                "../",
-                ".DS_Store",
-                "CHANGELOG.md",
-                "README.md",
-                "wtf.pem",
-            ],
-        )
-
-        result = find_all_version_files(s3, "kazhala-lol", "", deletemark=True)
-        self.assertEqual(
-            result, [" elb.pem", " w tf.txt", " wtf.txt", ".DS_Store"],
-        )
-
     @patch.object(BaseSession, "client", new_callable=PropertyMock)
     @patch("fzfaws.s3.delete_s3.get_confirmation")
     @patch("fzfaws.s3.delete_s3.walk_s3_folder")
-    @patch("fzfaws.s3.delete_s3.find_all_version_files")
-    @patch.object(S3, "get_object_version")
+    @patch("fzfaws.s3.delete_s3.list_object_versions")
     @patch.object(S3, "set_s3_path")
     @patch.object(S3, "set_s3_bucket")
     def test_delete_object_recursive(
         self,
         mocked_bucket,
         mocked_path,
-        mocked_version,
-        mocked_find,
+        mocked_list,
         mocked_walk,
         mocked_confirm,
         mocked_client,
@@ -95,84 +47,122 @@ class TestS3Delete(unittest.TestCase):
         self.capturedOutput.truncate(0)
         self.capturedOutput.seek(0)
         mocked_confirm.return_value = True
+        versions = [
+            ObjectVersion("hello.txt", "333333", True, True),
+            ObjectVersion("wtf.pem", "111111", False, False, 1024),
+            ObjectVersion("wtf.pem", "222222", True, False, 1024),
+        ]
+        # a version written after the dry run isn't deleted
+        mocked_list.side_effect = [
+            versions,
+            versions + [ObjectVersion("wtf.pem", "444444", True, False, 1024)],
+        ]
         s3 = boto3.client("s3")
         stubber = Stubber(s3)
         stubber.add_response(
-            "delete_object",
+            "delete_objects",
             {
-                "DeleteMarker": False,
-                "VersionId": "string",
-                "RequestCharged": "requester",
+                "Deleted": [
+                    {"Key": "hello.txt", "VersionId": "333333"},
+                    {"Key": "wtf.pem", "VersionId": "111111"},
+                    {"Key": "wtf.pem", "VersionId": "222222"},
+                ]
             },
             expected_params={
                 "Bucket": "kazhala-lol",
-                "Key": "wtf.pem",
-                "VersionId": "111111",
+                "Delete": {
+                    "Objects": [
+                        {"Key": "hello.txt", "VersionId": "333333"},
+                        {"Key": "wtf.pem", "VersionId": "111111"},
+                        {"Key": "wtf.pem", "VersionId": "222222"},
+                    ],
+                    "Quiet": False,
+                },
             },
         )
         stubber.activate()
         mocked_client.return_value = s3
-        mocked_find.return_value = ["wtf.pem"]
-        mocked_version.return_value = [{"Key": "wtf.pem", "VersionId": "111111"}]
         delete_s3(bucket="kazhala-lol/", recursive=True, allversion=True)
         self.assertEqual(
             self.capturedOutput.getvalue(),
-            "(dryrun) delete: s3://kazhala-lol/wtf.pem with all versions\ndelete: s3://kazhala-lol/wtf.pem with version 111111\n",
-        )
-        mocked_version.assert_called_once_with(
-            key="wtf.pem", delete=True, select_all=True, non_current=False
+            "(dryrun) delete: s3://kazhala-lol/hello.txt with all versions\n"
+            "(dryrun) delete: s3://kazhala-lol/wtf.pem with all versions\n"
+            "(dryrun) total: 3 version(s), 2.0 KiB\n"
+            "delete: s3://kazhala-lol/hello.txt with version 333333\n"
+            "delete: s3://kazhala-lol/wtf.pem with version 111111\n"
+            "delete: s3://kazhala-lol/wtf.pem with version 222222\n",
         )
-        mocked_find.assert_called_with(ANY, "kazhala-lol", "", [], [], [], False)
+        mocked_list.assert_called_once_with(ANY, "kazhala-lol", "", [], [])
+        stubber.assert_no_pending_responses()
+        mocked_list.side_effect = None
+        mocked_list.return_value = versions
 
         # test clean
-        mocked_version.reset_mock()
         self.capturedOutput.truncate(0)
         self.capturedOutput.seek(0)
         mocked_confirm.return_value = True
         s3 = boto3.client("s3")
         stubber = Stubber(s3)
         stubber.add_response(
-            "delete_object",
+            "delete_objects",
             {
-                "DeleteMarker": False,
-                "VersionId": "string",
-                "RequestCharged": "requester",
+                "Deleted": [
+                    {"Key": "hello.txt", "VersionId": "333333"},
+                    {"Key": "wtf.pem", "VersionId": "111111"},
+                ]
             },
             expected_params={
                 "Bucket": "kazhala-lol",
-                "Key": "wtf.pem",
-                "VersionId": "111111",
+                "Delete": {
+                    "Objects": [
+                        {"Key": "hello.txt", "VersionId": "333333"},
+                        {"Key": "wtf.pem", "VersionId": "111111"},
+                    ],
+                    "Quiet": False,
+                },
             },
         )
         stubber.activate()
         mocked_client.return_value = s3
-        mocked_find.return_value = ["wtf.pem"]
-        mocked_version.return_value = [{"Key": "wtf.pem", "VersionId": "111111"}]
-        delete_s3(bucket="kazhala-lol/", recursive=True, allversion=True, clean=True)
+        delete_s3(bucket="kazhala-lol/", recursive=True, clean=True, exclude=["*.txt"])
         self.assertEqual(
             self.capturedOutput.getvalue(),
-            "(dryrun) delete: s3://kazhala-lol/wtf.pem all non-current versions\ndelete: s3://kazhala-lol/wtf.pem with version 111111\n",
+            "(dryrun) delete: s3://kazhala-lol/hello.txt all non-current versions\n"
+            "(dryrun) delete: s3://kazhala-lol/wtf.pem all non-current versions\n"
+            "(dryrun) total: 2 version(s), 1.0 KiB\n"
+            "delete: s3://kazhala-lol/hello.txt with version 333333\n"
+            "delete: s3://kazhala-lol/wtf.pem with version 111111\n",
         )
-        mocked_version.assert_called_once_with(
-            key="wtf.pem", delete=True, select_all=True, non_current=True
+        mocked_list.assert_called_with(ANY, "kazhala-lol", "", ["*.txt"], [])
+        stubber.assert_no_pending_responses()
+
+        # test deletemark
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+        mocked_confirm.return_value = False
+        delete_s3(
+            bucket="kazhala-lol/", recursive=True, allversion=True, deletemark=True
+        )
+        self.assertEqual(
+            self.capturedOutput.getvalue(),
+            "(dryrun) delete: s3://kazhala-lol/hello.txt with all versions\n"
+            "(dryrun) total: 1 version(s), 0 Bytes\n",
         )
-        mocked_find.assert_called_with(ANY, "kazhala-lol", "", [], [], [], False)
 
         # test recursive non version delete
-        mocked_version.reset_mock()
+        mocked_list.reset_mock()
         self.capturedOutput.truncate(0)
         self.capturedOutput.seek(0)
         mocked_confirm.return_value = True
         s3 = boto3.client("s3")
         stubber = Stubber(s3)
         stubber.add_response(
-            "delete_object",
-            {
-                "DeleteMarker": False,
-                "VersionId": "string",
-                "RequestCharged": "requester",
+            "delete_objects",
+            {"Deleted": [{"Key": "wtf.pem"}]},
+            expected_params={
+                "Bucket": "kazhala-lol",
+                "Delete": {"Objects": [{"Key": "wtf.pem"}], "Quiet": False},
             },
-            expected_params={"Bucket": "kazhala-lol", "Key": "wtf.pem",},
         )
         stubber.activate()
         mocked_client.return_value = s3
@@ -182,7 +172,7 @@ class TestS3Delete(unittest.TestCase):
             self.capturedOutput.getvalue(), "delete: s3://kazhala-lol/wtf.pem\n",
         )
         mocked_walk.assert_called_with(ANY, "kazhala-lol", "", "", [], [], [], "delete")
-        mocked_version.assert_not_called()
+        mocked_list.assert_not_called()
 
     @patch.object(BaseSession, "client", new_callable=PropertyMock)
     @patch("fzfaws.s3.delete_s3.get_confirmation")
@@ -202,11 +192,9 @@ class TestS3Delete(unittest.TestCase):
         delete_s3(version=True, allversion=True, mfa="111111 111111", deletemark=True)
         mocked_bucket.assert_called_once()
         mocked_object.assert_called_once_with(
-            version=True, multi_select=False, deletemark=True
-        )
-        mocked_version.assert_called_once_with(
-            delete=True, select_all=False, multi_select=False
+            version=True, multi_select=True, deletemark=True
         )
+        mocked_version.assert_called_once_with(delete=True, select_all=False)
 
         # version test
         self.capturedOutput.truncate(0)
@@ -214,17 +202,14 @@ class TestS3Delete(unittest.TestCase):
         s3 = boto3.client("s3")
         stubber = Stubber(s3)
         stubber.add_response(
-            "delete_object",
-            {
-                "DeleteMarker": False,
-                "VersionId": "string",
-                "RequestCharged": "requester",
-            },
+            "delete_objects",
+            {"Deleted": [{"Key": "wtf.pem", "VersionId": "111111"}]},
             expected_params={
                 "Bucket": "kazhala-lol",
-                "Key": "wtf.pem",
-                "MFA": "",
-                "VersionId": "111111",
+                "Delete": {
+                    "Objects": [{"Key": "wtf.pem", "VersionId": "111111"}],
+                    "Quiet": False,
+                },
             },
         )
         stubber.activate()
@@ -235,9 +220,7 @@ class TestS3Delete(unittest.TestCase):
             self.capturedOutput.getvalue(),
             "(dryrun) delete: s3://kazhala-lol/wtf.pem with version 111111\ndelete: s3://kazhala-lol/wtf.pem with version 111111\n",
         )
-        mocked_version.assert_called_with(
-            delete=True, select_all=False, multi_select=True
-        )
+        mocked_version.assert_called_with(delete=True, select_all=False)
         mocked_object.assert_called_with(
             version=True, multi_select=True, deletemark=False
         )
@@ -248,17 +231,15 @@ class TestS3Delete(unittest.TestCase):
         s3 = boto3.client("s3")
         stubber = Stubber(s3)
         stubber.add_response(
-            "delete_object",
-            {
-                "DeleteMarker": False,
-                "VersionId": "string",
-                "RequestCharged": "requester",
-            },
+            "delete_objects",
+            {"Deleted": [{"Key": "wtf.pem", "VersionId": "111111"}]},
             expected_params={
                 "Bucket": "kazhala-lol",
-                "Key": "wtf.pem",
+                "Delete": {
+                    "Objects": [{"Key": "wtf.pem", "VersionId": "111111"}],
+                    "Quiet": False,
+                },
                 "MFA": "99999 111111",
-                "VersionId": "111111",
             },
         )
         stubber.activate()
@@ -275,13 +256,25 @@ class TestS3Delete(unittest.TestCase):
             self.capturedOutput.getvalue(),
             "(dryrun) delete: s3://kazhala-lol/wtf.pem with version 111111\ndelete: s3://kazhala-lol/wtf.pem with version 111111\n",
         )
-        mocked_version.assert_called_with(
-            delete=True, select_all=False, multi_select=False
-        )
+        mocked_version.assert_called_with(delete=True, select_all=False)
         mocked_object.assert_called_with(
-            version=True, multi_select=False, deletemark=False
+            version=True, multi_select=True, deletemark=False
         )
 
+        # more versions than a single mfa delete
+        mocked_confirm.reset_mock()
+        mocked_version.return_value = [
+            {"Key": "wtf.pem", "VersionId": str(i)} for i in range(1001)
+        ]
+        self.assertRaises(
+            MFADeleteLimit,
+            delete_s3,
+            version=True,
+            bucket="kazhala-lol/",
+            mfa="99999 111111",
+        )
+        mocked_confirm.assert_not_called()
+
     @patch.object(BaseSession, "client", new_callable=PropertyMock)
     @patch("fzfaws.s3.delete_s3.get_confirmation")
     @patch.object(S3, "set_s3_object")
@@ -302,13 +295,12 @@ class TestS3Delete(unittest.TestCase):
         s3 = boto3.client("s3")
         stubber = Stubber(s3)
         stubber.add_response(
-            "delete_object",
-            {
-                "DeleteMarker": False,
-                "VersionId": "string",
-                "RequestCharged": "requester",
+            "delete_objects",
+            {"Deleted": [{"Key": "wtf.pem"}]},
+            expected_params={
+                "Bucket": "kazhala-lol",
+                "Delete": {"Objects": [{"Key": "wtf.pem"}], "Quiet": False},
             },
-            expected_params={"Bucket": "kazhala-lol", "Key": "wtf.pem",},
         )
         stubber.activate()
         mocked_client.return_value = s3
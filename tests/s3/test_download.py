@@ -3,7 +3,7 @@ import os
 import io
 import sys
 import unittest
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 from fzfaws.s3.download_s3 import download_s3
 from fzfaws.s3 import S3
 
@@ -12,6 +12,11 @@ class TestS3Download(unittest.TestCase):
     def setUp(self):
         self.capturedOutput = io.StringIO()
         sys.stdout = self.capturedOutput
+        patcher = patch(
+            "fzfaws.s3.helper.bucket_region.get_bucket_region", return_value=None
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def tearDown(self):
         sys.stdout = sys.__stdout__
@@ -27,6 +32,8 @@ class TestS3Download(unittest.TestCase):
             include=[],
             from_path="s3://kazhala-lol/hello/",
             to_path=os.path.dirname(__file__),
+            client=ANY,
+            etag=False,
         )
         mocked_local.assert_called_with(False, directory=True, hidden=False)
 
@@ -37,6 +44,8 @@ class TestS3Download(unittest.TestCase):
             include=[],
             from_path="s3://kazhala-lol/",
             to_path=os.path.dirname(__file__),
+            client=ANY,
+            etag=False,
         )
 
         mocked_local.reset_mock()
@@ -48,6 +57,8 @@ class TestS3Download(unittest.TestCase):
             include=[],
             from_path="s3://kazhala-lol/hello/",
             to_path=os.path.dirname(__file__),
+            client=ANY,
+            etag=False,
         )
         mocked_local.assert_called_with(True, directory=True, hidden=True)
 
@@ -57,7 +68,7 @@ class TestS3Download(unittest.TestCase):
         self.capturedOutput.truncate(0)
         self.capturedOutput.seek(0)
         mocked_walk.return_value = [("hello/hello.txt", "hello.txt")]
-        mocked_walk.side_effect = lambda a, b, c, d, e, g, h, i, j: print(
+        mocked_walk.side_effect = lambda a, b, c, d, e, g, h, i, j, **kwargs: print(
             b, c, d, e, g, h, i, j
         )
         mocked_confirm.return_value = False
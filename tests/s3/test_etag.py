@@ -0,0 +1,110 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from fzfaws.s3.helper.etag import DigestCache, ETagHasher
+
+
+class TestETagHasher(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "cache", "etag.json")
+        self.filename = os.path.join(self.temp_dir.name, "hello.txt")
+        with open(self.filename, "w") as file:
+            file.write("hello")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @patch.dict(os.environ, {"FZFAWS_S3_TRANSFER": "{}"})
+    def test_constructor(self):
+        hasher = ETagHasher(cache=False)
+        self.assertEqual(hasher.chunksize, 8 * 1024 * 1024)
+        self.assertIsNone(hasher.digest_cache)
+        hasher.close()
+
+        with patch.dict(os.environ, {"XDG_CACHE_HOME": self.temp_dir.name}):
+            with ETagHasher(chunksize=2) as hasher:
+                self.assertEqual(hasher.chunksize, 2)
+                self.assertEqual(
+                    hasher.digest_cache.cache_path,
+                    "%s/fzfaws/etag.json" % self.temp_dir.name,
+                )
+
+    def test_get_etag(self):
+        with ETagHasher(chunksize=2, cache=False) as hasher:
+            self.assertEqual(
+                hasher.get_etag(self.filename),
+                '"%s"' % hashlib.md5(b"hello").hexdigest(),
+            )
+            parts = b"".join(
+                hashlib.md5(part).digest() for part in (b"he", b"ll", b"o")
+            )
+            self.assertEqual(
+                hasher.get_etag(self.filename, multipart=True),
+                '"%s-3"' % hashlib.md5(parts).hexdigest(),
+            )
+
+            empty_file = os.path.join(self.temp_dir.name, "empty.txt")
+            open(empty_file, "w").close()
+            self.assertEqual(
+                hasher.get_etag(empty_file), '"%s"' % hashlib.md5().hexdigest()
+            )
+
+    def test_cache(self):
+        hasher = ETagHasher(chunksize=2, cache=False)
+        hasher.digest_cache = DigestCache(self.cache_path)
+        etag = hasher.get_etag(self.filename)
+        hasher.close()
+        self.assertTrue(os.path.isfile(self.cache_path))
+
+        hasher = ETagHasher(chunksize=2, cache=False)
+        hasher.digest_cache = DigestCache(self.cache_path)
+        with patch.object(hasher, "get_digest") as mocked_digest:
+            self.assertEqual(hasher.get_etag(self.filename), etag)
+            mocked_digest.assert_not_called()
+
+        # file changed, hash again
+        with open(self.filename, "w") as file:
+            file.write("world")
+        os.utime(self.filename, (1000, 1000))
+        self.assertEqual(
+            hasher.get_etag(self.filename), '"%s"' % hashlib.md5(b"world").hexdigest()
+        )
+        hasher.close()
+
+
+class TestDigestCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "fzfaws", "etag.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_get_set(self):
+        stat = os.stat(self.temp_dir.name)
+        cache = DigestCache(self.cache_path)
+        self.assertIsNone(cache.get("hello.txt", stat, "md5"))
+        cache.set("hello.txt", stat, "md5", '"111"')
+        cache.set("hello.txt", stat, "8", '"111-2"')
+        self.assertEqual(cache.get("hello.txt", stat, "md5"), '"111"')
+        cache.save()
+
+        cache = DigestCache(self.cache_path)
+        self.assertEqual(cache.get("hello.txt", stat, "md5"), '"111"')
+        self.assertEqual(cache.get("hello.txt", stat, "8"), '"111-2"')
+        self.assertIsNone(cache.get("hello.txt", stat, "16"))
+        self.assertIsNone(cache.get("world.txt", stat, "md5"))
+
+        os.utime(self.temp_dir.name, (1000, 1000))
+        self.assertIsNone(cache.get("hello.txt", os.stat(self.temp_dir.name), "md5"))
+
+    def test_invalid_cache(self):
+        os.makedirs(os.path.dirname(self.cache_path))
+        with open(self.cache_path, "w") as file:
+            file.write("{")
+        cache = DigestCache(self.cache_path)
+        self.assertEqual(cache._entries, {})
@@ -1,5 +1,6 @@
+import fnmatch
 import unittest
-from fzfaws.s3.helper.exclude_file import exclude_file
+from fzfaws.s3.helper.exclude_file import GlobFilter, exclude_file
 
 
 class TestS3ExcludeFile(unittest.TestCase):
@@ -26,3 +27,47 @@ class TestS3ExcludeFile(unittest.TestCase):
 
         result = exclude_file(["*"], [".*"], "src/hello.txt")
         self.assertEqual(result, True)
+
+
+class TestGlobFilter(unittest.TestCase):
+    def test_exclude(self):
+        glob_filter = GlobFilter(["*.log", ".git/*"], ["important.*", "*.git/HEAD"])
+        self.assertEqual(glob_filter.exclude("app.log"), True)
+        self.assertEqual(glob_filter.exclude(".git/config"), True)
+        self.assertEqual(glob_filter.exclude("important.log"), False)
+        self.assertEqual(glob_filter.exclude(".git/HEAD"), False)
+        self.assertEqual(glob_filter.exclude("hello.txt"), False)
+
+        self.assertEqual(GlobFilter().exclude("hello.txt"), False)
+        self.assertEqual(GlobFilter(["*"]).exclude("hello.txt"), True)
+        self.assertEqual(GlobFilter(["*"], ["*"]).exclude("hello.txt"), False)
+        self.assertEqual(GlobFilter([], ["*.txt"]).exclude("hello.json"), False)
+
+    def test_same_as_fnmatch(self):
+        patterns = ["*", "*.txt", "src/*", "[!a]*", "?.json", "a[0-9]/*", "*.[ch]"]
+        filenames = ["a.txt", "b.json", "src/a.c", "a1/b.h", "abc", "", "x.txt/y"]
+        for exclude in patterns:
+            for include in [[]] + [[pattern] for pattern in patterns]:
+                glob_filter = GlobFilter([exclude], include)
+                for filename in filenames:
+                    expected = fnmatch.fnmatch(filename, exclude) and not any(
+                        fnmatch.fnmatch(filename, pattern) for pattern in include
+                    )
+                    self.assertEqual(
+                        glob_filter.exclude(filename),
+                        expected,
+                        (exclude, include, filename),
+                    )
+
+    def test_filter(self):
+        glob_filter = GlobFilter(["*"], ["*.txt"])
+        self.assertEqual(
+            glob_filter.filter(["a.txt", "b.json", "c.txt"]), ["a.txt", "c.txt"]
+        )
+        self.assertEqual(
+            glob_filter.filter(
+                [{"Key": "a.json"}, {"Key": "b.txt"}], key=lambda item: item["Key"]
+            ),
+            [{"Key": "b.txt"}],
+        )
+        self.assertEqual(GlobFilter().filter(iter(["a.json"])), ["a.json"])
@@ -1,16 +1,30 @@
 import os
 import json
 import unittest
-from unittest.mock import PropertyMock, patch
-from fzfaws.s3.helper.get_copy_args import get_copy_args, check_acl_update
+from unittest.mock import MagicMock, PropertyMock, patch
+from botocore.exceptions import ClientError
+from fzfaws.s3.helper.get_copy_args import (
+    MetadataCapture,
+    ObjectMetadata,
+    get_copy_args,
+    get_metadata_capture,
+    check_acl_update,
+)
 from fzfaws.s3.helper.s3args import S3Args
-from botocore.stub import Stubber
-import boto3
 from fzfaws.s3 import S3
 from fzfaws.s3.helper.s3args import S3Args
 
 
 class TestS3GetCopyArgs(unittest.TestCase):
+    def get_client(self, head, acl):
+        client = MagicMock()
+        client.head_object.return_value = head
+        client.get_object_acl.return_value = acl
+        client.get_object_tagging.return_value = {
+            "TagSet": [{"Key": "hello", "Value": "world"}]
+        }
+        return client
+
     @patch.object(S3Args, "acl_full", new_callable=PropertyMock)
     @patch.object(S3Args, "acl_read", new_callable=PropertyMock)
     @patch.object(S3Args, "acl_acp_write", new_callable=PropertyMock)
@@ -55,13 +69,8 @@ class TestS3GetCopyArgs(unittest.TestCase):
             response2 = json.load(file)
 
         # no version, update acl true
-        s3_client = boto3.client("s3")
-        stubber = Stubber(s3_client)
-        stubber.add_response("get_object", response1)
-        stubber.add_response("get_object_acl", response2)
-        stubber.activate()
         s3 = S3()
-        s3._client = s3_client
+        s3._client = self.get_client(response1, response2)
         s3.bucket_name = "hello"
         s3_args = S3Args(s3)
         result = get_copy_args(s3, "hello.json", s3_args, False)
@@ -74,18 +83,16 @@ class TestS3GetCopyArgs(unittest.TestCase):
                 "StorageClass": "REDUCED_REDUNDANCY",
                 "ServerSideEncryption": "aws:kms",
                 "SSEKMSKeyId": "arn:aws:kms:ap-southeast-2:11111111:key/11111111-f48d-48b8-90d4-d5bd03a603d4",
+                "Metadata": {"hello": "world"},
+                "ContentType": "binary/octet-stream",
+                "Tagging": "hello=world",
                 "GrantRead": "uri=http://acs.amazonaws.com/groups/global/AllUsers",
             },
         )
 
         # no version, update acl false
-        s3_client = boto3.client("s3")
-        stubber = Stubber(s3_client)
-        stubber.add_response("get_object", response1)
-        stubber.add_response("get_object_acl", response2)
-        stubber.activate()
         s3 = S3()
-        s3._client = s3_client
+        s3._client = self.get_client(response1, response2)
         s3.bucket_name = "hello"
         s3_args = S3Args(s3)
         s3_args._extra_args["GrantFullControl"] = "email=hello@gmail.com"
@@ -100,17 +107,15 @@ class TestS3GetCopyArgs(unittest.TestCase):
                 "StorageClass": "REDUCED_REDUNDANCY",
                 "ServerSideEncryption": "aws:kms",
                 "SSEKMSKeyId": "arn:aws:kms:ap-southeast-2:11111111:key/11111111-f48d-48b8-90d4-d5bd03a603d4",
+                "Metadata": {"hello": "world"},
+                "ContentType": "binary/octet-stream",
+                "Tagging": "hello=world",
             },
         )
 
         # no version, no extra_args
-        s3_client = boto3.client("s3")
-        stubber = Stubber(s3_client)
-        stubber.add_response("get_object", response1)
-        stubber.add_response("get_object_acl", response2)
-        stubber.activate()
         s3 = S3()
-        s3._client = s3_client
+        s3._client = self.get_client(response1, response2)
         s3.bucket_name = "hello"
         s3_args = S3Args(s3)
         s3_args._extra_args["GrantFullControl"] = "email=hello@gmail.com"
@@ -122,9 +127,23 @@ class TestS3GetCopyArgs(unittest.TestCase):
                 "StorageClass": "REDUCED_REDUNDANCY",
                 "ServerSideEncryption": "aws:kms",
                 "SSEKMSKeyId": "arn:aws:kms:ap-southeast-2:11111111:key/11111111-f48d-48b8-90d4-d5bd03a603d4",
+                "Metadata": {"hello": "world"},
+                "ContentType": "binary/octet-stream",
+                "Tagging": "hello=world",
             },
         )
 
+        # the capture of the operation is reused
+        capture = get_metadata_capture(s3, s3_args)
+        for _ in range(2):
+            self.assertEqual(
+                get_copy_args(s3, "hello.json", s3_args, True, capture=capture),
+                result,
+            )
+        s3.client.head_object.reset_mock()
+        get_copy_args(s3, "hello.json", s3_args, True, capture=capture)
+        s3.client.head_object.assert_not_called()
+
     def test_get_copy_args_with_version(self):
         data_path1 = os.path.join(
             os.path.dirname(os.path.abspath(__file__)), "../data/s3_obj.json"
@@ -138,13 +157,8 @@ class TestS3GetCopyArgs(unittest.TestCase):
             response2 = json.load(file)
 
         # with version
-        s3_client = boto3.client("s3")
-        stubber = Stubber(s3_client)
-        stubber.add_response("get_object", response1)
-        stubber.add_response("get_object_acl", response2)
-        stubber.activate()
         s3 = S3()
-        s3._client = s3_client
+        s3._client = self.get_client(response1, response2)
         s3.bucket_name = "hello"
         s3_args = S3Args(s3)
         result = get_copy_args(s3, "hello.json", s3_args, False)
@@ -157,6 +171,107 @@ class TestS3GetCopyArgs(unittest.TestCase):
                 "StorageClass": "REDUCED_REDUNDANCY",
                 "ServerSideEncryption": "aws:kms",
                 "SSEKMSKeyId": "arn:aws:kms:ap-southeast-2:11111111:key/11111111-f48d-48b8-90d4-d5bd03a603d4",
+                "Metadata": {"hello": "world"},
+                "ContentType": "binary/octet-stream",
+                "Tagging": "hello=world",
                 "GrantRead": "uri=http://acs.amazonaws.com/groups/global/AllUsers",
             },
         )
+
+
+class TestMetadataCapture(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.head_object.side_effect = lambda **kwargs: {
+            "ContentLength": len(kwargs["Key"])
+        }
+        self.client.get_object_acl.return_value = {"Grants": []}
+        self.client.get_object_tagging.return_value = {
+            "TagSet": [{"Key": "hello", "Value": "world"}]
+        }
+
+    def test_get(self):
+        capture = MetadataCapture(self.client)
+        result = capture.get("kazhala-lol", "hello.txt", "111")
+        self.assertEqual(
+            result,
+            ObjectMetadata(
+                {"ContentLength": 9},
+                {"Grants": []},
+                [{"Key": "hello", "Value": "world"}],
+            ),
+        )
+        args = {"Bucket": "kazhala-lol", "Key": "hello.txt", "VersionId": "111"}
+        self.client.head_object.assert_called_once_with(**args)
+        self.client.get_object_acl.assert_called_once_with(**args)
+        self.client.get_object_tagging.assert_called_once_with(**args)
+        self.client.get_object.assert_not_called()
+
+        # cached per key and version
+        self.assertIs(capture.get("kazhala-lol", "hello.txt", "111"), result)
+        self.client.head_object.assert_called_once()
+        capture.get("kazhala-lol", "hello.txt")
+        self.client.head_object.assert_called_with(
+            Bucket="kazhala-lol", Key="hello.txt"
+        )
+
+        # acl and tags not required, no permission to read tags
+        self.client.reset_mock()
+        self.client.get_object_tagging.side_effect = ClientError(
+            {"Error": {"Code": "AccessDenied"}}, "GetObjectTagging"
+        )
+        result = MetadataCapture(self.client, acl=False).get("kazhala-lol", "a.txt")
+        self.assertEqual(result, ObjectMetadata({"ContentLength": 5}, {}, []))
+        self.client.get_object_acl.assert_not_called()
+        result = MetadataCapture(self.client, acl=False, tags=False).get(
+            "kazhala-lol", "a.txt"
+        )
+        self.client.get_object_tagging.assert_called_once()
+
+        # other errors fail the object instead of dropping its tags
+        self.client.get_object_tagging.side_effect = ClientError(
+            {"Error": {"Code": "SlowDown"}}, "GetObjectTagging"
+        )
+        self.assertRaises(
+            ClientError, MetadataCapture(self.client).get, "kazhala-lol", "a.txt"
+        )
+        result = list(
+            MetadataCapture(self.client).prefetch(
+                "kazhala-lol", [("a.txt", None)], return_errors=True
+            )
+        )
+        self.assertIsInstance(result[0][2], ClientError)
+
+    def test_prefetch(self):
+        capture = MetadataCapture(self.client, max_workers=2)
+        objects = [("%s.txt" % ("a" * i), None) for i in range(10)]
+        result = list(capture.prefetch("kazhala-lol", iter(objects)))
+        self.assertEqual([(key, version) for key, version, _ in result], objects)
+        self.assertEqual(
+            [metadata.head["ContentLength"] for _, _, metadata in result],
+            list(range(4, 14)),
+        )
+        self.assertEqual(self.client.head_object.call_count, 10)
+        # streamed objects are not cached
+        self.assertEqual(capture._cache, {})
+
+    def test_prefetch_errors(self):
+        capture = MetadataCapture(self.client, max_workers=2)
+        head_object = self.client.head_object.side_effect
+
+        def failed_head_object(**kwargs):
+            if kwargs["Key"] == "b.txt":
+                raise ClientError({"Error": {"Code": "AccessDenied"}}, "HeadObject")
+            return head_object(**kwargs)
+
+        self.client.head_object.side_effect = failed_head_object
+        objects = [("a.txt", None), ("b.txt", None), ("c.txt", None)]
+        result = list(capture.prefetch("kazhala-lol", objects, return_errors=True))
+        self.assertEqual([key for key, _, _ in result], ["a.txt", "b.txt", "c.txt"])
+        self.assertIsInstance(result[0][2], ObjectMetadata)
+        self.assertIsInstance(result[1][2], ClientError)
+        self.assertIsInstance(result[2][2], ObjectMetadata)
+
+        self.assertRaises(
+            ClientError, list, capture.prefetch("kazhala-lol", objects, ordered=False)
+        )
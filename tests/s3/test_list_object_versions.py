@@ -0,0 +1,102 @@
+import json
+import os
+import unittest
+from unittest.mock import ANY, patch
+
+import boto3
+from botocore.paginate import Paginator
+
+from fzfaws.s3.helper.list_object_versions import (
+    ObjectVersion,
+    VersionSummary,
+    group_object_versions,
+    iter_object_versions,
+    list_object_versions,
+    summarize_object_versions,
+)
+
+
+class TestListObjectVersions(unittest.TestCase):
+    def setUp(self):
+        data_path = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "../data/s3_object_ver.json"
+        )
+        with open(data_path, "r") as file:
+            self.pages = json.load(file)
+        self.client = boto3.client("s3", region_name="us-east-1")
+
+    @patch.object(Paginator, "paginate")
+    def test_list_object_versions(self, mocked_paginate):
+        mocked_paginate.return_value = self.pages
+        result = list(list_object_versions(self.client, "kazhala-lol", "hello/"))
+        mocked_paginate.assert_called_once_with(
+            ANY, Bucket="kazhala-lol", Prefix="hello/"
+        )
+        self.assertEqual(len(result), 22)
+        keys = [version.key for version in result]
+        self.assertEqual(keys, sorted(keys))
+        elb = [version for version in result if version.key == " elb.pem"]
+        self.assertEqual(
+            [(version.is_latest, version.is_delete_marker) for version in elb],
+            [(False, False), (True, True)],
+        )
+
+        result = list(
+            list_object_versions(
+                self.client, "kazhala-lol", exclude=["*.pem"], include=["wtf.pem"]
+            )
+        )
+        self.assertEqual(len(result), 20)
+        self.assertNotIn(" elb.pem", [version.key for version in result])
+
+    def test_group_object_versions(self):
+        versions = [
+            ObjectVersion("a.txt", "1", True, False),
+            ObjectVersion("b.txt", "2", False, False),
+            ObjectVersion("b.txt", "3", True, True),
+            ObjectVersion("c.txt", "4", False, False),
+            ObjectVersion("c.txt", "5", True, False),
+        ]
+        self.assertEqual(
+            list(group_object_versions(versions)),
+            [
+                ("a.txt", versions[:1]),
+                ("b.txt", versions[1:3]),
+                ("c.txt", versions[3:]),
+            ],
+        )
+        self.assertEqual(
+            list(group_object_versions(iter(versions), non_current=True)),
+            [("b.txt", versions[1:3]), ("c.txt", versions[3:4])],
+        )
+        self.assertEqual(
+            list(group_object_versions(versions, deletemark=True)),
+            [("b.txt", versions[1:3])],
+        )
+
+    def test_summarize_object_versions(self):
+        # versions of b.txt span two pages
+        pages = [
+            {
+                "Versions": [
+                    {"Key": "a.txt", "VersionId": "1", "IsLatest": True, "Size": 1},
+                    {"Key": "b.txt", "VersionId": "2", "IsLatest": True, "Size": 2},
+                ],
+                "DeleteMarkers": [],
+            },
+            {
+                "Versions": [
+                    {"Key": "b.txt", "VersionId": "3", "IsLatest": False, "Size": 3},
+                    {"Key": "b.txt", "VersionId": "4", "IsLatest": False, "Size": 4},
+                ],
+                "DeleteMarkers": [{"Key": "c.txt", "VersionId": "5", "IsLatest": True}],
+            },
+        ]
+        self.assertEqual(
+            list(summarize_object_versions(iter_object_versions(iter(pages)))),
+            [
+                VersionSummary("a.txt", 1, 0, 0),
+                VersionSummary("b.txt", 3, 0, 7),
+                VersionSummary("c.txt", 0, 1, 0),
+            ],
+        )
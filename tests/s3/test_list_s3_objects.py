@@ -0,0 +1,148 @@
+import threading
+import time
+import unittest
+from botocore.exceptions import ClientError
+from fzfaws.s3.helper.list_s3_objects import get_shards, list_s3_objects
+
+
+class FakePaginator:
+    """Paginate list_objects_v2 over keys in memory."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def paginate(self, Bucket, Prefix="", Delimiter=None, StartAfter=None):
+        with self.client.lock:
+            self.client.calls.append(
+                {"Prefix": Prefix, "Delimiter": Delimiter, "StartAfter": StartAfter}
+            )
+        if self.client.error:
+            raise self.client.error
+        entries = []
+        seen_prefixes = set()
+        for key in sorted(self.client.keys):
+            if not key.startswith(Prefix) or (StartAfter and key <= StartAfter):
+                continue
+            rest = key[len(Prefix) :]
+            if Delimiter and Delimiter in rest:
+                common_prefix = Prefix + rest[: rest.index(Delimiter) + 1]
+                if common_prefix not in seen_prefixes:
+                    seen_prefixes.add(common_prefix)
+                    entries.append(("CommonPrefixes", {"Prefix": common_prefix}))
+            else:
+                entries.append(("Contents", {"Key": key, "Size": 1}))
+        for i in range(0, max(len(entries), 1), self.client.page_size):
+            page = {
+                "IsTruncated": i + self.client.page_size < len(entries),
+                "Contents": [],
+                "CommonPrefixes": [],
+            }
+            for entry_type, entry in entries[i : i + self.client.page_size]:
+                page[entry_type].append(entry)
+            with self.client.lock:
+                self.client.pages += 1
+            yield page
+
+
+class FakeClient:
+    def __init__(self, keys, page_size=3):
+        self.keys = keys
+        self.page_size = page_size
+        self.calls = []
+        self.pages = 0
+        self.error = None
+        self.lock = threading.Lock()
+
+    def get_paginator(self, operation):
+        assert operation == "list_objects_v2"
+        return FakePaginator(self)
+
+
+class TestListS3Objects(unittest.TestCase):
+    def setUp(self):
+        self.keys = ["a/%s/%s.txt" % (i % 3, i) for i in range(20)]
+        self.keys += ["b/%s.txt" % i for i in range(7)]
+        self.keys += ["a.txt", "c.txt", "d/", "e/f/g/h.txt"]
+        self.client = FakeClient(self.keys)
+
+    def list_keys(self, *args, **kwargs):
+        return [
+            s3_object["Key"]
+            for s3_object in list_s3_objects(self.client, "bucket", *args, **kwargs)
+        ]
+
+    def test_get_shards(self):
+        self.assertEqual(get_shards([]), [(None, None)])
+        self.assertEqual(
+            get_shards(["a/", "b/"]), [(None, "a/"), ("a/", "b/"), ("b/", None)]
+        )
+        self.assertEqual(
+            get_shards(["a/", "b/", "c/", "d/"], max_shards=2),
+            [(None, "c/"), ("c/", None)],
+        )
+
+    def test_list_sharded(self):
+        result = self.list_keys()
+        self.assertCountEqual(result, self.keys)
+        # one delimiter listing to find the prefixes, then a shard per range
+        delimiter_calls = [call for call in self.client.calls if call["Delimiter"]]
+        self.assertEqual(len(delimiter_calls), 1)
+        self.assertCountEqual(
+            [call["StartAfter"] for call in self.client.calls if not call["Delimiter"]],
+            [None, "a/", "b/", "d/", "e/"],
+        )
+
+        self.client.calls = []
+        self.assertCountEqual(self.list_keys(max_shards=2), self.keys)
+        self.assertEqual(len(self.client.calls), 3)
+
+        self.assertCountEqual(
+            self.list_keys("a/", max_workers=2),
+            [key for key in self.keys if key.startswith("a/")],
+        )
+
+    def test_list_boundaries(self):
+        self.assertCountEqual(self.list_keys(boundaries=["a/1", "b/3.txt"]), self.keys)
+        self.assertFalse(any(call["Delimiter"] for call in self.client.calls))
+
+    def test_list_flat(self):
+        # no sub prefix, the delimiter listing is the full listing
+        self.client.page_size = 100
+        self.assertEqual(self.list_keys("b/"), ["b/%s.txt" % i for i in range(7)])
+        self.assertEqual(len(self.client.calls), 1)
+
+        self.client.calls = []
+        self.assertEqual(self.list_keys("not-exists/"), [])
+        self.assertEqual(len(self.client.calls), 1)
+
+        # no sub prefix but truncated, listed in a single shard
+        self.client.calls = []
+        self.client.page_size = 3
+        self.assertEqual(self.list_keys("b/"), ["b/%s.txt" % i for i in range(7)])
+        self.assertEqual(len(self.client.calls), 2)
+
+    def test_list_error(self):
+        self.client.error = ClientError({"Error": {"Code": "AccessDenied"}}, "List")
+        self.assertRaises(ClientError, self.list_keys, boundaries=["b/"])
+
+    def test_list_close(self):
+        self.client.keys = ["%s/%s" % (i % 10, i) for i in range(5000)]
+        objects = list_s3_objects(self.client, "bucket", max_workers=2)
+        self.assertIn("/", next(objects)["Key"])
+        objects.close()
+
+        # more pages than buffered, queued shards are cancelled and
+        # running workers stop between pages
+        self.client = FakeClient(
+            sorted("%s/%s" % (i % 10, i) for i in range(100000)), page_size=50
+        )
+        objects = list_s3_objects(self.client, "bucket", max_workers=2)
+        self.assertIn("/", next(objects)["Key"])
+        objects.close()
+        time.sleep(0.5)
+        pages, calls = self.client.pages, len(self.client.calls)
+        time.sleep(0.2)
+        self.assertEqual((self.client.pages, len(self.client.calls)), (pages, calls))
+        self.assertLess(pages, 100000 // 50 // 2)
+        # the delimiter listing and 10 shards
+        self.assertLess(calls, 1 + 10)
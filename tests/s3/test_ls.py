@@ -1,8 +1,12 @@
 from fzfaws.s3.s3 import S3
 import io
+import json
+import os
 import sys
+import tempfile
 import unittest
-from unittest.mock import ANY, PropertyMock, patch
+from unittest.mock import ANY, MagicMock, PropertyMock, patch
+from fzfaws.s3.helper.bucket_region import clear_bucket_regions
 from fzfaws.s3.ls_s3 import ls_s3, get_detailed_info
 import boto3
 from fzfaws.utils import BaseSession
@@ -13,6 +17,12 @@ class TestS3LS(unittest.TestCase):
     def setUp(self):
         self.capturedOutput = io.StringIO()
         sys.stdout = self.capturedOutput
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        patcher = patch.dict(os.environ, {"XDG_CACHE_HOME": cache_dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        clear_bucket_regions()
 
     def tearDown(self):
         sys.stdout = sys.__stdout__
@@ -22,7 +32,7 @@ class TestS3LS(unittest.TestCase):
     @patch.object(S3, "set_s3_bucket")
     def test_bucket(self, mocked_bucket, mocked_info, mocked_client):
         ls_s3(bucket=True)
-        mocked_info.assert_called_with(ANY, True, False, [])
+        mocked_info.assert_called_with(ANY, True, False, [], True)
 
         self.capturedOutput.truncate(0)
         self.capturedOutput.seek(0)
@@ -76,7 +86,7 @@ class TestS3LS(unittest.TestCase):
         mocked_version.return_value = [{"Key": "hello.txt", "VersionId": "111111"}]
         ls_s3(version=True)
         mocked_detail.assert_called_with(
-            ANY, False, True, [{"Key": "hello.txt", "VersionId": "111111"}]
+            ANY, False, True, [{"Key": "hello.txt", "VersionId": "111111"}], True
         )
 
         self.capturedOutput.truncate(0)
@@ -114,7 +124,9 @@ class TestS3LS(unittest.TestCase):
     @patch.object(S3, "set_s3_bucket")
     def test_normal(self, mocked_bucket, mocked_object, mocked_detail, mocked_url):
         ls_s3()
-        mocked_detail.assert_called_with(ANY, False, False, [])
+        mocked_detail.assert_called_with(ANY, False, False, [], True)
+        ls_s3(unordered=True)
+        mocked_detail.assert_called_with(ANY, False, False, [], False)
 
         mocked_url.return_value = "https:hello"
         self.capturedOutput.truncate(0)
@@ -139,3 +151,45 @@ class TestS3LS(unittest.TestCase):
         self.assertEqual(
             self.capturedOutput.getvalue(), "arn:aws:s3:::kazhala-lol/hello.txt\n"
         )
+
+    def test_get_detailed_info(self):
+        s3 = S3()
+        s3.bucket_name = "kazhala-lol"
+        s3.path_list = ["hello.txt", "world.txt"]
+        s3._client = MagicMock()
+        s3._client.head_object.side_effect = lambda **kwargs: {
+            "ResponseMetadata": {},
+            "ContentLength": len(kwargs["Key"]),
+        }
+        s3._client.get_object_tagging.return_value = {"TagSet": []}
+        s3._client.get_object_acl.return_value = {"Owner": {"ID": "1"}, "Grants": []}
+        get_detailed_info(s3, False, False, [])
+        self.assertEqual(
+            [json.loads(line) for line in self.capturedOutput.getvalue().splitlines()],
+            [
+                {
+                    "S3Uri": "s3://kazhala-lol/hello.txt",
+                    "ContentLength": 9,
+                    "Tags": [],
+                    "Owner": {"ID": "1"},
+                    "Grants": [],
+                },
+                {
+                    "S3Uri": "s3://kazhala-lol/world.txt",
+                    "ContentLength": 9,
+                    "Tags": [],
+                    "Owner": {"ID": "1"},
+                    "Grants": [],
+                },
+            ],
+        )
+
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+        get_detailed_info(
+            s3, False, True, [{"Key": "hello.txt", "VersionId": "111"}], False
+        )
+        self.assertEqual(json.loads(self.capturedOutput.getvalue())["VersionId"], "111")
+        s3._client.head_object.assert_called_with(
+            Bucket="kazhala-lol", Key="hello.txt", VersionId="111"
+        )
@@ -20,7 +20,19 @@ class TestS3Main(unittest.TestCase):
     def test_upload(self, mocked_upload):
         s3(["upload"])
         mocked_upload.assert_called_with(
-            False, None, [], False, False, False, False, [], [], False
+            False,
+            None,
+            [],
+            False,
+            False,
+            False,
+            False,
+            [],
+            [],
+            False,
+            False,
+            "",
+            False,
         )
 
         s3(["upload", "-P", "-b", "kazhala-file-transfer/", "-p", "hello.txt", "-E"])
@@ -35,6 +47,9 @@ class TestS3Main(unittest.TestCase):
             [],
             [],
             True,
+            False,
+            "",
+            False,
         )
 
         s3(
@@ -51,6 +66,7 @@ class TestS3Main(unittest.TestCase):
                 "*.lol",
                 "-i",
                 "hello.txt",
+                "--summary",
             ]
         )
         mocked_upload.assert_called_with(
@@ -64,35 +80,64 @@ class TestS3Main(unittest.TestCase):
             ["*.git", "*.lol"],
             ["hello.txt"],
             False,
+            False,
+            "",
+            True,
         )
 
     @patch("fzfaws.s3.main.download_s3")
     def test_download(self, mocked_download):
         s3(["download"])
         mocked_download.assert_called_with(
-            False, None, None, False, False, False, [], [], False, False
+            False, None, None, False, False, False, [], [], False, False, False, ""
         )
 
-        s3(["download", "-r", "-R", "-s", "-e", "lol", "-v", "-H"])
+        s3(["download", "-r", "-R", "-s", "--etag", "-e", "lol", "-v", "-H"])
         mocked_download.assert_called_with(
-            False, None, None, True, True, True, ["lol"], [], True, True
+            False, None, None, True, True, True, ["lol"], [], True, True, True, ""
         )
 
         s3(["download", "-P", "root", "-b", "kazhala-file"])
         mocked_download.assert_called_with(
-            "root", "kazhala-file", None, False, False, False, [], [], False, False
+            "root",
+            "kazhala-file",
+            None,
+            False,
+            False,
+            False,
+            [],
+            [],
+            False,
+            False,
+            False,
+            "",
         )
 
     @patch("fzfaws.s3.main.bucket_s3")
     def test_bucket(self, mocked_bucket):
         s3(["bucket"])
         mocked_bucket.assert_called_with(
-            False, None, None, False, False, [], [], False, False
+            False, None, None, False, False, [], [], False, False, False, ""
         )
 
         s3(["bucket", "-b", "kazhala", "-t", "yes", "-r", "-s"])
         mocked_bucket.assert_called_with(
-            False, "kazhala", "yes", True, True, [], [], False, False
+            False, "kazhala", "yes", True, True, [], [], False, False, False, ""
+        )
+
+        s3(["bucket", "-r", "--resume", "copy-20200601000000-1"])
+        mocked_bucket.assert_called_with(
+            False,
+            None,
+            None,
+            True,
+            False,
+            [],
+            [],
+            False,
+            False,
+            False,
+            "copy-20200601000000-1",
         )
 
     @patch("fzfaws.s3.main.delete_s3")
@@ -135,12 +180,12 @@ class TestS3Main(unittest.TestCase):
     def test_ls(self, mocked_ls):
         s3(["ls"])
         mocked_ls.assert_called_with(
-            False, False, False, False, False, False, False, False, False, None
+            False, False, False, False, False, False, False, False, False, None, False
         )
 
-        s3(["ls", "-P", "-v", "-d", "-b"])
+        s3(["ls", "-P", "-v", "-d", "-b", "--unordered"])
         mocked_ls.assert_called_with(
-            True, True, True, True, False, False, False, False, False, None
+            True, True, True, True, False, False, False, False, False, None, True
         )
 
     @patch("fzfaws.s3.main.object_s3")
@@ -152,3 +197,19 @@ class TestS3Main(unittest.TestCase):
 
         s3(["object", "-b", "hello", "-r", "-v", "-V", "-n"])
         mocked_object.assert_called_with(False, "hello", True, True, True, [], [], True)
+
+    @patch("fzfaws.s3.main.set_index_refresh")
+    @patch("fzfaws.s3.main.ls_s3")
+    def test_refresh(self, mocked_ls, mocked_refresh):
+        s3(["ls"])
+        mocked_refresh.assert_not_called()
+
+        s3(["ls", "--refresh"])
+        mocked_refresh.assert_called_once_with()
+
+    @patch("fzfaws.s3.main.add_inventory_manifest")
+    @patch("fzfaws.s3.main.delete_s3")
+    def test_inventory(self, mocked_delete, mocked_add):
+        s3(["delete", "--inventory", "a.json", "--inventory", "s3://b/manifest.json"])
+        mocked_add.assert_any_call("a.json")
+        mocked_add.assert_called_with("s3://b/manifest.json")
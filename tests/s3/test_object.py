@@ -1,3 +1,4 @@
+from fzfaws.s3.helper.get_copy_args import ObjectMetadata
 from fzfaws.s3.helper.s3args import S3Args
 from botocore.stub import Stubber
 from fzfaws.utils.session import BaseSession
@@ -5,7 +6,7 @@ import io
 import sys
 import unittest
 from unittest.mock import PropertyMock, patch, ANY
-from fzfaws.s3.object_s3 import object_s3
+from fzfaws.s3.object_s3 import _get_update_jobs, object_s3
 from fzfaws.s3 import S3
 import boto3
 
@@ -96,7 +97,9 @@ class TestS3Object(unittest.TestCase):
         mocked_bucket.assert_called_once()
         mocked_path.assert_called_once()
         mocked_args.assert_called_once_with(False, False, False, False, False)
-        mocked_walk.assert_called_with(ANY, "", "", "", [], [], [], "object", "", "")
+        mocked_walk.assert_called_with(
+            ANY, "", "", "", [], [], [], "object", "", "", sizes={}
+        )
 
         mocked_bucket.reset_mock()
         mocked_path.reset_mock()
@@ -116,6 +119,7 @@ class TestS3Object(unittest.TestCase):
             "object",
             "hello/",
             "kazhala-lol",
+            sizes={},
         )
 
     @patch("fzfaws.s3.object_s3.get_confirmation")
@@ -188,3 +192,29 @@ class TestS3Object(unittest.TestCase):
             self.capturedOutput.getvalue(),
             "(dryrun) update: s3://kazhala-lol/hello.txt\n",
         )
+
+    @patch("fzfaws.s3.object_s3.get_copy_args")
+    @patch("fzfaws.s3.object_s3.get_metadata_capture")
+    def test_get_update_jobs(self, mocked_capture, mocked_copy_args):
+        error = ValueError("head failed")
+        metadata = ObjectMetadata({"ContentLength": 5}, {}, [])
+        mocked_capture.return_value.prefetch.return_value = [
+            ("a.txt", None, error),
+            ("b.txt", None, metadata),
+        ]
+        mocked_copy_args.return_value = {"StorageClass": "GLACIER"}
+        s3 = S3()
+        s3.bucket_name = "kazhala-lol"
+        jobs = list(_get_update_jobs(s3, S3Args(s3), ["a.txt", "b.txt"]))
+        mocked_capture.return_value.prefetch.assert_called_once_with(
+            "kazhala-lol", ANY, return_errors=True
+        )
+        self.assertEqual([job.key for job in jobs], ["a.txt", "b.txt"])
+        self.assertIs(jobs[0].error, error)
+        self.assertIsNone(jobs[0].extra_args)
+        self.assertIsNone(jobs[1].error)
+        self.assertEqual(jobs[1].size, 5)
+        self.assertEqual(jobs[1].extra_args, {"StorageClass": "GLACIER"})
+        mocked_copy_args.assert_called_once_with(
+            s3, "b.txt", ANY, extra_args=True, metadata=metadata
+        )
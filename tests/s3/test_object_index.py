@@ -0,0 +1,247 @@
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+from fzfaws.s3.helper.object_index import (
+    ObjectIndex,
+    clear_object_indexes,
+    get_object_index,
+    set_index_refresh,
+)
+from fzfaws.s3.helper.prefix_trie import PrefixListing, PrefixTrie
+from fzfaws.s3.helper.walk_s3_folder import walk_s3_folder
+
+LAST_MODIFIED = datetime(2020, 6, 1, tzinfo=timezone.utc)
+OBJECTS = [
+    {"Key": "a.txt", "Size": 1, "LastModified": LAST_MODIFIED, "ETag": '"a"'},
+    {"Key": "logs/", "Size": 0},
+    {"Key": "logs/2020/app.log", "Size": 2},
+    {"Key": "logs/2020/app.tmp", "Size": 3},
+    {"Key": "logs/app.log", "Size": 4, "StorageClass": "STANDARD"},
+    {"Key": "logs0.txt", "Size": 5},
+    {"Key": "z/b.txt", "Size": 6},
+]
+
+
+class TestObjectIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.index = ObjectIndex(
+            "kazhala-lol", path=os.path.join(self.temp_dir.name, "index.sqlite")
+        )
+        self.mocked_list = patch(
+            "fzfaws.s3.helper.object_index.list_s3_objects",
+            side_effect=lambda client, bucket, prefix: iter(
+                [obj for obj in OBJECTS if obj["Key"].startswith(prefix)]
+            ),
+        ).start()
+
+    def tearDown(self):
+        patch.stopall()
+        self.index.close()
+        self.temp_dir.cleanup()
+
+    def test_refresh(self):
+        self.assertTrue(self.index.is_stale())
+        self.assertEqual(self.index.refresh(MagicMock()), 7)
+        self.mocked_list.assert_called_with(
+            self.mocked_list.call_args[0][0], "kazhala-lol", ""
+        )
+        self.assertFalse(self.index.is_stale())
+        self.assertFalse(self.index.is_stale(3600))
+        objects = list(self.index.list_objects())
+        self.assertEqual([obj["Key"] for obj in objects], [o["Key"] for o in OBJECTS])
+        self.assertEqual(objects[0], OBJECTS[0])
+        self.assertEqual(objects[4], OBJECTS[4])
+
+    def test_refresh_prefix(self):
+        self.index.refresh(MagicMock())
+        refreshed_at = self.index.get_refreshed_at()
+        removed = OBJECTS.pop(2)
+        try:
+            self.assertEqual(self.index.refresh(MagicMock(), "logs/"), 3)
+        finally:
+            OBJECTS.insert(2, removed)
+        # only the refreshed prefix is swept, the bucket refresh time is kept
+        self.assertEqual(
+            [obj["Key"] for obj in self.index.list_objects()],
+            [
+                "a.txt",
+                "logs/",
+                "logs/2020/app.tmp",
+                "logs/app.log",
+                "logs0.txt",
+                "z/b.txt",
+            ],
+        )
+        self.assertEqual(self.index.get_refreshed_at(), refreshed_at)
+
+    def test_refresh_unlocked(self):
+        def objects():
+            # reads are not blocked while the bucket is listed
+            reader = threading.Thread(target=self.index.list_prefix, args=("",))
+            reader.start()
+            reader.join(timeout=5)
+            self.assertFalse(reader.is_alive())
+            yield from OBJECTS
+
+        self.assertEqual(self.index.refresh(MagicMock(), objects=objects()), 7)
+
+    def test_list_objects(self):
+        self.index.refresh(MagicMock())
+        self.assertEqual(
+            [obj["Key"] for obj in self.index.list_objects("logs/")],
+            ["logs/", "logs/2020/app.log", "logs/2020/app.tmp", "logs/app.log"],
+        )
+        self.assertEqual(
+            [
+                obj["Key"]
+                for obj in self.index.list_objects("logs/", exclude=["*.tmp", "logs/"])
+            ],
+            ["logs/2020/app.log", "logs/app.log"],
+        )
+        self.assertEqual(
+            [
+                obj["Key"]
+                for obj in self.index.list_objects(
+                    exclude=["*"], include=["*/app.[!l]*"]
+                )
+            ],
+            ["logs/2020/app.tmp"],
+        )
+
+    @patch("fzfaws.s3.helper.object_index.BATCH_SIZE", 2)
+    def test_list_objects_batch(self):
+        self.index.refresh(MagicMock())
+        self.assertEqual(
+            [obj["Key"] for obj in self.index.list_objects()],
+            [obj["Key"] for obj in OBJECTS],
+        )
+
+    def test_list_prefix(self):
+        self.index.refresh(MagicMock())
+        self.assertEqual(
+            self.index.list_prefix(),
+            PrefixListing(["logs/", "z/"], ["a.txt", "logs0.txt"]),
+        )
+        self.assertEqual(
+            self.index.list_prefix("logs/"),
+            PrefixListing(["logs/2020/"], ["logs/", "logs/app.log"]),
+        )
+        self.assertEqual(
+            self.index.list_prefix("logs/2020/a"),
+            PrefixListing([], ["logs/2020/app.log", "logs/2020/app.tmp"]),
+        )
+        self.assertEqual(self.index.list_prefix("nothing/"), PrefixListing([], []))
+
+    def test_prefix_trie(self):
+        self.index.refresh(MagicMock())
+        client = MagicMock()
+        with PrefixTrie(client, "kazhala-lol", index=self.index) as trie:
+            self.assertEqual(
+                trie.get("logs/"),
+                PrefixListing(["logs/2020/"], ["logs/", "logs/app.log"]),
+            )
+        client.get_paginator.assert_not_called()
+
+
+class TestGetObjectIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        patch.dict(
+            os.environ,
+            {
+                "XDG_CACHE_HOME": self.temp_dir.name,
+                "FZFAWS_S3_INDEX": "",
+                "FZFAWS_S3_INDEX_TTL": "",
+            },
+        ).start()
+        self.mocked_list = patch(
+            "fzfaws.s3.helper.object_index.list_s3_objects",
+            side_effect=lambda client, bucket, prefix: iter(OBJECTS),
+        ).start()
+        clear_object_indexes()
+
+    def tearDown(self):
+        clear_object_indexes()
+        patch.stopall()
+        self.temp_dir.cleanup()
+
+    def test_disabled(self):
+        self.assertIsNone(get_object_index(MagicMock(), "kazhala-lol"))
+        self.mocked_list.assert_not_called()
+
+    def test_enabled(self):
+        os.environ["FZFAWS_S3_INDEX"] = "1"
+        self.assertIsNone(get_object_index(MagicMock(), ""))
+        index = get_object_index(MagicMock(), "kazhala-lol", no_progress=True)
+        self.assertEqual(
+            index.path,
+            os.path.join(self.temp_dir.name, "fzfaws/s3index/kazhala-lol.sqlite"),
+        )
+        self.assertIs(get_object_index(MagicMock(), "kazhala-lol"), index)
+        self.assertEqual(self.mocked_list.call_count, 1)
+
+        # indexed on disk, not listed again by the next process
+        clear_object_indexes()
+        os.environ["FZFAWS_S3_INDEX"] = "1"
+        get_object_index(MagicMock(), "kazhala-lol", no_progress=True)
+        self.assertEqual(self.mocked_list.call_count, 1)
+
+    def test_concurrent(self):
+        os.environ["FZFAWS_S3_INDEX"] = "1"
+        indexes = []
+        threads = [
+            threading.Thread(
+                target=lambda: indexes.append(
+                    get_object_index(MagicMock(), "kazhala-lol", no_progress=True)
+                )
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(map(id, indexes))), 1)
+        self.assertEqual(self.mocked_list.call_count, 1)
+
+    def test_refresh(self):
+        os.environ["FZFAWS_S3_INDEX"] = "1"
+        get_object_index(MagicMock(), "kazhala-lol", no_progress=True)
+        clear_object_indexes()
+        os.environ["FZFAWS_S3_INDEX"] = ""
+        set_index_refresh()
+        self.assertEqual(os.environ["FZFAWS_S3_INDEX"], "1")
+        get_object_index(MagicMock(), "kazhala-lol", no_progress=True)
+        self.assertEqual(self.mocked_list.call_count, 2)
+
+    @patch("fzfaws.s3.helper.walk_s3_folder.list_s3_objects")
+    def test_walk_s3_folder(self, mocked_walk_list):
+        os.environ["FZFAWS_S3_INDEX"] = "1"
+        sizes = {}
+        with patch("sys.stdout"):
+            result = walk_s3_folder(
+                MagicMock(),
+                "kazhala-lol",
+                "logs/",
+                "logs/",
+                exclude=["*.tmp"],
+                destination_path="tmp",
+                sizes=sizes,
+            )
+        self.assertEqual(
+            result,
+            [
+                ("logs/2020/app.log", "tmp/2020/app.log"),
+                ("logs/app.log", "tmp/app.log"),
+            ],
+        )
+        self.assertEqual(sizes, {"logs/2020/app.log": 2, "logs/app.log": 4})
+        mocked_walk_list.assert_not_called()
+        # the walked prefix is listed into the index first
+        self.assertEqual(self.mocked_list.call_count, 2)
+        self.assertEqual(self.mocked_list.call_args[0][1:], ("kazhala-lol", "logs/"))
@@ -0,0 +1,78 @@
+import io
+import sys
+import unittest
+from unittest.mock import patch
+
+from fzfaws.s3.helper.prefix_picker import (
+    OPEN_KEY,
+    PARENT_KEY,
+    PREFIX_KEY,
+    get_entry_path,
+    get_open_prefix,
+    get_parent_prefix,
+    get_reload_binds,
+    get_up_prefix,
+    main,
+)
+from fzfaws.s3.s3 import S3
+
+
+class TestPrefixPicker(unittest.TestCase):
+    def setUp(self):
+        self.capturedOutput = io.StringIO()
+        sys.stdout = self.capturedOutput
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    def test_get_entry_path(self):
+        self.assertEqual(get_entry_path("Key: logs/app.log"), "logs/app.log")
+        self.assertEqual(get_entry_path("\x1b[33mPrefix: logs/\x1b[0m\n"), "logs/")
+        self.assertEqual(get_entry_path("\x1b[31mKey:  wtf.txt\x1b[0m"), " wtf.txt")
+        self.assertEqual(
+            get_entry_path("Key: logs/app.log: 2 version(s), 5 Bytes non-current"),
+            "logs/app.log",
+        )
+        self.assertEqual(get_entry_path(""), "")
+
+    def test_prefix(self):
+        self.assertEqual(get_parent_prefix("logs/2020/app.log"), "logs/2020/")
+        self.assertEqual(get_parent_prefix("logs/2020/"), "logs/")
+        self.assertEqual(get_parent_prefix("app.log"), "")
+        self.assertEqual(get_parent_prefix(""), "")
+
+        self.assertEqual(get_open_prefix("Prefix: logs/2020/"), "logs/2020/")
+        self.assertEqual(get_open_prefix("Key: logs/2020/app.log"), "logs/2020/")
+        self.assertEqual(get_open_prefix(""), "")
+
+        self.assertEqual(get_up_prefix("Prefix: logs/2020/"), "")
+        self.assertEqual(get_up_prefix("Key: logs/2020/app.log"), "logs/")
+        self.assertEqual(get_up_prefix("Key: app.log"), "")
+
+    def test_get_reload_binds(self):
+        binds = get_reload_binds("kazhala-lol", "default", "ap-southeast-2", True)
+        self.assertEqual([key for key, _ in binds], [OPEN_KEY, PARENT_KEY, PREFIX_KEY])
+        self.assertRegex(
+            binds[0][1],
+            r"import main; main\(\)' --bucket kazhala-lol --profile default"
+            r" --region ap-southeast-2 --version --open {}$",
+        )
+        self.assertRegex(binds[1][1], r"--parent {}$")
+        self.assertRegex(binds[2][1], r"--prefix {q}$")
+
+        binds = get_reload_binds("kazhala lol")
+        self.assertRegex(binds[0][1], r"--bucket 'kazhala lol' --open {}$")
+
+    @patch.object(S3, "get_prefix_entries")
+    def test_main(self, mocked_entries):
+        mocked_entries.return_value = iter(["Key: logs/app.log\n"])
+        main(["--bucket", "kazhala-lol", "--open", "Prefix: logs/"])
+        mocked_entries.assert_called_with("logs/", False, False)
+        self.assertEqual(self.capturedOutput.getvalue(), "Key: logs/app.log\n")
+
+        mocked_entries.return_value = iter([])
+        main(["--bucket", "kazhala-lol", "--version", "--parent", "Key: logs/a"])
+        mocked_entries.assert_called_with("", True, False)
+
+        main(["--bucket", "kazhala-lol", "--deletemark", "--prefix", "logs/20"])
+        mocked_entries.assert_called_with("logs/20", False, True)
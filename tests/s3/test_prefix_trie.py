@@ -0,0 +1,109 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from fzfaws.s3.helper.prefix_trie import PrefixListing, PrefixTrie
+
+PAGES = {
+    "": [{"CommonPrefixes": [{"Prefix": "logs/"}], "Contents": [{"Key": "a.txt"}]}],
+    "logs/": [
+        {"CommonPrefixes": [{"Prefix": "logs/2020/"}]},
+        {"Contents": [{"Key": "logs/app.log"}]},
+    ],
+    "logs/2020/": [{"Contents": [{"Key": "logs/2020/app.log"}]}],
+}
+
+
+def get_client():
+    client = MagicMock()
+    client.get_paginator.return_value.paginate.side_effect = lambda **kwargs: iter(
+        PAGES[kwargs["Prefix"]]
+    )
+    return client
+
+
+class TestPrefixTrie(unittest.TestCase):
+    def test_get(self):
+        client = get_client()
+        with PrefixTrie(client, "kazhala-lol") as trie:
+            self.assertNotIn("logs/", trie)
+            self.assertEqual(trie.get(""), PrefixListing(["logs/"], ["a.txt"]))
+            self.assertEqual(
+                trie.get("logs/"), PrefixListing(["logs/2020/"], ["logs/app.log"])
+            )
+            self.assertIn("logs/", trie)
+            # back to the parent, cached
+            self.assertEqual(trie.get(""), PrefixListing(["logs/"], ["a.txt"]))
+        paginate = client.get_paginator.return_value.paginate
+        self.assertEqual(paginate.call_count, 2)
+        paginate.assert_called_with(Bucket="kazhala-lol", Prefix="logs/", Delimiter="/")
+
+    def test_get_error(self):
+        client = get_client()
+        paginate = client.get_paginator.return_value.paginate
+        side_effect = paginate.side_effect
+        paginate.side_effect = Exception("throttled")
+        with PrefixTrie(client, "kazhala-lol") as trie:
+            self.assertRaises(Exception, trie.get, "logs/")
+            self.assertNotIn("logs/", trie)
+            paginate.side_effect = side_effect
+            self.assertEqual(
+                trie.get("logs/"), PrefixListing(["logs/2020/"], ["logs/app.log"])
+            )
+
+    def test_prefetch(self):
+        client = get_client()
+        with PrefixTrie(client, "kazhala-lol", max_prefetch=1) as trie:
+            trie.prefetch(["logs/", "logs/2020/"])
+            self.assertEqual(
+                trie.get("logs/"), PrefixListing(["logs/2020/"], ["logs/app.log"])
+            )
+            self.assertNotIn("logs/2020/", trie)
+        paginate = client.get_paginator.return_value.paginate
+        paginate.assert_called_once_with(
+            Bucket="kazhala-lol", Prefix="logs/", Delimiter="/"
+        )
+
+    def test_prefetch_callback(self):
+        client = get_client()
+        listed = {}
+        done = threading.Event()
+
+        def callback(prefix, listing):
+            listed[prefix] = listing
+            if len(listed) == 2:
+                done.set()
+
+        with PrefixTrie(client, "kazhala-lol") as trie:
+            trie.get("")
+            trie.prefetch(["", "logs/"], callback=callback)
+            self.assertTrue(done.wait(5))
+        self.assertEqual(
+            listed,
+            {
+                "": PrefixListing(["logs/"], ["a.txt"]),
+                "logs/": PrefixListing(["logs/2020/"], ["logs/app.log"]),
+            },
+        )
+
+    def test_close(self):
+        client = get_client()
+        started = threading.Event()
+        release = threading.Event()
+
+        def paginate(**kwargs):
+            started.set()
+            release.wait(5)
+            yield {"Contents": [{"Key": "logs/app.log"}]}
+            yield {"Contents": [{"Key": "logs/b.log"}]}
+
+        client.get_paginator.return_value.paginate.side_effect = paginate
+        trie = PrefixTrie(client, "kazhala-lol", max_workers=1)
+        trie.prefetch(["logs/", "logs/2020/"])
+        started.wait(5)
+        trie.close()
+        release.set()
+        # the running listing stops before the next page
+        node = trie._get_node("logs/")
+        self.assertEqual(node.future.result(5), PrefixListing([], []))
+        self.assertTrue(trie._get_node("logs/2020/").future.cancelled())
@@ -5,12 +5,20 @@ from unittest.mock import patch
 
 from fzfaws.s3.presign_s3 import presign_s3
 from fzfaws.s3.s3 import S3
+from fzfaws.utils.session import clear_registry
 
 
 class TestS3Presign(unittest.TestCase):
     def setUp(self):
         self.capturedOutput = io.StringIO()
         sys.stdout = self.capturedOutput
+        # generate_presigned_url is attached to the client when it's created
+        clear_registry()
+        patcher = patch(
+            "fzfaws.s3.helper.bucket_region.get_bucket_region", return_value=None
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def tearDown(self):
         sys.stdout = sys.__stdout__
@@ -3,22 +3,32 @@ import json
 import os
 from pathlib import Path
 import sys
+import tempfile
 import unittest
-from unittest.mock import PropertyMock, call, patch
+from unittest.mock import ANY, PropertyMock, call, patch
 
 import boto3
 from botocore.paginate import Paginator
 from botocore.stub import Stubber
 
 from fzfaws.s3 import S3
+from fzfaws.s3.helper.bucket_region import clear_bucket_regions
+from fzfaws.s3.helper.prefix_picker import PICKER_HEADER
 from fzfaws.utils import BaseSession, FileLoader, Pyfzf
 from fzfaws.utils.exceptions import InvalidFileType, InvalidS3PathPattern
+from fzfaws.utils.preview import FilePreview
 
 
 class TestS3(unittest.TestCase):
     def setUp(self):
         self.capturedOutput = io.StringIO()
         sys.stdout = self.capturedOutput
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        patcher = patch.dict(os.environ, {"XDG_CACHE_HOME": cache_dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        clear_bucket_regions()
         fileloader = FileLoader()
         config_path = Path(__file__).resolve().parent.joinpath("../data/fzfaws.yml")
         fileloader.load_config_file(config_path=str(config_path))
@@ -60,7 +70,7 @@ class TestS3(unittest.TestCase):
         mocked_execute.return_value = "kazhala-version-testing"
         self.s3.set_s3_bucket()
         self.assertEqual(self.s3.bucket_name, "kazhala-version-testing")
-        mocked_list.assert_called_with(response["Buckets"], "Name")
+        mocked_list.assert_called_with(response["Buckets"], "Name", reload=None)
         mocked_execute.assert_called_with(header="")
 
         # empty test
@@ -72,7 +82,7 @@ class TestS3(unittest.TestCase):
         mocked_execute.return_value = ""
         self.s3.set_s3_bucket(header="hello")
         self.assertEqual(self.s3.bucket_name, "")
-        mocked_list.assert_called_with([], "Name")
+        mocked_list.assert_called_with([], "Name", reload=None)
         mocked_execute.assert_called_with(header="hello")
 
     @patch.object(S3, "_validate_input_path")
@@ -174,6 +184,7 @@ class TestS3(unittest.TestCase):
         self.assertEqual(result, None)
         self.assertEqual(match, None)
 
+    @patch.object(FilePreview, "add")
     @patch("fzfaws.s3.s3.get_confirmation")
     @patch.object(Pyfzf, "execute_fzf")
     @patch.object(Pyfzf, "append_fzf")
@@ -188,7 +199,23 @@ class TestS3(unittest.TestCase):
         mocked_append,
         mocked_execute,
         mocked_confirmation,
+        mocked_preview,
     ):
+        keys = [
+            ".DS_Store",
+            "Fortnite refund.docx",
+            "README.md",
+            "VideoPageSpec.docx",
+            "boob.docx",
+            "boto3-s3-filter.png",
+            "cloudformation_parameters.png",
+            "elb.pem",
+            "lab.pem",
+            "ooooo.doc",
+            "version1.com",
+            "version2.com",
+            "version3.com",
+        ]
         # input
         self.s3.bucket_name = "kazhala-version-testing"
         mocked_option.return_value = "input"
@@ -222,8 +249,9 @@ class TestS3(unittest.TestCase):
         mocked_execute.assert_called_with(
             print_col=0,
             header='PWD: s3://kazhala-version-testing/ (select "./" will the current path)',
-            preview="echo .DS_Store^Fortnite refund.docx^README.md^VideoPageSpec.docx^boob.docx^boto3-s3-filter.png^cloudformation_parameters.png^elb.pem^lab.pem^ooooo.doc^version1.com^version2.com^version3.com^ | tr '^' '\n'",
+            preview=ANY,
         )
+        mocked_preview.assert_any_call("./", keys)
         mocked_append.assert_called_with("versiontesting/\n")
         self.assertRegex(self.capturedOutput.getvalue(), "S3 file path is set to root")
 
@@ -240,8 +268,9 @@ class TestS3(unittest.TestCase):
         mocked_execute.assert_called_with(
             print_col=0,
             header='PWD: s3://kazhala-version-testing/hello/ (select "./" will the current path)',
-            preview="echo  | tr '^' '\n'",
+            preview=ANY,
         )
+        mocked_preview.assert_any_call("./", [])
         mocked_append.assert_has_calls([call("\x1b[33m./\x1b[0m\n")])
         self.assertRegex(
             self.capturedOutput.getvalue(), "S3 file path is set to hello/"
@@ -262,8 +291,9 @@ class TestS3(unittest.TestCase):
         mocked_execute.assert_called_with(
             print_col=0,
             header='PWD: s3://kazhala-version-testing/ (select "./" will the current path)',
-            preview="echo .DS_Store^Fortnite refund.docx^README.md^VideoPageSpec.docx^boob.docx^boto3-s3-filter.png^cloudformation_parameters.png^elb.pem^lab.pem^ooooo.doc^version1.com^version2.com^version3.com^ | tr '^' '\n'",
+            preview=ANY,
         )
+        mocked_preview.assert_any_call("./", keys)
         mocked_append.assert_has_calls([call("versiontesting/\n")])
         self.assertRegex(
             self.capturedOutput.getvalue(), "S3 file path is set to newpath/"
@@ -289,8 +319,9 @@ class TestS3(unittest.TestCase):
         mocked_execute.assert_called_with(
             print_col=0,
             header='PWD: s3://kazhala-version-testing/newpath/ (select "./" will the current path)',
-            preview="echo .DS_Store^Fortnite refund.docx^README.md^VideoPageSpec.docx^boob.docx^boto3-s3-filter.png^cloudformation_parameters.png^elb.pem^lab.pem^ooooo.doc^version1.com^version2.com^version3.com^ | tr '^' '\n'",
+            preview=ANY,
         )
+        mocked_preview.assert_any_call("./", keys)
         mocked_append.assert_has_calls([call("\x1b[33m./\x1b[0m\n")])
         self.assertRegex(
             self.capturedOutput.getvalue(), "S3 file path is set to newpath/obj1"
@@ -302,9 +333,9 @@ class TestS3(unittest.TestCase):
         self.assertEqual(self.s3.path_list, ["newpath/obj1"])
 
     @patch.object(Paginator, "paginate")
-    @patch.object(Pyfzf, "append_fzf")
+    @patch.object(Pyfzf, "stream_fzf")
     @patch.object(Pyfzf, "execute_fzf")
-    def test_set_s3_object(self, mocked_execute, mocked_append, mocked_paginator):
+    def test_set_s3_object(self, mocked_execute, mocked_stream, mocked_paginator):
         self.s3.path_list = [""]
         self.s3.bucket_name = "kazhala-version-testing"
         # non version single test
@@ -317,16 +348,34 @@ class TestS3(unittest.TestCase):
         mocked_execute.return_value = ".DS_Store"
         self.s3.set_s3_object()
         self.assertEqual(self.s3.path_list[0], ".DS_Store")
-        mocked_append.assert_called_with("Key: version3.com\n")
+        entries = list(mocked_stream.call_args[0][0])
+        self.assertEqual(entries[0], "\x1b[33mPrefix: boob/\x1b[0m\n")
+        self.assertEqual(entries[-1], "Key: version3.com\n")
+        mocked_paginator.assert_called_with(
+            ANY, Bucket="kazhala-version-testing", Prefix="", Delimiter="/"
+        )
+
+        # folder selected, list the folder
+        mocked_stream.reset_mock()
+        mocked_execute.side_effect = ["boob/", "boob/hello.txt"]
+        self.s3.set_s3_object()
+        mocked_execute.side_effect = None
+        self.assertEqual(self.s3.path_list[0], "boob/hello.txt")
+        self.assertEqual(mocked_stream.call_count, 2)
+        list(mocked_stream.call_args[0][0])
+        mocked_paginator.assert_called_with(
+            ANY, Bucket="kazhala-version-testing", Prefix="boob/", Delimiter="/"
+        )
 
         # non version multi test
         mocked_execute.return_value = [".DS_Store", "object1"]
         self.s3.set_s3_object(multi_select=True)
         self.assertEqual(self.s3.path_list, [".DS_Store", "object1"])
-        mocked_append.assert_called_with("Key: version3.com\n")
+        self.assertEqual(
+            list(mocked_stream.call_args[0][0])[-1], "Key: version3.com\n"
+        )
 
         # version single test
-        mocked_append.reset_mock()
         self.s3.path_list = [""]
         self.s3.bucket_name = "kazhala-version-testing"
         data_path = os.path.join(
@@ -338,67 +387,105 @@ class TestS3(unittest.TestCase):
         mocked_execute.return_value = "sync/policy.json"
         self.s3.set_s3_object(version=True)
         self.assertEqual(self.s3.path_list[0], "sync/policy.json")
-        mocked_execute.assert_called_with(delimiter=": ")
-        mocked_append.assert_has_calls(
+        mocked_execute.assert_called_with(delimiter=": ", header=PICKER_HEADER)
+        self.assertCountEqual(
+            list(mocked_stream.call_args[0][0]),
             [
-                call("\x1b[31mKey:  elb.pem\x1b[0m\n"),
-                call("\x1b[31mKey: .DS_Store\x1b[0m\n"),
-                call("\x1b[31mKey:  wtf.txt\x1b[0m\n"),
-                call("\x1b[31mKey:  w tf.txt\x1b[0m\n"),
-                call("Key: CHANGELOG.md\n"),
-                call("Key: README.md\n"),
-                call("Key: wtf.pem\n"),
+                "\x1b[31mKey:  elb.pem\x1b[0m: 1 version(s), 1 delete marker(s), "
+                "1.7 KiB non-current\n",
+                "\x1b[31mKey: .DS_Store\x1b[0m: 4 version(s), 1 delete marker(s), "
+                "24.0 KiB non-current\n",
+                "\x1b[31mKey:  wtf.txt\x1b[0m: 2 version(s), 1 delete marker(s)\n",
+                "\x1b[31mKey:  w tf.txt\x1b[0m: 1 version(s), 1 delete marker(s)\n",
+                "Key: CHANGELOG.md: 1 version(s)\n",
+                "Key: README.md: 3 version(s), 10.4 KiB non-current\n",
+                "Key: wtf.pem: 5 version(s), 6.6 KiB non-current\n",
             ],
-            any_order=True,
         )
 
         # version multi test
-        mocked_append.reset_mock()
         mocked_execute.return_value = ["sync/policy.json", "wtf.pem"]
         self.s3.set_s3_object(version=True, multi_select=True)
         self.assertEqual(self.s3.path_list, ["sync/policy.json", "wtf.pem"])
-        mocked_append.assert_has_calls(
+        self.assertCountEqual(
+            list(mocked_stream.call_args[0][0]),
             [
-                call("\x1b[31mKey:  elb.pem\x1b[0m\n"),
-                call("\x1b[31mKey: .DS_Store\x1b[0m\n"),
-                call("\x1b[31mKey:  wtf.txt\x1b[0m\n"),
-                call("\x1b[31mKey:  w tf.txt\x1b[0m\n"),
-                call("Key: CHANGELOG.md\n"),
-                call("Key: README.md\n"),
-                call("Key: wtf.pem\n"),
+                "\x1b[31mKey:  elb.pem\x1b[0m: 1 version(s), 1 delete marker(s), "
+                "1.7 KiB non-current\n",
+                "\x1b[31mKey: .DS_Store\x1b[0m: 4 version(s), 1 delete marker(s), "
+                "24.0 KiB non-current\n",
+                "\x1b[31mKey:  wtf.txt\x1b[0m: 2 version(s), 1 delete marker(s)\n",
+                "\x1b[31mKey:  w tf.txt\x1b[0m: 1 version(s), 1 delete marker(s)\n",
+                "Key: CHANGELOG.md: 1 version(s)\n",
+                "Key: README.md: 3 version(s), 10.4 KiB non-current\n",
+                "Key: wtf.pem: 5 version(s), 6.6 KiB non-current\n",
             ],
-            any_order=True,
         )
-        mocked_execute.assert_called_with(delimiter=": ", multi_select=True)
+        mocked_execute.assert_called_with(
+            delimiter=": ", multi_select=True, header=PICKER_HEADER
+        )
 
         # version delete marker single
-        mocked_append.reset_mock()
         mocked_execute.return_value = " wtf.txt"
         self.s3.set_s3_object(version=True, deletemark=True)
         self.assertEqual(self.s3.path_list[0], " wtf.txt")
-        mocked_append.assert_has_calls(
+        self.assertCountEqual(
+            list(mocked_stream.call_args[0][0]),
             [
-                call("\x1b[31mKey: .DS_Store\x1b[0m\n"),
-                call("\x1b[31mKey:  elb.pem\x1b[0m\n"),
-                call("\x1b[31mKey:  w tf.txt\x1b[0m\n"),
-                call("\x1b[31mKey:  wtf.txt\x1b[0m\n"),
+                "\x1b[31mKey: .DS_Store\x1b[0m: 4 version(s), 1 delete marker(s), "
+                "24.0 KiB non-current\n",
+                "\x1b[31mKey:  elb.pem\x1b[0m: 1 version(s), 1 delete marker(s), "
+                "1.7 KiB non-current\n",
+                "\x1b[31mKey:  w tf.txt\x1b[0m: 1 version(s), 1 delete marker(s)\n",
+                "\x1b[31mKey:  wtf.txt\x1b[0m: 2 version(s), 1 delete marker(s)\n",
             ],
-            any_order=True,
         )
 
         # version delete marker multiple
-        mocked_append.reset_mock()
         mocked_execute.return_value = [" wtf.txt", ".DS_Store"]
         self.s3.set_s3_object(version=True, deletemark=True, multi_select=True)
         self.assertEqual(self.s3.path_list, [" wtf.txt", ".DS_Store"])
-        mocked_append.assert_has_calls(
+        self.assertCountEqual(
+            list(mocked_stream.call_args[0][0]),
+            [
+                "\x1b[31mKey: .DS_Store\x1b[0m: 4 version(s), 1 delete marker(s), "
+                "24.0 KiB non-current\n",
+                "\x1b[31mKey:  elb.pem\x1b[0m: 1 version(s), 1 delete marker(s), "
+                "1.7 KiB non-current\n",
+                "\x1b[31mKey:  w tf.txt\x1b[0m: 1 version(s), 1 delete marker(s)\n",
+                "\x1b[31mKey:  wtf.txt\x1b[0m: 2 version(s), 1 delete marker(s)\n",
+            ],
+        )
+
+    @patch.object(Paginator, "paginate")
+    def test_get_prefix_entries(self, mocked_paginator):
+        self.s3.bucket_name = "kazhala-version-testing"
+        # versions of hello.txt span two pages
+        mocked_paginator.return_value = [
+            {
+                "CommonPrefixes": [{"Prefix": "logs/"}],
+                "Versions": [
+                    {"Key": "hello.txt", "IsLatest": True, "Size": 5},
+                    {"Key": "hello.txt", "IsLatest": False, "Size": 1024},
+                ],
+            },
+            {
+                "CommonPrefixes": [{"Prefix": "sync/"}],
+                "Versions": [{"Key": "hello.txt", "IsLatest": False, "Size": 1024}],
+                "DeleteMarkers": [{"Key": "wtf.pem", "IsLatest": True}],
+            },
+        ]
+        self.assertCountEqual(
+            list(self.s3.get_prefix_entries(version=True)),
             [
-                call("\x1b[31mKey: .DS_Store\x1b[0m\n"),
-                call("\x1b[31mKey:  elb.pem\x1b[0m\n"),
-                call("\x1b[31mKey:  w tf.txt\x1b[0m\n"),
-                call("\x1b[31mKey:  wtf.txt\x1b[0m\n"),
+                "\x1b[33mPrefix: logs/\x1b[0m\n",
+                "\x1b[33mPrefix: sync/\x1b[0m\n",
+                "Key: hello.txt: 3 version(s), 2.0 KiB non-current\n",
+                "\x1b[31mKey: wtf.pem\x1b[0m: 0 version(s), 1 delete marker(s)\n",
             ],
-            any_order=True,
+        )
+        mocked_paginator.assert_called_with(
+            ANY, Bucket="kazhala-version-testing", Prefix="", Delimiter="/"
         )
 
     @patch.object(Paginator, "paginate")
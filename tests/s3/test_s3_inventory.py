@@ -0,0 +1,205 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+from fzfaws.s3.helper.object_index import clear_object_indexes, get_listing_source
+from fzfaws.s3.helper.prefix_trie import PrefixListing
+from fzfaws.s3.helper.s3_inventory import (
+    S3Inventory,
+    add_inventory_manifest,
+    clear_inventory_manifests,
+    get_inventory,
+    read_inventory_manifest,
+)
+from fzfaws.s3.helper.walk_s3_folder import walk_s3_folder
+from fzfaws.utils.exceptions import InvalidFileType
+
+MANIFEST_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "../data/s3_inventory/2020-06-01T00-00Z/manifest.json",
+)
+
+
+class TestS3Inventory(unittest.TestCase):
+    def setUp(self):
+        self.manifest = read_inventory_manifest(MagicMock(), MANIFEST_PATH)
+        self.inventory = S3Inventory(MagicMock(), self.manifest)
+
+    def test_read_inventory_manifest(self):
+        self.assertEqual(self.manifest.source_bucket, "kazhala-lol")
+        self.assertEqual(self.manifest.destination_bucket, "kazhala-inventory")
+        self.assertEqual(self.manifest.file_format, "CSV")
+        self.assertEqual(self.manifest.file_schema[:3], ["bucket", "key", "versionid"])
+        self.assertEqual(len(self.manifest.files), 2)
+        self.assertEqual(self.manifest.creation_timestamp, "1590969600000")
+
+    def test_read_inventory_manifest_s3(self):
+        client = MagicMock()
+        with open(MANIFEST_PATH, "rb") as file:
+            client.get_object.return_value = {"Body": io.BytesIO(file.read())}
+        manifest = read_inventory_manifest(
+            client, "s3://kazhala-inventory/kazhala-lol/daily/manifest.json"
+        )
+        client.get_object.assert_called_once_with(
+            Bucket="kazhala-inventory", Key="kazhala-lol/daily/manifest.json"
+        )
+        self.assertEqual(manifest.files, self.manifest.files)
+
+    def test_list_objects(self):
+        objects = list(self.inventory.list_objects())
+        # non-current versions and delete markers are skipped, keys are decoded
+        self.assertEqual(
+            [s3_object["Key"] for s3_object in objects],
+            ["a.txt", "logs/2020/app.log", "logs/my file(1).log", "z/b.txt"],
+        )
+        self.assertEqual(
+            objects[0],
+            {
+                "Key": "a.txt",
+                "Size": 1,
+                "LastModified": datetime(2020, 6, 1, 10, tzinfo=timezone.utc),
+                "ETag": '"0cc175b9c0f1b6a831c399e269772661"',
+                "StorageClass": "STANDARD",
+            },
+        )
+        self.assertEqual(objects[2]["StorageClass"], "GLACIER")
+
+        self.assertEqual(
+            [
+                s3_object["Key"]
+                for s3_object in self.inventory.list_objects(
+                    "logs/", exclude=["*"], include=["*.log"]
+                )
+            ],
+            ["logs/2020/app.log", "logs/my file(1).log"],
+        )
+
+    def test_list_objects_s3(self):
+        client = MagicMock()
+        data_directory = os.path.join(os.path.dirname(MANIFEST_PATH), "../data")
+
+        def get_object(Bucket, Key):
+            with open(os.path.join(data_directory, os.path.basename(Key)), "rb") as f:
+                return {"Body": io.BytesIO(f.read())}
+
+        client.get_object.side_effect = get_object
+        inventory = S3Inventory(
+            client, self.manifest._replace(path="s3://kazhala-inventory/manifest.json")
+        )
+        self.assertEqual(
+            [s3_object["Key"] for s3_object in inventory.list_objects("z/")],
+            ["z/b.txt"],
+        )
+        client.get_object.assert_called_with(
+            Bucket="kazhala-inventory", Key=self.manifest.files[1]
+        )
+
+    def test_list_prefix(self):
+        self.assertEqual(
+            self.inventory.list_prefix(),
+            PrefixListing(["logs/", "z/"], ["a.txt"]),
+        )
+        self.assertEqual(
+            self.inventory.list_prefix("logs/"),
+            PrefixListing(["logs/2020/"], ["logs/my file(1).log"]),
+        )
+
+    def test_unsupported_format(self):
+        inventory = S3Inventory(MagicMock(), self.manifest._replace(file_format="XML"))
+        self.assertRaises(InvalidFileType, list, inventory.list_objects())
+
+    def test_missing_file(self):
+        inventory = S3Inventory(
+            MagicMock(), self.manifest._replace(files=["data/missing.csv.gz"])
+        )
+        self.assertRaises(FileNotFoundError, list, inventory.list_objects())
+
+
+class TestGetInventory(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        patch.dict(
+            os.environ,
+            {
+                "XDG_CACHE_HOME": self.temp_dir.name,
+                "FZFAWS_S3_INDEX": "",
+                "FZFAWS_S3_INVENTORY": "",
+            },
+        ).start()
+        clear_inventory_manifests()
+        clear_object_indexes()
+
+    def tearDown(self):
+        clear_object_indexes()
+        clear_inventory_manifests()
+        patch.stopall()
+        self.temp_dir.cleanup()
+
+    def test_get_inventory(self):
+        self.assertIsNone(get_inventory(MagicMock(), "kazhala-lol"))
+        add_inventory_manifest(MANIFEST_PATH)
+        add_inventory_manifest(MANIFEST_PATH)
+        self.assertEqual(json.loads(os.environ["FZFAWS_S3_INVENTORY"]), [MANIFEST_PATH])
+        self.assertIsNone(get_inventory(MagicMock(), "kazhala-other"))
+        inventory = get_inventory(MagicMock(), "kazhala-lol")
+        self.assertEqual(inventory.manifest.path, MANIFEST_PATH)
+
+    def test_listing_source(self):
+        client = MagicMock()
+        add_inventory_manifest(MANIFEST_PATH)
+        self.assertIsInstance(get_listing_source(client, "kazhala-lol"), S3Inventory)
+
+        # the index is built from the report
+        os.environ["FZFAWS_S3_INDEX"] = "1"
+        index = get_listing_source(client, "kazhala-lol", no_progress=True)
+        self.assertEqual(index.list_prefix(), PrefixListing(["logs/", "z/"], ["a.txt"]))
+        self.assertEqual(index.get_source(), "%s@1590969600000" % MANIFEST_PATH)
+        client.get_paginator.assert_not_called()
+        client.list_objects_v2.assert_not_called()
+
+    @patch("fzfaws.s3.helper.walk_s3_folder.get_confirmation")
+    @patch("fzfaws.s3.helper.walk_s3_folder.list_s3_objects")
+    def test_walk_s3_folder(self, mocked_list, mocked_confirmation):
+        add_inventory_manifest(MANIFEST_PATH)
+        mocked_confirmation.return_value = True
+        captured_output = io.StringIO()
+        with patch("sys.stdout", captured_output):
+            result = walk_s3_folder(
+                MagicMock(), "kazhala-lol", "logs/", "logs/", operation="delete"
+            )
+        self.assertEqual(
+            result,
+            [
+                ("logs/2020/app.log", "/2020/app.log"),
+                ("logs/my file(1).log", "/my file(1).log"),
+            ],
+        )
+        self.assertIn(
+            "inventory report created at 2020-06-01 00:00:00 UTC",
+            captured_output.getvalue(),
+        )
+        mocked_confirmation.assert_called_once()
+        mocked_list.assert_not_called()
+
+        # declined, the bucket is listed
+        mocked_confirmation.reset_mock()
+        mocked_confirmation.return_value = False
+        mocked_list.return_value = [{"Key": "logs/b.log"}]
+        with patch("sys.stdout"):
+            result = walk_s3_folder(
+                MagicMock(), "kazhala-lol", "logs/", "logs/", operation="delete"
+            )
+        self.assertEqual(result, [("logs/b.log", "/b.log")])
+        mocked_list.assert_called_once()
+
+        # downloads don't modify the bucket
+        mocked_confirmation.reset_mock()
+        mocked_list.reset_mock()
+        with patch("sys.stdout"):
+            walk_s3_folder(MagicMock(), "kazhala-lol", "logs/", "logs/")
+        mocked_confirmation.assert_not_called()
+        mocked_list.assert_not_called()
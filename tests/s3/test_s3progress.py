@@ -2,7 +2,7 @@ import sys
 import io
 import unittest
 from unittest.mock import patch
-from fzfaws.s3.helper.s3progress import S3Progress
+from fzfaws.s3.helper.s3progress import BatchProgress, S3Progress, format_duration
 import boto3
 from botocore.stub import Stubber
 
@@ -34,6 +34,11 @@ class TestS3Progress(unittest.TestCase):
         self.assertEqual(progress._seen_so_far, 0)
         self.assertEqual(progress._size, 100)
 
+        # size from listing, no head_object
+        progress = S3Progress(filename=__file__, client=client, bucket="hello", size=5)
+        self.assertEqual(progress._size, 5)
+        stubber.assert_no_pending_responses()
+
     @patch("os.path.getsize")
     def test_call(self, mocked_size):
         mocked_size.return_value = 1000
@@ -57,3 +62,45 @@ class TestS3Progress(unittest.TestCase):
         self.assertEqual(result, "1.0 GiB")
         result = progress.human_readable_size(10737418991)
         self.assertEqual(result, "10.0 GiB")
+
+
+class TestBatchProgress(unittest.TestCase):
+    def setUp(self):
+        self.capturedOutput = io.StringIO()
+        sys.stdout = self.capturedOutput
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    @patch("fzfaws.s3.helper.s3progress.time.monotonic")
+    def test_get_line(self, mocked_time):
+        mocked_time.return_value = 0
+        progress = BatchProgress(total_files=2, total_bytes=2048)
+        self.assertEqual(
+            progress.get_line(), "0 Bytes / 2.0 KiB  0/2 files  0 Bytes/s  ETA --:--"
+        )
+
+        mocked_time.return_value = 2
+        progress.add_file()
+        progress.add_bytes(2048)
+        progress.update(2048)
+        progress.file_done()
+        self.assertEqual(
+            progress.get_line(), "2.0 KiB / 4.0 KiB  1/3 files  1.0 KiB/s  ETA 00:02"
+        )
+
+    def test_render(self):
+        with BatchProgress(frame_rate=100) as progress:
+            progress.add_file(10)
+            progress.update(10)
+            progress.file_done()
+            progress.write("download: hello.txt")
+        output = self.capturedOutput.getvalue()
+        self.assertRegex(output, r"download: hello.txt\n")
+        self.assertRegex(output, r"10 Bytes / 10 Bytes  1/1 files .*\n$")
+        self.assertIsNone(progress._thread)
+
+    def test_format_duration(self):
+        self.assertEqual(format_duration(5), "00:05")
+        self.assertEqual(format_duration(125), "02:05")
+        self.assertEqual(format_duration(3725), "1:02:05")
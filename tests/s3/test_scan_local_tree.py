@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from fzfaws.s3.helper.scan_local_tree import LocalFile, scan_local_tree
+
+
+class TestScanLocalTree(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        for relative_path, content in [
+            ("a.txt", "a"),
+            ("logs/app.log", "app"),
+            ("logs/2020/old.log", "old!"),
+            ("src/main.py", "print"),
+        ]:
+            path = os.path.join(self.root, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as file:
+                file.write(content)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_scan(self):
+        files = sorted(scan_local_tree(self.root, max_workers=3))
+        self.assertEqual(
+            [(local_file.relative_path, local_file.size) for local_file in files],
+            [
+                ("a.txt", 1),
+                (os.path.join("logs", "2020", "old.log"), 4),
+                (os.path.join("logs", "app.log"), 3),
+                (os.path.join("src", "main.py"), 5),
+            ],
+        )
+        self.assertEqual(files[0].path, os.path.join(self.root, "a.txt"))
+        self.assertEqual(files[0].mtime, os.stat(files[0].path).st_mtime)
+
+        # same files as os.walk
+        walked = sorted(
+            os.path.relpath(os.path.join(root, filename), self.root)
+            for root, _, filenames in os.walk(self.root)
+            for filename in filenames
+        )
+        self.assertEqual([local_file.relative_path for local_file in files], walked)
+
+    def test_scan_filter(self):
+        self.assertEqual(
+            sorted(
+                local_file.relative_path
+                for local_file in scan_local_tree(
+                    self.root, exclude=["logs/*"], include=["*/2020/*"]
+                )
+            ),
+            [
+                "a.txt",
+                os.path.join("logs", "2020", "old.log"),
+                os.path.join("src", "main.py"),
+            ],
+        )
+        self.assertEqual(list(scan_local_tree(self.root, exclude=["*"])), [])
+
+    def test_scan_symlink(self):
+        os.symlink(os.path.join(self.root, "src"), os.path.join(self.root, "link"))
+        os.symlink(
+            os.path.join(self.root, "missing"), os.path.join(self.root, "broken")
+        )
+        relative_paths = [
+            local_file.relative_path for local_file in scan_local_tree(self.root)
+        ]
+        self.assertNotIn(os.path.join("link", "main.py"), relative_paths)
+        self.assertNotIn("broken", relative_paths)
+        self.assertEqual(len(relative_paths), 4)
+
+    def test_scan_empty(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.assertEqual(list(scan_local_tree(temp_dir)), [])
+        self.assertEqual(list(scan_local_tree(os.path.join(self.root, "none"))), [])
+
+    def test_scan_close(self):
+        scanner = scan_local_tree(self.root, max_workers=2)
+        self.assertIsInstance(next(scanner), LocalFile)
+        scanner.close()
+
+    @patch("fzfaws.s3.helper.scan_local_tree._scan_directory")
+    def test_scan_error(self, mocked_scan):
+        mocked_scan.side_effect = ValueError("boom")
+        self.assertRaises(ValueError, list, scan_local_tree(self.root))
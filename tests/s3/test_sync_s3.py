@@ -1,56 +1,207 @@
+import hashlib
 import io
+import os
 import sys
+import tempfile
 import unittest
-from unittest.mock import patch
-from fzfaws.s3.helper.sync_s3 import sync_s3
-import subprocess
+from datetime import datetime, timezone
+from unittest.mock import ANY, patch
+
+from fzfaws.s3.helper.sync_s3 import get_sync_jobs, parse_s3_path, sync_s3
+from fzfaws.s3.helper.transfer_scheduler import TransferJob, TransferScheduler
 from fzfaws.utils.exceptions import InvalidS3PathPattern
 
 
+def s3_object(key, size, timestamp, etag=""):
+    return {
+        "Key": key,
+        "Size": size,
+        "ETag": etag,
+        "LastModified": datetime.fromtimestamp(timestamp, timezone.utc),
+    }
+
+
 class TestS3Sync(unittest.TestCase):
     def setUp(self):
         self.capturedOutput = io.StringIO()
         sys.stdout = self.capturedOutput
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.local_path = self.temp_dir.name
+        os.makedirs(os.path.join(self.local_path, "b"))
+        for filename in ("a.txt", "b/c.txt", "skip.txt"):
+            path = os.path.join(self.local_path, filename)
+            with open(path, "w") as file:
+                file.write("hello")
+            os.utime(path, (1000, 1000))
 
     def tearDown(self):
         sys.stdout = sys.__stdout__
+        self.temp_dir.cleanup()
 
-    @patch("fzfaws.s3.helper.sync_s3.get_confirmation")
-    @patch.object(subprocess, "Popen")
-    def test_no_extra(self, mocked_popen, mocked_confirmation):
-        mocked_confirmation.return_value = True
-        attrs = {"communicate.return_value": ("output", "error")}
-        mocked_popen.configure_mock(**attrs)
-        sync_s3(from_path="hello/world", to_path="s3://hello")
-        mocked_popen.assert_called_with(
-            ["aws", "s3", "sync", "hello/world", "s3://hello",]
+    def test_parse_s3_path(self):
+        self.assertEqual(parse_s3_path("s3://hello/world"), ("hello", "world/"))
+        self.assertEqual(parse_s3_path("s3://hello/world/"), ("hello", "world/"))
+        self.assertEqual(parse_s3_path("s3://hello/"), ("hello", ""))
+        self.assertEqual(parse_s3_path("s3://hello"), ("hello", ""))
+        self.assertEqual(parse_s3_path("/tmp/hello"), ("", ""))
+
+    @patch("fzfaws.s3.helper.sync_s3.list_s3_objects")
+    def test_upload(self, mocked_list):
+        mocked_list.return_value = [
+            s3_object("hello/a.txt", 5, 2000),
+            s3_object("hello/b/c.txt", 4, 2000),
+            s3_object("hello/d.txt", 4, 2000),
+        ]
+        jobs = get_sync_jobs(
+            None, self.local_path, "s3://kazhala-lol/hello", exclude=["skip*"]
+        )
+        mocked_list.assert_called_once_with(None, "kazhala-lol", "hello/")
+        self.assertEqual(
+            jobs,
+            [
+                TransferJob(
+                    "upload",
+                    "kazhala-lol",
+                    "hello/b/c.txt",
+                    filename=os.path.join(self.local_path, "b", "c.txt"),
+                    message="upload: %s to s3://kazhala-lol/hello/b/c.txt"
+                    % os.path.join(self.local_path, "b", "c.txt"),
+                    size=5,
+                )
+            ],
         )
 
-        self.assertRaises(InvalidS3PathPattern, sync_s3)
+        # local file is newer
+        mocked_list.return_value = [s3_object("a.txt", 5, 500)]
+        jobs = get_sync_jobs(None, self.local_path, "s3://kazhala-lol/")
+        self.assertEqual(
+            sorted(job.key for job in jobs), ["a.txt", "b/c.txt", "skip.txt"]
+        )
 
-    @patch("fzfaws.s3.helper.sync_s3.get_confirmation")
-    @patch.object(subprocess, "Popen")
-    def test_extra(self, mocked_popen, mocked_confirmation):
-        mocked_confirmation.return_value = True
-        attrs = {"communicate.return_value": ("output", "error")}
-        mocked_popen.configure_mock(**attrs)
-        sync_s3(["lol"], ["foo", "boo"], "tmp", "s3://yes")
-        mocked_popen.assert_called_with(
+    @patch("fzfaws.s3.helper.sync_s3.list_s3_objects")
+    def test_download(self, mocked_list):
+        mocked_list.return_value = [
+            s3_object("hello/a.txt", 5, 500),
+            s3_object("hello/b/c.txt", 5, 2000),
+            s3_object("hello/e/f.txt", 1, 2000),
+            s3_object("hello/e/", 0, 2000),
+        ]
+        jobs = get_sync_jobs(None, "s3://kazhala-lol/hello/", self.local_path)
+        self.assertEqual(
+            jobs,
             [
-                "aws",
-                "s3",
-                "sync",
-                "tmp",
-                "s3://yes",
-                "--exclude",
-                "lol",
-                "--include",
-                "foo",
-                "boo",
-            ]
-        )
-
-        sync_s3(["lol"], [], "tmp", "s3://yes")
-        mocked_popen.assert_called_with(
-            ["aws", "s3", "sync", "tmp", "s3://yes", "--exclude", "lol",]
+                TransferJob(
+                    "download",
+                    "kazhala-lol",
+                    "hello/b/c.txt",
+                    filename=os.path.join(self.local_path, "b", "c.txt"),
+                    message="download: s3://kazhala-lol/hello/b/c.txt to %s"
+                    % os.path.join(self.local_path, "b", "c.txt"),
+                    size=5,
+                    last_modified=2000,
+                ),
+                TransferJob(
+                    "download",
+                    "kazhala-lol",
+                    "hello/e/f.txt",
+                    filename=os.path.join(self.local_path, "e", "f.txt"),
+                    message="download: s3://kazhala-lol/hello/e/f.txt to %s"
+                    % os.path.join(self.local_path, "e", "f.txt"),
+                    size=1,
+                    last_modified=2000,
+                ),
+            ],
+        )
+
+        jobs = get_sync_jobs(
+            None, "s3://kazhala-lol/hello/", self.local_path, exclude=["e/*"]
+        )
+        self.assertEqual([job.key for job in jobs], ["hello/b/c.txt"])
+
+    @patch("fzfaws.s3.helper.sync_s3.list_s3_objects")
+    def test_copy(self, mocked_list):
+        destination = [
+            s3_object("foo/a.txt", 5, 2000, '"1"'),
+            s3_object("foo/b.txt", 5, 500, '"2"'),
+        ]
+        source = [
+            s3_object("a.txt", 5, 1000, '"1"'),
+            s3_object("b.txt", 5, 1000, '"2"'),
+            s3_object("c.txt", 5, 1000, '"3"'),
+        ]
+        mocked_list.side_effect = [destination, source]
+        jobs = get_sync_jobs(None, "s3://kazhala-lol/", "s3://kazhala-yes/foo/")
+        self.assertEqual([job.key for job in jobs], ["foo/b.txt", "foo/c.txt"])
+        self.assertEqual(
+            jobs[0].copy_source, {"Bucket": "kazhala-lol", "Key": "b.txt"}
+        )
+        self.assertEqual(
+            jobs[0].message,
+            "copy: s3://kazhala-lol/b.txt to s3://kazhala-yes/foo/b.txt",
         )
+
+        mocked_list.side_effect = [destination, source]
+        jobs = get_sync_jobs(
+            None, "s3://kazhala-lol/", "s3://kazhala-yes/foo/", etag=True
+        )
+        self.assertEqual([job.key for job in jobs], ["foo/c.txt"])
+
+    @patch("fzfaws.s3.helper.sync_s3.list_s3_objects")
+    def test_etag(self, mocked_list):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        patcher = patch.dict(os.environ, {"XDG_CACHE_HOME": cache_dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        etag = '"%s"' % hashlib.md5(b"hello").hexdigest()
+        mocked_list.return_value = [
+            s3_object("a.txt", 5, 500, etag),
+            s3_object("b/c.txt", 5, 500, '"1"'),
+            s3_object("skip.txt", 5, 2000, etag),
+        ]
+        jobs = get_sync_jobs(None, self.local_path, "s3://kazhala-lol/", etag=True)
+        self.assertEqual([job.key for job in jobs], ["b/c.txt"])
+
+        jobs = get_sync_jobs(None, "s3://kazhala-lol/", self.local_path, etag=True)
+        self.assertEqual([job.key for job in jobs], ["b/c.txt"])
+        self.assertTrue(os.path.isfile(cache_dir.name + "/fzfaws/etag.json"))
+
+    @patch("fzfaws.s3.helper.sync_s3.get_confirmation")
+    @patch.object(TransferScheduler, "run")
+    @patch("fzfaws.s3.helper.sync_s3.get_sync_jobs")
+    def test_sync_s3(self, mocked_jobs, mocked_run, mocked_confirm):
+        jobs = [TransferJob("upload", "kazhala-lol", "a.txt", message="upload: a.txt")]
+        mocked_jobs.return_value = jobs
+        mocked_confirm.return_value = True
+        sync_s3(["lol"], ["foo"], "tmp", "s3://kazhala-lol", client=ANY)
+        mocked_jobs.assert_called_once_with(
+            ANY, "tmp", "s3://kazhala-lol", ["lol"], ["foo"], False
+        )
+        mocked_run.assert_called_once_with(jobs)
+        self.assertEqual(
+            self.capturedOutput.getvalue(),
+            "(dryrun) upload: a.txt\ntmp synced with s3://kazhala-lol\n",
+        )
+
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+        mocked_run.reset_mock()
+        mocked_confirm.return_value = False
+        sync_s3(from_path="tmp", to_path="s3://kazhala-lol", client=ANY, etag=True)
+        mocked_jobs.assert_called_with(
+            ANY, "tmp", "s3://kazhala-lol", None, None, True
+        )
+        mocked_run.assert_not_called()
+
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+        mocked_jobs.return_value = []
+        sync_s3(from_path="tmp", to_path="s3://kazhala-lol", client=ANY)
+        self.assertEqual(
+            self.capturedOutput.getvalue(),
+            "tmp is already in sync with s3://kazhala-lol\n",
+        )
+
+        self.assertRaises(InvalidS3PathPattern, sync_s3)
+        mocked_jobs.side_effect = InvalidS3PathPattern
+        self.assertRaises(InvalidS3PathPattern, sync_s3, [], [], "tmp", "tmp", ANY)
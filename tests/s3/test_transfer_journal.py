@@ -0,0 +1,381 @@
+import hashlib
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import boto3
+from botocore.stub import Stubber
+
+from fzfaws.s3.helper.transfer_journal import TransferJournal, open_transfer_journal
+from fzfaws.s3.helper.transfer_scheduler import (
+    TransferJob,
+    TransferScheduler,
+    resume_multipart_upload,
+)
+from fzfaws.utils.exceptions import InvalidJournal
+
+
+class TestTransferJournal(unittest.TestCase):
+    def setUp(self):
+        self.capturedOutput = io.StringIO()
+        sys.stdout = self.capturedOutput
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.environ = patch.dict(
+            os.environ,
+            {"XDG_STATE_HOME": self.temp_dir.name, "FZFAWS_S3_TRANSFER": "{}"},
+        )
+        self.environ.start()
+        self.client = boto3.client(
+            "s3",
+            region_name="us-east-1",
+            aws_access_key_id="test",
+            aws_secret_access_key="test",
+        )
+        self.stubber = Stubber(self.client)
+        self.jobs = []
+        for i in range(2):
+            filename = os.path.join(self.temp_dir.name, "%s.txt" % i)
+            with open(filename, "w") as file:
+                file.write("hello")
+            self.jobs.append(
+                TransferJob(
+                    "upload", "kazhala-lol", "%s.txt" % i, filename=filename, size=5
+                )
+            )
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+        self.environ.stop()
+        self.temp_dir.cleanup()
+
+    def test_journal(self):
+        journal = open_transfer_journal("upload")
+        self.assertFalse(journal.resuming)
+        self.assertRegex(journal.job_id, r"^upload-\d{14}-\d+$")
+        self.assertEqual(
+            self.capturedOutput.getvalue(),
+            "job %s, resume with --resume %s\n" % (journal.job_id, journal.job_id),
+        )
+        self.assertEqual(
+            journal.path,
+            os.path.join(
+                self.temp_dir.name, "fzfaws", "journal", "%s.jsonl" % journal.job_id
+            ),
+        )
+        with patch("os.fsync") as mocked_fsync:
+            for job in self.jobs:
+                journal.plan(job)
+            journal.complete(self.jobs[0])
+            mocked_fsync.assert_not_called()
+            journal.sync()
+            mocked_fsync.assert_called_once()
+        journal.close()
+        # torn by a crash
+        with open(journal.path, "a") as file:
+            file.write('{"completed": ')
+
+        journal = open_transfer_journal("upload", journal.job_id)
+        self.assertTrue(journal.resuming)
+        self.assertTrue(journal.is_completed(self.jobs[0]))
+        self.assertFalse(journal.is_interrupted(self.jobs[0]))
+        self.assertFalse(journal.is_completed(self.jobs[1]))
+        self.assertTrue(journal.is_interrupted(self.jobs[1]))
+        self.assertFalse(journal.is_completed(self.jobs[0]._replace(size=6)))
+        self.assertFalse(journal.is_completed(self.jobs[0]._replace(key="2.txt")))
+
+        # changed since the upload
+        os.utime(self.jobs[0].filename, (0, 0))
+        self.assertFalse(journal.is_completed(self.jobs[0]))
+        journal.close(remove=True)
+        self.assertFalse(os.path.exists(journal.path))
+
+    def test_journal_download(self):
+        job = TransferJob(
+            "download",
+            "kazhala-lol",
+            "0.txt",
+            filename=self.jobs[0].filename,
+        )
+        journal = open_transfer_journal("download")
+        journal.complete(job)
+        journal.close()
+        journal = open_transfer_journal("download", journal.job_id)
+        self.assertTrue(journal.is_completed(job))
+        self.assertFalse(journal.is_completed(job._replace(size=6)))
+        with open(job.filename, "w") as file:
+            file.write("hell")
+        self.assertFalse(journal.is_completed(job))
+        os.remove(job.filename)
+        self.assertFalse(journal.is_completed(job))
+        journal.close()
+
+    def test_invalid_journal(self):
+        self.assertRaises(InvalidJournal, open_transfer_journal, "upload", "lol")
+        self.assertRaises(InvalidJournal, open_transfer_journal, "upload", "../lol")
+        journal = open_transfer_journal("download")
+        journal.close()
+        self.assertRaises(
+            InvalidJournal, TransferJournal, journal.job_id, "upload", resume=True
+        )
+
+    def test_scheduler(self):
+        journal = open_transfer_journal("upload")
+        journal.complete(self.jobs[0])
+        journal.close()
+
+        self.stubber.add_client_error("put_object", "AccessDenied")
+        self.stubber.activate()
+        failures = TransferScheduler(
+            self.client,
+            no_progress=True,
+            journal=open_transfer_journal("upload", journal.job_id),
+        ).run(self.jobs)
+        self.stubber.assert_no_pending_responses()
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(failures[0][0].key, "1.txt")
+        output = self.capturedOutput.getvalue()
+        self.assertIn("1 file(s) already transferred, skipped", output)
+        self.assertIn("Resume the transfer with --resume %s" % journal.job_id, output)
+        self.assertTrue(os.path.exists(journal.path))
+
+        self.stubber.add_response("put_object", {"ETag": '"1"'})
+        journal = open_transfer_journal("upload", journal.job_id)
+        self.assertEqual(
+            TransferScheduler(self.client, no_progress=True, journal=journal).run(
+                iter(self.jobs)
+            ),
+            [],
+        )
+        self.stubber.assert_no_pending_responses()
+        self.assertFalse(os.path.exists(journal.path))
+
+    def test_scheduler_interrupted(self):
+        def jobs():
+            yield self.jobs[0]
+            raise KeyboardInterrupt
+
+        journal = open_transfer_journal("upload")
+        self.stubber.add_response("put_object", {"ETag": '"1"'})
+        self.stubber.activate()
+        self.assertRaises(
+            KeyboardInterrupt,
+            TransferScheduler(self.client, no_progress=True, journal=journal).run,
+            jobs(),
+        )
+        self.assertTrue(os.path.exists(journal.path))
+
+        # the submitted upload is cancelled by the TransferManager
+        journal = open_transfer_journal("upload", journal.job_id)
+        self.assertTrue(
+            journal.is_completed(self.jobs[0]) or journal.is_interrupted(self.jobs[0])
+        )
+        journal.close()
+
+    def test_scheduler_interrupted_multipart(self):
+        started = threading.Event()
+        interrupted = threading.Event()
+
+        def upload_part(**kwargs):
+            started.set()
+            interrupted.wait()
+            time.sleep(0.1)
+
+        def jobs():
+            yield self.jobs[0]
+            started.wait()
+            interrupted.set()
+            raise KeyboardInterrupt
+
+        # s3transfer aborts the multipart upload on KeyboardInterrupt
+        self.client.meta.events.register(
+            "before-parameter-build.s3.UploadPart", upload_part
+        )
+        self.stubber.add_response("create_multipart_upload", {"UploadId": "1"})
+        self.stubber.add_response("upload_part", {"ETag": '"1"'})
+        self.stubber.add_response(
+            "abort_multipart_upload",
+            {},
+            {"Bucket": "kazhala-lol", "Key": "0.txt", "UploadId": "1"},
+        )
+        self.stubber.activate()
+        journal = open_transfer_journal("upload")
+        scheduler = TransferScheduler(self.client, no_progress=True, journal=journal)
+        scheduler.transfer_config.multipart_threshold = 5
+        self.assertRaises(KeyboardInterrupt, scheduler.run, jobs())
+        self.stubber.assert_no_pending_responses()
+
+        # so the resume uploads the file again
+        self.stubber.add_response("list_multipart_uploads", {})
+        self.stubber.add_response("create_multipart_upload", {"UploadId": "2"})
+        self.stubber.add_response("upload_part", {"ETag": '"1"'})
+        self.stubber.add_response("complete_multipart_upload", {})
+        journal = open_transfer_journal("upload", journal.job_id)
+        self.assertTrue(journal.is_interrupted(self.jobs[0]))
+        scheduler = TransferScheduler(self.client, no_progress=True, journal=journal)
+        scheduler.transfer_config.multipart_threshold = 5
+        self.assertEqual(scheduler.run([self.jobs[0]]), [])
+        self.stubber.assert_no_pending_responses()
+        self.assertFalse(os.path.exists(journal.path))
+
+    def test_scheduler_multipart(self):
+        job = self.jobs[1]
+        journal = open_transfer_journal("upload")
+        journal.plan(job)
+        journal.close()
+
+        scheduler = TransferScheduler(
+            self.client,
+            no_progress=True,
+            journal=open_transfer_journal("upload", journal.job_id),
+        )
+        scheduler.transfer_config.multipart_threshold = 5
+        self.stubber.add_response(
+            "list_multipart_uploads",
+            {
+                "Uploads": [
+                    {"Key": "1.txt", "UploadId": "1", "Initiated": datetime.now()}
+                ]
+            },
+        )
+        self.stubber.add_response(
+            "list_parts",
+            {
+                "Parts": [
+                    {
+                        "PartNumber": 1,
+                        "ETag": '"%s"' % hashlib.md5(b"hel").hexdigest(),
+                        "Size": 3,
+                    }
+                ]
+            },
+        )
+        # split at the adjusted multipart_chunksize, not the size of part 1
+        self.stubber.add_response(
+            "upload_part",
+            {"ETag": '"2"'},
+            {
+                "Bucket": "kazhala-lol",
+                "Key": "1.txt",
+                "UploadId": "1",
+                "PartNumber": 1,
+                "Body": b"hello",
+            },
+        )
+        self.stubber.add_response("complete_multipart_upload", {})
+        self.stubber.activate()
+        threads = []
+        self.client.meta.events.register(
+            "before-parameter-build.s3.ListMultipartUploads",
+            lambda **kwargs: threads.append(threading.current_thread()),
+        )
+        self.assertEqual(scheduler.run([job]), [])
+        # resumed on the resumer thread pool, not the submit loop
+        self.assertNotIn(threading.main_thread(), threads)
+        self.assertEqual(len(threads), 1)
+        self.stubber.assert_no_pending_responses()
+        self.assertFalse(os.path.exists(journal.path))
+
+    def test_resume_multipart_upload(self):
+        self.initiated = [datetime(2020, 1, 1), datetime(2020, 1, 2)]
+        job = self.jobs[0]._replace(
+            extra_args={
+                "SSECustomerAlgorithm": "AES256",
+                "SSECustomerKey": "key",
+                "ACL": "private",
+            }
+        )
+        self.stubber.add_response(
+            "list_multipart_uploads",
+            {
+                "Uploads": [
+                    {"Key": "0.txt", "UploadId": "1", "Initiated": self.initiated[0]},
+                    {"Key": "0.txt", "UploadId": "2", "Initiated": self.initiated[1]},
+                    {"Key": "0.txt.bak", "UploadId": "3", "Initiated": datetime.now()},
+                ]
+            },
+            {"Bucket": "kazhala-lol", "Prefix": "0.txt"},
+        )
+        self.stubber.add_response(
+            "list_parts",
+            {
+                "Parts": [
+                    {"PartNumber": 1, "ETag": '"lol"', "Size": 2},
+                    # only the short last part is uploaded
+                    {
+                        "PartNumber": 3,
+                        "ETag": '"%s"' % hashlib.md5(b"o").hexdigest(),
+                        "Size": 1,
+                    },
+                ]
+            },
+            {"Bucket": "kazhala-lol", "Key": "0.txt", "UploadId": "2"},
+        )
+        for part_number, body in [(1, b"he"), (2, b"ll")]:
+            self.stubber.add_response(
+                "upload_part",
+                {"ETag": '"%s"' % part_number},
+                {
+                    "Bucket": "kazhala-lol",
+                    "Key": "0.txt",
+                    "UploadId": "2",
+                    "PartNumber": part_number,
+                    "Body": body,
+                    "SSECustomerAlgorithm": "AES256",
+                    "SSECustomerKey": "key",
+                },
+            )
+        etag = '"%s"' % hashlib.md5(b"o").hexdigest()
+        self.stubber.add_response(
+            "complete_multipart_upload",
+            {},
+            {
+                "Bucket": "kazhala-lol",
+                "Key": "0.txt",
+                "UploadId": "2",
+                "MultipartUpload": {
+                    "Parts": [
+                        {"PartNumber": 1, "ETag": '"1"'},
+                        {"PartNumber": 2, "ETag": '"2"'},
+                        {"PartNumber": 3, "ETag": etag},
+                    ]
+                },
+            },
+        )
+        self.stubber.activate()
+        transferred = []
+        self.assertTrue(
+            resume_multipart_upload(self.client, job, 2, transferred.append)
+        )
+        self.stubber.assert_no_pending_responses()
+        self.assertEqual(transferred, [2, 2, 1])
+
+    def test_resume_multipart_upload_restart(self):
+        self.stubber.add_response("list_multipart_uploads", {})
+        self.stubber.add_response(
+            "list_multipart_uploads",
+            {
+                "Uploads": [
+                    {"Key": "0.txt", "UploadId": "1", "Initiated": datetime.now()}
+                ]
+            },
+        )
+        # more parts than the file, changed since the upload
+        self.stubber.add_response(
+            "list_parts",
+            {"Parts": [{"PartNumber": 4, "ETag": '"1"', "Size": 2}]},
+        )
+        self.stubber.add_response(
+            "abort_multipart_upload",
+            {},
+            {"Bucket": "kazhala-lol", "Key": "0.txt", "UploadId": "1"},
+        )
+        self.stubber.activate()
+        self.assertFalse(resume_multipart_upload(self.client, self.jobs[0], 2))
+        self.assertFalse(resume_multipart_upload(self.client, self.jobs[0], 2))
+        self.stubber.assert_no_pending_responses()
@@ -0,0 +1,204 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import boto3
+from botocore.stub import Stubber
+
+from fzfaws.s3.helper.transfer_scheduler import TransferJob, TransferScheduler
+
+
+@patch.dict(os.environ, {"FZFAWS_S3_TRANSFER": "{}"})
+class TestTransferScheduler(unittest.TestCase):
+    def setUp(self):
+        self.capturedOutput = io.StringIO()
+        sys.stdout = self.capturedOutput
+        self.client = boto3.client(
+            "s3",
+            region_name="us-east-1",
+            aws_access_key_id="test",
+            aws_secret_access_key="test",
+        )
+        self.stubber = Stubber(self.client)
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+        self.temp_dir.cleanup()
+
+    def test_constructor(self):
+        scheduler = TransferScheduler(self.client, max_in_flight=3)
+        self.assertEqual(scheduler.max_in_flight, 3)
+        with patch.dict(os.environ, {"FZFAWS_S3_MAX_IN_FLIGHT": "5"}):
+            self.assertEqual(TransferScheduler(self.client).max_in_flight, 5)
+        with patch.dict(os.environ, {"FZFAWS_S3_MAX_IN_FLIGHT": ""}):
+            self.assertEqual(TransferScheduler(self.client).max_in_flight, 10)
+
+    def test_upload(self):
+        jobs = []
+        for i in range(3):
+            filename = os.path.join(self.temp_dir.name, "%s.txt" % i)
+            with open(filename, "w") as file:
+                file.write("hello")
+            jobs.append(
+                TransferJob(
+                    "upload",
+                    "kazhala-lol",
+                    "%s.txt" % i,
+                    filename=filename,
+                    message="upload: %s.txt" % i,
+                )
+            )
+        self.stubber.add_response("put_object", {"ETag": '"1"'})
+        self.stubber.add_response("put_object", {"ETag": '"2"'})
+        self.stubber.add_client_error("put_object", "AccessDenied")
+        self.stubber.activate()
+        failures = TransferScheduler(self.client, max_in_flight=2).run(iter(jobs))
+        self.stubber.assert_no_pending_responses()
+
+        self.assertEqual(len(failures), 1)
+        self.assertIn(failures[0][0].key, ["0.txt", "1.txt", "2.txt"])
+        self.assertEqual(failures[0][0].size, 5)
+        output = self.capturedOutput.getvalue()
+        self.assertEqual(output.count("upload: "), 2)
+        self.assertRegex(output, r" / 15 Bytes  3/3 files")
+        self.assertRegex(output, r"1 file\(s\) failed to transfer:")
+        self.assertRegex(output, r"upload failed: s3://kazhala-lol/\d.txt")
+
+    def test_download_copy(self):
+        filename = os.path.join(self.temp_dir.name, "folder", "hello.txt")
+        self.stubber.add_response(
+            "head_object",
+            {"ContentLength": 5},
+            {"Bucket": "kazhala-lol", "Key": "hello.txt", "VersionId": "111"},
+        )
+        self.stubber.add_response(
+            "get_object",
+            {"Body": io.BytesIO(b"hello"), "ContentLength": 5},
+            {"Bucket": "kazhala-lol", "Key": "hello.txt", "VersionId": "111"},
+        )
+        # size is provided, no head_object before copy
+        self.stubber.add_response(
+            "copy_object",
+            {},
+            {
+                "Bucket": "kazhala-lol",
+                "Key": "world.txt",
+                "CopySource": {"Bucket": "kazhala-lol", "Key": "hello.txt"},
+                "StorageClass": "STANDARD_IA",
+            },
+        )
+        self.stubber.activate()
+        failures = TransferScheduler(self.client, max_in_flight=1).run(
+            [
+                TransferJob(
+                    "download",
+                    "kazhala-lol",
+                    "hello.txt",
+                    filename=filename,
+                    extra_args={"VersionId": "111"},
+                    last_modified=1000,
+                ),
+                TransferJob(
+                    "copy",
+                    "kazhala-lol",
+                    "world.txt",
+                    copy_source={"Bucket": "kazhala-lol", "Key": "hello.txt"},
+                    extra_args={"StorageClass": "STANDARD_IA"},
+                    message="copy: hello.txt to world.txt",
+                    size=5,
+                ),
+                TransferJob("move", "kazhala-lol", "hello.txt"),
+            ]
+        )
+        self.stubber.assert_no_pending_responses()
+        with open(filename, "r") as file:
+            self.assertEqual(file.read(), "hello")
+        self.assertEqual(os.path.getmtime(filename), 1000)
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(failures[0][0].operation, "move")
+        self.assertIsInstance(failures[0][1], ValueError)
+        self.assertRegex(
+            self.capturedOutput.getvalue(), r"copy: hello.txt to world.txt"
+        )
+
+    def test_source_client(self):
+        source_client = boto3.client(
+            "s3",
+            region_name="ap-southeast-2",
+            aws_access_key_id="test",
+            aws_secret_access_key="test",
+        )
+        source_stubber = Stubber(source_client)
+        # size of the copy source is read through the source client
+        source_stubber.add_response(
+            "head_object",
+            {"ContentLength": 5},
+            {"Bucket": "kazhala-version-testing", "Key": "hello.txt"},
+        )
+        source_stubber.activate()
+        self.stubber.add_response("copy_object", {})
+        self.stubber.activate()
+        failures = TransferScheduler(
+            self.client, max_in_flight=1, source_client=source_client
+        ).run(
+            [
+                TransferJob(
+                    "copy",
+                    "kazhala-lol",
+                    "hello.txt",
+                    copy_source={
+                        "Bucket": "kazhala-version-testing",
+                        "Key": "hello.txt",
+                    },
+                )
+            ]
+        )
+        self.assertEqual(failures, [])
+        source_stubber.assert_no_pending_responses()
+        self.stubber.assert_no_pending_responses()
+
+    def test_no_progress(self):
+        self.stubber.add_response("copy_object", {})
+        self.stubber.activate()
+        scheduler = TransferScheduler(self.client, no_progress=True)
+        scheduler.run(
+            TransferJob(
+                "copy",
+                "kazhala-lol",
+                "%s.txt" % i,
+                copy_source={"Bucket": "kazhala-lol", "Key": "hello.txt"},
+                message="copy: %s" % i,
+                size=1,
+            )
+            for i in range(1)
+        )
+        self.stubber.assert_no_pending_responses()
+        self.assertIsNone(scheduler.progress)
+        self.assertEqual(self.capturedOutput.getvalue(), "copy: 0\n")
+
+    def test_failed_job(self):
+        self.stubber.add_response("copy_object", {})
+        self.stubber.activate()
+        jobs = [
+            TransferJob(
+                "copy",
+                "kazhala-lol",
+                "%s.txt" % i,
+                copy_source={"Bucket": "kazhala-lol", "Key": "hello.txt"},
+                size=1,
+            )
+            for i in range(2)
+        ]
+        jobs[0] = jobs[0]._replace(error=ValueError("head failed"))
+        failures = TransferScheduler(self.client, no_progress=True).run(jobs)
+        self.stubber.assert_no_pending_responses()
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(failures[0][0].key, "0.txt")
+        self.assertIn(
+            "copy failed: s3://kazhala-lol/0.txt head failed",
+            self.capturedOutput.getvalue(),
+        )
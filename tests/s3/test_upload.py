@@ -1,12 +1,14 @@
 import io
 import sys
 import os
+import tempfile
 import unittest
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 from fzfaws.s3.upload_s3 import upload_s3
 from fzfaws.s3 import S3
 from fzfaws.utils import Pyfzf
 from fzfaws.s3.helper.s3args import S3Args
+from fzfaws.s3.helper.transfer_scheduler import TransferJob
 
 
 class TestS3Upload(unittest.TestCase):
@@ -29,6 +31,8 @@ class TestS3Upload(unittest.TestCase):
             include=[],
             from_path="/tmp",
             to_path="s3://kazhala-file-transfer/hello/",
+            client=ANY,
+            etag=False,
         )
         mocked_local_file.assert_called_with(
             search_from_root=False, directory=True, hidden=False, multi_select=False,
@@ -36,7 +40,12 @@ class TestS3Upload(unittest.TestCase):
 
         upload_s3(sync=True, search_root=True, recursive=True, hidden=True)
         mocked_sync.assert_called_with(
-            exclude=[], include=[], from_path="/tmp", to_path="s3:///",
+            exclude=[],
+            include=[],
+            from_path="/tmp",
+            to_path="s3:///",
+            client=ANY,
+            etag=False,
         )
         mocked_local_file.assert_called_with(
             search_from_root=True, directory=True, hidden=True, multi_select=False,
@@ -46,45 +55,100 @@ class TestS3Upload(unittest.TestCase):
 
     @patch.object(S3Args, "set_extra_args")
     @patch("fzfaws.s3.upload_s3.get_confirmation")
-    @patch("fzfaws.s3.upload_s3.os.walk")
     @patch.object(Pyfzf, "get_local_file")
-    def test_recusive_upload(
-        self, mocked_local_file, mocked_walk, mocked_confirm, mocked_args
-    ):
-        curr_dirname = os.path.dirname(os.path.abspath(__file__))
-        mocked_local_file.return_value = curr_dirname
-        mocked_walk.return_value = [(curr_dirname, "/tmp", [__file__])]
-        mocked_confirm.return_value = False
+    def test_recusive_upload(self, mocked_local_file, mocked_confirm, mocked_args):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            os.makedirs(os.path.join(temp_dir, "nested"))
+            with open(os.path.join(temp_dir, "nested", "test_upload.py"), "w") as file:
+                file.write("hello")
+            mocked_local_file.return_value = temp_dir
+            mocked_confirm.return_value = False
 
-        self.capturedOutput.truncate(0)
-        self.capturedOutput.seek(0)
-        upload_s3(recursive=True, bucket="kazhala-file-lol/hello/")
-        self.assertEqual(
-            self.capturedOutput.getvalue(),
-            "(dryrun) upload: test_upload.py to s3://kazhala-file-lol/hello/test_upload.py\n",
-        )
+            self.capturedOutput.truncate(0)
+            self.capturedOutput.seek(0)
+            upload_s3(recursive=True, bucket="kazhala-file-lol/hello/")
+            self.assertEqual(
+                self.capturedOutput.getvalue(),
+                "(dryrun) upload: nested/test_upload.py to s3://kazhala-file-lol/hello/nested/test_upload.py\n"
+                "(dryrun) total: 1 file(s), 5 Bytes\n",
+            )
 
-        self.capturedOutput.truncate(0)
-        self.capturedOutput.seek(0)
-        upload_s3(recursive=True, bucket="kazhala-file-lol/hello/", exclude=["*"])
-        self.assertEqual(
-            self.capturedOutput.getvalue(), "",
-        )
+            self.capturedOutput.truncate(0)
+            self.capturedOutput.seek(0)
+            upload_s3(recursive=True, bucket="kazhala-file-lol/hello/", exclude=["*"])
+            self.assertEqual(
+                self.capturedOutput.getvalue(), "",
+            )
 
-        self.capturedOutput.truncate(0)
-        self.capturedOutput.seek(0)
-        upload_s3(
-            recursive=True,
-            bucket="kazhala-file-lol/hello/",
-            exclude=["*"],
-            include=["test_upload.py"],
-            extra_config=True,
-        )
-        self.assertEqual(
-            self.capturedOutput.getvalue(),
-            "(dryrun) upload: test_upload.py to s3://kazhala-file-lol/hello/test_upload.py\n",
-        )
-        mocked_args.assert_called_once()
+            self.capturedOutput.truncate(0)
+            self.capturedOutput.seek(0)
+            upload_s3(
+                recursive=True,
+                bucket="kazhala-file-lol/hello/",
+                exclude=["*"],
+                include=["*/test_upload.py"],
+                extra_config=True,
+            )
+            self.assertEqual(
+                self.capturedOutput.getvalue(),
+                "(dryrun) upload: nested/test_upload.py to s3://kazhala-file-lol/hello/nested/test_upload.py\n"
+                "(dryrun) total: 1 file(s), 5 Bytes\n",
+            )
+            mocked_args.assert_called_once()
+
+            self.capturedOutput.truncate(0)
+            self.capturedOutput.seek(0)
+            upload_s3(recursive=True, bucket="kazhala-file-lol/hello/", summary=True)
+            self.assertEqual(
+                self.capturedOutput.getvalue(), "(dryrun) total: 1 file(s), 5 Bytes\n"
+            )
+
+    @patch("fzfaws.s3.upload_s3.open_transfer_journal")
+    @patch("fzfaws.s3.upload_s3.TransferScheduler")
+    @patch("fzfaws.s3.upload_s3.get_confirmation")
+    @patch.object(Pyfzf, "get_local_file")
+    def test_recusive_upload_jobs(
+        self, mocked_local_file, mocked_confirm, mocked_scheduler, mocked_journal
+    ):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with open(os.path.join(temp_dir, "hello.txt"), "w") as file:
+                file.write("hello")
+            mocked_local_file.return_value = temp_dir
+
+            def confirm(message):
+                # created after the dry run, not uploaded without being shown
+                with open(os.path.join(temp_dir, "new.txt"), "w") as file:
+                    file.write("hello")
+                return True
+
+            mocked_confirm.side_effect = confirm
+            jobs = []
+            mocked_scheduler.return_value.run.side_effect = jobs.extend
+            upload_s3(
+                recursive=True, bucket="kazhala-file-lol/hello/", resume="upload-1"
+            )
+            mocked_journal.assert_called_once_with("upload", "upload-1")
+            mocked_scheduler.assert_called_once_with(
+                ANY, journal=mocked_journal.return_value
+            )
+            # streamed from the spool of the dry run, not collected in memory
+            self.assertNotIsInstance(
+                mocked_scheduler.return_value.run.call_args[0][0], list
+            )
+            self.assertEqual(
+                jobs,
+                [
+                    TransferJob(
+                        "upload",
+                        "kazhala-file-lol",
+                        "hello/hello.txt",
+                        filename=os.path.join(temp_dir, "hello.txt"),
+                        extra_args={},
+                        message="upload: hello.txt to s3://kazhala-file-lol/hello/hello.txt",
+                        size=5,
+                    )
+                ],
+            )
 
     @patch("fzfaws.s3.upload_s3.recursive_upload")
     @patch("fzfaws.s3.upload_s3.get_confirmation")
@@ -17,9 +17,9 @@ class TestS3WalkFolder(unittest.TestCase):
     def tearDown(self):
         sys.stdout = sys.__stdout__
 
-    @patch("fzfaws.s3.helper.walk_s3_folder.exclude_file")
+    @patch("fzfaws.s3.helper.walk_s3_folder.GlobFilter")
     @patch.object(Paginator, "paginate")
-    def test_walk(self, mocked_paginator, mocked_exclude):
+    def test_walk(self, mocked_paginator, mocked_filter):
         data_path2 = os.path.join(
             os.path.dirname(os.path.abspath(__file__)), "../data/s3_object_nested.json"
         )
@@ -27,12 +27,20 @@ class TestS3WalkFolder(unittest.TestCase):
             response = json.load(file)
 
         mocked_paginator.return_value = response
+        mocked_exclude = mocked_filter.return_value.exclude
         mocked_exclude.return_value = False
         client = boto3.client("s3")
+        sizes = {}
         result = walk_s3_folder(
-            client, "kazhala-file-transfer", "wtf/hello", "", destination_path="tmp"
+            client,
+            "kazhala-file-transfer",
+            "wtf/hello",
+            "",
+            destination_path="tmp",
+            sizes=sizes,
         )
         self.assertEqual(result, [("wtf/hello/hello.txt", "tmp/wtf/hello/hello.txt")])
+        self.assertEqual(sizes, {"wtf/hello/hello.txt": 0})
         self.assertEqual(
             self.capturedOutput.getvalue(),
             "(dryrun) download: s3://kazhala-file-transfer/wtf/hello/hello.txt to tmp/wtf/hello/hello.txt\n",
@@ -1,7 +1,7 @@
 import unittest
 import io
 import sys
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 from fzfaws.sns import SNS
 from fzfaws.utils import Pyfzf, FileLoader
 from botocore.paginate import Paginator
@@ -56,12 +56,13 @@ class TestSNS(unittest.TestCase):
         self.assertEqual(
             self.sns.arns, ["arn:aws:sns:ap-southeast-2:11111111:s3testing"]
         )
-        mocked_fzf_list.assert_called_with(
+        mocked_fzf_list.assert_called_with(ANY, "TopicArn", stream=True, reload=None)
+        self.assertEqual(
+            list(mocked_fzf_list.call_args[0][0]),
             [
                 {"TopicArn": "arn:aws:sns:ap-southeast-2:11111111:cformtesting"},
                 {"TopicArn": "arn:aws:sns:ap-southeast-2:11111111:s3testing"},
             ],
-            "TopicArn",
         )
 
         # parameter test
@@ -87,6 +88,7 @@ class TestSNS(unittest.TestCase):
         self.sns.arns = [""]
         mocked_fzf_list.reset_mock()
         self.sns.set_arns()
-        mocked_fzf_list.assert_not_called()
+        mocked_fzf_list.assert_called_once()
+        self.assertEqual(list(mocked_fzf_list.call_args[0][0]), [])
         mocked_fzf_execute.assert_called_once()
         self.assertEqual(self.sns.arns, [""])
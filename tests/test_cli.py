@@ -7,6 +7,7 @@ from unittest.mock import patch
 from fzfaws.cli import main, copy_config
 import sys
 import io
+import subprocess
 from pathlib import Path
 import tempfile
 
@@ -22,9 +23,9 @@ class TestCLI(unittest.TestCase):
     def tearDown(self):
         sys.stdout = sys.__stdout__
 
-    @patch("fzfaws.cli.s3")
-    @patch("fzfaws.cli.ec2")
-    @patch("fzfaws.cli.cloudformation")
+    @patch("fzfaws.s3.main.s3")
+    @patch("fzfaws.ec2.main.ec2")
+    @patch("fzfaws.cloudformation.main.cloudformation")
     def test_subparser(self, mocked_cloudformation, mocked_ec2, mocked_s3):
         sys.argv = [__file__, "cloudformation", "-h"]
         main()
@@ -88,3 +89,19 @@ class TestCLI(unittest.TestCase):
         mocked_args.side_effect = ClientError
         sys.argv = [__file__, "s3"]
         self.assertRaises(SystemExit, main)
+
+    def test_lazy_imports(self):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, fzfaws.cli\n"
+                "print(' '.join(sorted(sys.modules)))",
+            ],
+            cwd=str(Path(__file__).resolve().parent.parent),
+            stdout=subprocess.PIPE,
+            check=True,
+        )
+        modules = str(result.stdout, "utf-8").split()
+        for module in ("boto3", "botocore", "yaml", "pkg_resources", "fzfaws.s3"):
+            self.assertNotIn(module, modules)
@@ -0,0 +1,84 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from dateutil.tz import tzutc
+from unittest.mock import patch
+from fzfaws.utils.cache import ResponseCache
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        env = {"XDG_CACHE_HOME": self.cache_dir.name, "FZFAWS_GLOBAL_CACHE_TTL": "60"}
+        with patch.dict(os.environ, env):
+            self.cache = ResponseCache(
+                profile="default", region="us-east-1", service_name="ec2"
+            )
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def test_constructor(self):
+        self.assertEqual(self.cache.ttl, 60)
+        self.assertTrue(self.cache.enabled)
+        self.assertEqual(self.cache.cache_dir, "%s/fzfaws" % self.cache_dir.name)
+
+        with patch.dict(
+            os.environ, {"FZFAWS_GLOBAL_CACHE_TTL": "60", "FZFAWS_EC2_CACHE_TTL": "0"}
+        ):
+            cache = ResponseCache(service_name="ec2")
+            self.assertFalse(cache.enabled)
+
+        with patch.dict(os.environ, {"FZFAWS_S3_CACHE_TTL": "10"}):
+            os.environ.pop("FZFAWS_GLOBAL_CACHE_TTL", None)
+            self.assertEqual(ResponseCache(service_name="ec2").ttl, 0)
+            self.assertEqual(ResponseCache(service_name="s3").ttl, 10)
+
+        with patch.dict(os.environ, {"FZFAWS_EC2_CACHE_TTL": "5m"}):
+            with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+                self.assertEqual(ResponseCache(service_name="ec2").ttl, 0)
+            self.assertEqual(
+                stderr.getvalue(),
+                "Invalid FZFAWS_EC2_CACHE_TTL 5m, response cache disabled\n",
+            )
+
+    def test_get_set(self):
+        self.assertIsNone(self.cache.get("describe_vpcs", {}))
+
+        pages = [
+            {
+                "Vpcs": [
+                    {
+                        "VpcId": "vpc-1111",
+                        "Created": datetime(2020, 1, 1),
+                        "Modified": datetime(2020, 1, 1, 1, 2, 3, 4, tzutc()),
+                    }
+                ]
+            }
+        ]
+        self.cache.set("describe_vpcs", {}, pages)
+        self.assertEqual(self.cache.get("describe_vpcs", {}), (pages, False))
+        modified = self.cache.get("describe_vpcs", {})[0][0]["Vpcs"][0]["Modified"]
+        self.assertEqual(modified.utcoffset(), timedelta(0))
+        self.assertIsNone(self.cache.get("describe_vpcs", {"VpcIds": ["vpc-1111"]}))
+
+        self.cache.ttl = -1
+        self.assertEqual(self.cache.get("describe_vpcs", {})[1], True)
+
+        # written by an older version with the datetimes as str
+        with open(self.cache.get_path("describe_vpcs", {}), "w") as file:
+            json.dump({"created": 0, "pages": [{"Vpcs": []}]}, file)
+        self.assertIsNone(self.cache.get("describe_vpcs", {}))
+
+    def test_get_path(self):
+        path = self.cache.get_path("describe_vpcs", {"MaxResults": 5})
+        self.assertRegex(path, r"%s/fzfaws/[0-9a-f]{64}\.json$" % self.cache_dir.name)
+        self.assertEqual(path, self.cache.get_path("describe_vpcs", {"MaxResults": 5}))
+        self.assertNotEqual(path, self.cache.get_path("describe_vpcs", {}))
+
+        cache = ResponseCache(profile="root", region="us-east-1", service_name="ec2")
+        cache.cache_dir = self.cache.cache_dir
+        self.assertNotEqual(path, cache.get_path("describe_vpcs", {"MaxResults": 5}))
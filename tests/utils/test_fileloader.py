@@ -141,6 +141,10 @@ class TestFileLoader(unittest.TestCase):
         self.fileloader._set_s3_env(
             {
                 "transfer_config": {"multipart_threshold": 1, "multipart_chunksize": 1},
+                "max_in_flight": 4,
+                "index": True,
+                "index_ttl": 60,
+                "inventory": ["manifest.json"],
                 "profile": "root",
                 "default_args": {"upload": "-R", "ls": "-b"},
             }
@@ -149,6 +153,13 @@ class TestFileLoader(unittest.TestCase):
             os.environ["FZFAWS_S3_TRANSFER"],
             json.dumps({"multipart_threshold": 1, "multipart_chunksize": 1,}),
         )
+        self.assertEqual(os.environ["FZFAWS_S3_MAX_IN_FLIGHT"], "4")
+        self.assertEqual(os.environ["FZFAWS_S3_INDEX"], "1")
+        self.assertEqual(os.environ["FZFAWS_S3_INDEX_TTL"], "60")
+        self.assertEqual(os.environ["FZFAWS_S3_INVENTORY"], '["manifest.json"]')
+        os.environ["FZFAWS_S3_INDEX"] = ""
+        os.environ["FZFAWS_S3_INDEX_TTL"] = ""
+        os.environ["FZFAWS_S3_INVENTORY"] = ""
         self.assertEqual(os.environ["FZFAWS_S3_UPLOAD"], "-R")
         self.assertEqual(os.environ["FZFAWS_S3_PROFILE"], "root")
         self.assertEqual(os.environ["FZFAWS_S3_LS"], "-b")
@@ -292,3 +303,17 @@ class TestFileLoader(unittest.TestCase):
         self.assertEqual(os.environ["FZFAWS_SPINNER_SPEED"], "0.8")
         self.assertEqual(os.environ["FZFAWS_SPINNER_MESSAGE"], "hello")
         self.assertEqual(os.environ["FZFAWS_SPINNER_PATTERN"], "xxx")
+
+    def test_set_cache_env(self):
+        # empty test
+        self.fileloader._set_cache_env("iam", {})
+        self.assertEqual(os.getenv("FZFAWS_IAM_CACHE_TTL", ""), "")
+
+        # custom settings
+        self.fileloader._set_gloable_env({"cache_ttl": 300})
+        self.fileloader._set_cache_env("iam", {"cache_ttl": 0})
+        self.assertEqual(os.environ["FZFAWS_GLOBAL_CACHE_TTL"], "300")
+        self.assertEqual(os.environ["FZFAWS_IAM_CACHE_TTL"], "0")
+
+        os.environ.pop("FZFAWS_GLOBAL_CACHE_TTL")
+        os.environ.pop("FZFAWS_IAM_CACHE_TTL")
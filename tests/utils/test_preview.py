@@ -0,0 +1,60 @@
+import os
+import shlex
+import subprocess
+import unittest
+
+from fzfaws.utils.preview import FilePreview, cksum
+
+
+class TestFilePreview(unittest.TestCase):
+    def setUp(self):
+        self.preview = FilePreview()
+
+    def tearDown(self):
+        self.preview.close()
+
+    def run_preview(self, entry):
+        # fzf replace {} with the quoted entry
+        command = self.preview.command.replace("{}", shlex.quote(entry))
+        return subprocess.run(
+            ["sh", "-c", command], stdout=subprocess.PIPE
+        ).stdout.decode()
+
+    def test_command(self):
+        self.preview.add("./", ["hello.txt", "world.txt"])
+        self.preview.add("logs/", ["logs/app.log"])
+        self.preview.add(" w tf.txt", ["$(echo injected)"])
+        self.assertEqual(self.run_preview("./"), "hello.txt\nworld.txt\n")
+        self.assertEqual(self.run_preview("logs/"), "logs/app.log\n")
+        self.assertEqual(self.run_preview(" w tf.txt"), "$(echo injected)\n")
+        self.assertEqual(self.run_preview("log"), "")
+        self.assertEqual(self.run_preview("-x"), "")
+
+        # replace the existing preview
+        self.preview.add("./", ["logs/app.log"])
+        self.assertEqual(self.run_preview("./"), "logs/app.log\n")
+        self.assertEqual(len(os.listdir(self.preview.directory)), 3)
+
+        # keys could contain newline or non ascii characters
+        self.preview.add("new\nline/", ["new\nline/hello.txt"])
+        self.preview.add("日本/", ["日本/hello.txt"])
+        self.assertEqual(self.run_preview("new\nline/"), "new\nline/hello.txt\n")
+        self.assertEqual(self.run_preview("new"), "")
+        self.assertEqual(self.run_preview("日本/"), "日本/hello.txt\n")
+
+    def test_cksum(self):
+        for data in (b"", b"./", b"logs/", "日本/".encode("utf-8"), b"a" * 300):
+            result = subprocess.run(
+                ["cksum"], input=data, stdout=subprocess.PIPE
+            ).stdout.decode()
+            self.assertEqual(cksum(data), result.strip())
+
+    def test_close(self):
+        with FilePreview() as preview:
+            preview.add("./", ["hello.txt"])
+            directory = preview.directory
+            self.assertTrue(os.path.isfile(preview.get_path("./")))
+        self.assertFalse(os.path.exists(directory))
+        # added after fzf exited, e.g. from a prefetch
+        preview.add("logs/", ["logs/app.log"])
+        self.assertFalse(os.path.exists(directory))
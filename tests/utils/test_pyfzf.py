@@ -1,7 +1,10 @@
 import unittest
 import subprocess
 import io
+import itertools
 import sys
+import threading
+import time
 from unittest.mock import ANY, patch
 from fzfaws.utils import Pyfzf, FileLoader
 from fzfaws.utils.exceptions import EmptyList, NoSelectionMade
@@ -76,9 +79,8 @@ class TestPyfzf(unittest.TestCase):
             ],
         )
 
-    @patch.object(subprocess, "Popen")
-    @patch.object(subprocess, "check_output")
-    def test_execute_fzf(self, mocked_output, mocked_popen):
+    @patch.object(Pyfzf, "_run_fzf")
+    def test_execute_fzf(self, mocked_output):
         mocked_output.return_value = b"hello"
         result = self.fzf.execute_fzf(print_col=1)
         self.assertEqual(result, "hello")
@@ -105,9 +107,26 @@ class TestPyfzf(unittest.TestCase):
         result = self.fzf.execute_fzf(multi_select=True, print_col=0)
         self.assertEqual(result, ["hello world", "foo boo"])
 
-    @patch.object(subprocess, "Popen")
-    @patch.object(subprocess, "check_output")
-    def test_check_ctrl_c(self, mocked_output, mocked_popen):
+        mocked_output.side_effect = subprocess.CalledProcessError(130, "fzf")
+        self.assertRaises(NoSelectionMade, self.fzf.execute_fzf)
+        self.assertEqual(self.fzf.execute_fzf(empty_allow=True), "")
+        self.assertEqual(
+            self.fzf.execute_fzf(empty_allow=True, multi_select=True), []
+        )
+
+    @patch.object(Pyfzf, "_construct_fzf_cmd")
+    def test_run_fzf(self, mocked_cmd):
+        mocked_cmd.return_value = ["sh", "-c", "cat", "sh"]
+        self.fzf.pipe_block_size = 16
+        self.fzf.append_fzf("hello\n")
+        self.fzf.append_fzf("world\n" * 100)
+        self.fzf.append_fzf("\n\n  ")
+        result = self.fzf.execute_fzf(multi_select=True, print_col=0)
+        self.assertEqual(result, ["hello"] + ["world"] * 100)
+        self.assertEqual(self.fzf.fzf_string, "hello\n" + "world\n" * 99 + "world")
+
+    @patch.object(Pyfzf, "_run_fzf")
+    def test_check_ctrl_c(self, mocked_output):
         mocked_output.return_value = b"ctrl-c"
         self.assertRaises(KeyboardInterrupt, self.fzf.execute_fzf)
         mocked_output.return_value = b"hello world"
@@ -207,6 +226,166 @@ class TestPyfzf(unittest.TestCase):
         self.fzf.process_list(test_list, "foo", "boo")
         self.assertEqual(self.fzf.fzf_string, "foo: 1 | boo: 2\nfoo: b | boo: None\n")
 
+        # stream test
+        self.fzf.fzf_string = ""
+        self.fzf.process_list([], "foo", stream=True)
+        self.fzf.process_list(test_list, "foo", "boo", stream=True)
+        self.assertEqual(self.fzf.fzf_string, "")
+        self.assertEqual(len(self.fzf._streams), 2)
+        self.assertEqual(list(self.fzf._streams[0]), [])
+        self.assertEqual(
+            list(self.fzf._streams[1]), ["foo: 1 | boo: 2\n", "foo: b | boo: None\n"]
+        )
+
+    @patch.object(Pyfzf, "_construct_fzf_cmd")
+    def test_execute_fzf_stream(self, mocked_cmd):
+        # head act as fzf, exit straight after the first entry
+        mocked_cmd.return_value = ["sh", "-c", "head -n 1", "sh"]
+        consumed = []
+        closed = []
+
+        def infinite_generator():
+            try:
+                for i in itertools.count():
+                    consumed.append(i)
+                    yield {"Key": i}
+            finally:
+                closed.append(True)
+
+        self.fzf.process_list(infinite_generator(), "Key", stream=True)
+        result = self.fzf.execute_fzf(delimiter=": ")
+        self.assertEqual(result, "0")
+        self.assertEqual(self.fzf._streams, [])
+        # producer should be stopped and closed once fzf exit
+        stopped_at = len(consumed)
+        time.sleep(0.2)
+        self.assertEqual(len(consumed), stopped_at)
+        self.assertEqual(closed, [True])
+
+        # streams are closed even if still referenced
+        stream = (str(entry["Key"]) + "\n" for entry in infinite_generator())
+        self.fzf.stream_fzf(stream)
+        self.assertEqual(self.fzf.execute_fzf(print_col=0), "0")
+        time.sleep(0.2)
+        self.assertIsNone(stream.gi_frame)
+
+        # fzf_string is written before the streams
+        self.fzf.append_fzf("hello\n")
+        self.fzf.stream_fzf(iter(["world\n"]))
+        result = self.fzf.execute_fzf(print_col=0)
+        self.assertEqual(result, "hello")
+
+        # empty stream
+        mocked_cmd.return_value = ["sh", "-c", "cat", "sh"]
+        self.fzf.fzf_string = ""
+        self.fzf.process_list([], "Key", stream=True)
+        self.assertRaises(NoSelectionMade, self.fzf.execute_fzf)
+        result = self.fzf.execute_fzf(empty_allow=True)
+        self.assertEqual(result, "")
+
+        # non zero exit as no selection made
+        mocked_cmd.return_value = ["sh", "-c", "cat > /dev/null; exit 130", "sh"]
+        self.fzf.stream_fzf(iter(["hello\n"]))
+        self.assertRaises(NoSelectionMade, self.fzf.execute_fzf)
+
+    @patch.object(Pyfzf, "_construct_fzf_cmd")
+    def test_execute_fzf_stream_error(self, mocked_cmd):
+        mocked_cmd.return_value = ["sh", "-c", "cat", "sh"]
+
+        def error_generator():
+            yield "hello\n"
+            raise ValueError("paginator failed")
+
+        self.fzf.stream_fzf(error_generator())
+        self.assertRaisesRegex(ValueError, "paginator failed", self.fzf.execute_fzf)
+        self.assertEqual(self.fzf._streams, [])
+
+    @patch.object(Pyfzf, "_construct_fzf_cmd")
+    def test_execute_fzf_records(self, mocked_cmd):
+        test_list = [{"foo": "1 | boo: 3", "boo": 2}, {"foo": "b"}]
+        self.fzf.process_list(test_list, "foo", "boo", record=True)
+        self.assertEqual(
+            self.fzf.fzf_string,
+            "0\tfoo: 1 | boo: 3 | boo: 2\n1\tfoo: b | boo: None\n",
+        )
+
+        mocked_cmd.return_value = ["sh", "-c", "tail -n 1", "sh"]
+        with patch.object(self.fzf, "_run_fzf", wraps=self.fzf._run_fzf) as mocked_run:
+            result = self.fzf.execute_fzf_records()
+            self.assertIn("--with-nth=2..", mocked_run.call_args[0][0])
+        self.assertIs(result, test_list[1])
+
+        mocked_cmd.return_value = ["sh", "-c", "cat", "sh"]
+        result = self.fzf.execute_fzf_records(multi_select=True)
+        self.assertEqual(result, test_list)
+
+        # records are streamed
+        self.fzf.fzf_string = ""
+        self.fzf.process_list(iter(test_list), "foo", stream=True, record=True)
+        result = self.fzf.execute_fzf_records(multi_select=True)
+        self.assertEqual(result, test_list)
+
+        mocked_cmd.return_value = ["sh", "-c", "cat > /dev/null; exit 130", "sh"]
+        self.fzf.fzf_string = ""
+        self.fzf.process_list(test_list, "foo", record=True)
+        self.assertRaises(NoSelectionMade, self.fzf.execute_fzf_records)
+        self.assertEqual(self.fzf.execute_fzf_records(empty_allow=True), None)
+        self.assertEqual(
+            self.fzf.execute_fzf_records(empty_allow=True, multi_select=True), []
+        )
+
+    @patch.object(Pyfzf, "_construct_fzf_cmd")
+    def test_execute_fzf_reload(self, mocked_cmd):
+        # run the reload command of the bind as if ctrl-r is pressed
+        mocked_cmd.return_value = [
+            sys.executable,
+            "-c",
+            "import subprocess, sys\n"
+            "sys.stdin.read()\n"
+            "bind = [a for a in sys.argv if a.startswith('--bind=ctrl-r:')][0]\n"
+            "command = bind[len('--bind=ctrl-r:reload(') : -1]\n"
+            "sys.stdout.write(subprocess.check_output(['sh', '-c', command]).decode())",
+        ]
+        cached = [{"foo": "1"}]
+        fresh = [{"foo": "1"}, {"foo": "2"}]
+        self.fzf.process_list(
+            iter(cached), "foo", stream=True, record=True, reload=iter(fresh)
+        )
+        result = self.fzf.execute_fzf_records(multi_select=True)
+        self.assertEqual(result, fresh)
+        self.assertEqual(self.fzf._reloads, [])
+
+    def test_list_generator_concurrent(self):
+        # the stdin writer and the reload thread record items at the same time
+        streams = [
+            [{"foo": "%s-%s" % (stream, i)} for i in range(2000)] for stream in range(4)
+        ]
+        entries = []
+        threads = [
+            threading.Thread(
+                target=lambda stream=stream: entries.extend(
+                    self.fzf._list_generator(stream, "foo", record=True)
+                )
+            )
+            for stream in streams
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.fzf._records), 8000)
+        for entry in entries:
+            index, value = entry.rstrip("\n").split("\tfoo: ")
+            self.assertEqual(self.fzf._records[int(index)]["foo"], value)
+
+    @patch.object(Pyfzf, "_run_fzf")
+    def test_bind_reload(self, mocked_run):
+        mocked_run.return_value = b"Key: hello.txt"
+        self.fzf.bind_reload("alt-l", "list {}")
+        self.fzf.execute_fzf(delimiter=": ")
+        self.assertIn("--bind=alt-l:reload(list {})", mocked_run.call_args[0][0])
+        self.assertEqual(self.fzf._binds, [])
+
     @patch.object(Pyfzf, "execute_fzf")
     def test_format_selected_to_dict(self, mocked_execute):
         mocked_execute.return_value = "foo: 1 | boo: 2 | wtf: None"
@@ -1,6 +1,10 @@
+import os
+import tempfile
+import time
 import unittest
 from unittest.mock import patch, PropertyMock
 from fzfaws.utils import BaseSession, Pyfzf, FileLoader
+from fzfaws.utils.session import clear_registry, get_session
 from boto3.session import Session
 import boto3
 from botocore.stub import Stubber
@@ -59,6 +63,65 @@ class TestSession(unittest.TestCase):
         self.assertEqual("ap-southeast-2", session.region)
         mocked_fzf_append.assert_called_with("ap-southeast-1\n")
 
+    def test_registry(self):
+        clear_registry()
+        ec2 = BaseSession(service_name="ec2")
+        self.assertIsNone(ec2._client)
+        self.assertIsNone(ec2._resource)
+
+        s3 = BaseSession(profile="root", service_name="s3")
+        other_ec2 = BaseSession(service_name="ec2")
+        self.assertIs(ec2.session, other_ec2.session)
+        self.assertIs(ec2.session, get_session("default", "us-east-1"))
+        self.assertIsNot(ec2.session, s3.session)
+        self.assertIs(ec2.client, other_ec2.client)
+        self.assertEqual(ec2.client.meta.service_model.service_name, "ec2")
+        self.assertIs(ec2.resource, other_ec2.resource)
+        other_s3 = BaseSession(profile="root", service_name="s3")
+        self.assertIs(s3.resource, other_s3.resource)
+
+        clear_registry()
+        self.assertIsNot(BaseSession(service_name="ec2").client, ec2.client)
+
+    @patch.object(BaseSession, "client", new_callable=PropertyMock)
+    def test_paginate(self, mocked_client):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        page = {"Topics": [{"TopicArn": "arn:aws:sns:us-east-1:111111:hello"}]}
+
+        # cache disabled
+        sns = boto3.client("sns")
+        stubber = Stubber(sns)
+        stubber.add_response("list_topics", page)
+        stubber.activate()
+        mocked_client.return_value = sns
+        session = BaseSession(service_name="sns")
+        self.assertEqual(list(session.paginate("list_topics")), [page])
+        self.assertIsNone(session.refreshed("list_topics", list))
+
+        with patch.dict(
+            os.environ,
+            {"XDG_CACHE_HOME": cache_dir.name, "FZFAWS_SNS_CACHE_TTL": "60"},
+        ):
+            # cache miss, cached after all pages are fetched
+            session = BaseSession(service_name="sns")
+            stubber.add_response("list_topics", page)
+            self.assertEqual(list(session.paginate("list_topics")), [page])
+            self.assertEqual(len(os.listdir("%s/fzfaws" % cache_dir.name)), 1)
+
+            # cache hit, no request
+            self.assertEqual(session.paginate("list_topics"), [page])
+            self.assertIsNone(session.refreshed("list_topics", list))
+            stubber.assert_no_pending_responses()
+
+            # expired, cached pages returned and refreshed in background
+            new_page = {"Topics": [{"TopicArn": "arn:aws:sns:us-east-1:111111:foo"}]}
+            stubber.add_response("list_topics", new_page)
+            with patch("fzfaws.utils.cache.time.time", return_value=time.time() + 120):
+                self.assertEqual(session.paginate("list_topics"), [page])
+                self.assertEqual(session.refreshed("list_topics", list), [new_page])
+            self.assertEqual(session.paginate("list_topics"), [new_page])
+
     # TODO: reference only for now
     def test_random(self):
         ec2 = boto3.client("ec2")